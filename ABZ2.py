@@ -1,5 +1,5 @@
 import streamlit as st
-import requests
+import cliente_http
 import json
 import os
 import numpy as np
@@ -177,7 +177,7 @@ if "ultima_previsao_abz" not in st.session_state:
 # ---------- Buscar novo número ----------
 def buscar_novo_numero():
     try:
-        r = requests.get(API_URL, headers=HEADERS, timeout=10)
+        r = cliente_http.get(API_URL, headers=HEADERS, timeout=10)
         if r.status_code == 200:
             data = r.json()
             numero = data.get("data", {}).get("result", {}).get("outcome", {}).get("number")
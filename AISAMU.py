@@ -1,6 +1,7 @@
 
 import streamlit as st
 import requests
+import cliente_http
 import os
 import joblib
 import numpy as np
@@ -111,7 +112,7 @@ historico = carregar(HISTORICO_PATH, deque(maxlen=1000))
 ultimo_alerta = carregar(ULTIMO_ALERTA_PATH, {"referencia": None, "entrada": None, "resultado_enviado": None})
 
 try:
-    dados = requests.get(API_URL).json()
+    dados = cliente_http.get(API_URL).json()
     ultimos_numeros = [r["value"]["number"] for r in dados if r["type"] == "RouletteWinNumberEvent"]
     for numero in ultimos_numeros:
         if not historico or historico[-1] != numero:
@@ -1,5 +1,6 @@
 import streamlit as st
 import requests
+import cliente_http
 import json
 import os
 from collections import deque
@@ -21,7 +22,7 @@ st_autorefresh(interval=5000, key="atualizacao")
 # === FUNÇÕES AUXILIARES ===
 def obter_numero_e_timestamp():
     try:
-        response = requests.get(API_URL)
+        response = cliente_http.get(API_URL)
         data = response.json()
         if (
             "data" in data and
@@ -1,5 +1,6 @@
 import streamlit as st
-import requests
+import resultados_lotofacil
+import analise_lotofacil
 import random
 import pandas as pd
 import numpy as np
@@ -11,6 +12,9 @@ from collections import Counter
 from datetime import datetime
 from scipy.stats import norm, binom
 from itertools import combinations
+from functools import lru_cache
+import probabilidades_lotofacil as prob
+import lotofacil_bits as lb
 import warnings
 warnings.filterwarnings("ignore")
 
@@ -244,20 +248,8 @@ def distribuir_por_colunas(jogo):
         colunas[(n-1)%5] += 1
     return colunas
 
-@st.cache_data
-def baseline_aleatorio(n=200000):
-    acertos = []
-    for _ in range(n):
-        jogo = set(random.sample(range(1, 26), 15))
-        sorteio = set(random.sample(range(1, 26), 15))
-        acertos.append(len(jogo & sorteio))
-    acertos = np.array(acertos)
-    return {
-        "media": acertos.mean(),
-        "std": acertos.std(),
-        "dist": np.bincount(acertos, minlength=16) / n,
-        "descricao": "Interseção 15×15 em universo 25"
-    }
+def baseline_aleatorio():
+    return prob.baseline()
 
 def criar_historico_df(dados_api, qtd_concursos):
     historico = []
@@ -289,23 +281,8 @@ def log_likelihood(features, dist):
         logL += math.log(p)
     return logL
 
-@st.cache_data
-def monte_carlo_jogo(jogo_tuple, n_sim):
-    jogo = set(jogo_tuple)
-    acertos = []
-    for _ in range(n_sim):
-        sorteio = set(random.sample(range(1, 26), 15))
-        acertos.append(len(jogo & sorteio))
-    acertos = np.array(acertos)
-    return {
-        "P>=11": np.mean(acertos >= 11),
-        "P>=12": np.mean(acertos >= 12),
-        "P>=13": np.mean(acertos >= 13),
-        "P>=14": np.mean(acertos >= 14),
-        "P=15": np.mean(acertos == 15),
-        "media": acertos.mean(),
-        "std": acertos.std()
-    }
+def probabilidades_jogo(jogo_tuple):
+    return prob.resumo_jogo(jogo_tuple)
 
 # =====================================================
 # GEOMETRIA ANALÍTICA
@@ -325,11 +302,7 @@ class MotorGeometria:
 
     def _calcular_matriz_coocorrencia(self):
         M = np.zeros((26, 26))
-        for jogo in self.concursos:
-            for i in jogo:
-                for j in jogo:
-                    if i != j:
-                        M[i][j] += 1
+        M[1:, 1:] = analise_lotofacil.obter_tabelas(self.concursos).coocorrencia()
         return M
 
     def _calcular_centroides(self):
@@ -348,11 +321,7 @@ class MotorGeometria:
         return centroides
 
     def _calcular_frequencias(self):
-        freq = [0]*26
-        for jogo in self.concursos:
-            for num in jogo:
-                freq[num] += 1
-        return freq
+        return [0] + analise_lotofacil.obter_tabelas(self.concursos).frequencia().tolist()
 
     def dispersao_geometrica(self, jogo):
         coords = [self.num_to_coord(n) for n in jogo if n in self.coordenadas]
@@ -444,24 +413,12 @@ class MotorPesosDinamicos:
             self.probabilidades_ewma = {i: 1.0 for i in self.dezenas_totais}
     
     def _calcular_atrasos(self):
-        self.atrasos = {i: 0 for i in self.dezenas_totais}
-        if not self.concursos:
-            return
-        for dezena in self.dezenas_totais:
-            atraso = 0
-            for concurso in self.concursos:
-                if dezena in concurso:
-                    break
-                atraso += 1
-            self.atrasos[dezena] = atraso
+        primeira = analise_lotofacil.obter_tabelas(self.concursos).primeira_ocorrencia()
+        self.atrasos = {i: int(primeira[i-1]) for i in self.dezenas_totais}
     
     def _calcular_coocorrencia(self):
         self.matriz_coocorrencia = np.zeros((26, 26))
-        for concurso in self.concursos:
-            for i in concurso:
-                for j in concurso:
-                    if i != j:
-                        self.matriz_coocorrencia[i][j] += 1
+        self.matriz_coocorrencia[1:, 1:] = analise_lotofacil.obter_tabelas(self.concursos).coocorrencia()
         
         self.pares_coocorrentes = {}
         for num in self.dezenas_totais:
@@ -634,45 +591,82 @@ class MotorPesosDinamicos:
 # MODELO PROFISSIONAL DE VALOR ESPERADO (EV)
 # =====================================================
 
-def simular_apostadores_realistas(num_apostas=10000):
-    apostas = []
-    for _ in range(int(num_apostas * 0.5)):
-        base = list(range(1, 16))
-        jogo = set(random.sample(base, min(15, len(base))))
-        while len(jogo) < 15:
-            jogo.add(random.randint(1, 25))
-        apostas.append(sorted(jogo))
-    for _ in range(int(num_apostas * 0.2)):
-        jogo = set()
-        linhas = random.sample(range(5), random.randint(2, 3))
-        for linha in linhas:
-            for col in range(5):
-                jogo.add(linha * 5 + col + 1)
-        while len(jogo) < 15:
-            jogo.add(random.randint(1, 25))
-        apostas.append(sorted(jogo))
-    for _ in range(int(num_apostas * 0.2)):
-        apostas.append(sorted(random.sample(range(1, 26), 15)))
-    for _ in range(int(num_apostas * 0.1)):
-        jogo = set()
-        jogo.update(random.sample(range(1, 32), min(8, 31)))
-        while len(jogo) < 15:
-            jogo.add(random.randint(1, 25))
-        apostas.append(sorted(jogo))
+SEMENTE_APOSTADORES = 2024   # população fixa: o mesmo ranking por EV a cada execução
+PROB_15 = 1 / 3268760
+_MASCARA_1_15 = lb.mascara(range(1, 16))
+_POSICOES_EV = np.arange(25, dtype=np.uint32)
+_BLOCO_EV = 256   # jogos por bloco no confronto com a população
+
+def _mascaras_de_bits(bits):
+    """Matriz N x 25 de bool -> array de máscaras uint32"""
+    return np.bitwise_or.reduce(bits.astype(np.uint32) << _POSICOES_EV, axis=1)
+
+def _completar_apostas(fixas, tamanhos, rng):
+    """Mantém as dezenas fixas e completa cada aposta com dezenas uniformes até `tamanhos`"""
+    chaves = rng.random(fixas.shape)
+    chaves[fixas] = 2.0
+    posicao = np.argsort(np.argsort(-chaves, axis=1), axis=1)
+    return _mascaras_de_bits(posicao < np.asarray(tamanhos)[:, None])
+
+def simular_apostadores_realistas(num_apostas=10000, rng=None):
+    """
+    População de apostas como máscaras de bits:
+    50% 1-15, 20% duas ou três linhas completas + aleatórias, 20% aleatórias e
+    10% com 8 "datas" (1-31; as acima de 25 não valem no volante) + aleatórias
+    """
+    rng = rng if rng is not None else np.random.default_rng()
+    n_baixos, n_linhas = int(num_apostas * 0.5), int(num_apostas * 0.2)
+    n_aleatorias, n_datas = int(num_apostas * 0.2), int(num_apostas * 0.1)
+
+    baixos = np.full(n_baixos, _MASCARA_1_15, dtype=np.uint32)
+
+    linhas_escolhidas = np.zeros((n_linhas, 5), dtype=bool)
+    qtd_linhas = rng.integers(2, 4, n_linhas)
+    ordem_linhas = np.argsort(rng.random((n_linhas, 5)), axis=1)
+    np.put_along_axis(linhas_escolhidas, ordem_linhas, np.arange(5) < qtd_linhas[:, None], axis=1)
+    linhas = _completar_apostas(np.repeat(linhas_escolhidas, 5, axis=1), np.full(n_linhas, 15), rng)
+
+    aleatorias = lb.sortear_lote(n_aleatorias, rng)
+
+    datas = np.argsort(rng.random((n_datas, 31)), axis=1)[:, :8]
+    datas_bits = np.zeros((n_datas, 31), dtype=bool)
+    np.put_along_axis(datas_bits, datas, True, axis=1)
+    fora_do_volante = datas_bits[:, 25:].sum(axis=1)
+    datas = _completar_apostas(datas_bits[:, :25], 15 - fora_do_volante, rng)
+
+    return np.concatenate([baixos, linhas, aleatorias, datas]).astype(np.uint32)
+
+@lru_cache(maxsize=8)
+def populacao_apostadores(num_apostas=10000, semente=SEMENTE_APOSTADORES):
+    """População simulada com semente fixa, calculada uma vez por processo"""
+    apostas = simular_apostadores_realistas(num_apostas, np.random.default_rng(semente))
+    apostas.flags.writeable = False
     return apostas
 
-def estimar_divisao_premio(jogo, apostas_simuladas):
-    iguais = 0
-    similares = 0
-    for aposta in apostas_simuladas:
-        inter = len(set(jogo) & set(aposta))
-        if inter == 15:
-            iguais += 1
-        elif inter >= 13:
-            similares += 1
-    competicao = iguais * 1.0 + similares * 0.3
+def _como_mascaras(apostas_simuladas):
+    if isinstance(apostas_simuladas, np.ndarray):
+        return apostas_simuladas
+    return lb.para_array([lb.mascara(a) for a in apostas_simuladas])
+
+def competicao_lote(jogos, apostas_simuladas):
+    """
+    Para cada jogo: apostas idênticas (15 acertos) + 0.3 × apostas com 13-14.
+    Apostas repetidas viram uma máscara com peso, e cada bloco de jogos é
+    confrontado com a população inteira num popcount só.
+    """
+    populacao, pesos = np.unique(_como_mascaras(apostas_simuladas), return_counts=True)
+    mascaras = lb.para_array([lb.mascara(j) for j in jogos])
+    competicao = np.zeros(len(mascaras))
+    for inicio in range(0, len(mascaras), _BLOCO_EV):
+        acertos = lb.popcount_lote(mascaras[inicio:inicio + _BLOCO_EV, None] & populacao[None, :])
+        iguais = (acertos == 15) @ pesos
+        similares = ((acertos >= 13) & (acertos < 15)) @ pesos
+        competicao[inicio:inicio + _BLOCO_EV] = iguais * 1.0 + similares * 0.3
     return competicao
 
+def estimar_divisao_premio(jogo, apostas_simuladas):
+    return float(competicao_lote([jogo], apostas_simuladas)[0])
+
 def calcular_ev(jogo, apostas_simuladas, premio_base=1500000):
     competicao = estimar_divisao_premio(jogo, apostas_simuladas)
     premio_esperado = premio_base / (competicao + 1)
@@ -710,41 +704,65 @@ def penalizar_repetidas(jogo, ultimo_concurso):
         return 0.1
     return 0
 
-def score_final_profissional(jogo, apostas_simuladas, ultimo_concurso=None):
-    ev = calcular_ev(jogo, apostas_simuladas)
-    penalty_humano = penalizar_padroes_humanos(jogo)
+def penalidades_lote(mascaras, ultimo_concurso=None):
+    """penalizar_padroes_humanos e penalizar_repetidas para um array de máscaras: (humano, repetidas)"""
+    mascaras = lb.para_array(mascaras)
+    consecutivos = lb.consecutivos_lote(mascaras).astype(float)
+    humano = np.where(consecutivos > 3, 0.2 * (consecutivos - 3), 0.0)
+    baixos = lb.contar_lote(mascaras, _MASCARA_1_15).astype(float)
+    humano += np.where(baixos > 10, 0.3 * (baixos - 10), np.where(baixos < 5, 0.1, 0.0))
+    for faixa in lb.LINHAS + lb.COLUNAS:
+        humano += np.where(lb.contar_lote(mascaras, faixa) == 5, 0.3, 0.0)
+    repetidas = np.zeros(len(mascaras))
     if ultimo_concurso:
-        penalty_rep = penalizar_repetidas(jogo, ultimo_concurso)
-    else:
-        penalty_rep = 0
-    score = ev * (1 - penalty_humano - penalty_rep)
-    score_normalizado = score * 1e9
-    return score_normalizado, ev
+        qtd = lb.contar_lote(mascaras, lb.mascara(ultimo_concurso)).astype(float)
+        repetidas = np.where(qtd > 9, 0.2 * (qtd - 9), np.where(qtd < 6, 0.1, 0.0))
+    return humano, repetidas
 
-def gerar_jogos_ev_otimizados(apostas_simuladas, qtd_jogos=10, amostragem=5000, ultimo_concurso=None):
-    jogos_candidatos = []
+def scores_profissionais_lote(jogos, apostas_simuladas, ultimo_concurso=None, premio_base=1500000):
+    """score_final_profissional de vários jogos de uma vez: arrays (scores, evs)"""
+    ev = PROB_15 * (premio_base / (competicao_lote(jogos, apostas_simuladas) + 1))
+    humano, repetidas = penalidades_lote([lb.mascara(j) for j in jogos], ultimo_concurso)
+    return ev * (1 - humano - repetidas) * 1e9, ev
+
+def score_final_profissional(jogo, apostas_simuladas, ultimo_concurso=None):
+    scores, evs = scores_profissionais_lote([jogo], apostas_simuladas, ultimo_concurso)
+    return float(scores[0]), float(evs[0])
+
+def _candidatos_ev(amostragem, rng):
+    """70% com 6-9 pares (o resto ímpares), 30% totalmente aleatórios"""
+    pares_volante = np.arange(2, 26, 2)
+    impares_volante = np.arange(1, 26, 2)
+    equilibrados = rng.random(amostragem) < 0.7
+    qtd_pares = rng.integers(6, 10, amostragem)
+    candidatos = lb.sortear_lote(amostragem, rng)
+    for pares in range(6, 10):
+        linhas = np.flatnonzero(equilibrados & (qtd_pares == pares))
+        if len(linhas):
+            candidatos[linhas] = (lb.sortear_lote(len(linhas), rng, k=pares, numeros=pares_volante) |
+                                  lb.sortear_lote(len(linhas), rng, k=15 - pares, numeros=impares_volante))
+    return candidatos
+
+def gerar_jogos_ev_otimizados(apostas_simuladas, qtd_jogos=10, amostragem=5000, ultimo_concurso=None, semente=None):
+    """Sorteia `amostragem` candidatos e devolve os melhores por score; com semente o ranking é reproduzível"""
+    rng = np.random.default_rng(semente)
     progress_bar = st.progress(0, text=f"Gerando e avaliando {amostragem} jogos...")
-    for i in range(amostragem):
-        if random.random() < 0.7:
-            pares = random.randint(6, 9)
-            impares = 15 - pares
-            jogo = set()
-            jogo.update(random.sample([n for n in range(1, 26) if n % 2 == 0], pares))
-            jogo.update(random.sample([n for n in range(1, 26) if n % 2 != 0], impares))
-            jogo = sorted(jogo)
-        else:
-            jogo = sorted(random.sample(range(1, 26), 15))
-        score, ev = score_final_profissional(jogo, apostas_simuladas, ultimo_concurso)
-        jogos_candidatos.append({'jogo': jogo, 'score': score, 'ev': ev})
-        if (i + 1) % 500 == 0:
-            progress_bar.progress((i + 1) / amostragem)
+    candidatos = _candidatos_ev(amostragem, rng)
+    jogos = [lb.dezenas(m) for m in candidatos]
+    scores, evs = np.zeros(amostragem), np.zeros(amostragem)
+    passo = max(_BLOCO_EV, amostragem // 10)
+    for inicio in range(0, amostragem, passo):
+        fim = min(inicio + passo, amostragem)
+        scores[inicio:fim], evs[inicio:fim] = scores_profissionais_lote(jogos[inicio:fim], apostas_simuladas, ultimo_concurso)
+        progress_bar.progress(fim / amostragem)
     progress_bar.empty()
-    jogos_candidatos.sort(key=lambda x: x['score'], reverse=True)
-    jogos_unicos = []
-    for item in jogos_candidatos:
-        if item['jogo'] not in [j['jogo'] for j in jogos_unicos]:
-            jogos_unicos.append(item)
-    return jogos_unicos[:qtd_jogos]
+    jogos_unicos = {}
+    for i in np.argsort(-scores, kind="stable"):
+        if int(candidatos[i]) not in jogos_unicos:
+            jogos_unicos[int(candidatos[i])] = {'jogo': jogos[i], 'score': float(scores[i]), 'ev': float(evs[i])}
+            if len(jogos_unicos) == qtd_jogos:
+                break
+    return list(jogos_unicos.values())
 
 def analisar_ev_detalhado(jogo, apostas_simuladas, premio_base=1500000):
     competicao = estimar_divisao_premio(jogo, apostas_simuladas)
@@ -1309,17 +1327,8 @@ class GeradorLotofacil:
         return {n: freq.get(n,0)/total for n in range(1,26)} if total > 0 else {n:0 for n in range(1,26)}
 
     def _calcular_atrasos(self):
-        if not self.historico:
-            return {n:0 for n in range(1,26)}
-        atrasos = {}
-        for num in range(1,26):
-            atraso = 0
-            for concurso in self.historico:
-                if num in concurso:
-                    break
-                atraso += 1
-            atrasos[num] = atraso
-        return atrasos
+        primeira = analise_lotofacil.obter_tabelas(self.historico).primeira_ocorrencia()
+        return {n: int(primeira[n-1]) for n in range(1,26)}
 
     def _criar_pool_ponderado(self, peso_freq=0.7, peso_atraso=0.3):
         max_freq = max(self.frequencias.values()) if self.frequencias else 1
@@ -1455,22 +1464,28 @@ def main():
         qtd = st.slider("Qtd concursos históricos", 20, 500, 100)
         if st.button("📥 Carregar concursos", use_container_width=True):
             with st.spinner("Carregando dados da Caixa..."):
-                try:
-                    url = "https://loteriascaixa-api.herokuapp.com/api/lotofacil/"
-                    response = requests.get(url)
-                    st.session_state.dados_api = response.json()
-                    concursos = [sorted(map(int, d["dezenas"])) for d in st.session_state.dados_api[:qtd]]
-                    st.session_state.historico_df = criar_historico_df(st.session_state.dados_api, qtd)
-                    st.session_state.baseline_cache = baseline_aleatorio()
-                    st.session_state.motor_geometria = MotorGeometria(concursos)
-                    st.session_state.gerador_principal = GeradorLotofacil(concursos, concursos[0])
-                    st.session_state.apostas_simuladas = simular_apostadores_realistas(10000)
-                    st.session_state.motor_pesos_dinamicos = MotorPesosDinamicos(
-                        st.session_state.dados_api, qtd
-                    )
-                    st.success(f"✅ Último concurso: #{st.session_state.dados_api[0]['concurso']} - {st.session_state.dados_api[0]['data']}")
-                except Exception as e:
-                    st.error(f"Erro ao carregar: {e}")
+                # histórico inteiro (a primeira carga baixa a lista completa); sem API, a base local
+                dados_api, erro = resultados_lotofacil.carregar_dados_api(qtd)
+                if erro is not None:
+                    if dados_api:
+                        st.warning(f"API indisponível ({type(erro).__name__}); usando {len(dados_api)} concursos da base local.")
+                    else:
+                        st.error(f"Erro ao carregar: {erro}")
+                if dados_api:
+                    try:
+                        st.session_state.dados_api = dados_api
+                        concursos = [sorted(map(int, d["dezenas"])) for d in st.session_state.dados_api[:qtd]]
+                        st.session_state.historico_df = criar_historico_df(st.session_state.dados_api, qtd)
+                        st.session_state.baseline_cache = baseline_aleatorio()
+                        st.session_state.motor_geometria = MotorGeometria(concursos)
+                        st.session_state.gerador_principal = GeradorLotofacil(concursos, concursos[0])
+                        st.session_state.apostas_simuladas = populacao_apostadores(10000)
+                        st.session_state.motor_pesos_dinamicos = MotorPesosDinamicos(
+                            st.session_state.dados_api, qtd
+                        )
+                        st.success(f"✅ Último concurso: #{st.session_state.dados_api[0]['concurso']} - {st.session_state.dados_api[0]['data']}")
+                    except Exception as e:
+                        st.error(f"Erro ao carregar: {e}")
 
     if not st.session_state.dados_api:
         st.info("👈 Carregue os concursos na barra lateral para começar.")
@@ -1742,7 +1757,7 @@ def main():
                     jogo, status = gerar_jogo_ilp_profissional(pesos, ultimo_concurso, config_ilp, timeout)
                     if jogo:
                         st.session_state.jogos_gerados = [jogo]
-                        mc = monte_carlo_jogo(tuple(jogo), 2000)
+                        mc = probabilidades_jogo(tuple(jogo))
                         st.session_state.scores = [mc['P>=13'] * 100]
                         st.success("✅ Jogo ótimo encontrado!")
                         st.markdown(f"""<div class="ilp-highlight"><strong>🎲 Jogo Gerado:</strong> {formatar_jogo_html(jogo)}<br><strong>📊 P(13+):</strong> {mc['P>=13']*100:.2f}%<br><strong>🔧 Status Solver:</strong> {status}</div>""", unsafe_allow_html=True)
@@ -1754,7 +1769,7 @@ def main():
                 jogos = gerar_multiplos_jogos_ilp(st.session_state.gerador_principal, ultimo_concurso, config_ilp, qtd_jogos=qtd_ilp, timeout_por_jogo=timeout, usar_diversidade=True)
                 if jogos:
                     st.session_state.jogos_gerados = jogos
-                    st.session_state.scores = [monte_carlo_jogo(tuple(j), 2000)['P>=13'] * 100 for j in jogos]
+                    st.session_state.scores = [probabilidades_jogo(tuple(j))['P>=13'] * 100 for j in jogos]
                     st.success(f"✅ {len(jogos)} jogos gerados via ILP!")
 
     # ================= TAB 5: IA 7.0 =================
@@ -1803,10 +1818,11 @@ def main():
             qtd_ev = st.slider("Quantidade de jogos", 5, 30, 10, key="qtd_ev")
         with col2:
             amostragem_ev = st.slider("Amostragem de jogos", 1000, 20000, 5000, key="amostragem_ev")
+        semente_fixa_ev = st.checkbox("🔒 Semente fixa (ranking reproduzível)", value=False, key="semente_fixa_ev")
         if st.button("🎯 OTIMIZAR POR VALOR ESPERADO", use_container_width=True, type="primary"):
             with st.spinner(f"Analisando {amostragem_ev} jogos e calculando EV..."):
                 ultimo_concurso = st.session_state.gerador_principal.ultimo if st.session_state.gerador_principal else None
-                top_jogos = gerar_jogos_ev_otimizados(st.session_state.apostas_simuladas, qtd_jogos=qtd_ev, amostragem=amostragem_ev, ultimo_concurso=ultimo_concurso)
+                top_jogos = gerar_jogos_ev_otimizados(st.session_state.apostas_simuladas, qtd_jogos=qtd_ev, amostragem=amostragem_ev, ultimo_concurso=ultimo_concurso, semente=SEMENTE_APOSTADORES if semente_fixa_ev else None)
                 if top_jogos:
                     st.session_state.jogos_gerados = [item['jogo'] for item in top_jogos]
                     st.session_state.scores = [item['score'] for item in top_jogos]
@@ -1885,18 +1901,21 @@ def main():
                 avaliacao.append({"Jogo": i+1, "Log-Likelihood": round(logL, 4), "Score EMS": round(score_ems, 2)})
             df_avaliacao = pd.DataFrame(avaliacao)
             st.dataframe(df_avaliacao.sort_values("Score EMS", ascending=False).reset_index(drop=True), use_container_width=True, hide_index=True)
-        st.markdown("### 🎲 Simulação Monte Carlo")
+        st.markdown("### 🎲 Probabilidades Exatas")
         if "jogos_gerados" in st.session_state and st.session_state.jogos_gerados:
-            n_sim = st.slider("Simulações por jogo", 1000, 50000, 10000, key="mc_sim")
-            if st.button("Executar Monte Carlo"):
-                with st.spinner(f"Simulando {n_sim} sorteios..."):
+            n_sim = st.slider(f"Simulações do bilhete (só acima de {prob.LIMITE_JOGOS_EXATO} jogos)", 10000, 500000, 200000, step=10000, key="mc_sim")
+            if st.button("Calcular Probabilidades"):
+                with st.spinner("Calculando probabilidades..."):
                     mc_res = []
                     for i, jogo in enumerate(st.session_state.jogos_gerados[:10]):
-                        res = monte_carlo_jogo(tuple(jogo), n_sim)
-                        mc_res.append({"Jogo": i+1, "P(≥11)": f"{res['P>=11']*100:.2f}%", "P(≥12)": f"{res['P>=12']*100:.2f}%", "P(≥13)": f"{res['P>=13']*100:.2f}%"})
+                        res = probabilidades_jogo(tuple(jogo))
+                        mc_res.append({"Jogo": str(i+1), "P(≥11)": f"{res['P>=11']*100:.2f}%", "P(≥12)": f"{res['P>=12']*100:.2f}%", "P(≥13)": f"{res['P>=13']*100:.2f}%"})
+                    conjunto = prob.resumo_conjunto(st.session_state.jogos_gerados, simulacoes=n_sim)
+                    mc_res.append({"Jogo": f"Bilhete ({conjunto['jogos']} jogos)", "P(≥11)": f"{conjunto['P>=11']*100:.2f}%", "P(≥12)": f"{conjunto['P>=12']*100:.2f}%", "P(≥13)": f"{conjunto['P>=13']*100:.2f}%"})
                     st.session_state.mc_resultados = pd.DataFrame(mc_res)
             if st.session_state.mc_resultados is not None:
                 st.dataframe(st.session_state.mc_resultados, use_container_width=True, hide_index=True)
+                st.caption("Por jogo: hipergeométrica exata. Bilhete: pelo menos um jogo na faixa, considerando a sobreposição entre os jogos.")
 
     # ================= TAB 9: GEOMETRIA DO VOLANTE =================
     with tab9:
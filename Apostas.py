@@ -1,83 +1,29 @@
 
 import streamlit as st
-import requests
+import resultados_lotofacil
+import analise_lotofacil
+import modelos_lotofacil
+import lotofacil_bits as lb
 import numpy as np
 import random
 import pandas as pd
 from collections import Counter
-from catboost import CatBoostClassifier
 import json
 import io
 
 st.set_page_config(page_title="Lotofácil Inteligente", layout="centered")
 
 # =========================
-# Captura concursos via API (robusta)
+# Captura concursos (base local sincronizada com a API)
 # =========================
 def capturar_ultimos_resultados(qtd=250):
-    url_base = "https://loteriascaixa-api.herokuapp.com/api/lotofacil/"
-    concursos = []
-
-    try:
-        resp = requests.get(url_base, timeout=20)
-        if resp.status_code != 200:
-            st.error("Erro ao buscar o último concurso.")
+    concursos, info_ultimo, erro = resultados_lotofacil.carregar_concursos(qtd)
+    if erro is not None:
+        if not concursos:
+            st.error(f"Erro ao acessar API: {type(erro).__name__}: {erro}")
             return [], None
-
-        dados = resp.json()
-        ultimo = dados[0] if isinstance(dados, list) else dados
-
-        numero_atual = int(ultimo.get("concurso"))
-        data_concurso = ultimo.get("data")
-        # A API pode devolver 'dezenas' ou 'resultado' em formatos diferentes.
-        if "dezenas" in ultimo:
-            dezenas = sorted([int(d) for d in ultimo.get("dezenas")])
-        elif "resultado" in ultimo:
-            # Pode ser string "01 02 ..." ou lista de ints
-            res = ultimo.get("resultado")
-            if isinstance(res, str):
-                dezenas = sorted([int(x) for x in res.split() if x.strip()])
-            else:
-                dezenas = sorted([int(x) for x in res])
-        else:
-            dezenas = []
-
-        concursos.append(dezenas)
-
-        info_ultimo = {
-            "numero": numero_atual,
-            "data": data_concurso,
-            "dezenas": dezenas
-        }
-
-        for i in range(1, qtd):
-            concurso_numero = numero_atual - i
-            try:
-                resp_i = requests.get(f"{url_base}{concurso_numero}", timeout=20)
-                if resp_i.status_code == 200:
-                    dados_i = resp_i.json()
-                    data_i = dados_i[0] if isinstance(dados_i, list) else dados_i
-                    if "dezenas" in data_i:
-                        dezenas_i = sorted([int(d) for d in data_i.get("dezenas")])
-                    elif "resultado" in data_i:
-                        res_i = data_i.get("resultado")
-                        if isinstance(res_i, str):
-                            dezenas_i = sorted([int(x) for x in res_i.split() if x.strip()])
-                        else:
-                            dezenas_i = sorted([int(x) for x in res_i])
-                    else:
-                        dezenas_i = []
-                    concursos.append(dezenas_i)
-                else:
-                    break
-            except Exception:
-                break
-
-        return concursos, info_ultimo
-
-    except Exception as e:
-        st.error(f"Erro ao acessar API: {type(e).__name__}: {e}")
-        return [], None
+        st.warning(f"API indisponível ({type(erro).__name__}); usando {len(concursos)} concursos da base local.")
+    return concursos, info_ultimo
 
 # =========================
 # NOVA CLASSE: Estratégia Repetidas/Ausentes das Imagens
@@ -424,17 +370,14 @@ class AnaliseCiclos:
         """Detecta o ciclo dinâmico atual: acumula concursos até todas as 25 dezenas aparecerem ou atingir o limite."""
         self.ciclo_concursos = []
         self.ciclo_concursos_info = []
-        self.numeros_presentes = set()
-        self.numeros_faltantes = set(self.TODAS)
         self.iniciar_indice = None
         
-        # Determinar o limite máximo de concursos a analisar
-        max_concursos = len(self.concursos)
-        if self.limite_concursos is not None:
-            max_concursos = min(self.limite_concursos, len(self.concursos))
+        # Fim do ciclo (ou do limite) sai do OR acumulado das máscaras, do mais recente (0) para o mais antigo
+        fim, vistas = analise_lotofacil.obter_tabelas(self.concursos).ciclo(self.limite_concursos)
+        self.numeros_presentes = set(lb.dezenas(vistas))
+        self.numeros_faltantes = self.TODAS - self.numeros_presentes
         
-        # percorre do mais recente (0) para o mais antigo
-        for idx, concurso in enumerate(self.concursos[:max_concursos]):
+        for idx, concurso in enumerate(self.concursos[:fim]):
             if not concurso:
                 continue
             self.ciclo_concursos.append(concurso)
@@ -450,13 +393,8 @@ class AnaliseCiclos:
                     "dezenas": concurso
                 })
             
-            self.numeros_presentes.update(concurso)
-            self.numeros_faltantes = self.TODAS - self.numeros_presentes
             # marca o índice mais antigo que foi considerado até agora
             self.iniciar_indice = idx
-            
-            if not self.numeros_faltantes:  # ciclo fechado
-                break
         
         self.tamanho = len(self.ciclo_concursos)
     
@@ -961,7 +899,7 @@ class LotoFacilIA:
                     self.models = {}
 
     def matriz_binaria(self):
-        return np.array([[1 if n in jogo else 0 for n in self.numeros] for jogo in self.concursos])
+        return np.array(analise_lotofacil.obter_tabelas(self.concursos).matriz, dtype=int)
 
     def frequencia(self, janela=10):
         janela = min(janela, max(1, len(self.concursos)-1))
@@ -970,25 +908,13 @@ class LotoFacilIA:
         if len(self.concursos) <= 1:
             return freq
         limite = min(len(self.concursos)-1, janela)
-        for jogo in self.concursos[0:limite]:
-            for d in jogo:
-                freq[d] +=1
-        return freq
+        contagem = analise_lotofacil.obter_tabelas(self.concursos).frequencia(0, limite)
+        return {n: int(contagem[n-1]) for n in self.numeros}
 
     def atraso(self):
-        atraso = {n:0 for n in self.numeros}
-        # calcula atraso em relação ao mais recente (índice 0)
-        for n in self.numeros:
-            atraso[n] = 0
-            found = False
-            for i, jogo in enumerate(self.concursos):
-                if n in jogo:
-                    atraso[n] = i
-                    found = True
-                    break
-            if not found:
-                atraso[n] = len(self.concursos)
-        return atraso
+        # atraso em relação ao mais recente (índice 0): primeira posição em que a dezena aparece
+        primeira = analise_lotofacil.obter_tabelas(self.concursos).primeira_ocorrencia()
+        return {n: int(primeira[n-1]) for n in self.numeros}
 
     def quentes_frios(self, top=10):
         freq = self.frequencia()
@@ -1009,61 +935,40 @@ class LotoFacilIA:
 
     def interacoes(self, janela=50):
         janela = min(janela, max(1, len(self.concursos)-1))
-        matriz = np.zeros((25,25), dtype=int)
         # usar concursos mais recentes: índices 0..janela-1
-        for jogo in self.concursos[0:janela]:
-            for i in range(15):
-                for j in range(i+1,15):
-                    matriz[jogo[i]-1, jogo[j]-1] += 1
-                    matriz[jogo[j]-1, jogo[i]-1] += 1
-        return matriz
+        return np.array(analise_lotofacil.obter_tabelas(self.concursos).coocorrencia(0, janela), dtype=int)
 
     def prob_condicional(self, janela=50):
         matriz = self.interacoes(janela)
         prob = np.zeros((25,25))
         freq = np.array([v for v in self.frequencia(janela).values()])
-        for i in range(25):
-            for j in range(25):
-                if freq[i] > 0:
-                    prob[i,j] = matriz[i,j]/freq[i]
+        np.divide(matriz, freq[:, None], out=prob, where=freq[:, None] > 0)
         return prob
 
     def gap_medio(self):
-        gaps = {n:[] for n in self.numeros}
-        # percorre concursos mais antigos para recentes
+        # média de (total-i) nos concursos i em que a dezena não saiu
         total = len(self.concursos)
-        for i, jogo in enumerate(self.concursos):
-            for n in self.numeros:
-                if n not in jogo:
-                    gaps[n].append(total - i)
-        return {n: np.mean(gaps[n]) if gaps[n] else 0 for n in self.numeros}
+        gaps = analise_lotofacil.obter_tabelas(self.concursos).distancia_media_ausencias(0, total, total)
+        return {n: float(gaps[n-1]) for n in self.numeros}
 
     def gerar_features(self):
-        features = []
         if len(self.concursos) < 2:
             return np.array([])
         freq = self.frequencia(janela=len(self.concursos)-1)
         gaps = self.gap_medio()
-        for jogo in self.concursos:
-            f = []
-            for n in self.numeros:
-                f.append(1 if n in jogo else 0)
-                f.append(freq[n])
-                f.append(gaps[n])
-                f.append(1 if n%2==0 else 0)
-                f.append(1 if n in self.primos else 0)
-            features.append(f)
-        return np.array(features)
+        # por dezena: presença no concurso + frequência, gap, par e primo (iguais em todas as linhas)
+        presenca = analise_lotofacil.obter_tabelas(self.concursos).matriz
+        features = np.empty((len(presenca), len(self.numeros), 5))
+        features[:, :, 0] = presenca
+        features[:, :, 1:] = [[freq[n], gaps[n], n%2==0, n in self.primos] for n in self.numeros]
+        return features.reshape(len(presenca), -1)
 
     def treinar_modelos(self):
-        for i, n in enumerate(self.numeros):
-            try:
-                model = CatBoostClassifier(iterations=600, verbose=0, random_state=42)
-                y = self.Y[:,i]
-                model.fit(self.X, y)
-                self.models[n] = model
-            except Exception as e:
-                st.warning(f"Erro ao treinar modelo para número {n}: {e}")
+        # modelos em cache por (concursos, hiperparâmetros); concurso novo continua o modelo anterior
+        self.models = modelos_lotofacil.treinar_ou_carregar(
+            self.X, self.Y, self.numeros, {"iterations": 600, "verbose": 0, "random_state": 42},
+            ao_falhar=lambda n, e: st.warning(f"Erro ao treinar modelo para número {n}: {e}")
+        )
 
     def prever_proximo(self):
         if not self.models:
@@ -9,9 +9,10 @@ from reportlab.lib.pagesizes import letter
 from reportlab.lib import colors
 from reportlab.platypus import SimpleDocTemplate, Table, TableStyle
 import time
-from collections import deque
 from threading import Lock
 import threading
+from limitador_api import LimitadorCota, PRIORIDADE_VARREDURA, prioridade_da_url
+from cache_persistente import CacheDuasCamadas
 
 # Pillow
 from PIL import Image, ImageDraw, ImageFont, ImageOps
@@ -35,7 +36,6 @@ BASE_URL_TG = f"https://api.telegram.org/bot{TELEGRAM_TOKEN}"
 ALERTAS_PATH = "alertas.json"
 CACHE_JOGOS = "cache_jogos.json"
 CACHE_CLASSIFICACAO = "cache_classificacao.json"
-CACHE_TIMEOUT = 3600  # 1 hora em segundos
 
 # Histórico de conferências
 HISTORICO_PATH = "historico_conferencias.json"
@@ -78,38 +78,21 @@ class RateLimiter:
             return cls._instance
     
     def _init(self):
-        self.requests = deque(maxlen=10)  # 10 requests por minuto
-        self.lock = threading.Lock()
-        self.last_request_time = 0
-        self.min_interval = 6.0  # 6 segundos entre requests (10/min)
+        self.limitador = LimitadorCota()
         self.backoff_factor = 1.5
         self.max_retries = 3
         
-    def wait_if_needed(self):
-        """Espera se necessário para respeitar rate limit"""
-        with self.lock:
-            now = time.time()
-            
-            # Remove requests antigos (mais de 1 minuto)
-            while self.requests and now - self.requests[0] > 60:
-                self.requests.popleft()
-            
-            # Se já temos 10 requests no último minuto, espera
-            if len(self.requests) >= 10:
-                wait_time = 60 - (now - self.requests[0])
-                if wait_time > 0:
-                    logging.info(f"⏳ Rate limit atingido. Esperando {wait_time:.1f} segundos...")
-                    time.sleep(wait_time + 0.1)
-                    now = time.time()
-            
-            # Verifica intervalo mínimo entre requests
-            time_since_last = now - self.last_request_time
-            if time_since_last < self.min_interval:
-                wait_time = self.min_interval - time_since_last
-                time.sleep(wait_time)
-            
-            self.requests.append(now)
-            self.last_request_time = now
+    def wait_if_needed(self, prioridade=PRIORIDADE_VARREDURA):
+        """Espera um token do balde (fora do lock); conferência de resultados passa na frente"""
+        espera = self.limitador.adquirir(prioridade)
+        if espera > 1:
+            logging.info(f"⏳ Rate limit atingido. Esperou {espera:.1f} segundos")
+    
+    def atualizar_cota(self, headers):
+        self.limitador.atualizar_cota(headers)
+    
+    def bloquear(self, segundos):
+        self.limitador.bloquear(segundos)
 
 # Instância global do rate limiter
 rate_limiter = RateLimiter()
@@ -118,11 +101,13 @@ rate_limiter = RateLimiter()
 CACHE_CONFIG = {
     "jogos": {
         "ttl": 3600,  # 1 hora para jogos
-        "max_size": 100  # Máximo de 100 entradas
+        "max_size": 100,  # Máximo de 100 entradas
+        "stale": 1800  # Serve o valor vencido por mais 30 min enquanto atualiza
     },
     "classificacao": {
         "ttl": 86400,  # 24 horas para classificação
-        "max_size": 50  # Máximo de 50 ligas
+        "max_size": 50,  # Máximo de 50 ligas
+        "stale": 86400  # Serve a classificação vencida por mais 1 dia enquanto atualiza
     },
     "match_details": {
         "ttl": 1800,  # 30 minutos para detalhes de partida
@@ -130,49 +115,11 @@ CACHE_CONFIG = {
     }
 }
 
-class SmartCache:
-    """Cache inteligente com TTL e tamanho máximo"""
+class SmartCache(CacheDuasCamadas):
+    """Cache com TTL em memória e em disco (SQLite compartilhado entre sessões e reinícios)"""
     def __init__(self, cache_type: str):
-        self.cache = {}
-        self.timestamps = {}
-        self.config = CACHE_CONFIG.get(cache_type, {"ttl": 3600, "max_size": 100})
-        self.lock = threading.Lock()
-        
-    def get(self, key: str):
-        """Obtém valor do cache se ainda for válido"""
-        with self.lock:
-            if key not in self.cache:
-                return None
-                
-            timestamp = self.timestamps.get(key, 0)
-            agora = time.time()
-            
-            if agora - timestamp > self.config["ttl"]:
-                # Expirou, remove do cache
-                del self.cache[key]
-                del self.timestamps[key]
-                return None
-                
-            return self.cache[key]
-    
-    def set(self, key: str, value):
-        """Armazena valor no cache"""
-        with self.lock:
-            # Limpa cache se exceder tamanho máximo
-            if len(self.cache) >= self.config["max_size"]:
-                # Remove o mais antigo
-                oldest_key = min(self.timestamps.items(), key=lambda x: x[1])[0]
-                del self.cache[oldest_key]
-                del self.timestamps[oldest_key]
-            
-            self.cache[key] = value
-            self.timestamps[key] = time.time()
-    
-    def clear(self):
-        """Limpa todo o cache"""
-        with self.lock:
-            self.cache.clear()
-            self.timestamps.clear()
+        config = CACHE_CONFIG.get(cache_type, {"ttl": 3600, "max_size": 100})
+        super().__init__(f"Arar.{cache_type}", **config)
 
 # Inicializar caches
 jogos_cache = SmartCache("jogos")
@@ -371,15 +318,6 @@ def carregar_json(caminho: str) -> dict:
             if not dados:
                 return {}
                 
-            if caminho in [CACHE_JOGOS, CACHE_CLASSIFICACAO]:
-                agora = datetime.now().timestamp()
-                if isinstance(dados, dict) and '_timestamp' in dados:
-                    if agora - dados['_timestamp'] > CACHE_TIMEOUT:
-                        return {}
-                else:
-                    # Se não tem timestamp, verificar modificação do arquivo
-                    if agora - os.path.getmtime(caminho) > CACHE_TIMEOUT:
-                        return {}
             return dados
     except (json.JSONDecodeError, IOError, Exception) as e:
         logging.error(f"Erro ao carregar {caminho}: {e}")
@@ -388,9 +326,6 @@ def carregar_json(caminho: str) -> dict:
 
 def salvar_json(caminho: str, dados: dict):
     try:
-        if caminho in [CACHE_JOGOS, CACHE_CLASSIFICACAO]:
-            if isinstance(dados, dict):
-                dados['_timestamp'] = datetime.now().timestamp()
         with open(caminho, "w", encoding='utf-8') as f:
             json.dump(dados, f, ensure_ascii=False, indent=2)
     except IOError as e:
@@ -403,18 +338,6 @@ def carregar_alertas() -> dict:
 def salvar_alertas(alertas: dict):
     salvar_json(ALERTAS_PATH, alertas)
 
-def carregar_cache_jogos() -> dict:
-    return carregar_json(CACHE_JOGOS)
-
-def salvar_cache_jogos(dados: dict):
-    salvar_json(CACHE_JOGOS, dados)
-
-def carregar_cache_classificacao() -> dict:
-    return carregar_json(CACHE_CLASSIFICACAO)
-
-def salvar_cache_classificacao(dados: dict):
-    salvar_json(CACHE_CLASSIFICACAO, dados)
-
 # NOVA FUNÇÃO: Carregar alertas TOP
 def carregar_alertas_top() -> dict:
     """Carrega os alertas TOP que foram gerados"""
@@ -857,18 +780,19 @@ def obter_dados_api_com_retry(url: str, timeout: int = 15, max_retries: int = 3)
     for attempt in range(max_retries):
         try:
             # Aplica rate limiting antes de cada request
-            rate_limiter.wait_if_needed()
+            rate_limiter.wait_if_needed(prioridade_da_url(url))
             
             logging.info(f"🔗 Request {attempt+1}/{max_retries}: {url}")
             
             response = requests.get(url, headers=HEADERS, timeout=timeout)
+            rate_limiter.atualizar_cota(response.headers)
             
             # Verifica rate limit na resposta
             if response.status_code == 429:  # Too Many Requests
                 api_monitor.log_request(False, True)
                 retry_after = int(response.headers.get('Retry-After', 60))
                 logging.warning(f"⏳ Rate limit da API. Esperando {retry_after} segundos...")
-                time.sleep(retry_after)
+                rate_limiter.bloquear(retry_after)
                 continue
                 
             response.raise_for_status()
@@ -909,17 +833,14 @@ def obter_dados_api(url: str, timeout: int = 15) -> dict | None:
     return obter_dados_api_com_retry(url, timeout, max_retries=3)
 
 def obter_classificacao(liga_id: str) -> dict:
-    """Obtém classificação com cache inteligente"""
-    # Verifica cache primeiro
-    cached = classificacao_cache.get(liga_id)
-    if cached:
-        logging.info(f"📊 Classificação da liga {liga_id} obtida do cache")
-        return cached
-    
+    """Obtém classificação com cache inteligente (uma busca só por liga, mesmo com sessões simultâneas)"""
+    return classificacao_cache.obter_ou_buscar(liga_id, lambda: _buscar_classificacao(liga_id)) or {}
+
+def _buscar_classificacao(liga_id: str) -> dict | None:
     url = f"{BASE_URL_FD}/competitions/{liga_id}/standings"
     data = obter_dados_api(url)
     if not data:
-        return {}
+        return None
 
     standings = {}
     for s in data.get("standings", []):
@@ -935,24 +856,16 @@ def obter_classificacao(liga_id: str) -> dict:
                 "draws": t.get("draw", 0),
                 "losses": t.get("lost", 0)
             }
-    classificacao_cache.set(liga_id, standings)
     return standings
 
 def obter_jogos(liga_id: str, data: str) -> list:
     """Obtém jogos com cache inteligente"""
-    key = f"{liga_id}_{data}"
-    
-    # Verifica cache primeiro
-    cached = jogos_cache.get(key)
-    if cached:
-        logging.info(f"⚽ Jogos {key} obtidos do cache")
-        return cached
-    
+    return jogos_cache.obter_ou_buscar(f"{liga_id}_{data}", lambda: _buscar_jogos(liga_id, data)) or []
+
+def _buscar_jogos(liga_id: str, data: str) -> list | None:
     url = f"{BASE_URL_FD}/competitions/{liga_id}/matches?dateFrom={data}&dateTo={data}"
     data_api = obter_dados_api(url)
-    jogos = data_api.get("matches", []) if data_api else []
-    jogos_cache.set(key, jogos)
-    return jogos
+    return data_api.get("matches", []) if data_api else None
 
 def obter_detalhes_partida(fixture_id: str) -> dict | None:
     """Obtém detalhes de uma partida específica com cache"""
@@ -3554,27 +3467,22 @@ def processar_jogos(data_selecionada, ligas_selecionadas, todas_ligas, top_n, mi
 
 def atualizar_status_partidas():
     """Atualiza o status das partidas no cache"""
-    cache_jogos = carregar_cache_jogos()
     mudou = False
     
-    for key in list(cache_jogos.keys()):
-        if key == "_timestamp":
-            continue
-            
+    for key in jogos_cache.chaves():
         try:
             liga_id, data = key.split("_", 1)
             url = f"{BASE_URL_FD}/competitions/{liga_id}/matches?dateFrom={data}&dateTo={data}"
             data_api = obter_dados_api(url)
             
             if data_api and "matches" in data_api:
-                cache_jogos[key] = data_api["matches"]
+                jogos_cache.set(key, data_api["matches"])
                 mudou = True
         except Exception as e:
             logging.error(f"Erro ao atualizar liga {key}: {e}")
             st.error(f"Erro ao atualizar liga {key}: {e}")
             
     if mudou:
-        salvar_cache_jogos(cache_jogos)
         st.success("✅ Status das partidas atualizado!")
     else:
         st.info("ℹ️ Nenhuma atualização disponível.")
@@ -3602,6 +3510,9 @@ def conferir_resultados():
 def limpar_caches():
     """Limpar caches do sistema"""
     try:
+        jogos_cache.clear()
+        classificacao_cache.clear()
+        match_cache.clear()
         arquivos_limpos = 0
         for cache_file in [CACHE_JOGOS, CACHE_CLASSIFICACAO, ALERTAS_PATH, ALERTAS_TOP_PATH]:
             if os.path.exists(cache_file):
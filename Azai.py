@@ -3,6 +3,7 @@ import streamlit as st
 import json
 import os
 import requests
+import cliente_http
 import logging
 import numpy as np
 import pandas as pd
@@ -14,6 +15,7 @@ from sklearn.utils import resample
 import joblib
 from streamlit_autorefresh import st_autorefresh
 import pickle
+from ingestao_roletas import mesa_da_url, ultimo_resultado_compartilhado
 import warnings
 warnings.filterwarnings('ignore')
 
@@ -3468,8 +3470,12 @@ def salvar_resultado_em_arquivo(historico, caminho=HISTORICO_PATH):
         logging.error(f"Erro ao salvar histórico: {e}")
 
 def fetch_latest_result():
+    # Com o daemon de ingestão rodando, lê o log compartilhado em vez de chamar a API
+    compartilhado = ultimo_resultado_compartilhado(mesa_da_url(API_URL))
+    if compartilhado is not None:
+        return compartilhado
     try:
-        response = requests.get(API_URL, headers=HEADERS, timeout=5)
+        response = cliente_http.get(API_URL, headers=HEADERS, timeout=5)
         response.raise_for_status()
         data = response.json()
         game_data = data.get("data", {})
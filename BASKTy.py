@@ -2,6 +2,7 @@
 import streamlit as st
 from datetime import datetime, timedelta, date
 import requests
+import cliente_http
 import json
 import os
 import io
@@ -303,13 +304,13 @@ def balldontlie_get(path: str, params: dict | None = None, timeout: int = REQUES
     
     try:
         url = BALLDONTLIE_BASE.rstrip("/") + "/" + path.lstrip("/")
-        resp = requests.get(url, headers=HEADERS_BDL, params=params, timeout=timeout)
+        resp = cliente_http.get(url, headers=HEADERS_BDL, params=params, timeout=timeout)
         LAST_REQUEST_TIME = time.time()
         
         if resp.status_code == 429:
             st.error("🚨 RATE LIMIT ATINGIDO! Aguardando 60 segundos...")
             time.sleep(60)
-            resp = requests.get(url, headers=HEADERS_BDL, params=params, timeout=timeout)
+            resp = cliente_http.get(url, headers=HEADERS_BDL, params=params, timeout=timeout)
             LAST_REQUEST_TIME = time.time()
         
         resp.raise_for_status()
@@ -2,6 +2,7 @@ import streamlit as st
 import json
 import os
 import requests
+import cliente_http
 import logging
 import numpy as np
 import pandas as pd
@@ -13,6 +14,8 @@ from sklearn.utils import resample
 import joblib
 from streamlit_autorefresh import st_autorefresh
 import pickle
+from roleta_features import MotorFeaturesRoleta
+from ingestao_roletas import mesa_da_url, ultimo_resultado_compartilhado
 
 # =============================
 # CONFIGURAÇÕES DE PERSISTÊNCIA
@@ -936,6 +939,8 @@ class MLRoletaOtimizada:
         self.numeros = list(range(37))
         self.ensemble_size = 3
 
+        self.motor_features = MotorFeaturesRoleta(self.roleta.race, janelas=self.window_for_features)
+
     def get_neighbors(self, numero, k=None):
         if k is None:
             k = self.k_vizinhos
@@ -1042,18 +1047,11 @@ class MLRoletaOtimizada:
         if len(historico_completo) > self.max_history:
             historico_completo = historico_completo[-self.max_history:]
 
-        X = []
-        y = []
-        
         start_index = max(50, len(historico_completo) // 10)
         
-        for i in range(start_index, len(historico_completo)):
-            janela = historico_completo[:i]
-            feats, _ = self.extrair_features(janela)
-            if feats is None:
-                continue
-            X.append(feats)
-            y.append(historico_completo[i])
+        # Uma única passada pelo histórico (antes: extrair_features em cada prefixo, O(N²))
+        X, y = self.motor_features.gerar_matriz(historico_completo, start_index)
+        self.feature_names = self.motor_features.feature_names
         
         if len(X) == 0:
             return np.array([]), np.array([])
@@ -1269,7 +1267,8 @@ class MLRoletaOtimizada:
         if not self.is_trained:
             return None, "Modelo não treinado"
 
-        feats, _ = self.extrair_features(historico)
+        self.motor_features.sincronizar(historico)
+        feats, _ = self.motor_features.features_atuais()
         if feats is None:
             return None, "Features insuficientes"
 
@@ -3162,8 +3161,12 @@ def salvar_resultado_em_arquivo(historico, caminho=HISTORICO_PATH):
         logging.error(f"Erro ao salvar histórico: {e}")
 
 def fetch_latest_result():
+    # Com o daemon de ingestão rodando, lê o log compartilhado em vez de chamar a API
+    compartilhado = ultimo_resultado_compartilhado(mesa_da_url(API_URL))
+    if compartilhado is not None:
+        return compartilhado
     try:
-        response = requests.get(API_URL, headers=HEADERS, timeout=5)
+        response = cliente_http.get(API_URL, headers=HEADERS, timeout=5)
         response.raise_for_status()
         data = response.json()
         game_data = data.get("data", {})
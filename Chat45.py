@@ -1,5 +1,6 @@
 import streamlit as st
 import requests
+import cliente_http
 import json
 import os
 import numpy as np
@@ -246,7 +247,7 @@ def enviar_alerta_telegram(mensagem):
 # ---------- Função para buscar novo número da API ----------
 def buscar_novo_numero():
     try:
-        r = requests.get(API_URL, headers=HEADERS, timeout=10)
+        r = cliente_http.get(API_URL, headers=HEADERS, timeout=10)
         if r.status_code == 200:
             data = r.json()
             numero = data.get("data", {}).get("result", {}).get("outcome", {}).get("number")
@@ -1,5 +1,5 @@
 import streamlit as st
-import requests
+import cliente_http
 import joblib
 import numpy as np
 from collections import deque, Counter
@@ -134,7 +134,7 @@ def treinar_modelo_coluna(historico):
 # =========================
 def fetch_latest_result():
     try:
-        r = requests.get(API_URL, headers=HEADERS, timeout=10)
+        r = cliente_http.get(API_URL, headers=HEADERS, timeout=10)
         r.raise_for_status()
         data = r.json()
         numero = data.get("result", {}).get("outcome", {}).get("number")
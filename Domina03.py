@@ -4,6 +4,7 @@ import json
 import os
 import time
 import requests
+import cliente_http
 from collections import deque, Counter
 from streamlit_autorefresh import st_autorefresh
 import logging
@@ -794,7 +795,7 @@ def salvar_historico(numero_dict):
 
 def fetch_latest_result():
     try:
-        response = requests.get(API_URL, headers=HEADERS, timeout=10)
+        response = cliente_http.get(API_URL, headers=HEADERS, timeout=10)
         response.raise_for_status()
         data = response.json()
         
@@ -1,5 +1,6 @@
 import streamlit as st
 import requests
+import cliente_http
 import joblib
 import numpy as np
 from sklearn.ensemble import RandomForestClassifier
@@ -164,7 +165,7 @@ modelo_coluna = joblib.load(MODELO_COLUNA_PATH) if Path(MODELO_COLUNA_PATH).exis
 
 # === OBTÉM NOVO NÚMERO ===
 try:
-    resp = requests.get(API_URL)
+    resp = cliente_http.get(API_URL)
     numero_atual = int(resp.json()["data"]["result"]["outcome"]["number"])
 except:
     st.error("Erro ao acessar API.")
@@ -1,5 +1,6 @@
 import streamlit as st
 import requests
+import cliente_http
 import joblib
 import numpy as np
 from sklearn.ensemble import RandomForestClassifier
@@ -168,7 +169,7 @@ st.title("🎯 IA Roleta Profissional - Dúzia & Coluna")
 st_autorefresh(interval=5000, key="atualizacao")
 
 try:
-    resposta = requests.get(API_URL, timeout=10).json()
+    resposta = cliente_http.get(API_URL, timeout=10).json()
     numero_atual = int(resposta["data"]["result"]["outcome"]["number"])
 except Exception as e:
     st.error(f"Erro ao obter número da API: {e}")
@@ -1,5 +1,5 @@
 import streamlit as st
-import requests
+import cliente_http
 import joblib
 import numpy as np
 from sklearn.ensemble import RandomForestClassifier
@@ -123,7 +123,7 @@ st.title("🎯 IA Roleta Avançada - Ensemble LGBM + RF")
 st_autorefresh(interval=REFRESH_INTERVAL, key="atualizacao")
 
 try:
-    resposta = requests.get(API_URL, timeout=5).json()
+    resposta = cliente_http.get(API_URL, timeout=5).json()
     numero_atual = int(resposta["data"]["result"]["outcome"]["number"])
 except Exception as e:
     st.error(f"Erro API: {e}")
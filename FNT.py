@@ -1,6 +1,7 @@
 import streamlit as st
 import threading
 import requests
+import cliente_http
 import joblib
 import numpy as np
 from collections import deque, Counter
@@ -380,7 +381,7 @@ def prever_duzia_rf():
 
 # === LOOP PRINCIPAL (API) ===
 try:
-    resposta = requests.get(API_URL, timeout=5).json()
+    resposta = cliente_http.get(API_URL, timeout=5).json()
     numero_atual = int(resposta["data"]["result"]["outcome"]["number"])
 except Exception as e:
     st.error(f"Erro API: {e}")
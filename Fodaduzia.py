@@ -1,5 +1,6 @@
 import streamlit as st
 import requests
+import cliente_http
 import joblib
 import numpy as np
 from sklearn.ensemble import RandomForestClassifier
@@ -182,7 +183,7 @@ st.title("🎯 IA Roleta Profissional - Dúzia ou Coluna mais provável")
 st_autorefresh(interval=5000, key="atualizacao")
 
 try:
-    resposta = requests.get(API_URL, timeout=5).json()
+    resposta = cliente_http.get(API_URL, timeout=5).json()
     numero_atual = int(resposta["data"]["result"]["outcome"]["number"])
 except Exception as e:
     st.error(f"Erro ao obter número da API: {e}")
@@ -1,6 +1,7 @@
 import streamlit as st
 from datetime import datetime, timedelta, timezone
 import requests
+import cliente_http
 import json
 import os
 import io
@@ -9,9 +10,16 @@ from reportlab.lib.pagesizes import letter
 from reportlab.lib import colors
 from reportlab.platypus import SimpleDocTemplate, Table, TableStyle
 import time
-from collections import deque
+from collections import OrderedDict
 from threading import Lock
 import threading
+from limitador_api import LimitadorCota, PRIORIDADE_RESULTADO, PRIORIDADE_VARREDURA, prioridade_da_url
+import conciliacao_resultados
+from cache_persistente import CacheDuasCamadas
+import armazem_alertas
+import agregados_performance
+import recursos_poster
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from PIL import Image, ImageDraw, ImageFont, ImageOps
 import logging
 import math
@@ -546,7 +554,6 @@ class ConfigManager:
     RESULTADOS_AMBAS_MARCAM_PATH = "resultados_ambas_marcam.json"
     CACHE_JOGOS = "cache_jogos.json"
     CACHE_CLASSIFICACAO = "cache_classificacao.json"
-    CACHE_TIMEOUT = 3600
     HISTORICO_PATH = "historico_conferencias.json"
     ALERTAS_TOP_PATH = "alertas_top.json"
     RESULTADOS_TOP_PATH = "resultados_top.json"
@@ -572,9 +579,11 @@ class ConfigManager:
         "Premier League (Inglaterra)": "PL"
     }
     
+    # "max_bytes" (opcional) limita também o tamanho aproximado de cada cache em memória;
+    # "stale" é por quanto tempo depois do ttl o valor antigo ainda é servido enquanto revalida
     CACHE_CONFIG = {
-        "jogos": {"ttl": 3600, "max_size": 100},
-        "classificacao": {"ttl": 86400, "max_size": 50},
+        "jogos": {"ttl": 3600, "max_size": 100, "stale": 1800},
+        "classificacao": {"ttl": 86400, "max_size": 50, "stale": 86400},
         "match_details": {"ttl": 1800, "max_size": 200}
     }
     
@@ -595,72 +604,30 @@ class RateLimiter:
             return cls._instance
     
     def _init(self):
-        self.requests = deque(maxlen=10)
-        self.lock = threading.Lock()
-        self.last_request_time = 0
-        self.min_interval = 6.0
+        self.limitador = LimitadorCota()
         self.backoff_factor = 1.5
         self.max_retries = 3
         
-    def wait_if_needed(self):
-        with self.lock:
-            now = time.time()
-            
-            while self.requests and now - self.requests[0] > 60:
-                self.requests.popleft()
-            
-            if len(self.requests) >= 10:
-                wait_time = 60 - (now - self.requests[0])
-                if wait_time > 0:
-                    logging.info(f"⏳ Rate limit atingido. Esperando {wait_time:.1f} segundos...")
-                    time.sleep(wait_time + 0.1)
-                    now = time.time()
-            
-            time_since_last = now - self.last_request_time
-            if time_since_last < self.min_interval:
-                wait_time = self.min_interval - time_since_last
-                time.sleep(wait_time)
-            
-            self.requests.append(now)
-            self.last_request_time = now
+    def wait_if_needed(self, prioridade=PRIORIDADE_VARREDURA):
+        """Espera um token do balde (fora do lock); conferência de resultados passa na frente"""
+        espera = self.limitador.adquirir(prioridade)
+        if espera > 1:
+            logging.info(f"⏳ Rate limit atingido. Esperou {espera:.1f} segundos")
+    
+    def atualizar_cota(self, headers):
+        self.limitador.atualizar_cota(headers)
+    
+    def bloquear(self, segundos):
+        self.limitador.bloquear(segundos)
 
 
-class SmartCache:
-    def __init__(self, cache_type: str):
-        self.cache = {}
-        self.timestamps = {}
-        self.config = ConfigManager.CACHE_CONFIG.get(cache_type, {"ttl": 3600, "max_size": 100})
-        self.lock = threading.Lock()
-        
-    def get(self, key: str):
-        with self.lock:
-            if key not in self.cache:
-                return None
-                
-            timestamp = self.timestamps.get(key, 0)
-            agora = time.time()
-            
-            if agora - timestamp > self.config["ttl"]:
-                del self.cache[key]
-                del self.timestamps[key]
-                return None
-                
-            return self.cache[key]
+class SmartCache(CacheDuasCamadas):
+    """LRU em memória na frente do SQLite compartilhado (cache_persistente), com ttl/stale do CACHE_CONFIG"""
     
-    def set(self, key: str, value):
-        with self.lock:
-            if len(self.cache) >= self.config["max_size"]:
-                oldest_key = min(self.timestamps.items(), key=lambda x: x[1])[0]
-                del self.cache[oldest_key]
-                del self.timestamps[oldest_key]
-            
-            self.cache[key] = value
-            self.timestamps[key] = time.time()
-    
-    def clear(self):
-        with self.lock:
-            self.cache.clear()
-            self.timestamps.clear()
+    def __init__(self, cache_type: str):
+        self.cache_type = cache_type
+        config = ConfigManager.CACHE_CONFIG.get(cache_type, {"ttl": 3600, "max_size": 100})
+        super().__init__(f"Furões.{cache_type}", **config)
 
 
 class APIMonitor:
@@ -702,17 +669,35 @@ class APIMonitor:
 
 
 class ImageCache:
+    """Escudos: LRU em memória (limite de itens e de bytes) sobre uma cópia em disco com TTL"""
+    
     def __init__(self):
-        self.cache = {}
-        self.timestamps = {}
+        self.cache = OrderedDict()  # chave -> (bytes, timestamp)
         self.max_size = 200
+        self.max_bytes = 50 * 1024 * 1024
+        self.bytes = 0
         self.ttl = 86400 * 7
         self.lock = threading.Lock()
         self.cache_dir = "escudos_cache"
+        self.hits_memoria = 0
+        self.hits_disco = 0
+        self.misses = 0
+        self.evictions = 0
         
         if not os.path.exists(self.cache_dir):
             os.makedirs(self.cache_dir, exist_ok=True)
     
+    def _guardar_memoria(self, key: str, img_bytes: bytes):
+        if key in self.cache:
+            self.bytes -= len(self.cache.pop(key)[0])
+        self.cache[key] = (img_bytes, time.time())
+        self.bytes += len(img_bytes)
+        while len(self.cache) > self.max_size or (self.bytes > self.max_bytes and len(self.cache) > 1):
+            # Sai só da memória; a cópia em disco continua valendo até o TTL
+            _, (antigo, _) = self.cache.popitem(last=False)
+            self.bytes -= len(antigo)
+            self.evictions += 1
+    
     def get(self, team_name: str, crest_url: str) -> bytes | None:
         if not crest_url:
             return None
@@ -720,12 +705,13 @@ class ImageCache:
         key = self._generate_key(team_name, crest_url)
         
         with self.lock:
-            if key in self.cache:
-                if time.time() - self.timestamps[key] <= self.ttl:
-                    return self.cache[key]
-                else:
-                    del self.cache[key]
-                    del self.timestamps[key]
+            item = self.cache.get(key)
+            if item is not None:
+                if time.time() - item[1] <= self.ttl:
+                    self.cache.move_to_end(key)
+                    self.hits_memoria += 1
+                    return item[0]
+                self.bytes -= len(self.cache.pop(key)[0])
             
             file_path = os.path.join(self.cache_dir, f"{key}.png")
             if os.path.exists(file_path):
@@ -734,11 +720,13 @@ class ImageCache:
                     try:
                         with open(file_path, "rb") as f:
                             img_data = f.read()
-                        self.cache[key] = img_data
-                        self.timestamps[key] = time.time()
+                        self._guardar_memoria(key, img_data)
+                        self.hits_disco += 1
                         return img_data
                     except Exception:
                         pass
+            
+            self.misses += 1
         
         return None
     
@@ -749,20 +737,7 @@ class ImageCache:
         key = self._generate_key(team_name, crest_url)
         
         with self.lock:
-            if len(self.cache) >= self.max_size:
-                oldest_key = min(self.timestamps.items(), key=lambda x: x[1])[0]
-                del self.cache[oldest_key]
-                del self.timestamps[oldest_key]
-                
-                old_file = os.path.join(self.cache_dir, f"{oldest_key}.png")
-                if os.path.exists(old_file):
-                    try:
-                        os.remove(old_file)
-                    except:
-                        pass
-            
-            self.cache[key] = img_bytes
-            self.timestamps[key] = time.time()
+            self._guardar_memoria(key, img_bytes)
             
             try:
                 file_path = os.path.join(self.cache_dir, f"{key}.png")
@@ -778,7 +753,7 @@ class ImageCache:
     def clear(self):
         with self.lock:
             self.cache.clear()
-            self.timestamps.clear()
+            self.bytes = 0
             try:
                 if os.path.exists(self.cache_dir):
                     shutil.rmtree(self.cache_dir)
@@ -796,11 +771,18 @@ class ImageCache:
                     except:
                         pass
             
+            consultas = self.hits_memoria + self.hits_disco + self.misses
+            acertos = self.hits_memoria + self.hits_disco
             return {
                 "memoria": len(self.cache),
                 "max_memoria": self.max_size,
+                "memoria_mb": self.bytes / (1024*1024),
                 "disco_mb": cache_dir_size / (1024*1024) if cache_dir_size > 0 else 0,
-                "hit_rate": f"{(len(self.cache) / max(self.max_size, 1)) * 100:.1f}%"
+                "hits_memoria": self.hits_memoria,
+                "hits_disco": self.hits_disco,
+                "misses": self.misses,
+                "despejos": self.evictions,
+                "hit_rate": f"{(acertos / consultas * 100) if consultas else 0:.1f}%"
             }
 
 
@@ -1087,15 +1069,6 @@ class DataStorage:
                 
                 if not dados:
                     return {}
-                    
-                if caminho in [ConfigManager.CACHE_JOGOS, ConfigManager.CACHE_CLASSIFICACAO]:
-                    agora = datetime.now().timestamp()
-                    if isinstance(dados, dict) and '_timestamp' in dados:
-                        if agora - dados['_timestamp'] > ConfigManager.CACHE_TIMEOUT:
-                            return {}
-                    else:
-                        if agora - os.path.getmtime(caminho) > ConfigManager.CACHE_TIMEOUT:
-                            return {}
                 return dados
         except (json.JSONDecodeError, IOError, Exception) as e:
             logging.error(f"Erro ao carregar {caminho}: {e}")
@@ -1107,10 +1080,6 @@ class DataStorage:
         try:
             dados_serializados = DataStorage._serialize_for_json(dados)
             
-            if caminho in [ConfigManager.CACHE_JOGOS, ConfigManager.CACHE_CLASSIFICACAO]:
-                if isinstance(dados_serializados, dict):
-                    dados_serializados['_timestamp'] = datetime.now().timestamp()
-            
             with open(caminho, "w", encoding='utf-8') as f:
                 json.dump(dados_serializados, f, ensure_ascii=False, indent=2)
         except IOError as e:
@@ -1125,73 +1094,145 @@ class DataStorage:
     def salvar_performance_modelo(performance: dict):
         DataStorage.salvar_json(ConfigManager.MODELO_PERFORMANCE_PATH, performance)
 
+    # Alertas, resultados e múltiplas ficam no armazem_alertas (SQLite, uma
+    # linha por registro); os caminhos .json identificam as coleções e são
+    # importados na primeira leitura. carregar_/salvar_ mantêm o dict inteiro
+    # para relatórios e manutenção; os fluxos de envio e conferência usam os
+    # métodos por registro abaixo.
+    ARQUIVOS_ALERTAS = {
+        "over_under": ConfigManager.ALERTAS_PATH,
+        "favorito": ConfigManager.ALERTAS_FAVORITOS_PATH,
+        "gols_ht": ConfigManager.ALERTAS_GOLS_HT_PATH,
+        "ambas_marcam": ConfigManager.ALERTAS_AMBAS_MARCAM_PATH,
+    }
+    ARQUIVOS_RESULTADOS = {
+        "over_under": ConfigManager.RESULTADOS_PATH,
+        "favorito": ConfigManager.RESULTADOS_FAVORITOS_PATH,
+        "gols_ht": ConfigManager.RESULTADOS_GOLS_HT_PATH,
+        "ambas_marcam": ConfigManager.RESULTADOS_AMBAS_MARCAM_PATH,
+    }
+    
+    @staticmethod
+    def pendentes(caminho: str, data: str = None) -> dict:
+        """Registros não conferidos da coleção (de uma data "YYYY-MM-DD", se informada)"""
+        return armazem_alertas.pendentes(caminho, data=data)
+    
+    @staticmethod
+    def obter(caminho: str, chave: str):
+        return armazem_alertas.obter(caminho, chave)
+    
+    @staticmethod
+    def contem(caminho: str, chave: str) -> bool:
+        return armazem_alertas.contem(caminho, chave)
+    
+    @staticmethod
+    def carregar_colecao(caminho: str) -> dict:
+        return armazem_alertas.carregar(caminho)
+    
+    @staticmethod
+    def salvar_colecao(caminho: str, dados: dict):
+        armazem_alertas.salvar(caminho, dados)
+    
+    @staticmethod
+    def registrar(caminho: str, chave: str, registro: dict):
+        armazem_alertas.registrar(caminho, chave, registro)
+    
+    @staticmethod
+    def registrar_varios(caminho: str, registros: dict):
+        armazem_alertas.registrar_varios(caminho, registros)
+    
+    @staticmethod
+    def registrar_em_lote(por_caminho: dict):
+        """{caminho: {chave: registro}} de várias coleções na mesma transação"""
+        armazem_alertas.registrar_em_lote(por_caminho)
+    
+    @staticmethod
+    def alerta_registrado(tipo_alerta: str, fixture_id: str) -> bool:
+        return armazem_alertas.contem(DataStorage.ARQUIVOS_ALERTAS[tipo_alerta], fixture_id)
+    
+    @staticmethod
+    def registrar_alerta(tipo_alerta: str, fixture_id: str, alerta: dict):
+        armazem_alertas.registrar(DataStorage.ARQUIVOS_ALERTAS[tipo_alerta], fixture_id, alerta)
+    
+    @staticmethod
+    def alertas_pendentes(tipo_alerta: str, data: str = None) -> dict:
+        return DataStorage.pendentes(DataStorage.ARQUIVOS_ALERTAS[tipo_alerta], data=data)
+    
+    @staticmethod
+    def registrar_conferencias(tipo_alerta: str, alertas: dict, resultados: dict):
+        """Alertas marcados como conferidos e os resultados deles, na mesma transação"""
+        DataStorage.registrar_em_lote({
+            DataStorage.ARQUIVOS_ALERTAS[tipo_alerta]: alertas,
+            DataStorage.ARQUIVOS_RESULTADOS[tipo_alerta]: resultados,
+        })
+    
     @staticmethod
     def carregar_alertas() -> dict:
-        return DataStorage.carregar_json(ConfigManager.ALERTAS_PATH)
+        return armazem_alertas.carregar(ConfigManager.ALERTAS_PATH)
     
     @staticmethod
     def salvar_alertas(alertas: dict):
-        DataStorage.salvar_json(ConfigManager.ALERTAS_PATH, alertas)
+        armazem_alertas.salvar(ConfigManager.ALERTAS_PATH, alertas)
     
     @staticmethod
     def carregar_alertas_favoritos() -> dict:
-        return DataStorage.carregar_json(ConfigManager.ALERTAS_FAVORITOS_PATH)
+        return armazem_alertas.carregar(ConfigManager.ALERTAS_FAVORITOS_PATH)
     
     @staticmethod
     def salvar_alertas_favoritos(alertas: dict):
-        DataStorage.salvar_json(ConfigManager.ALERTAS_FAVORITOS_PATH, alertas)
+        armazem_alertas.salvar(ConfigManager.ALERTAS_FAVORITOS_PATH, alertas)
     
     @staticmethod
     def carregar_alertas_gols_ht() -> dict:
-        return DataStorage.carregar_json(ConfigManager.ALERTAS_GOLS_HT_PATH)
+        return armazem_alertas.carregar(ConfigManager.ALERTAS_GOLS_HT_PATH)
     
     @staticmethod
     def salvar_alertas_gols_ht(alertas: dict):
-        DataStorage.salvar_json(ConfigManager.ALERTAS_GOLS_HT_PATH, alertas)
+        armazem_alertas.salvar(ConfigManager.ALERTAS_GOLS_HT_PATH, alertas)
     
     @staticmethod
     def carregar_alertas_ambas_marcam() -> dict:
-        return DataStorage.carregar_json(ConfigManager.ALERTAS_AMBAS_MARCAM_PATH)
+        return armazem_alertas.carregar(ConfigManager.ALERTAS_AMBAS_MARCAM_PATH)
     
     @staticmethod
     def salvar_alertas_ambas_marcam(alertas: dict):
-        DataStorage.salvar_json(ConfigManager.ALERTAS_AMBAS_MARCAM_PATH, alertas)
+        armazem_alertas.salvar(ConfigManager.ALERTAS_AMBAS_MARCAM_PATH, alertas)
     
     @staticmethod
     def carregar_resultados() -> dict:
-        return DataStorage.carregar_json(ConfigManager.RESULTADOS_PATH)
+        return armazem_alertas.carregar(ConfigManager.RESULTADOS_PATH)
     
     @staticmethod
     def salvar_resultados(resultados: dict):
-        DataStorage.salvar_json(ConfigManager.RESULTADOS_PATH, resultados)
+        armazem_alertas.salvar(ConfigManager.RESULTADOS_PATH, resultados)
     
     @staticmethod
     def carregar_resultados_favoritos() -> dict:
-        return DataStorage.carregar_json(ConfigManager.RESULTADOS_FAVORITOS_PATH)
+        return armazem_alertas.carregar(ConfigManager.RESULTADOS_FAVORITOS_PATH)
     
     @staticmethod
     def salvar_resultados_favoritos(resultados: dict):
-        DataStorage.salvar_json(ConfigManager.RESULTADOS_FAVORITOS_PATH, resultados)
+        armazem_alertas.salvar(ConfigManager.RESULTADOS_FAVORITOS_PATH, resultados)
     
     @staticmethod
     def carregar_resultados_gols_ht() -> dict:
-        return DataStorage.carregar_json(ConfigManager.RESULTADOS_GOLS_HT_PATH)
+        return armazem_alertas.carregar(ConfigManager.RESULTADOS_GOLS_HT_PATH)
     
     @staticmethod
     def salvar_resultados_gols_ht(resultados: dict):
-        DataStorage.salvar_json(ConfigManager.RESULTADOS_GOLS_HT_PATH, resultados)
+        armazem_alertas.salvar(ConfigManager.RESULTADOS_GOLS_HT_PATH, resultados)
     
     @staticmethod
     def carregar_resultados_ambas_marcam() -> dict:
-        return DataStorage.carregar_json(ConfigManager.RESULTADOS_AMBAS_MARCAM_PATH)
+        return armazem_alertas.carregar(ConfigManager.RESULTADOS_AMBAS_MARCAM_PATH)
     
     @staticmethod
     def salvar_resultados_ambas_marcam(resultados: dict):
-        DataStorage.salvar_json(ConfigManager.RESULTADOS_AMBAS_MARCAM_PATH, resultados)
+        armazem_alertas.salvar(ConfigManager.RESULTADOS_AMBAS_MARCAM_PATH, resultados)
     
     @staticmethod
     def carregar_alertas_top() -> dict:
-        dados = DataStorage.carregar_json(ConfigManager.ALERTAS_TOP_PATH)
+        dados = armazem_alertas.carregar(ConfigManager.ALERTAS_TOP_PATH)
         if not isinstance(dados, dict):
             return {}
         return dados
@@ -1200,47 +1241,47 @@ class DataStorage:
     def salvar_alertas_top(alertas_top: dict):
         if not isinstance(alertas_top, dict):
             alertas_top = {}
-        DataStorage.salvar_json(ConfigManager.ALERTAS_TOP_PATH, alertas_top)
+        armazem_alertas.salvar(ConfigManager.ALERTAS_TOP_PATH, alertas_top)
     
     @staticmethod
     def carregar_resultados_top() -> dict:
-        return DataStorage.carregar_json(ConfigManager.RESULTADOS_TOP_PATH)
+        return armazem_alertas.carregar(ConfigManager.RESULTADOS_TOP_PATH)
     
     @staticmethod
     def salvar_resultados_top(resultados_top: dict):
-        DataStorage.salvar_json(ConfigManager.RESULTADOS_TOP_PATH, resultados_top)
+        armazem_alertas.salvar(ConfigManager.RESULTADOS_TOP_PATH, resultados_top)
     
     @staticmethod
     def carregar_alertas_completos() -> dict:
-        return DataStorage.carregar_json(ConfigManager.ALERTAS_COMPLETOS_PATH)
+        return armazem_alertas.carregar(ConfigManager.ALERTAS_COMPLETOS_PATH)
     
     @staticmethod
     def salvar_alertas_completos(alertas: dict):
-        DataStorage.salvar_json(ConfigManager.ALERTAS_COMPLETOS_PATH, alertas)
+        armazem_alertas.salvar(ConfigManager.ALERTAS_COMPLETOS_PATH, alertas)
     
     @staticmethod
     def carregar_resultados_completos() -> dict:
-        return DataStorage.carregar_json(ConfigManager.RESULTADOS_COMPLETOS_PATH)
+        return armazem_alertas.carregar(ConfigManager.RESULTADOS_COMPLETOS_PATH)
     
     @staticmethod
     def salvar_resultados_completos(resultados: dict):
-        DataStorage.salvar_json(ConfigManager.RESULTADOS_COMPLETOS_PATH, resultados)
+        armazem_alertas.salvar(ConfigManager.RESULTADOS_COMPLETOS_PATH, resultados)
     
     @staticmethod
     def carregar_multiplas() -> dict:
-        return DataStorage.carregar_json(ConfigManager.MULTIPLAS_PATH)
+        return armazem_alertas.carregar(ConfigManager.MULTIPLAS_PATH)
     
     @staticmethod
     def salvar_multiplas(multiplas: dict):
-        DataStorage.salvar_json(ConfigManager.MULTIPLAS_PATH, multiplas)
+        armazem_alertas.salvar(ConfigManager.MULTIPLAS_PATH, multiplas)
     
     @staticmethod
     def carregar_resultados_multiplas() -> dict:
-        return DataStorage.carregar_json(ConfigManager.RESULTADOS_MULTIPLAS_PATH)
+        return armazem_alertas.carregar(ConfigManager.RESULTADOS_MULTIPLAS_PATH)
     
     @staticmethod
     def salvar_resultados_multiplas(resultados: dict):
-        DataStorage.salvar_json(ConfigManager.RESULTADOS_MULTIPLAS_PATH, resultados)
+        armazem_alertas.salvar(ConfigManager.RESULTADOS_MULTIPLAS_PATH, resultados)
     
     @staticmethod
     def carregar_historico() -> list:
@@ -1598,117 +1639,37 @@ def sigmoid(x):
 
 
 class AnalisadorPerformance:
+    # Estado compartilhado no processo (agregados_performance): os resultados
+    # ficam na memória e vão para o modelo_performance.json em descarregar(),
+    # uma vez por rodada de conferência.
     def __init__(self):
-        self.historico = self._carregar_historico()
-        
-    def _carregar_historico(self) -> dict:
-        return DataStorage.carregar_performance_modelo()
+        self.agregados = agregados_performance.compartilhado(
+            ConfigManager.MODELO_PERFORMANCE_PATH,
+            DataStorage.carregar_performance_modelo,
+            DataStorage.salvar_performance_modelo,
+        )
     
-    def _salvar_historico(self):
-        DataStorage.salvar_performance_modelo(self.historico)
+    @property
+    def historico(self) -> dict:
+        return self.agregados.estado
     
     def registrar_resultado(self, alerta: dict, tipo_alerta: str, resultado: str, metadata: dict):
-        chave = f"{tipo_alerta}_{datetime.now().strftime('%Y%m')}"
-        
-        if chave not in self.historico:
-            self.historico[chave] = {
-                "total": 0,
-                "greens": 0,
-                "reds": 0,
-                "por_liga": {},
-                "por_faixa_confianca": {},
-                "por_tipo": {},
-                "erros": []
-            }
-        
-        hist = self.historico[chave]
-        hist["total"] += 1
-        
-        if resultado == "GREEN":
-            hist["greens"] += 1
-        else:
-            hist["reds"] += 1
-            if len(hist["erros"]) < 100:
-                hist["erros"].append({
-                    "alerta": alerta,
-                    "metadata": metadata,
-                    "resultado_esperado": alerta.get("tendencia", ""),
-                    "resultado_real": f"{metadata.get('home_goals', '?')}-{metadata.get('away_goals', '?')}"
-                })
-        
-        liga = alerta.get("liga", "Desconhecida")
-        if liga not in hist["por_liga"]:
-            hist["por_liga"][liga] = {"total": 0, "greens": 0}
-        hist["por_liga"][liga]["total"] += 1
-        if resultado == "GREEN":
-            hist["por_liga"][liga]["greens"] += 1
-        
-        confianca = alerta.get("confianca", 0)
-        faixa = f"{int(confianca // 10 * 10)}-{int(confianca // 10 * 10 + 9)}"
-        if faixa not in hist["por_faixa_confianca"]:
-            hist["por_faixa_confianca"][faixa] = {"total": 0, "greens": 0}
-        hist["por_faixa_confianca"][faixa]["total"] += 1
-        if resultado == "GREEN":
-            hist["por_faixa_confianca"][faixa]["greens"] += 1
-        
-        tipo_aposta = alerta.get("tipo_aposta", "unknown")
-        if tipo_aposta not in hist["por_tipo"]:
-            hist["por_tipo"][tipo_aposta] = {"total": 0, "greens": 0}
-        hist["por_tipo"][tipo_aposta]["total"] += 1
-        if resultado == "GREEN":
-            hist["por_tipo"][tipo_aposta]["greens"] += 1
-        
-        self._salvar_historico()
-    
-    def obter_acuracia_por_liga(self, liga: str, tipo_alerta: str = "over_under") -> float:
-        chave = f"{tipo_alerta}_{datetime.now().strftime('%Y%m')}"
-        if chave not in self.historico:
-            return 0.5
-        
-        dados_liga = self.historico[chave]["por_liga"].get(liga, {})
-        total = dados_liga.get("total", 0)
-        if total == 0:
-            return 0.5
-        return dados_liga.get("greens", 0) / total
-    
-    def obter_acuracia_por_faixa_confianca(self, confianca: float, tipo_alerta: str = "over_under") -> float:
-        chave = f"{tipo_alerta}_{datetime.now().strftime('%Y%m')}"
-        if chave not in self.historico:
-            return 0.5
-        
-        faixa = f"{int(confianca // 10 * 10)}-{int(confianca // 10 * 10 + 9)}"
-        dados_faixa = self.historico[chave]["por_faixa_confianca"].get(faixa, {})
-        total = dados_faixa.get("total", 0)
-        if total == 0:
-            return 0.5
-        return dados_faixa.get("greens", 0) / total
-    
-    def ajustar_limiar_confianca(self, tipo_alerta: str = "over_under") -> float:
-        chave = f"{tipo_alerta}_{datetime.now().strftime('%Y%m')}"
-        if chave not in self.historico:
-            return 70.0
-        
-        dados = self.historico[chave]
-        
-        melhor_faixa = 70.0
-        melhor_score = 0.0
-        
-        for faixa, stats in dados["por_faixa_confianca"].items():
-            if stats["total"] < 5:
-                continue
-            
-            acuracia = stats["greens"] / stats["total"] if stats["total"] > 0 else 0
-            
-            score = acuracia * (stats["total"] ** 0.5)
-            
-            if score > melhor_score:
-                melhor_score = score
-                try:
-                    melhor_faixa = float(faixa.split('-')[0])
-                except:
-                    melhor_faixa = 70.0
-        
-        return max(60.0, min(85.0, melhor_faixa))
+        self.agregados.registrar(tipo_alerta, resultado, alerta, metadata)
+    
+    def descarregar(self):
+        gravados = self.agregados.descarregar()
+        if gravados:
+            logging.info(f"📊 Performance do modelo atualizada com {gravados} resultados")
+    
+    def obter_acuracia_por_liga(self, liga: str, tipo_alerta: str = "over_under", dias: int = 30) -> float:
+        return self.agregados.acuracia(tipo_alerta, "por_liga", liga, dias)
+    
+    def obter_acuracia_por_faixa_confianca(self, confianca: float, tipo_alerta: str = "over_under", dias: int = 30) -> float:
+        return self.agregados.acuracia(
+            tipo_alerta, "por_faixa_confianca", agregados_performance.faixa_confianca(confianca), dias)
+    
+    def ajustar_limiar_confianca(self, tipo_alerta: str = "over_under", dias: int = 30) -> float:
+        return max(60.0, min(85.0, self.agregados.limiar(tipo_alerta, dias)))
 
 
 # ============================================================
@@ -3079,21 +3040,38 @@ class APIClient:
         self.classificacao_cache = SmartCache("classificacao")
         self.match_cache = SmartCache("match_details")
         self.image_cache = ImageCache()
-    
-    def obter_dados_api_com_retry(self, url: str, timeout: int = 15, max_retries: int = 3) -> dict | None:
+        # Falhas definitivas de requisição, para a thread do script exibir (workers não têm ScriptRunContext)
+        self._falhas = []
+        self._falhas_lock = Lock()
+    
+    def _registrar_falha(self, mensagem: str):
+        logging.error(mensagem)
+        with self._falhas_lock:
+            self._falhas.append(mensagem)
+    
+    def consumir_falhas(self) -> list:
+        """Falhas registradas desde a última chamada (de qualquer thread); esvazia a lista"""
+        with self._falhas_lock:
+            falhas, self._falhas = self._falhas, []
+        return falhas
+    
+    def obter_dados_api_com_retry(self, url: str, timeout: int = 15, max_retries: int = 3, prioridade: int = None) -> dict | None:
+        if prioridade is None:
+            prioridade = prioridade_da_url(url)
         for attempt in range(max_retries):
             try:
-                self.rate_limiter.wait_if_needed()
+                self.rate_limiter.wait_if_needed(prioridade)
                 
                 logging.info(f"🔗 Request {attempt+1}/{max_retries}: {url}")
                 
-                response = requests.get(url, headers=self.config.HEADERS, timeout=timeout)
+                response = cliente_http.get(url, headers=self.config.HEADERS, timeout=timeout)
+                self.rate_limiter.atualizar_cota(response.headers)
                 
                 if response.status_code == 429:
                     self.api_monitor.log_request(False, True)
                     retry_after = int(response.headers.get('Retry-After', 60))
                     logging.warning(f"⏳ Rate limit da API. Esperando {retry_after} segundos...")
-                    time.sleep(retry_after)
+                    self.rate_limiter.bloquear(retry_after)
                     continue
                     
                 response.raise_for_status()
@@ -3123,24 +3101,22 @@ class APIClient:
                     wait_time = 2 ** attempt
                     time.sleep(wait_time)
                 else:
-                    st.error(f"❌ Falha após {max_retries} tentativas: {e}")
+                    self._registrar_falha(f"❌ Falha após {max_retries} tentativas: {e}")
                     return None
                     
         return None
     
-    def obter_dados_api(self, url: str, timeout: int = 15) -> dict | None:
-        return self.obter_dados_api_com_retry(url, timeout, max_retries=3)
+    def obter_dados_api(self, url: str, timeout: int = 15, prioridade: int = None) -> dict | None:
+        return self.obter_dados_api_com_retry(url, timeout, max_retries=3, prioridade=prioridade)
     
     def obter_classificacao(self, liga_id: str) -> dict:
-        cached = self.classificacao_cache.get(liga_id)
-        if cached:
-            logging.info(f"📊 Classificação da liga {liga_id} obtida do cache")
-            return cached
-        
+        return self.classificacao_cache.obter_ou_buscar(liga_id, lambda: self._buscar_classificacao(liga_id)) or {}
+    
+    def _buscar_classificacao(self, liga_id: str) -> dict | None:
         url = f"{self.config.BASE_URL_FD}/competitions/{liga_id}/standings"
         data = self.obter_dados_api(url)
         if not data:
-            return {}
+            return None
 
         standings = {}
         for s in data.get("standings", []):
@@ -3156,22 +3132,40 @@ class APIClient:
                     "draws": t.get("drawn", 0),
                     "losses": t.get("lost", 0)
                 }
-        self.classificacao_cache.set(liga_id, standings)
         return standings
     
     def obter_jogos(self, liga_id: str, data: str) -> list:
-        key = f"{liga_id}_{data}"
-        
-        cached = self.jogos_cache.get(key)
-        if cached:
-            logging.info(f"⚽ Jogos {key} obtidos do cache")
-            return cached
-        
+        return self.jogos_cache.obter_ou_buscar(f"{liga_id}_{data}", lambda: self._buscar_jogos(liga_id, data)) or []
+    
+    def _buscar_jogos(self, liga_id: str, data: str) -> list | None:
         url = f"{self.config.BASE_URL_FD}/competitions/{liga_id}/matches?dateFrom={data}&dateTo={data}"
         data_api = self.obter_dados_api(url)
-        jogos = data_api.get("matches", []) if data_api else []
-        self.jogos_cache.set(key, jogos)
-        return jogos
+        return data_api.get("matches", []) if data_api else None
+    
+    def obter_ligas_concorrente(self, ligas: list, data: str, max_workers: int = 4):
+        """
+        Busca classificação e jogos de várias ligas em paralelo, dentro da cota do RateLimiter.
+        Gera (liga_id, classificacao, jogos) assim que as duas respostas de uma liga chegam.
+        """
+        pendentes = {}
+        partes = defaultdict(dict)
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            for liga_id in ligas:
+                buscar_jogos = self.obter_jogos_brasileirao if liga_id == "BSA" else self.obter_jogos
+                pendentes[executor.submit(self.obter_classificacao, liga_id)] = (liga_id, "classificacao")
+                pendentes[executor.submit(buscar_jogos, liga_id, data)] = (liga_id, "jogos")
+            
+            for future in as_completed(pendentes):
+                liga_id, parte = pendentes[future]
+                try:
+                    partes[liga_id][parte] = future.result()
+                except Exception as e:
+                    logging.error(f"❌ Erro ao buscar {parte} da liga {liga_id}: {e}")
+                    partes[liga_id][parte] = {} if parte == "classificacao" else []
+                
+                if len(partes[liga_id]) == 2:
+                    liga = partes.pop(liga_id)
+                    yield liga_id, liga["classificacao"], liga["jogos"]
     
     def obter_jogos_brasileirao(self, liga_id: str, data_hoje: str) -> list:
         data_amanha = (datetime.strptime(data_hoje, "%Y-%m-%d") + timedelta(days=1)).strftime("%Y-%m-%d")
@@ -3210,6 +3204,42 @@ class APIClient:
             self.match_cache.set(fixture_id, data)
         return data
     
+    def _partidas_para_conferencia(self, url: str) -> list:
+        """Lista de partidas de uma consulta em lote, na fila de conferência do limitador"""
+        data = self.obter_dados_api(url, prioridade=PRIORIDADE_RESULTADO)
+        partidas = data.get("matches", []) if data else []
+        for partida in partidas:
+            if partida.get("id") is not None:
+                self.match_cache.set(str(partida["id"]), partida)
+        return partidas
+    
+    def obter_resultados_em_lote(self, pendentes) -> dict:
+        """
+        {id do jogo: partida} de todos os jogos pendentes (dicts com id, liga, hora
+        e data_busca), com uma consulta por competição e janela de dias em vez de
+        uma por jogo. Jogos já no cache de detalhes não são consultados de novo.
+        """
+        mapa = {}
+        restantes = []
+        for jogo in pendentes:
+            fixture_id = str(jogo.get("id") or "")
+            cached = self.match_cache.get(fixture_id) if fixture_id else None
+            if cached and cached.get("status") == "FINISHED":
+                mapa[fixture_id] = cached
+            else:
+                restantes.append(jogo)
+        
+        base = self.config.BASE_URL_FD
+        mapa.update(conciliacao_resultados.mapa_resultados(
+            restantes,
+            self.config.LIGA_DICT,
+            lambda codigo, inicio, fim: self._partidas_para_conferencia(
+                f"{base}/competitions/{codigo}/matches?dateFrom={inicio}&dateTo={fim}"),
+            lambda ids: self._partidas_para_conferencia(f"{base}/matches?ids={','.join(ids)}"),
+            self.obter_detalhes_jogo
+        ))
+        return mapa
+    
     def baixar_escudo_time(self, team_name: str, crest_url: str) -> bytes | None:
         if not crest_url:
             logging.warning(f"❌ URL do escudo vazia para {team_name}")
@@ -3316,26 +3346,7 @@ class PosterGenerator:
     
     @staticmethod
     def criar_fonte(tamanho: int) -> ImageFont.ImageFont:
-        try:
-            font_paths = [
-                "arial.ttf", "Arial.ttf", "arialbd.ttf",
-                "/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf",
-                "/System/Library/Fonts/Arial.ttf",
-                "C:/Windows/Fonts/arial.ttf"
-            ]
-            
-            for font_path in font_paths:
-                try:
-                    if os.path.exists(font_path):
-                        return ImageFont.truetype(font_path, tamanho)
-                except Exception:
-                    continue
-            
-            return ImageFont.load_default()
-            
-        except Exception as e:
-            logging.error(f"Erro ao carregar fonte: {e}")
-            return ImageFont.load_default()
+        return recursos_poster.fonte(tamanho)
     
     def _aplicar_bordas_arredondadas(self, img: Image.Image, raio: int = 60) -> Image.Image:
         """Aplica bordas arredondadas na imagem inteira"""
@@ -3352,72 +3363,109 @@ class PosterGenerator:
         
         return img_com_mascara
     
-    def _desenhar_escudo_squircle(self, img, escudo_img, x, y, tamanho, tamanho_escudo, nome_time, cor_borda):
-        """Desenha escudo dentro de um SQUIRCLE (quadrado com cantos arredondados)"""
-        raio = int(tamanho * 0.25)
-        
-        draw = ImageDraw.Draw(img)
+    @staticmethod
+    def _colar_selo_translucido(img, caixa, raio=15, cor=(0, 0, 0, 200)):
+        """Fundo translúcido do selo de odd; o overlay tem só o tamanho da caixa, não do pôster"""
+        x0, y0, x1, y1 = caixa
+        overlay = Image.new('RGBA', (x1 - x0 + 1, y1 - y0 + 1), (0, 0, 0, 0))
+        ImageDraw.Draw(overlay).rounded_rectangle([0, 0, x1 - x0, y1 - y0], radius=raio, fill=cor)
+        img.paste(overlay, (x0, y0), overlay)
+    
+    @staticmethod
+    def _desenhar_moldura_squircle(draw, x, y, tamanho, cor_borda):
         draw.rounded_rectangle(
             [x, y, x + tamanho, y + tamanho],
-            radius=raio,
+            radius=int(tamanho * 0.25),
             fill=(255, 255, 255, 255),
             outline=cor_borda,
             width=3
         )
+    
+    @staticmethod
+    def _preparar_escudo_squircle(escudo_img, tamanho_escudo):
+        """Escudo redimensionado e recortado com cantos arredondados, pronto para colar"""
+        escudo_img = escudo_img.convert("RGBA")
+        largura, altura = escudo_img.size
+        
+        tamanho_ajustado = tamanho_escudo - 8
+        if tamanho_ajustado < 40:
+            tamanho_ajustado = tamanho_escudo
+        
+        if largura > altura:
+            nova_largura = tamanho_ajustado
+            nova_altura = int(altura * (tamanho_ajustado / largura))
+        else:
+            nova_altura = tamanho_ajustado
+            nova_largura = int(largura * (tamanho_ajustado / altura))
         
-        if escudo_img:
-            escudo_img = escudo_img.convert("RGBA")
-            largura, altura = escudo_img.size
-            
-            tamanho_ajustado = tamanho_escudo - 8
-            if tamanho_ajustado < 40:
-                tamanho_ajustado = tamanho_escudo
-            
-            if largura > altura:
-                nova_largura = tamanho_ajustado
-                nova_altura = int(altura * (tamanho_ajustado / largura))
-            else:
-                nova_altura = tamanho_ajustado
-                nova_largura = int(largura * (tamanho_ajustado / altura))
-            
-            escudo_redim = escudo_img.resize((nova_largura, nova_altura), Image.Resampling.LANCZOS)
-            
-            escudo_x = x + (tamanho - nova_largura) // 2
-            escudo_y = y + (tamanho - nova_altura) // 2
-            
-            mascara = Image.new("L", (nova_largura, nova_altura), 0)
-            mascara_draw = ImageDraw.Draw(mascara)
-            raio_mascara = min(nova_largura, nova_altura) // 4
-            mascara_draw.rounded_rectangle(
-                [0, 0, nova_largura, nova_altura],
-                radius=raio_mascara,
-                fill=255
-            )
-            
-            escudo_com_mascara = Image.new("RGBA", (nova_largura, nova_altura), (0, 0, 0, 0))
-            escudo_com_mascara.paste(escudo_redim, (0, 0), mascara)
-            img.paste(escudo_com_mascara, (escudo_x, escudo_y), escudo_com_mascara)
+        escudo_redim = escudo_img.resize((nova_largura, nova_altura), Image.Resampling.LANCZOS)
+        
+        mascara = Image.new("L", (nova_largura, nova_altura), 0)
+        mascara_draw = ImageDraw.Draw(mascara)
+        raio_mascara = min(nova_largura, nova_altura) // 4
+        mascara_draw.rounded_rectangle(
+            [0, 0, nova_largura, nova_altura],
+            radius=raio_mascara,
+            fill=255
+        )
+        
+        escudo_com_mascara = Image.new("RGBA", (nova_largura, nova_altura), (0, 0, 0, 0))
+        escudo_com_mascara.paste(escudo_redim, (0, 0), mascara)
+        return escudo_com_mascara
+    
+    @staticmethod
+    def _colar_escudo_squircle(img, escudo_pronto, x, y, tamanho):
+        escudo_x = x + (tamanho - escudo_pronto.width) // 2
+        escudo_y = y + (tamanho - escudo_pronto.height) // 2
+        img.paste(escudo_pronto, (escudo_x, escudo_y), escudo_pronto)
+    
+    def _escudo_squircle(self, nome_time, crest_url, tamanho_escudo):
+        """Escudo pronto do LRU de recursos_poster; só baixa/decodifica/redimensiona no miss"""
+        def preparar():
+            dados = self.api_client.baixar_escudo_time(nome_time, crest_url)
+            escudo_img = recursos_poster.decodificar(dados) if dados else None
+            return self._preparar_escudo_squircle(escudo_img, tamanho_escudo) if escudo_img else None
+        return recursos_poster.escudos.obter_ou_criar((nome_time, crest_url, tamanho_escudo, "squircle"), preparar)
+
+    def _desenhar_escudo_time(self, img, nome_time, crest_url, x, y, tamanho, tamanho_escudo, cor_borda, nome_iniciais=None):
+        """Moldura squircle + escudo do LRU; sem escudo, as iniciais (de nome_iniciais, se dado)"""
+        self._desenhar_moldura_squircle(ImageDraw.Draw(img), x, y, tamanho, cor_borda)
+        escudo_pronto = self._escudo_squircle(nome_time, crest_url, tamanho_escudo)
+        if escudo_pronto is not None:
+            self._colar_escudo_squircle(img, escudo_pronto, x, y, tamanho)
         else:
-            if nome_time:
-                palavras = nome_time.split()
-                if len(palavras) >= 2:
-                    iniciais = palavras[0][0].upper() + palavras[1][0].upper()
-                else:
-                    iniciais = nome_time[:2].upper() if len(nome_time) >= 2 else nome_time[0].upper()
+            self._desenhar_iniciais_squircle(img, x, y, tamanho, nome_time if nome_iniciais is None else nome_iniciais)
+
+    @staticmethod
+    def escudo_redimensionado(api_client, nome_time, crest_url, tamanho):
+        """Escudo esticado para tamanho x tamanho (pôsteres individuais), do mesmo LRU"""
+        def preparar():
+            dados = api_client.baixar_escudo_time(nome_time, crest_url) if api_client else None
+            escudo_img = recursos_poster.decodificar(dados) if dados else None
+            return escudo_img.resize((tamanho, tamanho), Image.Resampling.LANCZOS) if escudo_img else None
+        return recursos_poster.escudos.obter_ou_criar((nome_time, crest_url, tamanho, "esticado"), preparar)
+
+    def _desenhar_iniciais_squircle(self, img, x, y, tamanho, nome_time):
+        if nome_time:
+            palavras = nome_time.split()
+            if len(palavras) >= 2:
+                iniciais = palavras[0][0].upper() + palavras[1][0].upper()
             else:
-                iniciais = "??"
-            
-            try:
-                fonte = self.criar_fonte(int(tamanho * 0.4))
-                draw = ImageDraw.Draw(img)
-                bbox = draw.textbbox((0, 0), iniciais, font=fonte)
-                text_w = bbox[2] - bbox[0]
-                text_h = bbox[3] - bbox[1]
-                text_x = x + (tamanho - text_w) // 2
-                text_y = y + (tamanho - text_h) // 2
-                draw.text((text_x, text_y), iniciais, font=fonte, fill=(100, 100, 100))
-            except Exception as e:
-                logging.error(f"Erro ao desenhar iniciais: {e}")
+                iniciais = nome_time[:2].upper() if len(nome_time) >= 2 else nome_time[0].upper()
+        else:
+            iniciais = "??"
+        
+        try:
+            fonte = self.criar_fonte(int(tamanho * 0.4))
+            draw = ImageDraw.Draw(img)
+            bbox = draw.textbbox((0, 0), iniciais, font=fonte)
+            text_w = bbox[2] - bbox[0]
+            text_h = bbox[3] - bbox[1]
+            text_x = x + (tamanho - text_w) // 2
+            text_y = y + (tamanho - text_h) // 2
+            draw.text((text_x, text_y), iniciais, font=fonte, fill=(100, 100, 100))
+        except Exception as e:
+            logging.error(f"Erro ao desenhar iniciais: {e}")
 
     def _desenhar_escudo_quadrado(self, draw, img, logo_img, x, y, tamanho_quadrado, tamanho_escudo, team_name=""):
         """Desenha escudo dentro de um SQUIRCLE para uso em posters de resultado"""
@@ -3454,32 +3502,7 @@ class PosterGenerator:
             return
 
         try:
-            logo_img = logo_img.convert("RGBA")
-            largura, altura = logo_img.size
-            
-            proporcao = largura / altura
-            
-            if proporcao > 1:
-                nova_altura = tamanho_escudo
-                nova_largura = int(tamanho_escudo * proporcao)
-                if nova_largura > tamanho_escudo:
-                    nova_largura = tamanho_escudo
-                    nova_altura = int(tamanho_escudo / proporcao)
-            else:
-                nova_largura = tamanho_escudo
-                nova_altura = int(tamanho_escudo / proporcao)
-                if nova_altura > tamanho_escudo:
-                    nova_altura = tamanho_escudo
-                    nova_largura = int(tamanho_escudo * proporcao)
-            
-            imagem_redimensionada = logo_img.resize((nova_largura, nova_altura), Image.Resampling.LANCZOS)
-            
-            pos_x = x + (tamanho_quadrado - nova_largura) // 2
-            pos_y = y + (tamanho_quadrado - nova_altura) // 2
-
-            fundo = Image.new("RGBA", (tamanho_quadrado, tamanho_quadrado), (255, 255, 255, 255))
-            fundo.paste(imagem_redimensionada, (pos_x - x, pos_y - y), imagem_redimensionada)
-            
+            fundo = self._preparar_escudo_quadrado(logo_img, tamanho_quadrado, tamanho_escudo)
             img.paste(fundo, (x, y), fundo)
 
         except Exception as e:
@@ -3504,6 +3527,52 @@ class PosterGenerator:
             except:
                 draw.text((x + 70, y + 90), iniciais, font=self.criar_fonte(50), fill=(255, 255, 255))
 
+    @staticmethod
+    def _preparar_escudo_quadrado(logo_img, tamanho_quadrado, tamanho_escudo):
+        """Fundo branco tamanho_quadrado com o escudo centralizado, pronto para colar"""
+        logo_img = logo_img.convert("RGBA")
+        largura, altura = logo_img.size
+        
+        proporcao = largura / altura
+        
+        if proporcao > 1:
+            nova_altura = tamanho_escudo
+            nova_largura = int(tamanho_escudo * proporcao)
+            if nova_largura > tamanho_escudo:
+                nova_largura = tamanho_escudo
+                nova_altura = int(tamanho_escudo / proporcao)
+        else:
+            nova_largura = tamanho_escudo
+            nova_altura = int(tamanho_escudo / proporcao)
+            if nova_altura > tamanho_escudo:
+                nova_altura = tamanho_escudo
+                nova_largura = int(tamanho_escudo * proporcao)
+        
+        imagem_redimensionada = logo_img.resize((nova_largura, nova_altura), Image.Resampling.LANCZOS)
+        
+        fundo = Image.new("RGBA", (tamanho_quadrado, tamanho_quadrado), (255, 255, 255, 255))
+        fundo.paste(imagem_redimensionada, ((tamanho_quadrado - nova_largura) // 2, (tamanho_quadrado - nova_altura) // 2), imagem_redimensionada)
+        return fundo
+
+    def _desenhar_escudo_quadrado_time(self, draw, img, nome_time, crest_url, x, y, tamanho_quadrado, tamanho_escudo):
+        """_desenhar_escudo_quadrado com o escudo pronto do LRU de recursos_poster"""
+        def preparar():
+            dados = self.api_client.baixar_escudo_time(nome_time, crest_url)
+            logo_img = recursos_poster.decodificar(dados) if dados else None
+            return self._preparar_escudo_quadrado(logo_img, tamanho_quadrado, tamanho_escudo) if logo_img else None
+        fundo = recursos_poster.escudos.obter_ou_criar((nome_time, crest_url, (tamanho_quadrado, tamanho_escudo), "quadrado"), preparar)
+        if fundo is None:
+            self._desenhar_escudo_quadrado(draw, img, None, x, y, tamanho_quadrado, tamanho_escudo, nome_time)
+            return
+        draw.rounded_rectangle(
+            [x, y, x + tamanho_quadrado, y + tamanho_quadrado],
+            radius=int(tamanho_quadrado * 0.35),
+            fill=(255, 255, 255),
+            outline=(255, 255, 255),
+            width=3
+        )
+        img.paste(fundo, (x, y), fundo)
+    
     def gerar_poster_multipla(self, multipla: dict, titulo: str = "💣 MÚLTIPLA PROFISSIONAL") -> io.BytesIO:
         LARGURA = 2000
         ALTURA_TOPO = 370
@@ -3590,10 +3659,7 @@ class PosterGenerator:
                 fundo_x1 = odd_x + odd_w + 15
                 fundo_y1 = odd_y + odd_h + 10
                 
-                overlay = Image.new('RGBA', img.size, (0, 0, 0, 0))
-                overlay_draw = ImageDraw.Draw(overlay)
-                overlay_draw.rounded_rectangle([fundo_x0, fundo_y0, fundo_x1, fundo_y1], radius=15, fill=(0, 0, 0, 200))
-                img.paste(overlay, (0, 0), overlay)
+                self._colar_selo_translucido(img, [fundo_x0, fundo_y0, fundo_x1, fundo_y1])
                 
                 draw.rounded_rectangle([fundo_x0, fundo_y0, fundo_x1, fundo_y1], radius=15, outline=cor_borda, width=3)
                 draw.text((odd_x, odd_y), odd_text, font=FONTE_ODD, fill=cor_borda)
@@ -3623,35 +3689,8 @@ class PosterGenerator:
             x_away = x_home + TAMANHO + ESPACO_ENTRE
             y_escudos = y0 + 100
 
-            escudo_home_bytes = self.api_client.baixar_escudo_time(jogo.get('home', ''), jogo.get('escudo_home', ''))
-            escudo_away_bytes = self.api_client.baixar_escudo_time(jogo.get('away', ''), jogo.get('escudo_away', ''))
-            
-            escudo_home_img = None
-            escudo_away_img = None
-            
-            if escudo_home_bytes:
-                try:
-                    escudo_home_img = Image.open(io.BytesIO(escudo_home_bytes)).convert("RGBA")
-                except Exception as e:
-                    logging.error(f"Erro ao abrir escudo do {jogo.get('home', '')}: {e}")
-            
-            if escudo_away_bytes:
-                try:
-                    escudo_away_img = Image.open(io.BytesIO(escudo_away_bytes)).convert("RGBA")
-                except Exception as e:
-                    logging.error(f"Erro ao abrir escudo do {jogo.get('away', '')}: {e}")
-
-            self._desenhar_escudo_squircle(
-                img, escudo_home_img, x_home, y_escudos,
-                TAMANHO, TAMANHO_ESCUDO,
-                jogo.get('home', ''), cor_borda
-            )
-
-            self._desenhar_escudo_squircle(
-                img, escudo_away_img, x_away, y_escudos,
-                TAMANHO, TAMANHO_ESCUDO,
-                jogo.get('away', ''), cor_borda
-            )
+            self._desenhar_escudo_time(img, jogo.get('home', ''), jogo.get('escudo_home', ''), x_home, y_escudos, TAMANHO, TAMANHO_ESCUDO, cor_borda)
+            self._desenhar_escudo_time(img, jogo.get('away', ''), jogo.get('escudo_away', ''), x_away, y_escudos, TAMANHO, TAMANHO_ESCUDO, cor_borda)
 
             home_text = jogo.get('home', 'TIME CASA')[:15]
             away_text = jogo.get('away', 'TIME FORA')[:15]
@@ -3725,7 +3764,7 @@ class PosterGenerator:
         img_com_bordas = self._aplicar_bordas_arredondadas(img_rgb, raio=50)
         
         buffer = io.BytesIO()
-        img_com_bordas.save(buffer, format="PNG", optimize=True, quality=95)
+        img_com_bordas.save(buffer, format="PNG", quality=95)
         buffer.seek(0)
         
         return buffer
@@ -3845,23 +3884,8 @@ class PosterGenerator:
             home_crest_url = jogo.get('escudo_home', '')
             away_crest_url = jogo.get('escudo_away', '')
             
-            escudo_home_bytes = self.api_client.baixar_escudo_time(jogo.get('home', ''), home_crest_url)
-            escudo_away_bytes = self.api_client.baixar_escudo_time(jogo.get('away', ''), away_crest_url)
-            
-            escudo_home_img = Image.open(io.BytesIO(escudo_home_bytes)).convert("RGBA") if escudo_home_bytes else None
-            escudo_away_img = Image.open(io.BytesIO(escudo_away_bytes)).convert("RGBA") if escudo_away_bytes else None
-
-            self._desenhar_escudo_squircle(
-                img, escudo_home_img, x_home, y_escudos,
-                TAMANHO, TAMANHO_ESCUDO,
-                jogo.get('home', ''), cor_borda
-            )
-
-            self._desenhar_escudo_squircle(
-                img, escudo_away_img, x_away, y_escudos,
-                TAMANHO, TAMANHO_ESCUDO,
-                jogo.get('away', ''), cor_borda
-            )
+            self._desenhar_escudo_time(img, jogo.get('home', ''), home_crest_url, x_home, y_escudos, TAMANHO, TAMANHO_ESCUDO, cor_borda)
+            self._desenhar_escudo_time(img, jogo.get('away', ''), away_crest_url, x_away, y_escudos, TAMANHO, TAMANHO_ESCUDO, cor_borda)
 
             home_text = jogo.get('home', '')[:12]
             away_text = jogo.get('away', '')[:12]
@@ -3923,46 +3947,108 @@ class PosterGenerator:
         img_com_bordas = self._aplicar_bordas_arredondadas(img_rgb, raio=50)
         
         buffer = io.BytesIO()
-        img_com_bordas.save(buffer, format="PNG", optimize=True, quality=95)
+        img_com_bordas.save(buffer, format="PNG", quality=95)
         buffer.seek(0)
         
         return buffer
 
+    # Layout do pôster westham (compartilhado com os modelos pré-desenhados)
+    WESTHAM_LARGURA = 2000
+    WESTHAM_ALTURA_TOPO = 280
+    WESTHAM_ALTURA_POR_JOGO = 830
+    WESTHAM_PADDING = 80
+    WESTHAM_TAMANHO_ESCUDO = 220
+    WESTHAM_TAMANHO = 240
+    WESTHAM_ESPACO_ENTRE = 700
+    WESTHAM_Y_ESCUDOS = 250
+    WESTHAM_FUNDO = (10, 20, 30, 255)
+
+    def _modelo_topo_westham(self, titulo):
+        """Faixa do título, igual para todos os pôsteres com o mesmo título"""
+        LARGURA = self.WESTHAM_LARGURA
+        topo = Image.new("RGBA", (LARGURA, self.WESTHAM_ALTURA_TOPO), self.WESTHAM_FUNDO)
+        draw = ImageDraw.Draw(topo)
+        FONTE_TITULO = self.criar_fonte(85)
+
+        try:
+            titulo_bbox = draw.textbbox((0, 0), titulo, font=FONTE_TITULO)
+            titulo_w = titulo_bbox[2] - titulo_bbox[0]
+            draw.text(((LARGURA - titulo_w) // 2, 100), titulo, font=FONTE_TITULO, fill=(255, 255, 255))
+        except:
+            draw.text((LARGURA//2 - 250, 100), titulo, font=FONTE_TITULO, fill=(255, 255, 255))
+
+        draw.line([(LARGURA//4, 220), (3*LARGURA//4, 220)], fill=(255, 215, 0), width=6)
+        return topo
+
+    def _modelo_cartao_westham(self, cor_borda):
+        """
+        Partes fixas do cartão de um jogo (fundo, borda, molduras dos escudos,
+        "VS" e divisória) em coordenadas locais; colado em (PADDING, y0)
+        """
+        TAMANHO = self.WESTHAM_TAMANHO
+        ESPACO_ENTRE = self.WESTHAM_ESPACO_ENTRE
+        x1 = self.WESTHAM_LARGURA - 2 * self.WESTHAM_PADDING
+        y1 = self.WESTHAM_ALTURA_POR_JOGO - 40
+        cartao = Image.new("RGBA", (x1 + 1, y1 + 1), self.WESTHAM_FUNDO)
+        draw = ImageDraw.Draw(cartao)
+        FONTE_VS = self.criar_fonte(55)
+
+        draw.rounded_rectangle([0, 0, x1, y1], radius=25, fill=(25, 35, 45, 255), outline=cor_borda, width=4)
+
+        x_home = (self.WESTHAM_LARGURA - (2 * TAMANHO + ESPACO_ENTRE)) // 2 - self.WESTHAM_PADDING
+        x_away = x_home + TAMANHO + ESPACO_ENTRE
+        y_escudos = self.WESTHAM_Y_ESCUDOS
+        self._desenhar_moldura_squircle(draw, x_home, y_escudos, TAMANHO, cor_borda)
+        self._desenhar_moldura_squircle(draw, x_away, y_escudos, TAMANHO, cor_borda)
+
+        try:
+            vs_bbox = draw.textbbox((0, 0), "VS", font=FONTE_VS)
+            vs_w = vs_bbox[2] - vs_bbox[0]
+            vs_x = x_home + TAMANHO + (ESPACO_ENTRE - vs_w) // 2
+            draw.text((vs_x, y_escudos + TAMANHO//2 - 30), "VS", font=FONTE_VS, fill=(255, 215, 0))
+        except:
+            vs_x = x_home + TAMANHO + ESPACO_ENTRE//2 - 30
+            draw.text((vs_x, y_escudos + TAMANHO//2 - 30), "VS", font=FONTE_VS, fill=(255, 215, 0))
+
+        y_analysis = y_escudos + TAMANHO + 150
+        draw.line([(80, y_analysis - 20), (x1 - 80, y_analysis - 20)], fill=(100, 130, 160), width=3)
+        return cartao
+
     def gerar_poster_westham_style(self, jogos: list, titulo: str = "⚽ ALERTA DE GOLS", tipo_alerta: str = "over_under") -> io.BytesIO:
-        LARGURA = 2000
-        ALTURA_TOPO = 280
-        ALTURA_POR_JOGO = 830
-        PADDING = 80
+        LARGURA = self.WESTHAM_LARGURA
+        ALTURA_TOPO = self.WESTHAM_ALTURA_TOPO
+        ALTURA_POR_JOGO = self.WESTHAM_ALTURA_POR_JOGO
+        PADDING = self.WESTHAM_PADDING
         
+        # a mesma lista de jogos no mesmo minuto (rerun, reenvio) devolve os bytes já gerados
+        rodape_text = f"Gerado em {datetime.now().strftime('%d/%m/%Y %H:%M')} - ELITE MASTER SYSTEM 3.0"
+        chave_poster = recursos_poster.hash_conteudo("westham", titulo, tipo_alerta, jogos, rodape_text)
+        pronto = recursos_poster.posters.get(chave_poster)
+        if pronto is not None:
+            return io.BytesIO(pronto)
+        escudos_completos = True
+
         jogos_count = len(jogos)
         altura_total = ALTURA_TOPO + jogos_count * ALTURA_POR_JOGO + PADDING
 
-        img = Image.new("RGBA", (LARGURA, altura_total), (10, 20, 30, 255))
+        img = Image.new("RGBA", (LARGURA, altura_total), self.WESTHAM_FUNDO)
         draw = ImageDraw.Draw(img)
 
-        FONTE_TITULO = self.criar_fonte(85)
         FONTE_SUBTITULO = self.criar_fonte(65)
         FONTE_TIMES = self.criar_fonte(60)
-        FONTE_VS = self.criar_fonte(55)
         FONTE_INFO = self.criar_fonte(50)
         FONTE_DETALHES = self.criar_fonte(45)
         FONTE_ANALISE = self.criar_fonte(50)
         FONTE_ODD = self.criar_fonte(65)
 
-        try:
-            titulo_bbox = draw.textbbox((0, 0), titulo, font=FONTE_TITULO)
-            titulo_w = titulo_bbox[2] - titulo_bbox[0]
-            draw.text(((LARGURA - titulo_w) // 2, 100), titulo, font=FONTE_TITULO, fill=(255, 255, 255))
-        except:
-            draw.text((LARGURA//2 - 250, 100), titulo, font=FONTE_TITULO, fill=(255, 255, 255))
-
-        draw.line([(LARGURA//4, 220), (3*LARGURA//4, 220)], fill=(255, 215, 0), width=6)
+        topo = recursos_poster.modelos.obter_ou_criar(("westham_topo", titulo), lambda: self._modelo_topo_westham(titulo))
+        img.paste(topo, (0, 0))
 
         y_pos = ALTURA_TOPO
 
         for idx, jogo_dict in enumerate(jogos):
             x0, y0 = PADDING, y_pos
-            x1, y1 = LARGURA - PADDING, y_pos + ALTURA_POR_JOGO - 40
+            x1 = LARGURA - PADDING
             
             if tipo_alerta == "over_under":
                 cor_borda = (255, 215, 0) if jogo_dict.get('tipo_aposta') == "over" else (100, 200, 255)
@@ -3975,7 +4061,9 @@ class PosterGenerator:
             else:
                 cor_borda = (255, 215, 0)
             
-            draw.rounded_rectangle([x0, y0, x1, y1], radius=25, fill=(25, 35, 45, 255), outline=cor_borda, width=4)
+            cartao = recursos_poster.modelos.obter_ou_criar(("westham_cartao", cor_borda),
+                                                            lambda: self._modelo_cartao_westham(cor_borda))
+            img.paste(cartao, (x0, y0))
 
             if tipo_alerta == "over_under":
                 prob = jogo_dict.get('probabilidade', 50)
@@ -4012,10 +4100,7 @@ class PosterGenerator:
                 fundo_x1 = odd_x + odd_w + 15
                 fundo_y1 = odd_y + odd_h + 10
                 
-                overlay = Image.new('RGBA', img.size, (0,0,0,0))
-                overlay_draw = ImageDraw.Draw(overlay)
-                overlay_draw.rounded_rectangle([fundo_x0, fundo_y0, fundo_x1, fundo_y1], radius=15, fill=(0, 0, 0, 200))
-                img.paste(overlay, (0,0), overlay)
+                self._colar_selo_translucido(img, [fundo_x0, fundo_y0, fundo_x1, fundo_y1])
                 
                 draw.rounded_rectangle([fundo_x0, fundo_y0, fundo_x1, fundo_y1], radius=15, outline=(255, 215, 0), width=3)
                 draw.text((odd_x, odd_y), odd_text, font=FONTE_ODD, fill=cor_odd)
@@ -4045,37 +4130,29 @@ class PosterGenerator:
             except:
                 draw.text((LARGURA//2 - 150, y0 + 130), data_text, font=FONTE_INFO, fill=(150, 200, 255))
 
-            TAMANHO_ESCUDO = 220
-            TAMANHO = 240
-            ESPACO_ENTRE = 700
+            TAMANHO_ESCUDO = self.WESTHAM_TAMANHO_ESCUDO
+            TAMANHO = self.WESTHAM_TAMANHO
+            ESPACO_ENTRE = self.WESTHAM_ESPACO_ENTRE
 
             largura_total = 2 * TAMANHO + ESPACO_ENTRE
             x_inicio = (LARGURA - largura_total) // 2
 
             x_home = x_inicio
             x_away = x_home + TAMANHO + ESPACO_ENTRE
-            y_escudos = y0 + 250
-
-            home_crest_url = jogo_dict.get('escudo_home', '')
-            away_crest_url = jogo_dict.get('escudo_away', '')
-            
-            escudo_home_bytes = self.api_client.baixar_escudo_time(jogo_dict.get('home', ''), home_crest_url)
-            escudo_away_bytes = self.api_client.baixar_escudo_time(jogo_dict.get('away', ''), away_crest_url)
-            
-            escudo_home_img = Image.open(io.BytesIO(escudo_home_bytes)).convert("RGBA") if escudo_home_bytes else None
-            escudo_away_img = Image.open(io.BytesIO(escudo_away_bytes)).convert("RGBA") if escudo_away_bytes else None
-
-            self._desenhar_escudo_squircle(
-                img, escudo_home_img, x_home, y_escudos,
-                TAMANHO, TAMANHO_ESCUDO,
-                jogo_dict.get('home', ''), cor_borda
-            )
-
-            self._desenhar_escudo_squircle(
-                img, escudo_away_img, x_away, y_escudos,
-                TAMANHO, TAMANHO_ESCUDO,
-                jogo_dict.get('away', ''), cor_borda
-            )
+            y_escudos = y0 + self.WESTHAM_Y_ESCUDOS
+
+            # as molduras já vêm no cartão; aqui só o escudo pronto (LRU) ou as iniciais
+            for x_escudo, nome_time, crest_url in (
+                (x_home, jogo_dict.get('home', ''), jogo_dict.get('escudo_home', '')),
+                (x_away, jogo_dict.get('away', ''), jogo_dict.get('escudo_away', '')),
+            ):
+                escudo_pronto = self._escudo_squircle(nome_time, crest_url, TAMANHO_ESCUDO)
+                if escudo_pronto is not None:
+                    self._colar_escudo_squircle(img, escudo_pronto, x_escudo, y_escudos, TAMANHO)
+                else:
+                    # escudo que falhou agora pode baixar no próximo pôster: não guardar esse
+                    escudos_completos = escudos_completos and not crest_url
+                    self._desenhar_iniciais_squircle(img, x_escudo, y_escudos, TAMANHO, nome_time)
 
             home_text = jogo_dict.get('home', 'TIME CASA')[:15]
             away_text = jogo_dict.get('away', 'TIME FORA')[:15]
@@ -4096,17 +4173,7 @@ class PosterGenerator:
             except:
                 draw.text((x_away, y_escudos + TAMANHO + 50), away_text, font=FONTE_TIMES, fill=(255, 255, 255))
 
-            try:
-                vs_bbox = draw.textbbox((0, 0), "VS", font=FONTE_VS)
-                vs_w = vs_bbox[2] - vs_bbox[0]
-                vs_x = x_home + TAMANHO + (ESPACO_ENTRE - vs_w) // 2
-                draw.text((vs_x, y_escudos + TAMANHO//2 - 30), "VS", font=FONTE_VS, fill=(255, 215, 0))
-            except:
-                vs_x = x_home + TAMANHO + ESPACO_ENTRE//2 - 30
-                draw.text((vs_x, y_escudos + TAMANHO//2 - 30), "VS", font=FONTE_VS, fill=(255, 215, 0))
-
             y_analysis = y_escudos + TAMANHO + 150
-            draw.line([(x0 + 80, y_analysis - 20), (x1 - 80, y_analysis - 20)], fill=(100, 130, 160), width=3)
             
             if tipo_alerta == "over_under":
                 textos_analise = [
@@ -4154,7 +4221,6 @@ class PosterGenerator:
 
             y_pos += ALTURA_POR_JOGO
 
-        rodape_text = f"Gerado em {datetime.now().strftime('%d/%m/%Y %H:%M')} - ELITE MASTER SYSTEM 3.0"
         try:
             rodape_bbox = draw.textbbox((0, 0), rodape_text, font=FONTE_DETALHES)
             rodape_w = rodape_bbox[2] - rodape_bbox[0]
@@ -4167,9 +4233,12 @@ class PosterGenerator:
         
         img_com_bordas = self._aplicar_bordas_arredondadas(img_rgb, raio=50)
         
+        # sem optimize=True: zlib padrão gera os mesmos pixels na metade do tempo (~3% a mais de bytes)
         buffer = io.BytesIO()
-        img_com_bordas.save(buffer, format="PNG", optimize=True, quality=95)
+        img_com_bordas.save(buffer, format="PNG", quality=95)
         buffer.seek(0)
+        if escudos_completos:
+            recursos_poster.posters.set(chave_poster, buffer.getvalue())
         
         return buffer
 
@@ -4300,23 +4369,8 @@ class PosterGenerator:
             home_crest_url = jogo.get('escudo_home', '')
             away_crest_url = jogo.get('escudo_away', '')
             
-            escudo_home_bytes = self.api_client.baixar_escudo_time(jogo['home'], home_crest_url)
-            escudo_away_bytes = self.api_client.baixar_escudo_time(jogo['away'], away_crest_url)
-            
-            escudo_home_img = Image.open(io.BytesIO(escudo_home_bytes)).convert("RGBA") if escudo_home_bytes else None
-            escudo_away_img = Image.open(io.BytesIO(escudo_away_bytes)).convert("RGBA") if escudo_away_bytes else None
-
-            self._desenhar_escudo_squircle(
-                img, escudo_home_img, x_home, y_escudos,
-                TAMANHO, TAMANHO_ESCUDO,
-                jogo['home'], cor_borda
-            )
-
-            self._desenhar_escudo_squircle(
-                img, escudo_away_img, x_away, y_escudos,
-                TAMANHO, TAMANHO_ESCUDO,
-                jogo['away'], cor_borda
-            )
+            self._desenhar_escudo_time(img, jogo['home'], home_crest_url, x_home, y_escudos, TAMANHO, TAMANHO_ESCUDO, cor_borda)
+            self._desenhar_escudo_time(img, jogo['away'], away_crest_url, x_away, y_escudos, TAMANHO, TAMANHO_ESCUDO, cor_borda)
 
             home_text = jogo['home'][:12]
             away_text = jogo['away'][:12]
@@ -4434,7 +4488,7 @@ class PosterGenerator:
         img_com_bordas = self._aplicar_bordas_arredondadas(img_rgb, raio=50)
         
         buffer = io.BytesIO()
-        img_com_bordas.save(buffer, format="PNG", optimize=True, quality=95)
+        img_com_bordas.save(buffer, format="PNG", quality=95)
         buffer.seek(0)
         
         st.success(f"✅ Poster de resultados GERADO com {len(jogos_com_resultados)} jogos")
@@ -4529,10 +4583,7 @@ class PosterGenerator:
                 fundo_x1 = odd_x + odd_w + 15
                 fundo_y1 = odd_y + 50
                 
-                overlay = Image.new('RGBA', img.size, (0,0,0,0))
-                overlay_draw = ImageDraw.Draw(overlay)
-                overlay_draw.rounded_rectangle([fundo_x0, fundo_y0, fundo_x1, fundo_y1], radius=15, fill=(0, 0, 0, 200))
-                img.paste(overlay, (0,0), overlay)
+                self._colar_selo_translucido(img, [fundo_x0, fundo_y0, fundo_x1, fundo_y1])
                 
                 draw.rounded_rectangle([fundo_x0, fundo_y0, fundo_x1, fundo_y1], radius=15, outline=cor_borda, width=3)
                 draw.text((odd_x, odd_y), odd_text, font=FONTE_ODD, fill=cor_borda)
@@ -4582,23 +4633,8 @@ class PosterGenerator:
             x_away = x_home + TAMANHO + ESPACO_ENTRE
             y_escudos = y0 + 150
 
-            escudo_home_bytes = self.api_client.baixar_escudo_time(jogo.get('home', ''), jogo.get('escudo_home', ''))
-            escudo_away_bytes = self.api_client.baixar_escudo_time(jogo.get('away', ''), jogo.get('escudo_away', ''))
-            
-            escudo_home_img = Image.open(io.BytesIO(escudo_home_bytes)).convert("RGBA") if escudo_home_bytes else None
-            escudo_away_img = Image.open(io.BytesIO(escudo_away_bytes)).convert("RGBA") if escudo_away_bytes else None
-
-            self._desenhar_escudo_squircle(
-                img, escudo_home_img, x_home, y_escudos,
-                TAMANHO, TAMANHO_ESCUDO,
-                jogo.get('home', ''), cor_borda
-            )
-
-            self._desenhar_escudo_squircle(
-                img, escudo_away_img, x_away, y_escudos,
-                TAMANHO, TAMANHO_ESCUDO,
-                jogo.get('away', ''), cor_borda
-            )
+            self._desenhar_escudo_time(img, jogo.get('home', ''), jogo.get('escudo_home', ''), x_home, y_escudos, TAMANHO, TAMANHO_ESCUDO, cor_borda)
+            self._desenhar_escudo_time(img, jogo.get('away', ''), jogo.get('escudo_away', ''), x_away, y_escudos, TAMANHO, TAMANHO_ESCUDO, cor_borda)
 
             home_text = jogo.get('home', 'TIME CASA')[:18]
             away_text = jogo.get('away', 'TIME FORA')[:18]
@@ -4656,7 +4692,7 @@ class PosterGenerator:
         img_com_bordas = self._aplicar_bordas_arredondadas(img_rgb, raio=50)
         
         buffer = io.BytesIO()
-        img_com_bordas.save(buffer, format="PNG", optimize=True, quality=95)
+        img_com_bordas.save(buffer, format="PNG", quality=95)
         buffer.seek(0)
         
         return buffer
@@ -4776,23 +4812,8 @@ class PosterGenerator:
             home_crest_url = jogo.get('escudo_home', '')
             away_crest_url = jogo.get('escudo_away', '')
             
-            escudo_home_bytes = self.api_client.baixar_escudo_time(jogo.get('home', ''), home_crest_url)
-            escudo_away_bytes = self.api_client.baixar_escudo_time(jogo.get('away', ''), away_crest_url)
-            
-            escudo_home_img = Image.open(io.BytesIO(escudo_home_bytes)).convert("RGBA") if escudo_home_bytes else None
-            escudo_away_img = Image.open(io.BytesIO(escudo_away_bytes)).convert("RGBA") if escudo_away_bytes else None
-
-            self._desenhar_escudo_squircle(
-                img, escudo_home_img, x_home, y_escudos,
-                TAMANHO, TAMANHO_ESCUDO,
-                jogo.get('home', ''), cor_borda
-            )
-
-            self._desenhar_escudo_squircle(
-                img, escudo_away_img, x_away, y_escudos,
-                TAMANHO, TAMANHO_ESCUDO,
-                jogo.get('away', ''), cor_borda
-            )
+            self._desenhar_escudo_time(img, jogo.get('home', ''), home_crest_url, x_home, y_escudos, TAMANHO, TAMANHO_ESCUDO, cor_borda)
+            self._desenhar_escudo_time(img, jogo.get('away', ''), away_crest_url, x_away, y_escudos, TAMANHO, TAMANHO_ESCUDO, cor_borda)
 
             home_text = jogo.get('home', '')[:15]
             away_text = jogo.get('away', '')[:15]
@@ -4851,7 +4872,7 @@ class PosterGenerator:
         img_com_bordas = self._aplicar_bordas_arredondadas(img_rgb, raio=50)
         
         buffer = io.BytesIO()
-        img_com_bordas.save(buffer, format="PNG", optimize=True, quality=95)
+        img_com_bordas.save(buffer, format="PNG", quality=95)
         buffer.seek(0)
         
         return buffer
@@ -4922,25 +4943,8 @@ class PosterGenerator:
             
             escudo_x_pos = x0 + 5
 
-            escudo_home_bytes = self.api_client.baixar_escudo_time(jogo.get('home', ''), jogo.get('escudo_home', ''))
-            escudo_away_bytes = self.api_client.baixar_escudo_time(jogo.get('away', ''), jogo.get('escudo_away', ''))
-            escudo_home_img = None
-            escudo_away_img = None
-
-            if escudo_home_bytes:
-                try:
-                    escudo_home_img = Image.open(io.BytesIO(escudo_home_bytes)).convert("RGBA")
-                except Exception:
-                    escudo_home_img = None
-
-            if escudo_away_bytes:
-                try:
-                    escudo_away_img = Image.open(io.BytesIO(escudo_away_bytes)).convert("RGBA")
-                except Exception:
-                    escudo_away_img = None
-
-            self._desenhar_escudo_squircle(img, escudo_home_img, escudo_x_pos, y_escudo_home, TAMANHO, TAMANHO_ESCUDO, '', (0, 150, 0))
-            self._desenhar_escudo_squircle(img, escudo_away_img, escudo_x_pos, y_escudo_away, TAMANHO, TAMANHO_ESCUDO, '', (0, 150, 0))
+            self._desenhar_escudo_time(img, jogo.get('home', ''), jogo.get('escudo_home', ''), escudo_x_pos, y_escudo_home, TAMANHO, TAMANHO_ESCUDO, (0, 150, 0), nome_iniciais='')
+            self._desenhar_escudo_time(img, jogo.get('away', ''), jogo.get('escudo_away', ''), escudo_x_pos, y_escudo_away, TAMANHO, TAMANHO_ESCUDO, (0, 150, 0), nome_iniciais='')
 
             home_text = jogo.get('home', '')[:20]
             away_text = jogo.get('away', '')[:20]
@@ -5009,7 +5013,7 @@ class PosterGenerator:
         img_rgb.paste(img, (0, 0), img)
 
         buffer = io.BytesIO()
-        img_rgb.save(buffer, format="PNG", optimize=True, quality=95)
+        img_rgb.save(buffer, format="PNG", quality=95)
         buffer.seek(0)
         return buffer
 
@@ -5028,7 +5032,6 @@ class GerenciadorMultiplasIndividuais:
     
     def salvar_multipla(self, multipla: dict) -> str:
         """Salva uma múltipla individual para conferência"""
-        multiplas = self.carregar_multiplas()
         multipla_id = multipla.get("id", f"ind_{datetime.now().strftime('%Y%m%d_%H%M%S')}")
         
         if "data_criacao" not in multipla:
@@ -5041,60 +5044,52 @@ class GerenciadorMultiplasIndividuais:
             multipla["mercados_conferidos"] = []
         
         multipla["id"] = multipla_id
-        multiplas[multipla_id] = multipla
-        self._salvar_multiplas(multiplas)
+        DataStorage.registrar(self.MULTIPLAS_IND_PATH, multipla_id, multipla)
         return multipla_id
     
     def carregar_multiplas(self) -> dict:
         try:
-            if os.path.exists(self.MULTIPLAS_IND_PATH):
-                with open(self.MULTIPLAS_IND_PATH, "r", encoding='utf-8') as f:
-                    dados = json.load(f)
-                    return dados if isinstance(dados, dict) else {}
+            return DataStorage.carregar_colecao(self.MULTIPLAS_IND_PATH)
         except Exception as e:
             logging.error(f"Erro ao carregar múltiplas individuais: {e}")
         return {}
     
     def _salvar_multiplas(self, multiplas: dict):
         try:
-            with open(self.MULTIPLAS_IND_PATH, "w", encoding='utf-8') as f:
-                json.dump(multiplas, f, ensure_ascii=False, indent=2)
+            DataStorage.salvar_colecao(self.MULTIPLAS_IND_PATH, multiplas)
         except Exception as e:
             logging.error(f"Erro ao salvar múltiplas individuais: {e}")
     
     def carregar_resultados(self) -> dict:
         try:
-            if os.path.exists(self.RESULTADOS_IND_PATH):
-                with open(self.RESULTADOS_IND_PATH, "r", encoding='utf-8') as f:
-                    dados = json.load(f)
-                    return dados if isinstance(dados, dict) else {}
+            return DataStorage.carregar_colecao(self.RESULTADOS_IND_PATH)
         except Exception as e:
             logging.error(f"Erro ao carregar resultados individuais: {e}")
         return {}
     
     def _salvar_resultados(self, resultados: dict):
         try:
-            with open(self.RESULTADOS_IND_PATH, "w", encoding='utf-8') as f:
-                json.dump(resultados, f, ensure_ascii=False, indent=2)
+            DataStorage.salvar_colecao(self.RESULTADOS_IND_PATH, resultados)
         except Exception as e:
             logging.error(f"Erro ao salvar resultados individuais: {e}")
     
-    def conferir_multipla(self, multipla_id: str, api_client) -> dict:
-        """Confere os 3 mercados de uma múltipla individual"""
-        multiplas = self.carregar_multiplas()
+    def conferir_multipla(self, multipla_id: str, api_client, mapa_resultados: dict = None) -> dict:
+        """Confere os 3 mercados de uma múltipla individual (mapa_resultados: de obter_resultados_em_lote)"""
+        multipla = DataStorage.obter(self.MULTIPLAS_IND_PATH, multipla_id)
         
-        if multipla_id not in multiplas:
+        if multipla is None:
             return {"error": "Múltipla não encontrada"}
         
-        multipla = multiplas[multipla_id]
-        
         if multipla.get("conferida", False):
             return {"error": "Múltipla já conferida"}
         
         jogo = multipla.get("jogo", {})
         fixture_id = jogo.get("id")
         
-        match_data = api_client.obter_detalhes_jogo(fixture_id)
+        if mapa_resultados is not None:
+            match_data = mapa_resultados.get(str(fixture_id))
+        else:
+            match_data = api_client.obter_detalhes_jogo(fixture_id)
         if not match_data:
             return {"conferida": False, "motivo": "Não foi possível obter dados"}
         
@@ -5168,8 +5163,7 @@ class GerenciadorMultiplasIndividuais:
         multipla["ht_away_goals"] = half_time.get("away", 0)
         multipla["data_conferencia"] = datetime.now().isoformat()
         
-        resultados = self.carregar_resultados()
-        resultados[multipla_id] = {
+        resultado = {
             "id": multipla_id,
             "jogo": jogo,
             "resultados": resultados_mercados,
@@ -5178,10 +5172,10 @@ class GerenciadorMultiplasIndividuais:
             "away_goals": away_goals,
             "data_conferencia": datetime.now().isoformat()
         }
-        self._salvar_resultados(resultados)
-        
-        multiplas[multipla_id] = multipla
-        self._salvar_multiplas(multiplas)
+        DataStorage.registrar_em_lote({
+            self.RESULTADOS_IND_PATH: {multipla_id: resultado},
+            self.MULTIPLAS_IND_PATH: {multipla_id: multipla},
+        })
         
         return {
             "conferida": True,
@@ -5193,14 +5187,14 @@ class GerenciadorMultiplasIndividuais:
     
     def conferir_multiplas_pendentes(self, api_client) -> list:
         """Confere todas as múltiplas individuais pendentes"""
-        multiplas = self.carregar_multiplas()
+        multiplas = DataStorage.pendentes(self.MULTIPLAS_IND_PATH)
         resultados = []
         
+        pendentes = [{**m.get("jogo", {}), "data_busca": m.get("data_busca")} for m in multiplas.values()]
+        mapa_resultados = api_client.obter_resultados_em_lote(pendentes) if pendentes else {}
+        
         for multipla_id, multipla in multiplas.items():
-            if multipla.get("conferida", False):
-                continue
-            
-            resultado = self.conferir_multipla(multipla_id, api_client)
+            resultado = self.conferir_multipla(multipla_id, api_client, mapa_resultados)
             if resultado.get("conferida"):
                 resultados.append({
                     "multipla_id": multipla_id,
@@ -5268,25 +5262,9 @@ def gerar_poster_multipla_individual(jogo: dict, mercados: dict, titulo: str = "
     home_nome = jogo.get("home", "TIME CASA")
     away_nome = jogo.get("away", "TIME FORA")
     
-    escudo_home_img = None
-    escudo_away_img = None
-    
-    if api_client:
-        try:
-            escudo_home_bytes = api_client.baixar_escudo_time(home_nome, jogo.get("escudo_home", ""))
-            if escudo_home_bytes:
-                escudo_home_img = Image.open(io.BytesIO(escudo_home_bytes)).convert("RGBA")
-                escudo_home_img = escudo_home_img.resize((TAMANHO_ESCUDO, TAMANHO_ESCUDO), Image.Resampling.LANCZOS)
-        except:
-            pass
-        
-        try:
-            escudo_away_bytes = api_client.baixar_escudo_time(away_nome, jogo.get("escudo_away", ""))
-            if escudo_away_bytes:
-                escudo_away_img = Image.open(io.BytesIO(escudo_away_bytes)).convert("RGBA")
-                escudo_away_img = escudo_away_img.resize((TAMANHO_ESCUDO, TAMANHO_ESCUDO), Image.Resampling.LANCZOS)
-        except:
-            pass
+    # escudos já redimensionados do LRU de recursos_poster (sem api_client, None)
+    escudo_home_img = PosterGenerator.escudo_redimensionado(api_client, home_nome, jogo.get("escudo_home", ""), TAMANHO_ESCUDO)
+    escudo_away_img = PosterGenerator.escudo_redimensionado(api_client, away_nome, jogo.get("escudo_away", ""), TAMANHO_ESCUDO)
     
     def criar_escudo_fallback(nome, cor_fundo=(35, 40, 55)):
         img_esc = Image.new("RGBA", (TAMANHO_ESCUDO, TAMANHO_ESCUDO), cor_fundo + (255,))
@@ -5430,7 +5408,7 @@ def gerar_poster_multipla_individual(jogo: dict, mercados: dict, titulo: str = "
     img_rgb.paste(img, (0, 0), img)
     
     buffer = io.BytesIO()
-    img_rgb.save(buffer, format="PNG", optimize=True, quality=95)
+    img_rgb.save(buffer, format="PNG", quality=95)
     buffer.seek(0)
     
     return buffer
@@ -5551,25 +5529,9 @@ def gerar_poster_resultado_individual(multipla: dict, data_br: str, api_client=N
     x_away = x_home + TAMANHO_QUADRADO + ESPACO_ENTRE
     y_escudos = 300
     
-    escudo_home_img = None
-    escudo_away_img = None
-    
-    if api_client:
-        try:
-            escudo_home_bytes = api_client.baixar_escudo_time(home_nome, jogo.get("escudo_home", ""))
-            if escudo_home_bytes:
-                escudo_home_img = Image.open(io.BytesIO(escudo_home_bytes)).convert("RGBA")
-                escudo_home_img = escudo_home_img.resize((TAMANHO_ESCUDO, TAMANHO_ESCUDO), Image.Resampling.LANCZOS)
-        except:
-            pass
-        
-        try:
-            escudo_away_bytes = api_client.baixar_escudo_time(away_nome, jogo.get("escudo_away", ""))
-            if escudo_away_bytes:
-                escudo_away_img = Image.open(io.BytesIO(escudo_away_bytes)).convert("RGBA")
-                escudo_away_img = escudo_away_img.resize((TAMANHO_ESCUDO, TAMANHO_ESCUDO), Image.Resampling.LANCZOS)
-        except:
-            pass
+    # escudos já redimensionados do LRU de recursos_poster (sem api_client, None)
+    escudo_home_img = PosterGenerator.escudo_redimensionado(api_client, home_nome, jogo.get("escudo_home", ""), TAMANHO_ESCUDO)
+    escudo_away_img = PosterGenerator.escudo_redimensionado(api_client, away_nome, jogo.get("escudo_away", ""), TAMANHO_ESCUDO)
     
     def criar_escudo_fallback(nome, cor_fundo=(35, 40, 55)):
         img_esc = Image.new("RGBA", (TAMANHO_ESCUDO, TAMANHO_ESCUDO), cor_fundo + (255,))
@@ -5725,7 +5687,7 @@ def gerar_poster_resultado_individual(multipla: dict, data_br: str, api_client=N
     img_rgb.paste(img, (0, 0), img)
     
     buffer = io.BytesIO()
-    img_rgb.save(buffer, format="PNG", optimize=True, quality=95)
+    img_rgb.save(buffer, format="PNG", quality=95)
     buffer.seek(0)
     
     return buffer
@@ -6080,7 +6042,6 @@ class GerenciadorMultiplasPro:
     
     def salvar_multipla(self, multipla: dict):
         """Salva uma múltipla para conferência futura"""
-        multiplas = self.carregar_multiplas()
         multipla_id = multipla.get("id", f"multipla_{datetime.now().strftime('%Y%m%d_%H%M%S')}")
         
         if "data_criacao" not in multipla:
@@ -6097,21 +6058,16 @@ class GerenciadorMultiplasPro:
             multipla["resultado"] = None
         
         multipla["id"] = multipla_id
-        multiplas[multipla_id] = multipla
-        self._salvar_multiplas(multiplas)
+        DataStorage.registrar(self.MULTIPLAS_PRO_PATH, multipla_id, multipla)
         logging.info(f"✅ Múltipla salva: {multipla_id} - {multipla.get('tipo', 'N/A')}")
         return multipla_id
     
     def carregar_multiplas(self) -> dict:
         """Carrega todas as múltiplas salvas"""
         try:
-            if os.path.exists(self.MULTIPLAS_PRO_PATH):
-                with open(self.MULTIPLAS_PRO_PATH, "r", encoding='utf-8') as f:
-                    dados = json.load(f)
-                    logging.info(f"📂 Múltiplas Pro carregadas: {len(dados)} registros")
-                    return dados if isinstance(dados, dict) else {}
-            else:
-                logging.info(f"📂 Arquivo não existe: {self.MULTIPLAS_PRO_PATH}")
+            dados = DataStorage.carregar_colecao(self.MULTIPLAS_PRO_PATH)
+            logging.info(f"📂 Múltiplas Pro carregadas: {len(dados)} registros")
+            return dados
         except Exception as e:
             logging.error(f"Erro ao carregar múltiplas Pro: {e}")
         return {}
@@ -6119,18 +6075,14 @@ class GerenciadorMultiplasPro:
     def _salvar_multiplas(self, multiplas: dict):
         """Salva múltiplas"""
         try:
-            with open(self.MULTIPLAS_PRO_PATH, "w", encoding='utf-8') as f:
-                json.dump(multiplas, f, ensure_ascii=False, indent=2)
+            DataStorage.salvar_colecao(self.MULTIPLAS_PRO_PATH, multiplas)
         except Exception as e:
             logging.error(f"Erro ao salvar múltiplas Pro: {e}")
     
     def carregar_resultados(self) -> dict:
         """Carrega resultados das múltiplas"""
         try:
-            if os.path.exists(self.RESULTADOS_MULTIPLAS_PRO_PATH):
-                with open(self.RESULTADOS_MULTIPLAS_PRO_PATH, "r", encoding='utf-8') as f:
-                    dados = json.load(f)
-                    return dados if isinstance(dados, dict) else {}
+            return DataStorage.carregar_colecao(self.RESULTADOS_MULTIPLAS_PRO_PATH)
         except Exception as e:
             logging.error(f"Erro ao carregar resultados Pro: {e}")
         return {}
@@ -6138,20 +6090,17 @@ class GerenciadorMultiplasPro:
     def _salvar_resultados(self, resultados: dict):
         """Salva resultados"""
         try:
-            with open(self.RESULTADOS_MULTIPLAS_PRO_PATH, "w", encoding='utf-8') as f:
-                json.dump(resultados, f, ensure_ascii=False, indent=2)
+            DataStorage.salvar_colecao(self.RESULTADOS_MULTIPLAS_PRO_PATH, resultados)
         except Exception as e:
             logging.error(f"Erro ao salvar resultados Pro: {e}")
     
-    def conferir_multipla(self, multipla_id: str, api_client) -> dict:
-        """Confere o resultado de uma múltipla"""
-        multiplas = self.carregar_multiplas()
+    def conferir_multipla(self, multipla_id: str, api_client, mapa_resultados: dict = None) -> dict:
+        """Confere o resultado de uma múltipla (mapa_resultados: de obter_resultados_em_lote)"""
+        multipla = DataStorage.obter(self.MULTIPLAS_PRO_PATH, multipla_id)
         
-        if multipla_id not in multiplas:
+        if multipla is None:
             return {"error": "Múltipla não encontrada"}
         
-        multipla = multiplas[multipla_id]
-        
         if multipla.get("conferida", False):
             return {"error": "Múltipla já conferida", "resultado": multipla.get("resultado")}
         
@@ -6160,10 +6109,13 @@ class GerenciadorMultiplasPro:
         resultados_jogos = []
         jogos_conferidos = []
         
+        if mapa_resultados is None:
+            mapa_resultados = api_client.obter_resultados_em_lote(jogos)
+        
         for jogo in jogos:
             fixture_id = jogo.get("id")
             
-            match_data = api_client.obter_detalhes_jogo(fixture_id)
+            match_data = mapa_resultados.get(str(fixture_id))
             if not match_data:
                 todos_finalizados = False
                 continue
@@ -6221,8 +6173,7 @@ class GerenciadorMultiplasPro:
             multipla["data_conferencia"] = datetime.now().isoformat()
             multipla["resultado"] = "GREEN" if multipla_acertada else "RED"
             
-            resultados = self.carregar_resultados()
-            resultados[multipla_id] = {
+            resultado = {
                 "id": multipla_id,
                 "tipo": multipla.get("tipo"),
                 "odd_total": multipla.get("odd_total"),
@@ -6231,10 +6182,10 @@ class GerenciadorMultiplasPro:
                 "jogos": jogos_conferidos,
                 "data_conferencia": datetime.now().isoformat()
             }
-            self._salvar_resultados(resultados)
-            
-            multiplas[multipla_id] = multipla
-            self._salvar_multiplas(multiplas)
+            DataStorage.registrar_em_lote({
+                self.RESULTADOS_MULTIPLAS_PRO_PATH: {multipla_id: resultado},
+                self.MULTIPLAS_PRO_PATH: {multipla_id: multipla},
+            })
             
             return {
                 "conferida": True,
@@ -6252,22 +6203,26 @@ class GerenciadorMultiplasPro:
     
     def conferir_todas_multiplas_pendentes(self, api_client, data_limite: datetime = None) -> list:
         """Confere todas as múltiplas pendentes"""
-        multiplas = self.carregar_multiplas()
+        multiplas = DataStorage.pendentes(self.MULTIPLAS_PRO_PATH)
         resultados = []
         
-        logging.info(f"🔍 Verificando {len(multiplas)} múltiplas para conferência")
+        logging.info(f"🔍 Verificando {len(multiplas)} múltiplas pendentes para conferência")
         
+        a_conferir = []
         for multipla_id, multipla in multiplas.items():
-            if multipla.get("conferida", False):
-                continue
-            
             if data_limite:
                 data_criacao = datetime.fromisoformat(multipla.get("data_criacao", ""))
                 if data_criacao > data_limite:
                     continue
-            
+            a_conferir.append(multipla_id)
+        
+        pendentes = [jogo for multipla_id in a_conferir for jogo in multiplas[multipla_id].get("jogos", [])]
+        mapa_resultados = api_client.obter_resultados_em_lote(pendentes) if pendentes else {}
+        
+        for multipla_id in a_conferir:
+            multipla = multiplas[multipla_id]
             logging.info(f"📋 Conferindo múltipla: {multipla_id} - {multipla.get('tipo', 'N/A')}")
-            resultado = self.conferir_multipla(multipla_id, api_client)
+            resultado = self.conferir_multipla(multipla_id, api_client, mapa_resultados)
             if resultado.get("conferida"):
                 resultados.append({
                     "multipla_id": multipla_id,
@@ -6293,15 +6248,7 @@ class ResultadosTopAlertas:
         data_br = data_selecionada.strftime("%d/%m/%Y")
         st.subheader(f"🏆 Conferindo Resultados TOP Alertas - {data_br}")
         
-        alertas_top = DataStorage.carregar_alertas_top()
-        if not alertas_top:
-            st.warning("⚠️ Nenhum alerta TOP salvo para conferência")
-            return
-        
-        alertas_hoje = {}
-        for chave, alerta in alertas_top.items():
-            if alerta.get("data_busca") == hoje and not alerta.get("conferido", False):
-                alertas_hoje[chave] = alerta
+        alertas_hoje = DataStorage.pendentes(ConfigManager.ALERTAS_TOP_PATH, data=hoje)
         
         if not alertas_hoje:
             st.info(f"ℹ️ Nenhum alerta TOP pendente para {data_br}")
@@ -6318,13 +6265,14 @@ class ResultadosTopAlertas:
         progress_bar = st.progress(0)
         total_alertas = len(alertas_hoje)
         idx = 0
+        mapa_resultados = self.api_client.obter_resultados_em_lote(alertas_hoje.values())
         
         for tipo_alerta, alertas_lista in alertas_por_tipo.items():
             jogos_conferidos = []
             for alerta in alertas_lista:
                 fixture_id = alerta.get("id")
                 
-                match_data = self.api_client.obter_detalhes_jogo(fixture_id)
+                match_data = mapa_resultados.get(str(fixture_id))
                 if not match_data:
                     st.warning(f"⚠️ Não foi possível obter dados do jogo {fixture_id}")
                     continue
@@ -6361,7 +6309,8 @@ class ResultadosTopAlertas:
                 jogos_conferidos_por_tipo[tipo_alerta] = jogos_conferidos
         
         if jogos_conferidos_por_tipo:
-            self._salvar_alertas_top_atualizados(alertas_top)
+            self._salvar_alertas_top_atualizados(
+                {chave: alerta for chave, alerta in alertas_hoje.items() if alerta.get("conferido")})
             st.success(f"✅ {sum(len(j) for j in jogos_conferidos_por_tipo.values())} jogos conferidos!")
             
             for tipo_alerta, jogos in jogos_conferidos_por_tipo.items():
@@ -6373,7 +6322,7 @@ class ResultadosTopAlertas:
     
     def _salvar_alertas_top_atualizados(self, alertas_top):
         try:
-            DataStorage.salvar_alertas_top(alertas_top)
+            DataStorage.registrar_varios(ConfigManager.ALERTAS_TOP_PATH, alertas_top)
             logging.info(f"✅ Alertas TOP salvos com sucesso")
         except Exception as e:
             logging.error(f"❌ Erro ao salvar alertas TOP: {e}")
@@ -6722,10 +6671,8 @@ class GerenciadorAlertasCompletos:
         self.RESULTADOS_MULTIPLAS_PATH = ConfigManager.RESULTADOS_MULTIPLAS_PATH
     
     def salvar_alerta_completo(self, alerta: AlertaCompleto):
-        alertas = self.carregar_alertas()
         chave = f"{alerta.jogo.id}_{alerta.data_busca}"
-        alertas[chave] = alerta.to_dict()
-        self._salvar_alertas(alertas)
+        DataStorage.registrar(self.ALERTAS_COMPLETOS_PATH, chave, alerta.to_dict())
     
     def carregar_alertas(self) -> dict:
         return DataStorage.carregar_alertas_completos()
@@ -6887,7 +6834,7 @@ class GerenciadorAlertasCompletos:
     
     def _classificar_e_gerar_alertas_top(self, jogos: list, data_busca: str, tipos_analise_selecionados: dict) -> list:
         jogos_classificados = []
-        alertas_top = DataStorage.carregar_alertas_top()
+        alertas_top = {}
         
         for jogo_dict in jogos:
             liga = jogo_dict.get("liga", "")
@@ -6983,7 +6930,7 @@ class GerenciadorAlertasCompletos:
             fixture_id = str(jogo_dict.get("id"))
             chave_alerta = f"{fixture_id}_{data_busca}"
             
-            if chave_alerta not in alertas_top:
+            if chave_alerta not in alertas_top and not DataStorage.contem(ConfigManager.ALERTAS_TOP_PATH, chave_alerta):
                 alerta_top = {
                     "id": fixture_id,
                     "home": jogo_dict.get("home", ""),
@@ -7012,7 +6959,7 @@ class GerenciadorAlertasCompletos:
             
             jogos_classificados.append(jogo_dict)
         
-        DataStorage.salvar_alertas_top(alertas_top)
+        DataStorage.registrar_varios(ConfigManager.ALERTAS_TOP_PATH, alertas_top)
         
         return jogos_classificados
     
@@ -7056,25 +7003,20 @@ class GerenciadorAlertasCompletos:
         data_br = data_selecionada.strftime("%d/%m/%Y")
         st.subheader(f"🏆 Conferindo Resultados Completos - {data_br}")
 
-        alertas = self.carregar_alertas()
-        if alertas:
-            alertas_hoje = {k: v for k, v in alertas.items() if v.get("data_busca") == hoje and not v.get("conferido", False)}
-            
-            if alertas_hoje:
-                st.info(f"🔍 Encontrados {len(alertas_hoje)} alertas pendentes")
-                self._conferir_alertas_individuais(alertas_hoje, hoje)
-            else:
-                st.info(f"ℹ️ Nenhum alerta individual pendente para {data_br}")
+        alertas_hoje = DataStorage.pendentes(self.ALERTAS_COMPLETOS_PATH, data=hoje)
+        if alertas_hoje:
+            st.info(f"🔍 Encontrados {len(alertas_hoje)} alertas pendentes")
+            self._conferir_alertas_individuais(alertas_hoje, hoje)
+        else:
+            st.info(f"ℹ️ Nenhum alerta individual pendente para {data_br}")
         
-        multiplas = self.carregar_multiplas()
-        if multiplas:
-            multiplas_hoje = {k: v for k, v in multiplas.items() if v.get("data_criacao", "").startswith(hoje) and not v.get("enviada", False)}
-            
-            if multiplas_hoje:
-                st.info(f"🔍 Conferindo {len(multiplas_hoje)} múltiplas pendentes...")
-                self._conferir_multiplas(multiplas_hoje, hoje)
-            else:
-                st.info(f"ℹ️ Nenhuma múltipla pendente para {data_br}")
+        # Nas múltiplas do sistema autônomo a pendência é "enviada" (o armazém usa como conferido)
+        multiplas_hoje = DataStorage.pendentes(self.MULTIPLAS_PATH, data=hoje)
+        if multiplas_hoje:
+            st.info(f"🔍 Conferindo {len(multiplas_hoje)} múltiplas pendentes...")
+            self._conferir_multiplas(multiplas_hoje, hoje)
+        else:
+            st.info(f"ℹ️ Nenhuma múltipla pendente para {data_br}")
         
         self._mostrar_resumo_completos()
     
@@ -7083,11 +7025,12 @@ class GerenciadorAlertasCompletos:
         progress_bar = st.progress(0)
         total = len(alertas)
         idx = 0
+        mapa_resultados = self.api_client.obter_resultados_em_lote(alertas.values())
         
         for chave, alerta in alertas.items():
             fixture_id = alerta.get("id")
             
-            match_data = self.api_client.obter_detalhes_jogo(fixture_id)
+            match_data = mapa_resultados.get(str(fixture_id))
             if not match_data:
                 st.warning(f"⚠️ Não foi possível obter dados do jogo {alerta.get('home')} vs {alerta.get('away')}")
                 continue
@@ -7175,7 +7118,7 @@ class GerenciadorAlertasCompletos:
             idx += 1
             progress_bar.progress(idx / total)
         
-        self._salvar_alertas(alertas)
+        DataStorage.registrar_varios(self.ALERTAS_COMPLETOS_PATH, alertas)
         
         if jogos_conferidos:
             st.success(f"✅ {len(jogos_conferidos)} jogos conferidos!")
@@ -7197,6 +7140,8 @@ class GerenciadorAlertasCompletos:
     
     def _conferir_multiplas(self, multiplas, hoje):
         multiplas_para_enviar = []
+        mapa_resultados = self.api_client.obter_resultados_em_lote(
+            [jogo for multipla in multiplas.values() for jogo in multipla["jogos"]])
         
         for multipla_id, multipla in multiplas.items():
             st.write(f"📋 Conferindo múltipla: {multipla['modelo']} (Odds: {multipla['odd_total']:.2f})")
@@ -7208,7 +7153,7 @@ class GerenciadorAlertasCompletos:
             for jogo in multipla["jogos"]:
                 fixture_id = jogo.get("id")
                 
-                match_data = self.api_client.obter_detalhes_jogo(fixture_id)
+                match_data = mapa_resultados.get(str(fixture_id))
                 if not match_data:
                     st.warning(f"⚠️ Não foi possível obter dados do jogo {jogo.get('home')} vs {jogo.get('away')}")
                     todos_finalizados = False
@@ -7272,14 +7217,13 @@ class GerenciadorAlertasCompletos:
                 multipla["data_conferencia"] = datetime.now().isoformat()
                 multiplas_para_enviar.append(multipla)
         
-        multiplas_atualizadas = self.carregar_multiplas()
+        multiplas_atualizadas = {}
         for multipla in multiplas_para_enviar:
-            multipla_id = multipla["id"]
-            multiplas_atualizadas[multipla_id] = multipla
-            multiplas_atualizadas[multipla_id]["enviada"] = True
+            multipla["enviada"] = True
+            multiplas_atualizadas[multipla["id"]] = multipla
             self._enviar_resultado_multipla_v2(multipla)
         
-        self._salvar_multiplas(multiplas_atualizadas)
+        DataStorage.registrar_varios(self.MULTIPLAS_PATH, multiplas_atualizadas)
         
         if multiplas_para_enviar:
             st.success(f"✅ {len(multiplas_para_enviar)} múltiplas finalizadas e enviadas!")
@@ -7476,14 +7420,8 @@ class GerenciadorAlertasCompletos:
             x_away = x_home + TAMANHO_QUADRADO + ESPACO_ENTRE_ESCUDOS
             y_escudos = y0 + 130
 
-            escudo_home_bytes = self.api_client.baixar_escudo_time(jogo['home'], jogo.get('escudo_home', ''))
-            escudo_away_bytes = self.api_client.baixar_escudo_time(jogo['away'], jogo.get('escudo_away', ''))
-            
-            escudo_home_img = Image.open(io.BytesIO(escudo_home_bytes)).convert("RGBA") if escudo_home_bytes else None
-            escudo_away_img = Image.open(io.BytesIO(escudo_away_bytes)).convert("RGBA") if escudo_away_bytes else None
-
-            self.poster_generator._desenhar_escudo_quadrado(draw, img, escudo_home_img, x_home, y_escudos, TAMANHO_QUADRADO, TAMANHO_ESCUDO, jogo['home'])
-            self.poster_generator._desenhar_escudo_quadrado(draw, img, escudo_away_img, x_away, y_escudos, TAMANHO_QUADRADO, TAMANHO_ESCUDO, jogo['away'])
+            self.poster_generator._desenhar_escudo_quadrado_time(draw, img, jogo['home'], jogo.get('escudo_home', ''), x_home, y_escudos, TAMANHO_QUADRADO, TAMANHO_ESCUDO)
+            self.poster_generator._desenhar_escudo_quadrado_time(draw, img, jogo['away'], jogo.get('escudo_away', ''), x_away, y_escudos, TAMANHO_QUADRADO, TAMANHO_ESCUDO)
 
             resultado_text = f"{home_goals} - {away_goals}"
             try:
@@ -7532,7 +7470,7 @@ class GerenciadorAlertasCompletos:
             draw.text((LARGURA//2 - 300, altura_total - 70), rodape_text, font=FONTE_DETALHES, fill=(100, 130, 160))
 
         buffer = io.BytesIO()
-        img.save(buffer, format="PNG", optimize=True, quality=95)
+        img.save(buffer, format="PNG", quality=95)
         buffer.seek(0)
         
         return buffer
@@ -7583,141 +7521,129 @@ class SistemaAlertasFutebol:
         progress_bar = st.progress(0)
         total_ligas = len(ligas_busca)
 
-        classificacoes = {}
-        for liga_id in ligas_busca:
-            classificacoes[liga_id] = self.api_client.obter_classificacao(liga_id)
-        
-        for i, liga_id in enumerate(ligas_busca):
-            classificacao = classificacoes[liga_id]
+        ligas_concluidas = 0
+        for liga_id, classificacao, jogos_data in self.api_client.obter_ligas_concorrente(ligas_busca, hoje):
             analisador = AnalisadorTendencia(classificacao)
-            
-            if liga_id == "BSA":
-                jogos_data = self.api_client.obter_jogos_brasileirao(liga_id, hoje)
-                st.write(f"📊 Liga BSA: {len(jogos_data)} jogos encontrados")
-            else:
-                jogos_data = self.api_client.obter_jogos(liga_id, hoje)
-                st.write(f"📊 Liga {liga_id}: {len(jogos_data)} jogos encontrados")
+            st.write(f"📊 Liga {liga_id}: {len(jogos_data)} jogos encontrados")
 
-            batch_size = 5
-            for j in range(0, len(jogos_data), batch_size):
-                batch = jogos_data[j:j+batch_size]
+            for match_data in jogos_data:
+                if not self.api_client.validar_dados_jogo(match_data):
+                    continue
                 
-                for match_data in batch:
-                    if not self.api_client.validar_dados_jogo(match_data):
-                        continue
-                    
-                    jogo = Jogo(match_data)
-                    if not jogo.validar_dados():
-                        continue
-                    
-                    analise = analisador.calcular_tendencia_completa(jogo.home_team, jogo.away_team)
-                    
-                    if classificacao:
-                        vitoria_analise = AnalisadorEstatistico.calcular_probabilidade_vitoria(
-                            jogo.home_team, jogo.away_team, classificacao
-                        )
-                        analise["detalhes"]["vitoria"] = vitoria_analise
-                        
-                        ht_analise = AnalisadorEstatistico.calcular_probabilidade_gols_ht(
-                            jogo.home_team, jogo.away_team, classificacao
-                        )
-                        analise["detalhes"]["gols_ht"] = ht_analise
-                        
-                        ambas_marcam_analise = AnalisadorEstatistico.calcular_probabilidade_ambas_marcam(
-                            jogo.home_team, jogo.away_team, classificacao
-                        )
-                        analise["detalhes"]["ambas_marcam"] = ambas_marcam_analise
-                    
-                    jogo.set_analise(analise)
+                jogo = Jogo(match_data)
+                if not jogo.validar_dados():
+                    continue
+                
+                analise = analisador.calcular_tendencia_completa(jogo.home_team, jogo.away_team)
+                
+                if classificacao:
+                    vitoria_analise = AnalisadorEstatistico.calcular_probabilidade_vitoria(
+                        jogo.home_team, jogo.away_team, classificacao
+                    )
+                    analise["detalhes"]["vitoria"] = vitoria_analise
                     
-                    data_br, hora_br = jogo.get_data_hora_brasilia()
-                    tipo_emoji = "📈" if analise["tipo_aposta"] == "over" else "📉"
+                    ht_analise = AnalisadorEstatistico.calcular_probabilidade_gols_ht(
+                        jogo.home_team, jogo.away_team, classificacao
+                    )
+                    analise["detalhes"]["gols_ht"] = ht_analise
                     
-                    st.write(f"   {tipo_emoji} {jogo.home_team} vs {jogo.away_team}")
-                    st.write(f"      🕒 {data_br} {hora_br} | {analise['tendencia']}")
-                    st.write(f"      ⚽ Estimativa: {analise['estimativa']:.2f} | 🎯 Prob: {analise['probabilidade']:.0f}% | 🔍 Conf: {analise['confianca']:.0f}%")
+                    ambas_marcam_analise = AnalisadorEstatistico.calcular_probabilidade_ambas_marcam(
+                        jogo.home_team, jogo.away_team, classificacao
+                    )
+                    analise["detalhes"]["ambas_marcam"] = ambas_marcam_analise
+                
+                jogo.set_analise(analise)
+                
+                data_br, hora_br = jogo.get_data_hora_brasilia()
+                tipo_emoji = "📈" if analise["tipo_aposta"] == "over" else "📉"
+                
+                st.write(f"   {tipo_emoji} {jogo.home_team} vs {jogo.away_team}")
+                st.write(f"      🕒 {data_br} {hora_br} | {analise['tendencia']}")
+                st.write(f"      ⚽ Estimativa: {analise['estimativa']:.2f} | 🎯 Prob: {analise['probabilidade']:.0f}% | 🔍 Conf: {analise['confianca']:.0f}%")
+                
+                if 'vitoria' in analise['detalhes']:
+                    v = analise['detalhes']['vitoria']
+                    st.write(f"      🏆 Favorito: {jogo.home_team if v['favorito']=='home' else jogo.away_team if v['favorito']=='away' else 'EMPATE'} ({v['confianca_vitoria']:.1f}%)")
+                
+                if 'gols_ht' in analise['detalhes']:
+                    ht = analise['detalhes']['gols_ht']
+                    st.write(f"      ⏰ HT: {ht['tendencia_ht']} ({ht['confianca_ht']:.1f}%)")
+                
+                if 'ambas_marcam' in analise['detalhes']:
+                    am = analise['detalhes']['ambas_marcam']
+                    st.write(f"      🤝 Ambas Marcam: {am['tendencia_ambas_marcam']} ({am['confianca_ambas_marcam']:.1f}%)")
+                
+                st.write(f"      Status: {jogo.status}")
+                
+                if tipo_analise == "Over/Under de Gols":
+                    if min_conf <= analise["confianca"] <= max_conf:
+                        if tipo_filtro == "Todos" or \
+                           (tipo_filtro == "Apenas Over" and analise["tipo_aposta"] == "over") or \
+                           (tipo_filtro == "Apenas Under" and analise["tipo_aposta"] == "under"):
+                            self._verificar_enviar_alerta(jogo, match_data, analise, alerta_individual, 
+                                                         min_conf, max_conf, "over_under")
+                
+                elif tipo_analise == "Favorito (Vitória)":
+                    min_conf_vitoria = config_analise.get("min_conf_vitoria", 65)
+                    filtro_favorito = config_analise.get("filtro_favorito", "Todos")
                     
                     if 'vitoria' in analise['detalhes']:
                         v = analise['detalhes']['vitoria']
-                        st.write(f"      🏆 Favorito: {jogo.home_team if v['favorito']=='home' else jogo.away_team if v['favorito']=='away' else 'EMPATE'} ({v['confianca_vitoria']:.1f}%)")
+                        
+                        if v['confianca_vitoria'] >= min_conf_vitoria:
+                            send_alert = False
+                            if filtro_favorito == "Todos":
+                                send_alert = True
+                            elif filtro_favorito == "Casa" and v['favorito'] == "home":
+                                send_alert = True
+                            elif filtro_favorito == "Fora" and v['favorito'] == "away":
+                                send_alert = True
+                            elif filtro_favorito == "Empate" and v['favorito'] == "draw":
+                                send_alert = True
+                            
+                            if send_alert:
+                                self._verificar_enviar_alerta(jogo, match_data, analise, alerta_individual, 
+                                                             min_conf_vitoria, 100, "favorito")
+                
+                elif tipo_analise == "Gols HT (Primeiro Tempo)":
+                    min_conf_ht = config_analise.get("min_conf_ht", 60)
+                    tipo_ht = config_analise.get("tipo_ht", "OVER 0.5 HT")
                     
                     if 'gols_ht' in analise['detalhes']:
                         ht = analise['detalhes']['gols_ht']
-                        st.write(f"      ⏰ HT: {ht['tendencia_ht']} ({ht['confianca_ht']:.1f}%)")
+                        
+                        if ht['confianca_ht'] >= min_conf_ht and ht['tendencia_ht'] == tipo_ht:
+                            self._verificar_enviar_alerta(jogo, match_data, analise, alerta_individual, 
+                                                         min_conf_ht, 100, "gols_ht")
+                
+                elif tipo_analise == "Ambas Marcam (BTTS)":
+                    min_conf_am = config_analise.get("min_conf_am", 60)
+                    filtro_am = config_analise.get("filtro_am", "Todos")
                     
                     if 'ambas_marcam' in analise['detalhes']:
                         am = analise['detalhes']['ambas_marcam']
-                        st.write(f"      🤝 Ambas Marcam: {am['tendencia_ambas_marcam']} ({am['confianca_ambas_marcam']:.1f}%)")
-                    
-                    st.write(f"      Status: {jogo.status}")
-                    
-                    if tipo_analise == "Over/Under de Gols":
-                        if min_conf <= analise["confianca"] <= max_conf:
-                            if tipo_filtro == "Todos" or \
-                               (tipo_filtro == "Apenas Over" and analise["tipo_aposta"] == "over") or \
-                               (tipo_filtro == "Apenas Under" and analise["tipo_aposta"] == "under"):
-                                self._verificar_enviar_alerta(jogo, match_data, analise, alerta_individual, 
-                                                             min_conf, max_conf, "over_under")
-                    
-                    elif tipo_analise == "Favorito (Vitória)":
-                        min_conf_vitoria = config_analise.get("min_conf_vitoria", 65)
-                        filtro_favorito = config_analise.get("filtro_favorito", "Todos")
-                        
-                        if 'vitoria' in analise['detalhes']:
-                            v = analise['detalhes']['vitoria']
-                            
-                            if v['confianca_vitoria'] >= min_conf_vitoria:
-                                send_alert = False
-                                if filtro_favorito == "Todos":
-                                    send_alert = True
-                                elif filtro_favorito == "Casa" and v['favorito'] == "home":
-                                    send_alert = True
-                                elif filtro_favorito == "Fora" and v['favorito'] == "away":
-                                    send_alert = True
-                                elif filtro_favorito == "Empate" and v['favorito'] == "draw":
-                                    send_alert = True
-                                
-                                if send_alert:
-                                    self._verificar_enviar_alerta(jogo, match_data, analise, alerta_individual, 
-                                                                 min_conf_vitoria, 100, "favorito")
-                    
-                    elif tipo_analise == "Gols HT (Primeiro Tempo)":
-                        min_conf_ht = config_analise.get("min_conf_ht", 60)
-                        tipo_ht = config_analise.get("tipo_ht", "OVER 0.5 HT")
                         
-                        if 'gols_ht' in analise['detalhes']:
-                            ht = analise['detalhes']['gols_ht']
+                        if am['confianca_ambas_marcam'] >= min_conf_am:
+                            send_alert = False
+                            if filtro_am == "Todos":
+                                send_alert = True
+                            elif filtro_am == "SIM" and am['tendencia_ambas_marcam'] == "SIM":
+                                send_alert = True
+                            elif filtro_am == "NÃO" and am['tendencia_ambas_marcam'] == "NÃO":
+                                send_alert = True
                             
-                            if ht['confianca_ht'] >= min_conf_ht and ht['tendencia_ht'] == tipo_ht:
+                            if send_alert:
                                 self._verificar_enviar_alerta(jogo, match_data, analise, alerta_individual, 
-                                                             min_conf_ht, 100, "gols_ht")
-                    
-                    elif tipo_analise == "Ambas Marcam (BTTS)":
-                        min_conf_am = config_analise.get("min_conf_am", 60)
-                        filtro_am = config_analise.get("filtro_am", "Todos")
-                        
-                        if 'ambas_marcam' in analise['detalhes']:
-                            am = analise['detalhes']['ambas_marcam']
-                            
-                            if am['confianca_ambas_marcam'] >= min_conf_am:
-                                send_alert = False
-                                if filtro_am == "Todos":
-                                    send_alert = True
-                                elif filtro_am == "SIM" and am['tendencia_ambas_marcam'] == "SIM":
-                                    send_alert = True
-                                elif filtro_am == "NÃO" and am['tendencia_ambas_marcam'] == "NÃO":
-                                    send_alert = True
-                                
-                                if send_alert:
-                                    self._verificar_enviar_alerta(jogo, match_data, analise, alerta_individual, 
-                                                                 min_conf_am, 100, "ambas_marcam")
-
-                    top_jogos.append(jogo.to_dict())
-                
-                if j + batch_size < len(jogos_data):
-                    time.sleep(0.5)
-            
-            progress_bar.progress((i + 1) / total_ligas)
+                                                             min_conf_am, 100, "ambas_marcam")
+
+                top_jogos.append(jogo.to_dict())
+
+            ligas_concluidas += 1
+            progress_bar.progress(ligas_concluidas / total_ligas)
+        
+        # falhas das buscas em paralelo só podem ir para a tela daqui, da thread do script
+        for mensagem in self.api_client.consumir_falhas():
+            st.error(mensagem)
         
         jogos_filtrados = self._filtrar_por_tipo_analise(top_jogos, tipo_analise, config_analise)
         
@@ -7832,12 +7758,25 @@ class SistemaAlertasFutebol:
         data_br = data_selecionada.strftime("%d/%m/%Y")
         st.subheader(f"📊 Conferindo Resultados para {data_br}")
         
-        resultados_totais = {
-            "over_under": self._conferir_resultados_tipo("over_under", hoje),
-            "favorito": self._conferir_resultados_tipo("favorito", hoje),
-            "gols_ht": self._conferir_resultados_tipo("gols_ht", hoje),
-            "ambas_marcam": self._conferir_resultados_tipo("ambas_marcam", hoje)
-        }
+        # Um único mapa de resultados para os quatro tipos de alerta
+        pendentes = [
+            {**alerta, "id": fixture_id}
+            for tipo_alerta in DataStorage.ARQUIVOS_ALERTAS
+            for fixture_id, alerta in DataStorage.alertas_pendentes(tipo_alerta).items()
+        ]
+        mapa_resultados = self.api_client.obter_resultados_em_lote(pendentes) if pendentes else {}
+        
+        try:
+            resultados_totais = {
+                "over_under": self._conferir_resultados_tipo("over_under", hoje, mapa_resultados),
+                "favorito": self._conferir_resultados_tipo("favorito", hoje, mapa_resultados),
+                "gols_ht": self._conferir_resultados_tipo("gols_ht", hoje, mapa_resultados),
+                "ambas_marcam": self._conferir_resultados_tipo("ambas_marcam", hoje, mapa_resultados)
+            }
+        finally:
+            # Uma gravação da performance do modelo para a rodada inteira; mesmo se um tipo falhar,
+            # os já conferidos (gravados no armazém) não podem ficar só com o delta na memória
+            self.analisador_performance.descarregar()
         
         st.markdown("---")
         st.subheader("📈 RESUMO DE RESULTADOS")
@@ -7888,22 +7827,14 @@ class SistemaAlertasFutebol:
             st.info("🚨 Enviando alertas de resultados automaticamente...")
             self._enviar_alertas_resultados_automaticos(resultados_totais, data_selecionada)
     
-    def _conferir_resultados_tipo(self, tipo_alerta: str, data_busca: str) -> dict:
-        if tipo_alerta == "over_under":
-            alertas = DataStorage.carregar_alertas()
-            resultados = DataStorage.carregar_resultados()
-        elif tipo_alerta == "favorito":
-            alertas = DataStorage.carregar_alertas_favoritos()
-            resultados = DataStorage.carregar_resultados_favoritos()
-        elif tipo_alerta == "gols_ht":
-            alertas = DataStorage.carregar_alertas_gols_ht()
-            resultados = DataStorage.carregar_resultados_gols_ht()
-        elif tipo_alerta == "ambas_marcam":
-            alertas = DataStorage.carregar_alertas_ambas_marcam()
-            resultados = DataStorage.carregar_resultados_ambas_marcam()
-        else:
+    def _conferir_resultados_tipo(self, tipo_alerta: str, data_busca: str, mapa_resultados: dict = None) -> dict:
+        if tipo_alerta not in DataStorage.ARQUIVOS_ALERTAS:
             return {}
         
+        # Só os não conferidos saem do armazém; no fim gravam-se apenas os conferidos agora
+        alertas = DataStorage.alertas_pendentes(tipo_alerta)
+        resultados = {}
+        
         jogos_com_resultados = {}
         progress_bar = st.progress(0)
         total_alertas = len(alertas)
@@ -7914,11 +7845,12 @@ class SistemaAlertasFutebol:
         
         st.write(f"🔍 Conferindo {total_alertas} alertas do tipo {tipo_alerta}...")
         
+        if mapa_resultados is None:
+            mapa_resultados = self.api_client.obter_resultados_em_lote(
+                [{**alerta, "id": fixture_id} for fixture_id, alerta in alertas.items()])
+        
         for idx, (fixture_id, alerta) in enumerate(alertas.items()):
-            if alerta.get("conferido", False):
-                continue
-            
-            match_data = self.api_client.obter_detalhes_jogo(fixture_id)
+            match_data = mapa_resultados.get(str(fixture_id))
             if not match_data:
                 continue
             
@@ -8052,18 +7984,8 @@ class SistemaAlertasFutebol:
             
             progress_bar.progress((idx + 1) / total_alertas)
         
-        if tipo_alerta == "over_under":
-            DataStorage.salvar_alertas(alertas)
-            DataStorage.salvar_resultados(resultados)
-        elif tipo_alerta == "favorito":
-            DataStorage.salvar_alertas_favoritos(alertas)
-            DataStorage.salvar_resultados_favoritos(resultados)
-        elif tipo_alerta == "gols_ht":
-            DataStorage.salvar_alertas_gols_ht(alertas)
-            DataStorage.salvar_resultados_gols_ht(resultados)
-        elif tipo_alerta == "ambas_marcam":
-            DataStorage.salvar_alertas_ambas_marcam(alertas)
-            DataStorage.salvar_resultados_ambas_marcam(resultados)
+        DataStorage.registrar_conferencias(
+            tipo_alerta, {fixture_id: alertas[fixture_id] for fixture_id in resultados}, resultados)
         
         return jogos_com_resultados
     
@@ -8158,20 +8080,10 @@ class SistemaAlertasFutebol:
                 st.success(f"📊 Resumo final {tipo_alerta} enviado!")
     
     def _verificar_enviar_alerta(self, jogo: Jogo, match_data: dict, analise: dict, alerta_individual: bool, min_conf: int, max_conf: int, tipo_alerta: str):
-        if tipo_alerta == "over_under":
-            alertas = DataStorage.carregar_alertas()
-        elif tipo_alerta == "favorito":
-            alertas = DataStorage.carregar_alertas_favoritos()
-        elif tipo_alerta == "gols_ht":
-            alertas = DataStorage.carregar_alertas_gols_ht()
-        elif tipo_alerta == "ambas_marcam":
-            alertas = DataStorage.carregar_alertas_ambas_marcam()
-        else:
-            alertas = {}
-        
         fixture_id = str(jogo.id)
+        conhecido = tipo_alerta in DataStorage.ARQUIVOS_ALERTAS
         
-        if fixture_id not in alertas:
+        if not (conhecido and DataStorage.alerta_registrado(tipo_alerta, fixture_id)):
             alerta_data = {
                 "id": fixture_id,
                 "home": jogo.home_team,
@@ -8228,19 +8140,11 @@ class SistemaAlertasFutebol:
                         "detalhes": analise.get("detalhes", {})
                     })
             
-            alertas[fixture_id] = alerta_data
-            
             if alerta_individual:
                 self._enviar_alerta_individual(match_data, analise, tipo_alerta, min_conf, max_conf)
             
-            if tipo_alerta == "over_under":
-                DataStorage.salvar_alertas(alertas)
-            elif tipo_alerta == "favorito":
-                DataStorage.salvar_alertas_favoritos(alertas)
-            elif tipo_alerta == "gols_ht":
-                DataStorage.salvar_alertas_gols_ht(alertas)
-            elif tipo_alerta == "ambas_marcam":
-                DataStorage.salvar_alertas_ambas_marcam(alertas)
+            if conhecido:
+                DataStorage.registrar_alerta(tipo_alerta, fixture_id, alerta_data)
     
     def _enviar_alerta_individual(self, fixture: dict, analise: dict, tipo_alerta: str, min_conf: int, max_conf: int):
         home = fixture["homeTeam"]["name"]
@@ -9046,6 +8950,17 @@ class SistemaAlertasFutebol:
             except Exception as e:
                 logging.error(f"❌ Erro ao limpar {arquivo}: {e}")
         
+        try:
+            armazem_alertas.limpar()
+            logging.info("✅ Armazém de alertas, resultados e múltiplas limpo")
+        except Exception as e:
+            logging.error(f"❌ Erro ao limpar armazém de alertas: {e}")
+        
+        try:
+            self.analisador_performance.agregados.recarregar()
+        except Exception as e:
+            logging.error(f"❌ Erro ao recarregar performance do modelo: {e}")
+        
         try:
             if hasattr(self, 'image_cache') and self.image_cache:
                 self.image_cache.clear()
@@ -9622,6 +9537,11 @@ def render_tab_multiplas_green(sistema):
 # FUNÇÕES DAS DEMAIS ABAS (BUSCA, RESULTADOS, TOP, COMPLETOS, PRO, EXPORTAR, ADMIN)
 # ============================================================
 
+def exibir_falhas_api(sistema):
+    """st.error das falhas de API registradas pelas threads (chamar na thread do script)"""
+    for mensagem in sistema.api_client.consumir_falhas():
+        st.error(mensagem)
+
 def render_tab_busca(sistema):
     st.subheader("🔍 Buscar Partidas")
     
@@ -10222,6 +10142,30 @@ def render_tab_admin(sistema):
             sistema.api_monitor.reset()
             st.rerun()
     
+    with st.expander("🧠 Estatísticas de Cache", expanded=False):
+        st.caption("Acertos, despejos e expirações desde que o app subiu; use para ajustar ConfigManager.CACHE_CONFIG.")
+        caches_dados = [
+            sistema.api_client.jogos_cache,
+            sistema.api_client.classificacao_cache,
+            sistema.api_client.match_cache,
+        ]
+        st.dataframe(pd.DataFrame([c.get_stats() for c in caches_dados]), use_container_width=True, hide_index=True)
+        
+        col1, col2, col3, col4 = st.columns(4)
+        col1.metric("Escudos Hit Rate", cache_stats['hit_rate'])
+        col2.metric("Hits Memória / Disco", f"{cache_stats['hits_memoria']} / {cache_stats['hits_disco']}")
+        col3.metric("Misses", cache_stats['misses'])
+        col4.metric("Memória", f"{cache_stats['memoria_mb']:.1f} MB ({cache_stats['despejos']} despejos)")
+        
+        st.caption("Recursos de pôster (escudos prontos, modelos pré-desenhados e PNGs gerados)")
+        st.dataframe(pd.DataFrame([
+            {"recurso": nome, **lru.get_stats()} for nome, lru in (
+                ("escudos", recursos_poster.escudos),
+                ("modelos", recursos_poster.modelos),
+                ("posters", recursos_poster.posters),
+            )
+        ]), use_container_width=True, hide_index=True)
+    
     with st.expander("🗑️ Limpeza de Cache", expanded=False):
         st.info("Limpa apenas os caches temporários, mantendo os alertas e resultados.")
         
@@ -10230,6 +10174,7 @@ def render_tab_admin(sistema):
             if st.button("🧹 Limpar Cache de Imagens", use_container_width=True):
                 with st.spinner("Limpando cache de imagens..."):
                     sistema.image_cache.clear()
+                    recursos_poster.limpar()
                     st.success("✅ Cache de imagens limpo!")
                     time.sleep(1)
                     st.rerun()
@@ -10512,30 +10457,39 @@ def main():
     
     with tab1:
         render_tab_busca(sistema)
+        exibir_falhas_api(sistema)
     
     with tab2:
         render_tab_resultados(sistema)
+        exibir_falhas_api(sistema)
     
     with tab3:
         render_tab_top_alertas(sistema)
+        exibir_falhas_api(sistema)
     
     with tab4:
         render_tab_completos(sistema)
+        exibir_falhas_api(sistema)
     
     with tab5:
         render_tab_multiplas_pro(sistema)
+        exibir_falhas_api(sistema)
     
     with tab6:
         render_tab_multiplas_green(sistema)
+        exibir_falhas_api(sistema)
     
     with tab7:
         render_tab_multiplas_individuais(sistema)
+        exibir_falhas_api(sistema)
     
     with tab8:
         render_tab_exportar(sistema)
+        exibir_falhas_api(sistema)
     
     with tab9:
         render_tab_admin(sistema)
+        exibir_falhas_api(sistema)
 
 
 if __name__ == "__main__":
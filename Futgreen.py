@@ -6,6 +6,7 @@ import os
 import io
 import pandas as pd
 import time
+from limitador_api import CotaCompartilhada
 from reportlab.lib.pagesizes import letter
 from reportlab.lib import colors
 from reportlab.platypus import SimpleDocTemplate, Table, TableStyle
@@ -60,97 +61,30 @@ HISTORICO_COMPOSTOS_PATH = "historico_compostos.json"  # NOVO
 # SISTEMA DE RATE LIMIT AUTOMÁTICO
 # =============================
 
-RATE_LIMIT_CACHE = "rate_limit_cache.json"
+RATE_LIMIT_CACHE = "rate_limit_state.bin"  # Estado compartilhado entre processos (mmap)
 RATE_LIMIT_CALLS_PER_MINUTE = 8  # Limite conservador para a API
 RATE_LIMIT_WAIT_TIME = 70  # Segundos para esperar (1 minuto + margem)
 
 class RateLimitManager:
-    """Gerenciador de Rate Limit automático para a API"""
+    """Gerenciador de Rate Limit automático para a API (compartilhado entre sessões e processos)"""
     
     def __init__(self):
         self.cache_file = RATE_LIMIT_CACHE
         self.calls_per_minute = RATE_LIMIT_CALLS_PER_MINUTE
         self.wait_time = RATE_LIMIT_WAIT_TIME
-        self._ensure_cache()
-    
-    def _ensure_cache(self):
-        """Garante que o cache de rate limit existe"""
-        try:
-            if not os.path.exists(self.cache_file):
-                cache_data = {
-                    "last_reset": datetime.now().timestamp(),
-                    "call_count": 0,
-                    "last_call_time": 0,
-                    "pause_until": 0
-                }
-                with open(self.cache_file, 'w') as f:
-                    json.dump(cache_data, f)
-        except Exception:
-            pass
-    
-    def _load_cache(self):
-        """Carrega o cache de rate limit"""
-        try:
-            with open(self.cache_file, 'r') as f:
-                return json.load(f)
-        except:
-            return {
-                "last_reset": datetime.now().timestamp(),
-                "call_count": 0,
-                "last_call_time": 0,
-                "pause_until": 0
-            }
-    
-    def _save_cache(self, cache_data):
-        """Salva o cache de rate limit"""
-        try:
-            with open(self.cache_file, 'w') as f:
-                json.dump(cache_data, f)
-        except Exception:
-            pass
+        self.cota = CotaCompartilhada(self.cache_file, self.calls_per_minute)
     
     def check_rate_limit(self):
-        """Verifica e aplica o rate limit automaticamente"""
-        cache = self._load_cache()
-        now = datetime.now().timestamp()
-        
-        # Verificar se estamos em pausa forçada
-        if now < cache.get("pause_until", 0):
-            wait_remaining = cache["pause_until"] - now
-            st.warning(f"⏳ Rate limit: Aguardando {wait_remaining:.1f}s...")
-            time.sleep(wait_remaining)
-            # Recarregar cache após espera
-            cache = self._load_cache()
-            now = datetime.now().timestamp()
-        
-        # Verificar se precisa resetar o contador (a cada minuto)
-        if now - cache["last_reset"] > 60:  # Mais de 1 minuto
-            cache["last_reset"] = now
-            cache["call_count"] = 0
-        
-        # Verificar se excedeu o limite
-        if cache["call_count"] >= self.calls_per_minute:
-            time_since_reset = now - cache["last_reset"]
-            wait_time = max(60 - time_since_reset + 1, 1)  # Esperar pelo menos 1 segundo
-            
-            st.warning(f"🚫 Rate limit atingido! Aguardando {wait_time:.1f}s...")
+        """Reserva a próxima chamada na cota compartilhada e espera (fora da trava) se preciso"""
+        wait_time = self.cota.reservar()
+        if wait_time > 0:
+            st.warning(f"⏳ Rate limit: Aguardando {wait_time:.1f}s...")
             time.sleep(wait_time)
-            
-            # Resetar após espera
-            cache["last_reset"] = datetime.now().timestamp()
-            cache["call_count"] = 0
-            now = cache["last_reset"]
-        
-        # Atualizar contador
-        cache["call_count"] += 1
-        cache["last_call_time"] = now
-        
-        self._save_cache(cache)
-        
-        # Pequena pausa entre chamadas para distribuir melhor
-        time.sleep(0.5)
-        
         return True
+    
+    def pausar(self, segundos):
+        """Pausa forçada para todos os processos (429 da API)"""
+        self.cota.pausar(segundos)
 
 # Instância global do gerenciador de rate limit
 rate_limit_manager = RateLimitManager()
@@ -174,12 +108,8 @@ def obter_dados_api_com_rate_limit(url: str, timeout: int = 15) -> dict | None:
         if hasattr(e, 'response') and e.response is not None:
             if e.response.status_code == 429:
                 st.error("🚫 Rate Limit da API atingido! Aguardando 70s...")
-                # Pausa forçada no cache
-                cache = rate_limit_manager._load_cache()
-                cache["pause_until"] = datetime.now().timestamp() + RATE_LIMIT_WAIT_TIME
-                rate_limit_manager._save_cache(cache)
-                time.sleep(RATE_LIMIT_WAIT_TIME)
-                # Tentar novamente após espera
+                # Pausa forçada na cota compartilhada; a nova tentativa espera por ela
+                rate_limit_manager.pausar(RATE_LIMIT_WAIT_TIME)
                 return obter_dados_api_com_rate_limit(url, timeout)
             elif e.response.status_code == 404:
                 st.warning(f"⚠️ Recurso não encontrado: {url}")
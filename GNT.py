@@ -1,5 +1,6 @@
 import streamlit as st
 import requests
+import cliente_http
 import pandas as pd
 import joblib
 import os
@@ -49,7 +50,7 @@ if 'entrada_ativa' not in st.session_state:
 # === API ===
 def obter_ultimo_numero():
     try:
-        response = requests.get(API_URL, timeout=3)
+        response = cliente_http.get(API_URL, timeout=3)
         response.raise_for_status()
         data = response.json().get("data", {})
         resultado = data.get("result", {}).get("outcome", {})
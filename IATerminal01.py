@@ -1,5 +1,6 @@
 import streamlit as st
 import requests
+import cliente_http
 import json
 import os
 import joblib
@@ -36,7 +37,7 @@ def enviar_telegram(msg):
 
 def get_numero_api():
     try:
-        r = requests.get(API_URL, headers={"User-Agent": "Mozilla/5.0"}, timeout=3)
+        r = cliente_http.get(API_URL, headers={"User-Agent": "Mozilla/5.0"}, timeout=3)
         data = r.json()
         numero = data.get("data", {}).get("result", {}).get("outcome", {}).get("number")
         timestamp = data.get("data", {}).get("settledAt")
@@ -1,5 +1,6 @@
 import streamlit as st
 import requests
+import cliente_http
 import json
 import os
 import joblib
@@ -136,7 +137,7 @@ def log_csv(row):
 
 # === CAPTURA DA API ===
 try:
-    resposta = requests.get(API_URL, timeout=5)
+    resposta = cliente_http.get(API_URL, timeout=5)
     if resposta.status_code == 200:
         dados = resposta.json()
         try:
@@ -1,6 +1,7 @@
 # ====== PARTE 1 ======
 import streamlit as st
 import requests
+import cliente_http
 import joblib
 import numpy as np
 from collections import deque, Counter
@@ -243,7 +244,7 @@ def extrair_features(janela_numeros):
 
 def capturar_numero_api():
     try:
-        r = requests.get(API_URL, timeout=4)
+        r = cliente_http.get(API_URL, timeout=4)
         r.raise_for_status()
         data = r.json()
         candidates = []
@@ -1,5 +1,6 @@
 import streamlit as st
 import requests
+import cliente_http
 import os
 import joblib
 from collections import deque, Counter
@@ -184,7 +185,7 @@ for chave in ["quentes_green", "quentes_red"]:
 
 # ✅ CORREÇÃO: API JSON CORRETO
 try:
-    response = requests.get(API_URL, timeout=3)
+    response = cliente_http.get(API_URL, timeout=3)
     response.raise_for_status()
     data = response.json()
     numero_atual = data["data"]["result"]["outcome"]["number"]
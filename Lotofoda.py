@@ -1,5 +1,7 @@
 import streamlit as st
-import requests
+import resultados_lotofacil
+import analise_lotofacil
+import fechamento_lotofacil
 import random
 import pandas as pd
 import numpy as np
@@ -10,6 +12,11 @@ import math
 from collections import Counter
 from datetime import datetime
 from scipy.stats import norm
+import lotofacil_bits as lb
+import candidatos_lotofacil as cand
+from indice_lotofacil import obter_indice
+import probabilidades_lotofacil as prob
+import backtest_lotofacil as bt
 import warnings
 warnings.filterwarnings("ignore")  # CORRIGIDO: era filterprobabilities
 
@@ -31,6 +38,8 @@ class MotorLotofacilPro:
         """
         self.historico = dados_historicos
         self.ultimo = sorted(ultimo_concurso) if ultimo_concurso else []
+        self.mascara_ultimo = lb.mascara(self.ultimo)
+        self.rng = np.random.default_rng()
         
         # Volante como matriz 5x5 para geometria
         self.volante = np.array([
@@ -47,6 +56,7 @@ class MotorLotofacilPro:
         # Faixas do volante
         self.baixos = list(range(1, 13))   # 1-12
         self.altos = list(range(13, 26))   # 13-25
+        self.mascara_baixos = lb.mascara(self.baixos)
         
         # =====================================================
         # 1️⃣ CAMADA 1: FREQUÊNCIA HISTÓRICA
@@ -97,21 +107,9 @@ class MotorLotofacilPro:
     
     def _calcular_atrasos(self):
         """Calcula quantos concursos cada número está ausente"""
-        if not self.historico:
-            return {n: 0 for n in range(1, 26)}
-        
-        ultimo_concurso = set(self.historico[0])
-        atrasos = {}
-        
-        for num in range(1, 26):
-            atraso = 0
-            for concurso in self.historico:
-                if num in concurso:
-                    break
-                atraso += 1
-            atrasos[num] = atraso
-        
-        return atrasos
+        # historico[0] é o mais recente: atraso = posição da primeira aparição (0 se o histórico está vazio)
+        primeira = analise_lotofacil.obter_tabelas(self.historico).primeira_ocorrencia()
+        return {n: int(primeira[n - 1]) for n in range(1, 26)}
     
     def _get_top_atrasados(self, n=5):
         """Retorna os n números mais atrasados"""
@@ -213,35 +211,25 @@ class MotorLotofacilPro:
             'distribuicao_linhas': {},
             'aprovado': False
         }
+        m = lb.mascara(jogo)
         
         # 5️⃣ CAMADA 5: FILTROS MATEMÁTICOS
         
         # Filtro 1: Sequência máxima (evitar mais de 3 consecutivos)
-        jogo_sorted = sorted(jogo)
-        max_seq = 1
-        atual = 1
-        for i in range(1, len(jogo_sorted)):
-            if jogo_sorted[i] == jogo_sorted[i-1] + 1:
-                atual += 1
-                max_seq = max(max_seq, atual)
-            else:
-                atual = 1
+        max_seq = lb.maior_sequencia(m)
         diag['sequencia_max'] = max_seq
         if max_seq > 3:
             return False, diag
         
         # Filtro 2: Repetição do concurso anterior (normalmente 8-10)
         if self.ultimo:
-            rep = len(set(jogo) & set(self.ultimo))
+            rep = lb.popcount(m & self.mascara_ultimo)
             diag['repeticao_anterior'] = rep
             if rep < 7 or rep > 11:
                 return False, diag
         
         # Filtro 3: Distribuição por linhas do volante (2-4 por linha)
-        linhas = {i: 0 for i in range(5)}
-        for num in jogo:
-            linha = (num - 1) // 5
-            linhas[linha] += 1
+        linhas = dict(enumerate(lb.linhas(m)))
         diag['distribuicao_linhas'] = linhas
         
         for linha, count in linhas.items():
@@ -251,80 +239,83 @@ class MotorLotofacilPro:
         diag['aprovado'] = True
         return True, diag
     
+    def filtrar_lote(self, mascaras):
+        """Camadas 4 e 5 sobre um array de máscaras; retorna o array booleano de aprovados"""
+        return cand.filtro_pro_lote(mascaras, self.mascara_baixos, self.mascara_ultimo)
+    
+    def filtrar_indice(self, indice):
+        """Camadas 4 e 5 direto nas colunas do índice completo"""
+        aprovado = (
+            indice.entre("pares", 7, 8) & indice.entre("baixos_12", 7, 8) &
+            indice.entre("soma", 170, 210) & (indice.coluna("maior_sequencia") <= 3)
+        )
+        for i in range(1, 6):
+            aprovado &= indice.entre(f"linha_{i}", 2, 4)
+        if self.ultimo:
+            rep = indice.contar(self.mascara_ultimo)
+            aprovado &= (rep >= 7) & (rep <= 11)
+        return aprovado
+    
     def _gerar_jogo_base(self):
         """
         Gera um jogo base usando a estratégia 6 quentes / 5 mornos / 4 frios
         + 2-3 atrasados
         """
-        jogo = set()
-        
-        # Garantir que temos números suficientes em cada categoria
-        quentes_disp = self.quentes if len(self.quentes) >= 6 else self.quentes + self.mornos[:6-len(self.quentes)]
-        mornos_disp = self.mornos if len(self.mornos) >= 5 else self.mornos + self.frios[:5-len(self.mornos)]
-        frios_disp = self.frios if len(self.frios) >= 4 else self.frios + [n for n in range(1,26) if n not in jogo][:4-len(self.frios)]
-        
-        # Adicionar 6 quentes
-        jogo.update(random.sample(quentes_disp, min(6, len(quentes_disp))))
-        
-        # Adicionar 5 mornos (que não estão no jogo)
-        mornos_restantes = [n for n in mornos_disp if n not in jogo]
-        if mornos_restantes:
-            jogo.update(random.sample(mornos_restantes, min(5, len(mornos_restantes))))
-        
-        # Adicionar 4 frios (que não estão no jogo)
-        frios_restantes = [n for n in frios_disp if n not in jogo]
-        if frios_restantes:
-            jogo.update(random.sample(frios_restantes, min(4, len(frios_restantes))))
-        
-        # Completar com números atrasados se necessário
-        while len(jogo) < 15:
-            # Escolher um dos números mais atrasados que ainda não está no jogo
-            atrasados_disp = [n for n, _ in self.atrasados if n not in jogo]
-            if atrasados_disp:
-                jogo.add(random.choice(atrasados_disp))
-            else:
-                # Se não houver atrasados disponíveis, escolher qualquer número
-                jogo.add(random.choice([n for n in range(1, 26) if n not in jogo]))
-        
-        return sorted(jogo)
+        return cand.jogo_base(random, self.quentes, self.mornos, self.frios, [n for n, _ in self.atrasados])
     
-    def gerar_jogo_inteligente(self, max_tentativas=10000):
+    def _plano_geracao(self):
+        """O que os processos de geração precisam saber do motor (só dados, sem Streamlit)"""
+        return {
+            "quentes": list(self.quentes),
+            "mornos": list(self.mornos),
+            "frios": list(self.frios),
+            "atrasados": [n for n, _ in self.atrasados],
+            "mascara_baixos": self.mascara_baixos,
+            "mascara_ultimo": self.mascara_ultimo,
+        }
+    
+    def gerar_jogo_inteligente(self, max_tentativas=10000, lote=256):
         """
         Gera um jogo passando por todas as 6 camadas
+        (candidatos em lotes; camadas 4 e 5 filtradas de uma vez sobre as máscaras).
+        Se nenhum jogo base passar, sorteia entre as combinações do índice que passam
+        nas camadas 4 e 5, então sempre há jogo quando os filtros admitem algum.
         """
-        for tentativa in range(max_tentativas):
-            # Gerar jogo base (camadas 1 e 2)
-            jogo = self._gerar_jogo_base()
-            
-            # Verificar padrões estatísticos (camada 4)
-            pares = sum(1 for n in jogo if n % 2 == 0)
-            if pares not in [7, 8]:
-                continue
+        jogo = None
+        for inicio in range(0, max_tentativas, lote):
+            # Gerar jogos base (camadas 1 e 2)
+            candidatos = [self._gerar_jogo_base() for _ in range(min(lote, max_tentativas - inicio))]
             
-            baixos = sum(1 for n in jogo if n <= 12)
-            if baixos not in [7, 8]:
-                continue
-            
-            soma = sum(jogo)
-            if soma < 170 or soma > 210:
-                continue
-            
-            # Aplicar filtros matemáticos (camada 5)
-            aprovado, diag = self._verificar_filtros_matematicos(jogo)
-            if aprovado:
-                # Calcular score geométrico (camada 3)
-                score_geo = self._calcular_score_geometrico(jogo)
-                
-                return jogo, {
-                    'frequencias': self._classificar_jogo(jogo),
-                    'pares': pares,
-                    'baixos': baixos,
-                    'soma': soma,
-                    'geometria': score_geo,
-                    'filtros': diag
-                }
+            # Padrões estatísticos (camada 4) e filtros matemáticos (camada 5)
+            aprovados = np.flatnonzero(self.filtrar_lote(lb.de_matriz(candidatos)))
+            if len(aprovados) > 0:
+                jogo = candidatos[aprovados[0]]
+                break
         
-        return None, None
+        if jogo is None:
+            indice = obter_indice()
+            sorteado = indice.sortear(self.filtrar_indice(indice), 1, self.rng)
+            if not sorteado:
+                return None, None
+            jogo = lb.dezenas(sorteado[0])
+        
+        return jogo, self._diagnostico(jogo)
+    
+    def _diagnostico(self, jogo):
+        """Camadas 1, 3 e 5 de um jogo aprovado, no formato exibido pela interface"""
+        _, diag = self._verificar_filtros_matematicos(jogo)
+        
+        # Calcular score geométrico (camada 3)
+        score_geo = self._calcular_score_geometrico(jogo)
+        
+        return {
+            'frequencias': self._classificar_jogo(jogo),
+            'pares': sum(1 for n in jogo if n % 2 == 0),
+            'baixos': sum(1 for n in jogo if n <= 12),
+            'soma': sum(jogo),
+            'geometria': score_geo,
+            'filtros': diag
+        }
     
     def _calcular_score_geometrico(self, jogo):
         """
@@ -374,42 +365,30 @@ class MotorLotofacilPro:
                 result['frios'] += 1
         return result
     
-    def gerar_multiplos_jogos(self, quantidade, max_global=20000):
+    def gerar_multiplos_jogos(self, quantidade, max_global=20000, semente=None):
         """
         Gera múltiplos jogos usando o pipeline completo
         Similar a: gerar 20000, filtrar, sobram 200 bons
+        (candidatos em paralelo, sem repetidos, só os `quantidade` melhores guardados;
+        max_global × 100 é o teto de jogos base, como no laço antigo)
         """
-        jogos = []
-        diagnosticos = []
-        tentativas = 0
-        
         progress_text = "🧠 Motor PRO gerando jogos inteligentes..."
         progress_bar = st.progress(0, text=progress_text)
         
-        # Gerar muitos jogos e filtrar os melhores
-        candidatos = []
-        for _ in range(max_global):
-            jogo, diag = self.gerar_jogo_inteligente(max_tentativas=100)
-            if jogo and jogo not in [c[0] for c in candidatos]:
-                # Calcular score total
-                score_total = (
-                    diag['geometria'] + 
-                    (10 if diag['pares'] in [7,8] else 0) +
-                    (10 if 170 <= diag['soma'] <= 210 else 0) +
-                    (5 if diag['filtros']['aprovado'] else 0)
-                )
-                candidatos.append((jogo, diag, score_total))
-            
-            if len(candidatos) >= quantidade * 5:  # Gerar 5x mais que necessário
-                break
+        candidatos, _, _ = cand.gerar_candidatos(
+            self._plano_geracao(), quantidade, max_global * 100, semente=semente,
+            ao_progredir=lambda feitos, total: progress_bar.progress(feitos / total, text=progress_text)
+        )
+        mascaras = [m for m, _ in candidatos]
         
-        # Ordenar por score e pegar os melhores
-        candidatos.sort(key=lambda x: x[2], reverse=True)
+        # Se poucos jogos base passaram nos filtros, completa com o índice
+        if len(mascaras) < quantidade:
+            indice = obter_indice()
+            mascaras += indice.sortear(self.filtrar_indice(indice), quantidade - len(mascaras), self.rng,
+                                       excluir=mascaras)
         
-        for jogo, diag, _ in candidatos[:quantidade]:
-            jogos.append(jogo)
-            diagnosticos.append(diag)
-            progress_bar.progress(len(jogos) / quantidade, text=progress_text)
+        jogos = [lb.dezenas(m) for m in mascaras]
+        diagnosticos = [self._diagnostico(jogo) for jogo in jogos]
         
         progress_bar.empty()
         
@@ -513,13 +492,7 @@ class MotorGeometriaAvancada:
         M[i][j] = quantas vezes i e j apareceram juntos
         """
         M = np.zeros((26, 26))  # Índices 1-25 (ignorar 0)
-        
-        for jogo in self.concursos:
-            for i in jogo:
-                for j in jogo:
-                    if i != j:
-                        M[i][j] += 1
-        
+        M[1:, 1:] = analise_lotofacil.obter_tabelas(self.concursos).coocorrencia()
         return M
     
     def _calcular_centroides(self):
@@ -550,13 +523,7 @@ class MotorGeometriaAvancada:
     
     def _calcular_frequencias(self):
         """Calcula frequência absoluta de cada número"""
-        freq = [0] * 26
-        
-        for jogo in self.concursos:
-            for num in jogo:
-                freq[num] += 1
-        
-        return freq
+        return [0] + analise_lotofacil.obter_tabelas(self.concursos).frequencia().tolist()
     
     def _calcular_entropia(self, frequencias):
         """
@@ -1411,6 +1378,13 @@ class Gerador3622:
         self.faixa_media = list(range(9, 17))    # 09-16
         self.faixa_alta = list(range(17, 26))    # 17-25
         
+        # Máscaras de bits para os filtros
+        self.mascara_ultimo = lb.mascara(self.ultimo)
+        self.mascara_primos = lb.mascara(self.primos)
+        self.mascara_baixa = lb.mascara(self.faixa_baixa)
+        self.mascara_media = lb.mascara(self.faixa_media)
+        self.mascara_alta = lb.mascara(self.faixa_alta)
+        
         # Ajustes adaptáveis (serão calculados)
         self.ajustes = self._calcular_ajustes()
     
@@ -1482,33 +1456,34 @@ class Gerador3622:
             "regra6": False,  # Primos
             "falhas": 0
         }
+        m = lb.mascara(jogo)
         
         # REGRA 1 - Repetição do concurso anterior
         if self.ultimo:
-            repeticoes = len(set(jogo) & set(self.ultimo))
+            repeticoes = lb.popcount(m & self.mascara_ultimo)
             if 8 <= repeticoes <= 10:
                 diagnostico["regra1"] = True
             elif repeticoes == 7 or repeticoes == 11:
                 diagnostico["regra1"] = True  # Aceitável mas não ideal
         
         # REGRA 2 - Ímpares x Pares
-        pares = sum(1 for n in jogo if n % 2 == 0)
+        pares = lb.popcount(m & lb.PARES)
         if pares in [7, 8]:
             diagnostico["regra2"] = True
         elif pares == 6 or pares == 9:
             diagnostico["regra2"] = True  # Alternativa aceitável
         
         # REGRA 3 - Soma total
-        soma = sum(jogo)
+        soma = lb.soma(m)
         if 168 <= soma <= 186:
             diagnostico["regra3"] = True
         elif 165 <= soma <= 190:
             diagnostico["regra3"] = True  # Fora da faixa premium mas aceitável
         
         # REGRA 4 - Distribuição por faixas
-        baixas = sum(1 for n in jogo if n in self.faixa_baixa)
-        medias = sum(1 for n in jogo if n in self.faixa_media)
-        altas = sum(1 for n in jogo if n in self.faixa_alta)
+        baixas = lb.popcount(m & self.mascara_baixa)
+        medias = lb.popcount(m & self.mascara_media)
+        altas = lb.popcount(m & self.mascara_alta)
         
         if (5 <= baixas <= 6 and 5 <= medias <= 6 and 3 <= altas <= 4):
             diagnostico["regra4"] = True
@@ -1518,12 +1493,12 @@ class Gerador3622:
                 diagnostico["regra4"] = True
         
         # REGRA 5 - Consecutivos
-        consecutivos = self._contar_sequencias(jogo)
+        consecutivos = lb.consecutivos(m)
         if consecutivos >= 3:
             diagnostico["regra5"] = True
         
         # REGRA 6 - Primos
-        qtd_primos = sum(1 for n in jogo if n in self.primos)
+        qtd_primos = lb.popcount(m & self.mascara_primos)
         if 4 <= qtd_primos <= 6:
             diagnostico["regra6"] = True
         
@@ -1712,6 +1687,14 @@ class Gerador12Plus:
         # Peso extra para números do último concurso
         self.peso_ultimo = 3.0
         
+        # Máscaras de bits para os filtros
+        self.mascara_ultimo = lb.mascara(self.ultimo)
+        self.mascara_baixas = lb.mascara(self.baixas)
+        self.mascara_medias = lb.mascara(self.medias)
+        self.mascara_altas = lb.mascara(self.altas)
+        self.mascara_primos = lb.mascara(self.primos)
+        self.rng = np.random.default_rng()
+        
     def _calcular_frequencias_recentes(self, n=10):
         """Calcula frequências dos últimos N concursos para ponderação"""
         frequencias = Counter()
@@ -1731,30 +1714,11 @@ class Gerador12Plus:
     
     def _maior_bloco_consecutivo(self, jogo):
         """Retorna o tamanho do maior bloco de números consecutivos"""
-        if not jogo:
-            return 0
-        
-        nums = sorted(jogo)
-        maior = 1
-        atual = 1
-        
-        for i in range(len(nums) - 1):
-            if nums[i+1] - nums[i] == 1:
-                atual += 1
-                maior = max(maior, atual)
-            else:
-                atual = 1
-        
-        return maior
+        return lb.maior_sequencia(lb.mascara(jogo))
     
     def _contar_consecutivos(self, jogo):
         """Conta pares consecutivos (não blocos)"""
-        nums = sorted(jogo)
-        count = 0
-        for i in range(len(nums) - 1):
-            if nums[i+1] - nums[i] == 1:
-                count += 1
-        return count
+        return lb.consecutivos(lb.mascara(jogo))
     
     def jogo_valido(self, jogo):
         """
@@ -1765,17 +1729,18 @@ class Gerador12Plus:
             return False, {"erro": "Tamanho incorreto"}
         
         # Calcular métricas
-        baixas = sum(1 for n in jogo if n in self.baixas)
-        medias = sum(1 for n in jogo if n in self.medias)
-        altas = sum(1 for n in jogo if n in self.altas)
+        m = lb.mascara(jogo)
+        baixas = lb.popcount(m & self.mascara_baixas)
+        medias = lb.popcount(m & self.mascara_medias)
+        altas = lb.popcount(m & self.mascara_altas)
         
-        pares = sum(1 for n in jogo if n % 2 == 0)
-        primos = sum(1 for n in jogo if n in self.primos)
-        soma = sum(jogo)
+        pares = lb.popcount(m & lb.PARES)
+        primos = lb.popcount(m & self.mascara_primos)
+        soma = lb.soma(m)
         
-        repetidas = len(set(jogo) & set(self.ultimo))
-        consecutivos = self._contar_consecutivos(jogo)
-        maior_bloco = self._maior_bloco_consecutivo(jogo)
+        repetidas = lb.popcount(m & self.mascara_ultimo)
+        consecutivos = lb.consecutivos(m)
+        maior_bloco = lb.maior_sequencia(m)
         
         # Diagnóstico detalhado
         diag = {
@@ -1838,6 +1803,40 @@ class Gerador12Plus:
         
         return aprovado, diag
     
+    def filtrar_lote(self, mascaras):
+        """Mesmas regras de jogo_valido sobre um array de máscaras (regras e bloqueios juntos)"""
+        baixas = lb.contar_lote(mascaras, self.mascara_baixas)
+        medias = lb.contar_lote(mascaras, self.mascara_medias)
+        altas = lb.contar_lote(mascaras, self.mascara_altas)
+        pares = lb.contar_lote(mascaras, lb.PARES)
+        primos = lb.contar_lote(mascaras, self.mascara_primos)
+        soma = lb.soma_lote(mascaras)
+        repetidas = lb.contar_lote(mascaras, self.mascara_ultimo)
+        consecutivos = lb.consecutivos_lote(mascaras)
+        maior_bloco = lb.maior_sequencia_lote(mascaras)
+        return (
+            (baixas >= 4) & (baixas <= 5) & (medias >= 5) & (medias <= 6) & (altas >= 5) & (altas <= 6) &
+            (pares >= 7) & (pares <= 8) &
+            (soma >= 190) & (soma <= 210) &
+            (primos >= 5) & (primos <= 6) &
+            (repetidas >= 9) & (repetidas <= 11) &
+            (consecutivos >= 2) & (consecutivos <= 4) &
+            (maior_bloco >= 3)
+        )
+    
+    def filtrar_indice(self, indice):
+        """Mesmas regras de filtrar_lote direto nas colunas do índice completo"""
+        repetidas = indice.contar(self.mascara_ultimo)
+        return (
+            indice.entre("faixa_baixa", 4, 5) & indice.entre("faixa_media", 5, 6) & indice.entre("faixa_alta", 5, 6) &
+            indice.entre("pares", 7, 8) &
+            indice.entre("soma", 190, 210) &
+            indice.entre("primos", 5, 6) &
+            (repetidas >= 9) & (repetidas <= 11) &
+            indice.entre("consecutivos", 2, 4) &
+            (indice.coluna("maior_sequencia") >= 3)
+        )
+    
     def _gerar_jogo_ponderado(self):
         """
         Gera um jogo usando pool ponderado baseado em:
@@ -1865,60 +1864,38 @@ class Gerador12Plus:
         
         return pool, pesos
     
-    def gerar_jogo(self, max_tentativas=10000):
+    def gerar_jogo(self):
         """
         Gera um único jogo válido
         """
-        pool, pesos = self._gerar_jogo_ponderado()
-        
-        for _ in range(max_tentativas):
-            # Gerar 15 números com pesos
-            indices = np.random.choice(len(pool), size=15, replace=False, p=pesos)
-            jogo = sorted([pool[i] for i in indices])
-            
-            # Validar
-            aprovado, diag = self.jogo_valido(jogo)
-            if aprovado:
-                return jogo, diag
-        
-        # Fallback: gerar aleatório simples e tentar validar
-        for _ in range(max_tentativas):
-            jogo = sorted(random.sample(range(1, 26), 15))
-            aprovado, diag = self.jogo_valido(jogo)
-            if aprovado:
-                return jogo, diag
-        
-        # Último fallback: retornar None
+        jogos, _ = self._coletar_jogos(1)
+        if jogos:
+            return jogos[0], self.jogo_valido(jogos[0])[1]
         return None, None
     
-    def gerar_multiplos_jogos(self, quantidade, max_total_tentativas=100000):
+    def _coletar_jogos(self, quantidade):
+        """
+        Consulta o índice pelas combinações que passam em todas as regras e sorteia
+        entre elas com o peso das dezenas (produto dos pesos do pool ponderado).
+        Retorna (jogos, combinações que passam nos filtros).
+        """
+        indice = obter_indice()
+        sobreviventes = np.flatnonzero(self.filtrar_indice(indice))
+        _, pesos = self._gerar_jogo_ponderado()
+        mascaras = indice.sortear(sobreviventes, quantidade, self.rng, pesos=pesos)
+        return [lb.dezenas(m) for m in mascaras], len(sobreviventes)
+    
+    def gerar_multiplos_jogos(self, quantidade):
         """
         Gera múltiplos jogos válidos
         Retorna lista de jogos e lista de diagnósticos
         """
-        jogos = []
-        diagnosticos = []
-        tentativas = 0
-        
-        # Barra de progresso (simulada)
-        progress_text = "Gerando jogos válidos..."
-        progress_bar = st.progress(0, text=progress_text)
-        
-        while len(jogos) < quantidade and tentativas < max_total_tentativas:
-            jogo, diag = self.gerar_jogo()
-            tentativas += 1
-            
-            if jogo and jogo not in jogos:  # Evitar duplicatas
-                jogos.append(jogo)
-                diagnosticos.append(diag)
-                
-                # Atualizar progresso
-                progress_bar.progress(len(jogos) / quantidade, text=progress_text)
-        
-        progress_bar.empty()
+        with st.spinner("Gerando jogos válidos..."):
+            jogos, combinacoes = self._coletar_jogos(quantidade)
+            diagnosticos = [self.jogo_valido(jogo)[1] for jogo in jogos]
         
         if len(jogos) < quantidade:
-            st.warning(f"⚠️ Gerados apenas {len(jogos)} jogos válidos em {tentativas} tentativas")
+            st.warning(f"⚠️ Gerados apenas {len(jogos)} jogos válidos: só {combinacoes} combinações passam nos filtros")
         
         return jogos, diagnosticos
     
@@ -1973,6 +1950,14 @@ class Gerador13Plus:
         # Peso extra para números do último concurso (mais importante para 13+)
         self.peso_ultimo = 4.0
         
+        # Máscaras de bits para os filtros
+        self.mascara_ultimo = lb.mascara(self.ultimo)
+        self.mascara_baixas = lb.mascara(self.baixas)
+        self.mascara_medias = lb.mascara(self.medias)
+        self.mascara_altas = lb.mascara(self.altas)
+        self.mascara_primos = lb.mascara(self.primos)
+        self.rng = np.random.default_rng()
+        
     def _calcular_frequencias_recentes(self, n=20):
         """Calcula frequências dos últimos N concursos para ponderação"""
         frequencias = Counter()
@@ -1992,51 +1977,17 @@ class Gerador13Plus:
     
     def _maior_bloco_consecutivo(self, jogo):
         """Retorna o tamanho do maior bloco de números consecutivos"""
-        if not jogo:
-            return 0
-        
-        nums = sorted(jogo)
-        maior = 1
-        atual = 1
-        
-        for i in range(len(nums) - 1):
-            if nums[i+1] - nums[i] == 1:
-                atual += 1
-                maior = max(maior, atual)
-            else:
-                atual = 1
-        
-        return maior
+        return lb.maior_sequencia(lb.mascara(jogo))
     
     def _contar_consecutivos(self, jogo):
         """Conta pares consecutivos (não blocos)"""
-        nums = sorted(jogo)
-        count = 0
-        for i in range(len(nums) - 1):
-            if nums[i+1] - nums[i] == 1:
-                count += 1
-        return count
+        return lb.consecutivos(lb.mascara(jogo))
     
     def _tem_dois_blocos(self, jogo):
         """Verifica se tem pelo menos 2 blocos consecutivos diferentes"""
-        nums = sorted(jogo)
-        blocos = []
-        atual = 1
-        
-        for i in range(len(nums) - 1):
-            if nums[i+1] - nums[i] == 1:
-                atual += 1
-            else:
-                if atual >= 2:
-                    blocos.append(atual)
-                atual = 1
-        
-        # Verificar último bloco
-        if atual >= 2:
-            blocos.append(atual)
-        
+        m = lb.mascara(jogo)
         # Para 13+: precisa de 1 bloco longo (≥3) e 1 bloco curto (2)
-        return len(blocos) >= 2 and max(blocos) >= 3
+        return lb.blocos(m) >= 2 and lb.maior_sequencia(m) >= 3
     
     def jogo_valido(self, jogo):
         """
@@ -2047,18 +1998,19 @@ class Gerador13Plus:
             return False, {"erro": "Tamanho incorreto"}
         
         # Calcular métricas
-        baixas = sum(1 for n in jogo if n in self.baixas)
-        medias = sum(1 for n in jogo if n in self.medias)
-        altas = sum(1 for n in jogo if n in self.altas)
+        m = lb.mascara(jogo)
+        baixas = lb.popcount(m & self.mascara_baixas)
+        medias = lb.popcount(m & self.mascara_medias)
+        altas = lb.popcount(m & self.mascara_altas)
         
-        pares = sum(1 for n in jogo if n % 2 == 0)
-        primos = sum(1 for n in jogo if n in self.primos)
-        soma = sum(jogo)
+        pares = lb.popcount(m & lb.PARES)
+        primos = lb.popcount(m & self.mascara_primos)
+        soma = lb.soma(m)
         
-        repetidas = len(set(jogo) & set(self.ultimo))
-        consecutivos = self._contar_consecutivos(jogo)
-        maior_bloco = self._maior_bloco_consecutivo(jogo)
-        tem_dois_blocos = self._tem_dois_blocos(jogo)
+        repetidas = lb.popcount(m & self.mascara_ultimo)
+        consecutivos = lb.consecutivos(m)
+        maior_bloco = lb.maior_sequencia(m)
+        tem_dois_blocos = lb.blocos(m) >= 2 and maior_bloco >= 3
         
         # Diagnóstico detalhado
         diag = {
@@ -2125,6 +2077,41 @@ class Gerador13Plus:
         
         return aprovado, diag
     
+    def filtrar_lote(self, mascaras):
+        """Mesmas regras de jogo_valido sobre um array de máscaras (regras e bloqueios juntos)"""
+        soma = lb.soma_lote(mascaras)
+        repetidas = lb.contar_lote(mascaras, self.mascara_ultimo)
+        consecutivos = lb.consecutivos_lote(mascaras)
+        maior_bloco = lb.maior_sequencia_lote(mascaras)
+        return (
+            (lb.contar_lote(mascaras, self.mascara_baixas) == 4) &
+            (lb.contar_lote(mascaras, self.mascara_medias) == 6) &
+            (lb.contar_lote(mascaras, self.mascara_altas) == 5) &
+            (lb.contar_lote(mascaras, lb.PARES) == 7) &
+            (soma >= 195) & (soma <= 205) &
+            (lb.contar_lote(mascaras, self.mascara_primos) == 5) &
+            ((repetidas == 10) | (repetidas == 11)) &
+            ((consecutivos == 3) | (consecutivos == 4)) &
+            (maior_bloco >= 3) &
+            (lb.blocos_lote(mascaras) >= 2)
+        )
+    
+    def filtrar_indice(self, indice):
+        """Mesmas regras de filtrar_lote direto nas colunas do índice completo"""
+        repetidas = indice.contar(self.mascara_ultimo)
+        return (
+            (indice.coluna("faixa_baixa") == 4) &
+            (indice.coluna("faixa_media") == 6) &
+            (indice.coluna("faixa_alta") == 5) &
+            (indice.coluna("pares") == 7) &
+            indice.entre("soma", 195, 205) &
+            (indice.coluna("primos") == 5) &
+            ((repetidas == 10) | (repetidas == 11)) &
+            indice.entre("consecutivos", 3, 4) &
+            (indice.coluna("maior_sequencia") >= 3) &
+            (indice.coluna("blocos") >= 2)
+        )
+    
     def _gerar_jogo_ponderado(self):
         """
         Gera um jogo usando pool ponderado baseado em:
@@ -2152,67 +2139,41 @@ class Gerador13Plus:
         
         return pool, pesos
     
-    def gerar_jogo(self, max_tentativas=20000):
+    def gerar_jogo(self):
         """
         Gera um único jogo válido
-        Mais tentativas porque 13+ é mais restritivo
         """
-        pool, pesos = self._gerar_jogo_ponderado()
-        
-        for _ in range(max_tentativas):
-            # Gerar 15 números com pesos
-            indices = np.random.choice(len(pool), size=15, replace=False, p=pesos)
-            jogo = sorted([pool[i] for i in indices])
-            
-            # Validar
-            aprovado, diag = self.jogo_valido(jogo)
-            if aprovado:
-                return jogo, diag
-        
-        # Fallback: gerar aleatório simples e tentar validar
-        for _ in range(max_tentativas * 2):
-            jogo = sorted(random.sample(range(1, 26), 15))
-            aprovado, diag = self.jogo_valido(jogo)
-            if aprovado:
-                return jogo, diag
-        
+        jogos, _ = self._coletar_jogos(1)
+        if jogos:
+            return jogos[0], self.jogo_valido(jogos[0])[1]
         return None, None
     
-    def gerar_multiplos_jogos(self, quantidade, max_total_tentativas=500000):
+    def _coletar_jogos(self, quantidade):
+        """
+        Consulta o índice pelas combinações que passam em todas as regras e sorteia
+        entre elas com o peso das dezenas (produto dos pesos do pool ponderado).
+        Retorna (jogos, combinações que passam nos filtros).
+        """
+        indice = obter_indice()
+        sobreviventes = np.flatnonzero(self.filtrar_indice(indice))
+        _, pesos = self._gerar_jogo_ponderado()
+        mascaras = indice.sortear(sobreviventes, quantidade, self.rng, pesos=pesos)
+        return [lb.dezenas(m) for m in mascaras], len(sobreviventes)
+    
+    def gerar_multiplos_jogos(self, quantidade):
         """
         Gera múltiplos jogos válidos
-        MUITAS tentativas porque 13+ é extremamente restritivo
+        (13+ é extremamente restritivo: poucas combinações passam nos filtros)
         """
-        jogos = []
-        diagnosticos = []
-        tentativas = 0
-        
-        # Barra de progresso
-        progress_text = "Gerando jogos 13+ (paciência, é restritivo)..."
-        progress_bar = st.progress(0, text=progress_text)
-        
-        while len(jogos) < quantidade and tentativas < max_total_tentativas:
-            jogo, diag = self.gerar_jogo()
-            tentativas += 1
-            
-            if jogo and jogo not in jogos:  # Evitar duplicatas
-                jogos.append(jogo)
-                diagnosticos.append(diag)
-                
-                # Atualizar progresso
-                progress_bar.progress(len(jogos) / quantidade, text=progress_text)
-            
-            # Atualizar a cada 1000 tentativas para não travar
-            if tentativas % 1000 == 0:
-                progress_bar.progress(len(jogos) / quantidade, 
-                                     text=f"{len(jogos)}/{quantidade} jogos encontrados em {tentativas} tentativas...")
-        
-        progress_bar.empty()
+        with st.spinner("Gerando jogos 13+..."):
+            jogos, combinacoes = self._coletar_jogos(quantidade)
+            diagnosticos = [self.jogo_valido(jogo)[1] for jogo in jogos]
         
+        taxa = combinacoes / len(obter_indice()) * 100
         if len(jogos) < quantidade:
-            st.warning(f"⚠️ Gerados apenas {len(jogos)} jogos 13+ em {tentativas} tentativas (taxa de acerto: {len(jogos)/tentativas*100:.4f}%)")
+            st.warning(f"⚠️ Gerados apenas {len(jogos)} jogos 13+: só {combinacoes} combinações passam nos filtros ({taxa:.4f}% do total)")
         else:
-            st.success(f"✅ {len(jogos)} jogos 13+ gerados em {tentativas} tentativas (taxa: {len(jogos)/tentativas*100:.4f}%)")
+            st.success(f"✅ {len(jogos)} jogos 13+ sorteados entre {combinacoes} combinações válidas ({taxa:.4f}% do total)")
         
         return jogos, diagnosticos
     
@@ -2285,84 +2246,76 @@ class GeradorProfissional:
         self.medias = list(range(9, 17))   # 09-16
         self.altas = list(range(17, 25))   # 17-25
         
+        # Máscaras de bits para os filtros
+        self.mascara_ultimo = lb.mascara(self.ultimo_concurso)
+        self.mascara_baixas = lb.mascara(self.baixas)
+        self.mascara_medias = lb.mascara(self.medias)
+        self.mascara_altas = lb.mascara(self.altas)
+        self.rng = np.random.default_rng()
+        
     def contar_consecutivos(self, jogo):
         """
         Conta o tamanho da maior sequência consecutiva no jogo
         """
-        jogo_sorted = sorted(jogo)
-        maior = 1
-        atual = 1
-        
-        for i in range(1, len(jogo_sorted)):
-            if jogo_sorted[i] == jogo_sorted[i-1] + 1:
-                atual += 1
-                maior = max(maior, atual)
-            else:
-                atual = 1
-                
-        return maior
+        return lb.maior_sequencia(lb.mascara(jogo))
     
     def verificar_padrao(self, jogo, padrao):
         """
         Verifica se o jogo segue um padrão específico B-M-A
         """
-        baixas = sum(1 for n in jogo if n in self.baixas)
-        medias = sum(1 for n in jogo if n in self.medias)
-        altas = sum(1 for n in jogo if n in self.altas)
-        
+        m = lb.mascara(jogo)
+        config = self.PADROES_DISPONIVEIS[padrao]
+        return (lb.popcount(m & self.mascara_baixas) == config["baixas"] and 
+                lb.popcount(m & self.mascara_medias) == config["medias"] and 
+                lb.popcount(m & self.mascara_altas) == config["altas"])
+    
+    def filtrar_lote(self, mascaras):
+        """PASSOS 2 a 5 (pares, repetidas, sequência, soma) sobre um array de máscaras"""
+        pares = lb.contar_lote(mascaras, lb.PARES)
+        seq = lb.maior_sequencia_lote(mascaras)
+        soma = lb.soma_lote(mascaras)
+        aprovado = (pares >= 6) & (pares <= 8) & (seq >= 4) & (seq <= 6) & (soma >= 180) & (soma <= 220)
+        if self.ultimo_concurso:
+            repetidas = lb.contar_lote(mascaras, self.mascara_ultimo)
+            aprovado &= (repetidas == 8) | (repetidas == 9)
+        return aprovado
+    
+    def filtrar_indice(self, indice, padrao):
+        """Padrão B-M-A e passos 2 a 5 direto nas colunas do índice completo"""
         config = self.PADROES_DISPONIVEIS[padrao]
-        return (baixas == config["baixas"] and 
-                medias == config["medias"] and 
-                altas == config["altas"])
+        aprovado = (
+            (indice.coluna("faixa_baixa") == config["baixas"]) &
+            (indice.coluna("faixa_media") == config["medias"]) &
+            (indice.contar(self.mascara_altas) == config["altas"]) &
+            indice.entre("pares", 6, 8) & indice.entre("maior_sequencia", 4, 6) & indice.entre("soma", 180, 220)
+        )
+        if self.ultimo_concurso:
+            repetidas = indice.contar(self.mascara_ultimo)
+            aprovado &= (repetidas == 8) | (repetidas == 9)
+        return aprovado
+    
+    def _diagnostico(self, jogo, padrao):
+        m = lb.mascara(jogo)
+        config = self.PADROES_DISPONIVEIS[padrao]
+        return {
+            "padrao": padrao,
+            "distribuicao": f"{config['baixas']}-{config['medias']}-{config['altas']}",
+            "pares": lb.popcount(m & lb.PARES),
+            "repetidas": lb.popcount(m & self.mascara_ultimo) if self.ultimo_concurso else 0,
+            "sequencia_max": lb.maior_sequencia(m),
+            "soma": lb.soma(m)
+        }
     
-    def gerar_jogo_com_padrao(self, padrao, max_tentativas=5000):
+    def gerar_jogo_com_padrao(self, padrao):
         """
         Gera um jogo respeitando um padrão específico e todos os filtros
         """
-        config = self.PADROES_DISPONIVEIS[padrao]
-        
-        for tentativa in range(max_tentativas):
-            jogo = set()
-            
-            # PASSO 1: Distribuição conforme padrão selecionado
-            jogo.update(random.sample(self.baixas, config["baixas"]))
-            jogo.update(random.sample(self.medias, config["medias"]))
-            jogo.update(random.sample(self.altas, config["altas"]))
-            
-            jogo = sorted(jogo)
-            
-            # PASSO 2: Verificar pares/ímpares
-            pares = sum(1 for n in jogo if n % 2 == 0)
-            if pares not in [6, 7, 8]:
-                continue
-            
-            # PASSO 3: Verificar repetidas do último concurso
-            if self.ultimo_concurso:
-                repetidas = len(set(jogo) & self.ultimo_concurso)
-                if repetidas not in [8, 9]:
-                    continue
-            
-            # PASSO 4: Verificar sequências consecutivas
-            seq = self.contar_consecutivos(jogo)
-            if seq < 4 or seq > 6:
-                continue
-            
-            # PASSO 5: Verificar soma total
-            soma = sum(jogo)
-            if soma < 180 or soma > 220:
-                continue
-            
-            # Se passou por todos os filtros, jogo é válido
-            return jogo, {
-                "padrao": padrao,
-                "distribuicao": f"{config['baixas']}-{config['medias']}-{config['altas']}",
-                "pares": pares,
-                "repetidas": repetidas if self.ultimo_concurso else 0,
-                "sequencia_max": seq,
-                "soma": soma
-            }
-        
-        return None, None
+        indice = obter_indice()
+        mascaras = indice.sortear(self.filtrar_indice(indice, padrao), 1, self.rng)
+        if not mascaras:
+            return None, None
+        jogo = lb.dezenas(mascaras[0])
+        return jogo, self._diagnostico(jogo, padrao)
     
     def gerar_jogo(self):
         """
@@ -2385,8 +2338,6 @@ class GeradorProfissional:
         """
         jogos = []
         diagnosticos = []
-        tentativas = 0
-        max_tentativas = quantidade * 10000
         
         # Se não houver distribuição, distribuir igualmente
         if not distribuicao_por_padrao:
@@ -2415,33 +2366,24 @@ class GeradorProfissional:
         progress_text = "Gerando jogos profissionais com padrões selecionados..."
         progress_bar = st.progress(0, text=progress_text)
         
-        total_gerados = 0
+        indice = obter_indice()
+        esgotados = []
         for padrao, qtd_alvo in jogos_por_padrao.items():
-            qtd_gerados_padrao = 0
-            while qtd_gerados_padrao < qtd_alvo and tentativas < max_tentativas:
-                jogo, diag = self.gerar_jogo_com_padrao(padrao)
-                tentativas += 1
-                
-                if jogo and jogo not in jogos:
-                    jogos.append(jogo)
-                    diagnosticos.append(diag)
-                    qtd_gerados_padrao += 1
-                    total_gerados += 1
-                    
-                    # Atualizar progresso
-                    progress_bar.progress(total_gerados / quantidade, text=progress_text)
-                
-                # Atualizar a cada 1000 tentativas
-                if tentativas % 1000 == 0:
-                    progress_bar.progress(
-                        total_gerados / quantidade, 
-                        text=f"{total_gerados}/{quantidade} jogos encontrados ({tentativas} tentativas)..."
-                    )
+            if qtd_alvo <= 0:
+                continue
+            mascaras = indice.sortear(self.filtrar_indice(indice, padrao), qtd_alvo, self.rng)
+            if len(mascaras) < qtd_alvo:
+                esgotados.append(padrao)
+            for m in mascaras:
+                jogo = lb.dezenas(m)
+                jogos.append(jogo)
+                diagnosticos.append(self._diagnostico(jogo, padrao))
+            progress_bar.progress(min(len(jogos) / quantidade, 1.0), text=progress_text)
         
         progress_bar.empty()
         
         if len(jogos) < quantidade:
-            st.warning(f"⚠️ Gerados apenas {len(jogos)} jogos profissionais em {tentativas} tentativas")
+            st.warning(f"⚠️ Gerados apenas {len(jogos)} jogos profissionais: sem combinações suficientes para {', '.join(esgotados)}")
         
         return jogos, diagnosticos
     
@@ -2466,12 +2408,22 @@ class SistemaAutonomo:
     Sistema que testa múltiplas estratégias e escolhe automaticamente a melhor
     Baseado no estudo de auto-estratégia com backtest
     AGORA COM ESTRATÉGIA HARD OTIMIZADA (Top 10 + 8 Atrasados + 5 Rotativos)
+    (backtest walk-forward em backtest_lotofacil, estratégias em paralelo)
     """
     
+    # Nome exibido -> chave da estratégia em backtest_lotofacil
+    ESTRATEGIAS = {
+        "🎯 Frequência (quentes)": "frequencia",
+        "⏱️ Atraso (frias)": "atraso",
+        "🧬 Híbrida (70/30)": "hibrida",
+        "🎲 Aleatória": "aleatoria",
+        "🔥 HARD Otimizado": "hard",
+    }
+    
     def __init__(self, concursos_historico):
         """
         Args:
-            concursos_historico: Lista de listas com todos os concursos
+            concursos_historico: Lista de listas com todos os concursos (mais recente primeiro)
         """
         self.concursos = concursos_historico
         self.total_concursos = len(concursos_historico)
@@ -2483,52 +2435,30 @@ class SistemaAutonomo:
         
         # Número de testes no backtest (padrão)
         self.num_testes = 50
+        self.semente = bt.SEMENTE_PADRAO
+        self.rng = np.random.default_rng()
+        
+        # Frequência/atraso de todo o histórico, para gerar os jogos de agora
+        self.estado = bt.EstadoHistorico.de_concursos(reversed(self.concursos))
+        self.ultimo_backtest = None
         
     # ===== ESTRATÉGIAS DE SELEÇÃO DE BASE =====
     
     def estrategia_frequencia(self, qtd=18):
         """Seleciona números mais frequentes"""
-        freq = Counter()
-        for c in self.concursos:
-            freq.update(c)
-        return sorted(freq, key=freq.get, reverse=True)[:qtd]
+        return bt.base_frequencia(self.estado, self.rng, qtd)
     
     def estrategia_atraso(self, qtd=18):
         """Seleciona números mais atrasados"""
-        atraso = {n: 0 for n in range(1, 26)}
-        for c in reversed(self.concursos):
-            for n in range(1, 26):
-                if n not in c:
-                    atraso[n] += 1
-        return sorted(atraso, key=atraso.get, reverse=True)[:qtd]
+        return bt.base_atraso(self.estado, self.rng, qtd)
     
     def estrategia_hibrida(self, qtd=18):
         """Mix de frequência e atraso (70% freq + 30% atraso)"""
-        freq = Counter()
-        for c in self.concursos:
-            freq.update(c)
-        
-        atraso = {n: 0 for n in range(1, 26)}
-        for c in reversed(self.concursos):
-            for n in range(1, 26):
-                if n not in c:
-                    atraso[n] += 1
-        
-        # Normalizar scores
-        max_freq = max(freq.values())
-        max_atraso = max(atraso.values())
-        
-        score = {}
-        for n in range(1, 26):
-            freq_norm = freq[n] / max_freq if max_freq > 0 else 0
-            atraso_norm = atraso[n] / max_atraso if max_atraso > 0 else 0
-            score[n] = freq_norm * 0.7 + atraso_norm * 0.3
-        
-        return sorted(score, key=score.get, reverse=True)[:qtd]
+        return bt.base_hibrida(self.estado, self.rng, qtd)
     
     def estrategia_aleatoria(self, qtd=18):
         """Seleção aleatória controlada"""
-        return sorted(random.sample(range(1, 26), qtd))
+        return bt.base_aleatoria(self.estado, self.rng, qtd)
     
     # ===== NOVA ESTRATÉGIA HARD OTIMIZADA =====
     def estrategia_hard_otimizado(self, qtd=18):
@@ -2540,102 +2470,23 @@ class SistemaAutonomo:
         - Restante como rotativos
         Retorna os qtd números para a base
         """
-        # Calcular frequência de todos os números
-        freq = Counter()
-        for c in self.concursos:
-            freq.update(c)
-        
-        # Top 10 mais frequentes (base fixa)
-        top_10 = [n for n, _ in freq.most_common(10)]
-        
-        # 8 menos frequentes (atrasados)
-        menos_frequentes = sorted(freq.items(), key=lambda x: x[1])[:8]
-        atrasados = [n for n, _ in menos_frequentes]
-        
-        # Rotativos = resto
-        rotativos = list(set(range(1, 26)) - set(top_10) - set(atrasados))
-        
-        # Para formar a base de qtd números, combinar:
-        # - Todos os top_10 (10 números)
-        # - Complementar com atrasados e rotativos conforme necessário
-        base = top_10.copy()
-        
-        # Se precisar de mais números, adicionar atrasados
-        if len(base) < qtd:
-            faltam = qtd - len(base)
-            base.extend(atrasados[:faltam])
-        
-        # Se ainda faltar, adicionar rotativos
-        if len(base) < qtd:
-            faltam = qtd - len(base)
-            base.extend(random.sample(rotativos, min(faltam, len(rotativos))))
-        
-        # Garantir que todos são únicos
-        base = sorted(list(set(base)))
-        
-        # Se ainda não atingiu qtd, completar com números aleatórios
-        while len(base) < qtd:
-            novo = random.randint(1, 25)
-            if novo not in base:
-                base.append(novo)
-        
+        top_10, atrasados, rotativos = bt.componentes_hard(self.estado)
+        base = top_10 + atrasados[:max(0, qtd - len(top_10))]
+        faltam = qtd - len(base)
+        if faltam > 0:
+            base += [int(n) for n in self.rng.choice(rotativos, min(faltam, len(rotativos)), replace=False)]
         return sorted(base[:qtd])
     
     # ===== GERADOR DE JOGOS HARD =====
-    def gerar_jogo_hard(self, base, rotativos, atrasados, max_tentativas=1000):
+    def gerar_jogo_hard(self, base, rotativos, atrasados):
         """
         Gera um jogo usando a estrutura HARD:
         - Base fixa (10 números mais frequentes)
         - 5 números dos rotativos
         - Garantia de pelo menos 2 atrasados
         """
-        def valido(jogo):
-            pares = sum(1 for n in jogo if n % 2 == 0)
-            
-            # Distribuição por linhas do volante (5x5)
-            linhas = [0] * 5
-            for n in jogo:
-                linhas[(n-1)//5] += 1
-            
-            return (
-                6 <= pares <= 9 and
-                2 <= linhas[0] <= 4 and
-                2 <= linhas[1] <= 4 and
-                2 <= linhas[2] <= 4 and
-                1 <= linhas[3] <= 3 and
-                3 <= linhas[4] <= 5 and
-                len(set(jogo) & set(atrasados)) >= 2  # Pelo menos 2 atrasados
-            )
-        
-        for _ in range(max_tentativas):
-            # Selecionar 5 números dos rotativos (se disponível)
-            if len(rotativos) >= 5:
-                selecionados = random.sample(rotativos, 5)
-            else:
-                # Se não houver rotativos suficientes, completar com aleatórios
-                selecionados = random.sample([n for n in range(1, 26) if n not in base], 5)
-            
-            jogo = sorted(base + selecionados)
-            
-            # Garantir que temos exatamente 15 números únicos
-            jogo = sorted(list(set(jogo)))
-            if len(jogo) != 15:
-                continue
-            
-            if valido(jogo):
-                return jogo
-        
-        # Fallback: gerar jogo válido de forma mais simples
-        for _ in range(max_tentativas):
-            # Usar base completa + complemento aleatório
-            complemento = random.sample([n for n in range(1, 26) if n not in base], 5)
-            jogo = sorted(base + complemento)
-            jogo = sorted(list(set(jogo)))
-            
-            if len(jogo) == 15 and valido(jogo):
-                return jogo
-        
-        return None
+        mascaras = bt.jogos_hard(base, rotativos, atrasados, 1, self.rng)
+        return lb.dezenas(mascaras[0]) if mascaras else None
     
     # ===== VALIDAÇÃO DE JOGOS =====
     
@@ -2643,83 +2494,63 @@ class SistemaAutonomo:
         """
         Valida se o jogo respeita os filtros básicos
         """
+        m = lb.mascara(jogo)
+        
         # Pares/Ímpares
-        pares = sum(1 for n in jogo if n % 2 == 0)
-        if not (6 <= pares <= 9):
+        if not (6 <= lb.popcount(m & lb.PARES) <= 9):
             return False
         
         # Distribuição por linhas (2-4 por linha)
-        linhas = [0] * 5
-        for n in jogo:
-            linhas[(n-1)//5] += 1
-        if any(l < 2 or l > 4 for l in linhas):
+        if any(l < 2 or l > 4 for l in lb.linhas(m)):
             return False
         
         # Sequências consecutivas
-        seq = 0
-        for i in range(len(jogo)-1):
-            if jogo[i] + 1 == jogo[i+1]:
-                seq += 1
-        if not (2 <= seq <= 5):
+        if not (2 <= lb.consecutivos(m) <= 5):
             return False
         
         return True
     
+    def jogo_valido_lote(self, mascaras):
+        """jogo_valido sobre um array de máscaras"""
+        return bt.filtro_basico_lote(mascaras)
+    
     # ===== GERADOR DE JOGOS BASE =====
     
     def gerar_jogos_base(self, base, qtd=10):
         """
         Gera jogos a partir de uma base de números
         """
-        jogos = []
-        max_tentativas = qtd * 1000
-        tentativas = 0
-        
-        while len(jogos) < qtd and tentativas < max_tentativas:
-            jogo = sorted(random.sample(base, 15))
-            if self.jogo_valido(jogo) and jogo not in jogos:
-                jogos.append(jogo)
-            tentativas += 1
-        
-        return jogos
+        return [lb.dezenas(m) for m in bt.jogos_base(base, qtd, self.rng)]
     
     # ===== BACKTEST =====
     
+    def executar_backtest(self, estrategias=None, num_testes=None, processos=None, ao_progredir=None):
+        """
+        Backtest walk-forward nos últimos num_testes concursos: cada concurso é previsto
+        só com os anteriores a ele. Retorna a tabela por concurso (uma linha por estratégia).
+        """
+        if num_testes is None:
+            num_testes = self.num_testes
+        return bt.executar_backtest(
+            list(reversed(self.concursos)),
+            estrategias=estrategias or bt.ESTRATEGIAS,
+            num_testes=num_testes,
+            semente=self.semente,
+            processos=processos,
+            ao_progredir=ao_progredir
+        )
+    
+    def _score(self, tabela):
+        return float(tabela["melhor"].mean()) if not tabela.empty else 0
+    
     def avaliar_estrategia(self, estrategia_func, num_testes=None):
         """
         Avalia uma estratégia via backtest
         """
         if self.total_concursos < 100:
             return 0
-        
-        if num_testes is None:
-            num_testes = self.num_testes
-        
-        resultados = []
-        
-        for i in range(50, min(50 + num_testes, self.total_concursos - 1)):
-            # Dados históricos até o concurso i
-            historico = self.concursos[:i]
-            resultado_real = set(self.concursos[i])
-            
-            # Se a estratégia espera concursos, passa o histórico
-            if estrategia_func.__name__ in ['estrategia_hard_otimizado']:
-                base = estrategia_func(qtd=18)
-            else:
-                base = estrategia_func(qtd=18)
-            
-            # Gerar jogos
-            jogos = self.gerar_jogos_base(base, qtd=10)
-            
-            # Calcular melhor acerto
-            melhor = 0
-            for j in jogos:
-                acertos = len(set(j) & resultado_real)
-                melhor = max(melhor, acertos)
-            
-            resultados.append(melhor)
-        
-        return np.mean(resultados) if resultados else 0
+        chave = estrategia_func.__name__.replace("estrategia_", "")
+        return self._score(self.executar_backtest([chave], num_testes, processos=1))
     
     # ===== BACKTEST PARA ESTRATÉGIA HARD (usa gerador específico) =====
     def avaliar_estrategia_hard(self, num_testes=None):
@@ -2728,99 +2559,45 @@ class SistemaAutonomo:
         """
         if self.total_concursos < 100:
             return 0
-        
-        if num_testes is None:
-            num_testes = self.num_testes
-        
-        resultados = []
-        
-        for i in range(50, min(50 + num_testes, self.total_concursos - 1)):
-            # Dados históricos até o concurso i
-            historico = self.concursos[:i]
-            resultado_real = set(self.concursos[i])
-            
-            # Gerar base HARD
-            freq = Counter()
-            for c in historico:
-                freq.update(c)
-            
-            top_10 = [n for n, _ in freq.most_common(10)]
-            menos_frequentes = sorted(freq.items(), key=lambda x: x[1])[:8]
-            atrasados = [n for n, _ in menos_frequentes]
-            rotativos = list(set(range(1, 26)) - set(top_10) - set(atrasados))
-            
-            # Gerar 10 jogos HARD
-            jogos = []
-            for _ in range(10):
-                jogo = self.gerar_jogo_hard(top_10, rotativos, atrasados)
-                if jogo:
-                    jogos.append(jogo)
-            
-            # Calcular melhor acerto
-            melhor = 0
-            for j in jogos:
-                acertos = len(set(j) & resultado_real)
-                melhor = max(melhor, acertos)
-            
-            resultados.append(melhor)
-        
-        return np.mean(resultados) if resultados else 0
+        return self._score(self.executar_backtest(["hard"], num_testes, processos=1))
     
     # ===== AUTO SELEÇÃO =====
     
     def escolher_melhor_estrategia(self, progress_callback=None):
         """
-        Testa todas as estratégias e retorna a melhor
+        Testa todas as estratégias (em paralelo) e retorna a melhor
         """
-        estrategias = {
-            "🎯 Frequência (quentes)": self.estrategia_frequencia,
-            "⏱️ Atraso (frias)": self.estrategia_atraso,
-            "🧬 Híbrida (70/30)": self.estrategia_hibrida,
-            "🎲 Aleatória": self.estrategia_aleatoria,
-            "🔥 HARD Otimizado": None  # Tratamento especial
+        funcoes = {
+            "frequencia": self.estrategia_frequencia,
+            "atraso": self.estrategia_atraso,
+            "hibrida": self.estrategia_hibrida,
+            "aleatoria": self.estrategia_aleatoria,
+            "hard": self.estrategia_hard_otimizado,
         }
+        nomes = {chave: nome for nome, chave in self.ESTRATEGIAS.items()}
         
-        scores = {}
-        detalhes = {}
-        
-        total_estrategias = len(estrategias)
-        idx = 0
-        
-        # Testar estratégias normais
-        for nome, func in estrategias.items():
-            if func is None:
-                continue
-            
+        if self.total_concursos < 100:
+            tabela = pd.DataFrame(columns=["estrategia", "melhor"])
+        else:
             if progress_callback:
-                progress_callback(idx / total_estrategias, f"Testando {nome}...")
-            
-            score = self.avaliar_estrategia(func)
-            scores[nome] = score
-            detalhes[nome] = {
-                "score": score,
-                "func": func,
-                "tipo": "normal"
-            }
-            idx += 1
-        
-        # Testar estratégia HARD especial
-        if progress_callback:
-            progress_callback(idx / total_estrategias, "Testando 🔥 HARD Otimizado...")
-        
-        score_hard = self.avaliar_estrategia_hard()
-        scores["🔥 HARD Otimizado"] = score_hard
-        detalhes["🔥 HARD Otimizado"] = {
-            "score": score_hard,
-            "func": self.estrategia_hard_otimizado,
-            "gerador": self.gerar_jogo_hard,
-            "tipo": "hard"
-        }
+                progress_callback(0.0, f"Backtest walk-forward em {self.num_testes} concursos...")
+            tabela = self.executar_backtest(
+                ao_progredir=(lambda feitas, total, chave: progress_callback(
+                    feitas / total, f"{nomes[chave]} concluída ({feitas}/{total})"
+                )) if progress_callback else None
+            )
+        self.ultimo_backtest = tabela
+        
+        scores = {}
+        for nome, chave in self.ESTRATEGIAS.items():
+            scores[nome] = self._score(tabela[tabela["estrategia"] == chave])
         
         # Encontrar melhor estratégia
         melhor_nome = max(scores, key=scores.get)
         melhor_score = scores[melhor_nome]
-        melhor_func = detalhes[melhor_nome]["func"]
-        melhor_tipo = detalhes[melhor_nome].get("tipo", "normal")
+        melhor_chave = self.ESTRATEGIAS[melhor_nome]
+        melhor_func = funcoes[melhor_chave]
+        melhor_tipo = "hard" if melhor_chave == "hard" else "normal"
         
         return melhor_nome, melhor_func, melhor_score, scores, melhor_tipo
     
@@ -2843,13 +2620,7 @@ class SistemaAutonomo:
         
         if melhor_tipo == "hard":
             # Para estratégia HARD, precisamos dos componentes
-            freq = Counter()
-            for c in self.concursos:
-                freq.update(c)
-            
-            base = [n for n, _ in freq.most_common(10)]
-            atrasados = [n for n, _ in sorted(freq.items(), key=lambda x: x[1])[:8]]
-            rotativos = list(set(range(1, 26)) - set(base) - set(atrasados))
+            base, atrasados, rotativos = bt.componentes_hard(self.estado)
         else:
             base = melhor_func(qtd=18)
         
@@ -2858,12 +2629,7 @@ class SistemaAutonomo:
         
         if melhor_tipo == "hard":
             # Usar gerador HARD
-            for _ in range(qtd_jogos * 2):  # Tentar mais vezes
-                jogo = self.gerar_jogo_hard(base, rotativos, atrasados)
-                if jogo and jogo not in jogos:
-                    jogos.append(jogo)
-                if len(jogos) >= qtd_jogos:
-                    break
+            jogos = [lb.dezenas(m) for m in bt.jogos_hard(base, rotativos, atrasados, qtd_jogos, self.rng)]
         else:
             # Usar gerador base normal
             jogos = self.gerar_jogos_base(base, qtd=qtd_jogos)
@@ -2875,7 +2641,8 @@ class SistemaAutonomo:
             "todos_scores": todos_scores,
             "base_utilizada": sorted(base) if base else [],
             "jogos": jogos,
-            "quantidade_jogos": len(jogos)
+            "quantidade_jogos": len(jogos),
+            "resumo_backtest": bt.resumo_backtest(self.ultimo_backtest)
         }
 
 # =====================================================
@@ -2951,27 +2718,12 @@ def log_likelihood(features, dist):
         logL += w * math.log(p)
     return logL
 
-@st.cache_data
-def baseline_aleatorio(n=200000):
+def baseline_aleatorio():
     """
     Baseline estatisticamente correto para Lotofácil
-    Simula interseção de dois conjuntos aleatórios de 15 números em 25
+    Interseção de dois conjuntos aleatórios de 15 números em 25 (hipergeométrica exata)
     """
-    acertos = []
-    
-    for _ in range(n):
-        jogo = set(random.sample(range(1, 26), 15))
-        sorteio = set(random.sample(range(1, 26), 15))
-        acertos.append(len(jogo & sorteio))
-    
-    acertos = np.array(acertos)
-    
-    return {
-        "media": acertos.mean(),
-        "std": acertos.std(),
-        "dist": np.bincount(acertos, minlength=16) / n,
-        "descricao": "Interseção 15×15 em universo 25"
-    }
+    return prob.baseline()
 
 def criar_historico_df(dados_api, qtd_concursos):
     """Cria DataFrame com features históricas"""
@@ -3008,32 +2760,14 @@ FEATURE_WEIGHTS = {
 }
 
 # =====================================================
-# FUNÇÃO MONTE CARLO PARA O NÍVEL PROFISSIONAL
+# PROBABILIDADES PARA O NÍVEL PROFISSIONAL
 # =====================================================
-@st.cache_data
-def monte_carlo_jogo(jogo_tuple, n_sim):
+def probabilidades_jogo(jogo_tuple):
     """
-    Simulação Monte Carlo para um jogo específico
-    Retorna probabilidades empíricas de acertos
+    Probabilidades exatas de acertos de um jogo específico
+    (P(≥11..15), média e desvio)
     """
-    jogo = set(jogo_tuple)
-    acertos = []
-
-    for _ in range(n_sim):
-        sorteio = set(random.sample(range(1, 26), 15))
-        acertos.append(len(jogo & sorteio))
-
-    acertos = np.array(acertos)
-
-    return {
-        "P>=11": np.mean(acertos >= 11),
-        "P>=12": np.mean(acertos >= 12),
-        "P>=13": np.mean(acertos >= 13),
-        "P>=14": np.mean(acertos >= 14),
-        "P=15": np.mean(acertos == 15),
-        "media": acertos.mean(),
-        "std": acertos.std()
-    }
+    return prob.resumo_jogo(jogo_tuple)
 
 # =====================================================
 # FUNÇÃO PARA VERIFICAR E RECUPERAR JOGOS
@@ -3589,8 +3323,12 @@ def main():
         st.session_state.baseline_cache = None
     if "mc_resultados" not in st.session_state:
         st.session_state.mc_resultados = None
+    if "mc_conjunto" not in st.session_state:
+        st.session_state.mc_conjunto = None
     if "jogos_3622" not in st.session_state:
         st.session_state.jogos_3622 = None
+    if "fechamento_otimizado" not in st.session_state:
+        st.session_state.fechamento_otimizado = None
     if "diagnosticos_3622" not in st.session_state:
         st.session_state.diagnosticos_3622 = None
     if "jogos_otimizados" not in st.session_state:
@@ -3666,27 +3404,33 @@ def main():
         
         if st.button("📥 Carregar concursos", use_container_width=True):
             with st.spinner("Carregando dados da Caixa..."):
-                try:
-                    url = "https://loteriascaixa-api.herokuapp.com/api/lotofacil/"
-                    response = requests.get(url)
-                    st.session_state.dados_api = response.json()
-                    concursos = [sorted(map(int, d["dezenas"])) for d in st.session_state.dados_api[:qtd]]
-                    st.session_state.analise = AnaliseLotofacilBasica(concursos, st.session_state.dados_api[:qtd])
+                # histórico inteiro (a primeira carga baixa a lista completa); sem API, a base local
+                dados_api, erro = resultados_lotofacil.carregar_dados_api(qtd)
+                if erro is not None:
+                    if dados_api:
+                        st.warning(f"API indisponível ({type(erro).__name__}); usando {len(dados_api)} concursos da base local.")
+                    else:
+                        st.error(f"Erro ao carregar: {erro}")
+                if dados_api:
+                    try:
+                        st.session_state.dados_api = dados_api
+                        concursos = [sorted(map(int, d["dezenas"])) for d in st.session_state.dados_api[:qtd]]
+                        st.session_state.analise = AnaliseLotofacilBasica(concursos, st.session_state.dados_api[:qtd])
                     
-                    # Criar DataFrame histórico para motor estatístico
-                    st.session_state.historico_df = criar_historico_df(st.session_state.dados_api, qtd)
+                        # Criar DataFrame histórico para motor estatístico
+                        st.session_state.historico_df = criar_historico_df(st.session_state.dados_api, qtd)
                     
-                    # Cache do baseline para usar em toda a aplicação
-                    st.session_state.baseline_cache = baseline_aleatorio()
+                        # Cache do baseline para usar em toda a aplicação
+                        st.session_state.baseline_cache = baseline_aleatorio()
                     
-                    # Inicializar sistema autônomo com a nova estratégia HARD
-                    st.session_state.sistema_autonomo = SistemaAutonomo(concursos)
+                        # Inicializar sistema autônomo com a nova estratégia HARD
+                        st.session_state.sistema_autonomo = SistemaAutonomo(concursos)
                     
-                    ultimo = st.session_state.dados_api[0]
-                    st.success(f"✅ Último concurso: #{ultimo['concurso']} - {ultimo['data']}")
+                        ultimo = st.session_state.dados_api[0]
+                        st.success(f"✅ Último concurso: #{ultimo['concurso']} - {ultimo['data']}")
                     
-                except Exception as e:
-                    st.error(f"Erro ao carregar: {e}")
+                    except Exception as e:
+                        st.error(f"Erro ao carregar: {e}")
 
     # ================= INTERFACE PRINCIPAL =================
     st.subheader("🎯 Modelo Universal 3622")
@@ -3858,7 +3602,8 @@ def main():
                             # Salvar na sessão
                             st.session_state.jogos_3622 = jogos
                             st.session_state.diagnosticos_3622 = diagnosticos
-                            st.session_state.mc_resultados = None  # Reset Monte Carlo
+                            st.session_state.mc_resultados = None  # Reset probabilidades
+                            st.session_state.mc_conjunto = None
                             
                             st.success(f"✅ {len(jogos)} jogos gerados com sucesso!")
                 
@@ -3933,6 +3678,7 @@ def main():
                             st.session_state.jogos_3622 = None
                             st.session_state.diagnosticos_3622 = None
                             st.session_state.mc_resultados = None
+                            st.session_state.mc_conjunto = None
                             st.rerun()
                     
                     with col3:
@@ -3959,6 +3705,96 @@ def main():
                             use_container_width=True
                         )
                 
+                # =====================================================
+                # FECHAMENTO OTIMIZADO (COBERTURA DO CONJUNTO)
+                # =====================================================
+                st.markdown("---")
+                st.markdown("## 🧮 FECHAMENTO OTIMIZADO")
+                st.caption("Escolhe os jogos em conjunto dentro de uma base de 18-20 dezenas, maximizando a chance (ou a garantia) de algum jogo premiar")
+
+                frequencia_base = analise_lotofacil.obter_tabelas(
+                    [sorted(map(int, c['dezenas'])) for c in st.session_state.dados_api]
+                ).frequencia()
+                base_sugerida = sorted(int(i) + 1 for i in np.argsort(-frequencia_base, kind="stable")[:18])
+
+                base_fechamento = st.multiselect(
+                    "Base (18 a 20 dezenas; sugestão: as mais frequentes)",
+                    list(range(1, 26)), default=base_sugerida, key="base_fechamento"
+                )
+                col1, col2, col3 = st.columns(3)
+                with col1:
+                    qtd_fechamento = st.slider("Jogos no fechamento", 3, 50, 10, key="qtd_fechamento")
+                with col2:
+                    acertos_fechamento = st.selectbox("Pontos alvo", [11, 12, 13, 14], index=2, key="acertos_fechamento")
+                with col3:
+                    modo_fechamento = st.radio(
+                        "Objetivo", ["Probabilidade", "Garantia"], horizontal=True, key="modo_fechamento",
+                        help="Probabilidade: maximiza P(algum jogo ≥ alvo). Garantia: cobre os casos em que N dezenas da base saem."
+                    )
+
+                base_valida = fechamento_lotofacil.TAMANHO_BASE_MINIMO <= len(base_fechamento) <= fechamento_lotofacil.TAMANHO_BASE_MAXIMO
+                sorteadas_fechamento = None
+                if modo_fechamento == "Garantia" and base_valida:
+                    opcoes_sorteadas = list(range(max(acertos_fechamento, len(base_fechamento) - 10), 16))
+                    sorteadas_fechamento = st.select_slider(
+                        "Garantir quando saírem da base", opcoes_sorteadas, value=opcoes_sorteadas[-1], key="sorteadas_fechamento"
+                    )
+
+                if not base_valida:
+                    st.info(f"Selecione de {fechamento_lotofacil.TAMANHO_BASE_MINIMO} a {fechamento_lotofacil.TAMANHO_BASE_MAXIMO} dezenas para a base.")
+                elif st.button("🧮 OTIMIZAR FECHAMENTO", use_container_width=True, type="primary"):
+                    with st.spinner("Otimizando cobertura do fechamento..."):
+                        jogos_fech, avaliacao_fech = fechamento_lotofacil.otimizar_fechamento(
+                            base_fechamento, qtd_fechamento, acertos_fechamento, sorteadas_fechamento
+                        )
+                        referencia = fechamento_lotofacil.avaliar_jogos(
+                            fechamento_lotofacil.jogos_aleatorios_da_base(base_fechamento, len(jogos_fech)), base_fechamento
+                        )
+                        st.session_state.fechamento_otimizado = {
+                            "base": sorted(base_fechamento),
+                            "jogos": jogos_fech,
+                            "avaliacao": avaliacao_fech,
+                            "referencia": referencia,
+                            "acertos": acertos_fechamento,
+                            "sorteadas": sorteadas_fechamento,
+                        }
+
+                if st.session_state.fechamento_otimizado:
+                    fech = st.session_state.fechamento_otimizado
+                    st.markdown(f"### 📋 Fechamento ({len(fech['jogos'])} jogos, base de {len(fech['base'])})")
+                    for i, jogo in enumerate(fech["jogos"]):
+                        st.markdown(f"**Jogo {i+1:2d}:** {formatar_jogo_html(jogo)}", unsafe_allow_html=True)
+
+                    # Comparação com jogos aleatórios da mesma base e com os geradores da sessão
+                    comparacao = {"Fechamento otimizado": fech["avaliacao"], "Aleatórios da mesma base": fech["referencia"]}
+                    for nome, chave in [("Modelo 3622", "jogos_3622"), ("Gerador 12+", "jogos_12plus"),
+                                        ("Gerador 13+", "jogos_13plus"), ("Profissional", "jogos_profissionais")]:
+                        jogos_sessao = st.session_state.get(chave)
+                        if jogos_sessao:
+                            comparacao[nome] = fechamento_lotofacil.avaliar_jogos(jogos_sessao[:len(fech["jogos"])])
+                    st.dataframe(pd.DataFrame([
+                        {"Conjunto": nome, "Jogos": av["jogos"], **{f"P(≥{k})": f"{av[f'P>={k}']:.4%}" for k in (11, 12, 13, 14)},
+                         "Exato": "✅" if av["exato"] else "≈"}
+                        for nome, av in comparacao.items()
+                    ]), use_container_width=True, hide_index=True)
+
+                    garantias = fech["avaliacao"].get("garantias", {})
+                    if garantias:
+                        st.caption("Garantia: " + " | ".join(f"{m} da base sorteadas → {g} pontos" for m, g in sorted(garantias.items())))
+
+                    if st.button("💾 Salvar Fechamento", key="salvar_fechamento_otimizado", use_container_width=True):
+                        arquivo, jogo_id = salvar_jogos_gerados(
+                            fech["jogos"],
+                            fech["base"],
+                            {"modelo": "fechamento_otimizado", "acertos": fech["acertos"], "sorteadas": fech["sorteadas"]},
+                            ultimo['concurso'],
+                            ultimo['data'],
+                            {k: v for k, v in fech["avaliacao"].items() if k.startswith("P>=")}
+                        )
+                        if arquivo:
+                            st.success(f"✅ Fechamento salvo! ID: {jogo_id}")
+                            st.session_state.jogos_salvos = carregar_jogos_salvos()
+                
                 # =====================================================
                 # GERADOR PROFISSIONAL (INTEGRADO) - VERSÃO MODIFICADA
                 # =====================================================
@@ -4343,9 +4179,8 @@ def main():
                 # CALCULAR PERCENTIS RELATIVOS AO BASELINE
                 percentis = []
                 for jogo in jogos_otimizados:
-                    # Simular probabilidade de acertos via Monte Carlo rápido
-                    mc_fast = monte_carlo_jogo(tuple(jogo), 5000)  # Rápido para não travar
-                    percentis.append(mc_fast["P>=11"] * 100)
+                    # Probabilidade exata de acertos
+                    percentis.append(probabilidades_jogo(tuple(jogo))["P>=11"] * 100)
                 
                 # MOSTrar cada jogo
                 for i, (jogo, logL, pct) in enumerate(zip(jogos_otimizados, logs_otimizados, percentis)):
@@ -4625,28 +4460,28 @@ def main():
                     st.info("Nenhum jogo disponível para exibição.")
                 
                 # =====================================================
-                # 🔥 NÍVEL PROFISSIONAL: MONTE CARLO POR JOGO
+                # 🔥 NÍVEL PROFISSIONAL: PROBABILIDADES POR JOGO
                 # =====================================================
                 st.markdown("---")
-                st.markdown("## 🎲 Simulação Monte Carlo por Jogo")
-                st.caption("Estimativa empírica real de probabilidade por jogo")
+                st.markdown("## 🎲 Probabilidades por Jogo e do Bilhete")
+                st.caption("Distribuição hipergeométrica exata por jogo; o bilhete completo considera a sobreposição entre os jogos")
 
                 N_SIM = st.slider(
-                    "Quantidade de simulações por jogo",
-                    min_value=1_000,
-                    max_value=50_000,
-                    value=st.session_state.mc_sim_value,
-                    step=1_000,
+                    f"Simulações do bilhete completo (só acima de {prob.LIMITE_JOGOS_EXATO} jogos)",
+                    min_value=10_000,
+                    max_value=500_000,
+                    value=max(st.session_state.mc_sim_value, 10_000),
+                    step=10_000,
                     key="mc_slider_principal"
                 )
                 st.session_state.mc_sim_value = N_SIM
 
-                if st.button("🚀 Rodar Simulação Monte Carlo", use_container_width=True, type="primary"):
-                    with st.spinner(f"Rodando {N_SIM:,} simulações para cada jogo..."):
+                if st.button("🚀 Calcular Probabilidades", use_container_width=True, type="primary"):
+                    with st.spinner("Calculando probabilidades..."):
                         mc_resultados = []
                         
                         for i, jogo in enumerate(jogos_gerados):
-                            res = monte_carlo_jogo(tuple(jogo), N_SIM)
+                            res = probabilidades_jogo(tuple(jogo))
                             mc_resultados.append({
                                 "Jogo": i + 1,
                                 "P(≥11)": f"{res['P>=11']*100:.2f}%",
@@ -4659,11 +4494,27 @@ def main():
                             })
                         
                         st.session_state.mc_resultados = pd.DataFrame(mc_resultados)
-                        st.success("✅ Simulação concluída!")
+                        st.session_state.mc_conjunto = prob.resumo_conjunto(jogos_gerados, simulacoes=N_SIM)
+                        st.success("✅ Probabilidades calculadas!")
 
-                # Mostrar resultados Monte Carlo se existirem
+                # Mostrar probabilidades se existirem
                 if st.session_state.mc_resultados is not None:
-                    st.markdown("### 📊 Resultados da Simulação")
+                    conjunto = st.session_state.mc_conjunto
+                    if conjunto is not None:
+                        st.markdown(f"### 🎫 Bilhete Completo ({conjunto['jogos']} jogos)")
+                        cols = st.columns(len(prob.FAIXAS_PREMIO))
+                        for col, k in zip(cols, prob.FAIXAS_PREMIO):
+                            with col:
+                                st.metric(
+                                    f"Algum jogo ≥{k}",
+                                    f"{conjunto[f'P>={k}']*100:.4f}%",
+                                    f"{conjunto[f'premios_esperados_{k}']:.4f} prêmios de {k} esperados",
+                                    delta_color="off"
+                                )
+                        if not conjunto["exato"]:
+                            st.caption(f"Bilhete com mais de {prob.LIMITE_JOGOS_EXATO} jogos: 'Algum jogo' estimado com {N_SIM:,} sorteios simulados")
+                    
+                    st.markdown("### 📊 Probabilidades por Jogo")
                     
                     # Ordenar por P(≥11) para melhor visualização
                     df_mc = st.session_state.mc_resultados.copy()
@@ -4734,9 +4585,11 @@ def main():
                         )
                     
                     # Explicação técnica
-                    with st.expander("📘 O que significa Monte Carlo?"):
+                    with st.expander("📘 Como as probabilidades são calculadas?"):
                         st.markdown("""
-                        **Monte Carlo** é uma técnica estatística que simula milhares de sorteios reais para estimar probabilidades.
+                        Os acertos de um jogo seguem a **distribuição hipergeométrica**: a conta é exata, sem simulação,
+                        e todo jogo de 15 dezenas tem exatamente as mesmas chances. O que muda de um bilhete para outro é a
+                        **sobreposição** entre os jogos, medida no "Bilhete Completo" percorrendo os 3.268.760 sorteios possíveis.
                         
                         - **P(≥11)**: Probabilidade de fazer 11 pontos ou mais
                         - **P(≥12)**: Probabilidade de fazer 12 pontos ou mais  
@@ -4744,7 +4597,7 @@ def main():
                         - **P(≥14)**: Probabilidade de fazer 14 pontos ou mais
                         - **P(15)**: Probabilidade de acertar os 15 números
                         
-                        Quanto maior o número de simulações, mais precisa a estimativa.
+                        Acima de 24 jogos o "Bilhete Completo" é estimado por simulação: quanto mais simulações, mais precisa a estimativa.
                         """)
                 
                 # MÉTRICA AGREGADA FINAL
@@ -6601,7 +6454,8 @@ def main():
                        - 🎲 **Aleatória:** seleção aleatória controlada
                        - 🔥 **HARD Otimizado:** Top 10 + 8 atrasados + 5 rotativos (NOVA!)
                     
-                    2. **Avalia o desempenho** de cada uma nos últimos 50 concursos
+                    2. **Avalia o desempenho** de cada uma nos últimos concursos, em walk-forward:
+                       cada concurso é previsto só com os concursos anteriores a ele
                     
                     3. **Escolhe a melhor** estratégia baseada na média de acertos
                     
@@ -6626,14 +6480,15 @@ def main():
                     st.session_state.qtd_autonomo = qtd_autonomo
                 
                 with col2:
+                    max_testes = max(100, st.session_state.sistema_autonomo.total_concursos - bt.AQUECIMENTO)
                     num_testes = st.slider(
                         "Número de testes no backtest",
                         min_value=20,
-                        max_value=100,
-                        value=st.session_state.num_testes_autonomo,
+                        max_value=max_testes,
+                        value=min(st.session_state.num_testes_autonomo, max_testes),
                         step=10,
                         key="slider_testes_autonomo",
-                        help="Mais testes = mais preciso, porém mais lento"
+                        help="Concursos mais recentes testados em walk-forward (o máximo usa todo o histórico carregado)"
                     )
                     st.session_state.num_testes_autonomo = num_testes
                 
@@ -6720,6 +6575,22 @@ def main():
                     # Mostrar como tabela
                     st.dataframe(df_scores, use_container_width=True, hide_index=True)
                     
+                    resumo_bt = resultado.get('resumo_backtest')
+                    if resumo_bt is not None and not resumo_bt.empty:
+                        with st.expander("🧪 Backtest walk-forward por estratégia"):
+                            nomes = {chave: nome for nome, chave in SistemaAutonomo.ESTRATEGIAS.items()}
+                            df_bt = resumo_bt.assign(estrategia=resumo_bt["estrategia"].map(nomes))
+                            for k in bt.FAIXAS_PREMIO:
+                                df_bt[f"melhor_{k}"] = (df_bt[f"melhor_{k}"] * 100).round(1)
+                            st.dataframe(
+                                df_bt.rename(columns={
+                                    "estrategia": "Estratégia", "testes": "Concursos",
+                                    "melhor_medio": "Melhor Médio", "media_jogos": "Média dos Jogos",
+                                    **{f"melhor_{k}": f"% Melhor = {k}" for k in bt.FAIXAS_PREMIO}
+                                }).round(3),
+                                use_container_width=True, hide_index=True
+                            )
+                    
                     # =====================================================
                     # BASE UTILIZADA
                     # =====================================================
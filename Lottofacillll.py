@@ -1,9 +1,10 @@
 import streamlit as st
-import requests
+import resultados_lotofacil
+import analise_lotofacil
+import modelos_lotofacil
 import numpy as np
 import random
 from collections import Counter
-from catboost import CatBoostClassifier
 import itertools
 import math
 import json
@@ -14,48 +15,13 @@ st.set_page_config(page_title="Lotofácil Inteligente", layout="centered")
 # CAPTURA CONCURSOS VIA API (robusta)
 # =========================
 def capturar_ultimos_resultados(qtd=250):
-    url_base = "https://loteriascaixa-api.herokuapp.com/api/lotofacil/"
-    concursos = []
-
-    try:
-        resp = requests.get(url_base, timeout=20)
-        if resp.status_code != 200:
-            st.error("Erro ao buscar o último concurso.")
+    concursos, info_ultimo, erro = resultados_lotofacil.carregar_concursos(qtd)
+    if erro is not None:
+        if not concursos:
+            st.error(f"Erro ao acessar API: {type(erro).__name__}: {erro}")
             return [], None
-
-        dados = resp.json()
-        ultimo = dados[0] if isinstance(dados, list) else dados
-
-        numero_atual = int(ultimo.get("concurso"))
-        data_concurso = ultimo.get("data")
-        dezenas = sorted([int(d) for d in ultimo.get("dezenas")])
-        concursos.append(dezenas)
-
-        info_ultimo = {
-            "numero": numero_atual,
-            "data": data_concurso,
-            "dezenas": dezenas
-        }
-
-        for i in range(1, qtd):
-            concurso_numero = numero_atual - i
-            try:
-                resp_i = requests.get(f"{url_base}{concurso_numero}", timeout=20)
-                if resp_i.status_code == 200:
-                    dados_i = resp_i.json()
-                    data_i = dados_i[0] if isinstance(dados_i, list) else dados_i
-                    dezenas_i = sorted([int(d) for d in data_i.get("dezenas")])
-                    concursos.append(dezenas_i)
-                else:
-                    break
-            except Exception:
-                break
-
-        return concursos, info_ultimo
-
-    except Exception as e:
-        st.error(f"Erro ao acessar API: {type(e).__name__}: {e}")
-        return [], None
+        st.warning(f"API indisponível ({type(erro).__name__}); usando {len(concursos)} concursos da base local.")
+    return concursos, info_ultimo
 
 # =========================
 # NOVA CLASSE: Sistema de Probabilidade Matemática
@@ -545,15 +511,12 @@ class LotoFacilIA:
             self.treinar_modelos()
 
     def matriz_binaria(self):
-        return np.array([[1 if n in jogo else 0 for n in self.numeros] for jogo in self.concursos])
+        return np.array(analise_lotofacil.obter_tabelas(self.concursos).matriz, dtype=int)
 
     def frequencia(self, janela=10):
         janela = min(janela, max(1, len(self.concursos)-1))
-        freq = {n:0 for n in self.numeros}
-        for jogo in self.concursos[-janela-1:-1]:
-            for d in jogo:
-                freq[d] +=1
-        return freq
+        contagem = analise_lotofacil.obter_tabelas(self.concursos).frequencia(-janela-1, -1)
+        return {n: int(contagem[n-1]) for n in self.numeros}
 
     def atraso(self):
         atraso = {n:0 for n in self.numeros}
@@ -580,55 +543,38 @@ class LotoFacilIA:
 
     def interacoes(self, janela=50):
         janela = min(janela, max(1, len(self.concursos)-1))
-        matriz = np.zeros((25,25), dtype=int)
-        for jogo in self.concursos[-janela-1:-1]:
-            for i in range(15):
-                for j in range(i+1,15):
-                    matriz[jogo[i]-1, jogo[j]-1] += 1
-                    matriz[jogo[j]-1, jogo[i]-1] += 1
-        return matriz
+        return np.array(analise_lotofacil.obter_tabelas(self.concursos).coocorrencia(-janela-1, -1), dtype=int)
 
     def prob_condicional(self, janela=50):
         matriz = self.interacoes(janela)
         prob = np.zeros((25,25))
         freq = np.array([v for v in self.frequencia(janela).values()])
-        for i in range(25):
-            for j in range(25):
-                if freq[i] > 0:
-                    prob[i,j] = matriz[i,j]/freq[i]
+        np.divide(matriz, freq[:, None], out=prob, where=freq[:, None] > 0)
         return prob
 
     def gap_medio(self):
-        gaps = {n:[] for n in self.numeros}
-        for i, jogo in enumerate(self.concursos[:-1]):
-            for n in self.numeros:
-                if n not in jogo:
-                    gaps[n].append(len(self.concursos)-1-i)
-        return {n: np.mean(gaps[n]) if gaps[n] else 0 for n in self.numeros}
+        # média de (len-1-i) nos concursos i (exceto o último) em que a dezena não saiu
+        tabelas = analise_lotofacil.obter_tabelas(self.concursos)
+        gaps = tabelas.distancia_media_ausencias(0, -1, len(self.concursos)-1)
+        return {n: float(gaps[n-1]) for n in self.numeros}
 
     def gerar_features(self):
-        features = []
         if len(self.concursos) < 2:
             return np.array([])
         freq = self.frequencia(janela=len(self.concursos)-1)
         gaps = self.gap_medio()
-        for jogo in self.concursos:
-            f = []
-            for n in self.numeros:
-                f.append(1 if n in jogo else 0)
-                f.append(freq[n])
-                f.append(gaps[n])
-                f.append(1 if n%2==0 else 0)
-                f.append(1 if n in self.primos else 0)
-            features.append(f)
-        return np.array(features)
+        # por dezena: presença no concurso + frequência, gap, par e primo (iguais em todas as linhas)
+        presenca = analise_lotofacil.obter_tabelas(self.concursos).matriz
+        features = np.empty((len(presenca), len(self.numeros), 5))
+        features[:, :, 0] = presenca
+        features[:, :, 1:] = [[freq[n], gaps[n], n%2==0, n in self.primos] for n in self.numeros]
+        return features.reshape(len(presenca), -1)
 
     def treinar_modelos(self):
-        for i, n in enumerate(self.numeros):
-            model = CatBoostClassifier(iterations=600, verbose=0, random_state=42)
-            y = self.Y[:,i]
-            model.fit(self.X, y)
-            self.models[n] = model
+        # modelos em cache por (concursos, hiperparâmetros); concurso novo continua o modelo anterior
+        self.models = modelos_lotofacil.treinar_ou_carregar(
+            self.X, self.Y, self.numeros, {"iterations": 600, "verbose": 0, "random_state": 42}
+        )
 
     def prever_proximo(self):
         if not self.models:
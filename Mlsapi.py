@@ -1,7 +1,7 @@
 # soccer_api.py
 from fastapi import FastAPI, Query
 from fastapi.responses import JSONResponse
-import requests
+import cliente_http
 import pandas as pd
 from datetime import datetime, timedelta
 import json
@@ -60,7 +60,7 @@ def buscar_dados(liga_code, data_str):
     try:
         url = f"https://site.api.espn.com/apis/site/v2/sports/soccer/{liga_code}/scoreboard?dates={data_str}"
         headers = {"User-Agent": "Mozilla/5.0"}
-        r = requests.get(url, headers=headers, timeout=10)
+        r = cliente_http.get(url, headers=headers, timeout=10)
         r.raise_for_status()
         data = r.json()
         partidas = []
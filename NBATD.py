@@ -9,9 +9,12 @@ from reportlab.lib.pagesizes import letter
 from reportlab.lib import colors
 from reportlab.platypus import SimpleDocTemplate, Table, TableStyle
 import time
-from collections import deque
 from threading import Lock
 import threading
+from limitador_api import LimitadorCota, PRIORIDADE_VARREDURA, prioridade_da_url
+from cache_persistente import CacheDuasCamadas
+import armazem_alertas
+import recursos_poster
 from PIL import Image, ImageDraw, ImageFont, ImageOps
 import logging
 import math
@@ -42,9 +45,6 @@ class ConfigManager:
     RESULTADOS_FAVORITOS_PATH = "resultados_favoritos.json"
     RESULTADOS_GOLS_HT_PATH = "resultados_gols_ht.json"
     RESULTADOS_AMBAS_MARCAM_PATH = "resultados_ambas_marcam.json"  # NOVO
-    CACHE_JOGOS = "cache_jogos.json"
-    CACHE_CLASSIFICACAO = "cache_classificacao.json"
-    CACHE_TIMEOUT = 3600
     HISTORICO_PATH = "historico_conferencias.json"
     ALERTAS_TOP_PATH = "alertas_top.json"
     RESULTADOS_TOP_PATH = "resultados_top.json"
@@ -65,10 +65,10 @@ class ConfigManager:
         "Premier League (Inglaterra)": "PL"
     }
     
-    # Configurações de cache
+    # Configurações de cache ("stale": segundos após o ttl em que o valor antigo ainda serve enquanto revalida)
     CACHE_CONFIG = {
-        "jogos": {"ttl": 3600, "max_size": 100},
-        "classificacao": {"ttl": 86400, "max_size": 50},
+        "jogos": {"ttl": 3600, "max_size": 100, "stale": 1800},
+        "classificacao": {"ttl": 86400, "max_size": 50, "stale": 86400},
         "match_details": {"ttl": 1800, "max_size": 200}
     }
     
@@ -90,76 +90,27 @@ class RateLimiter:
             return cls._instance
     
     def _init(self):
-        self.requests = deque(maxlen=10)
-        self.lock = threading.Lock()
-        self.last_request_time = 0
-        self.min_interval = 6.0
+        self.limitador = LimitadorCota()
         self.backoff_factor = 1.5
         self.max_retries = 3
         
-    def wait_if_needed(self):
-        """Espera se necessário para respeitar rate limit"""
-        with self.lock:
-            now = time.time()
-            
-            while self.requests and now - self.requests[0] > 60:
-                self.requests.popleft()
-            
-            if len(self.requests) >= 10:
-                wait_time = 60 - (now - self.requests[0])
-                if wait_time > 0:
-                    logging.info(f"⏳ Rate limit atingido. Esperando {wait_time:.1f} segundos...")
-                    time.sleep(wait_time + 0.1)
-                    now = time.time()
-            
-            time_since_last = now - self.last_request_time
-            if time_since_last < self.min_interval:
-                wait_time = self.min_interval - time_since_last
-                time.sleep(wait_time)
-            
-            self.requests.append(now)
-            self.last_request_time = now
-
-class SmartCache:
-    """Cache inteligente com TTL e tamanho máximo"""
-    def __init__(self, cache_type: str):
-        self.cache = {}
-        self.timestamps = {}
-        self.config = ConfigManager.CACHE_CONFIG.get(cache_type, {"ttl": 3600, "max_size": 100})
-        self.lock = threading.Lock()
-        
-    def get(self, key: str):
-        """Obtém valor do cache se ainda for válido"""
-        with self.lock:
-            if key not in self.cache:
-                return None
-                
-            timestamp = self.timestamps.get(key, 0)
-            agora = time.time()
-            
-            if agora - timestamp > self.config["ttl"]:
-                del self.cache[key]
-                del self.timestamps[key]
-                return None
-                
-            return self.cache[key]
+    def wait_if_needed(self, prioridade=PRIORIDADE_VARREDURA):
+        """Espera um token do balde (fora do lock); conferência de resultados passa na frente"""
+        espera = self.limitador.adquirir(prioridade)
+        if espera > 1:
+            logging.info(f"⏳ Rate limit atingido. Esperou {espera:.1f} segundos")
     
-    def set(self, key: str, value):
-        """Armazena valor no cache"""
-        with self.lock:
-            if len(self.cache) >= self.config["max_size"]:
-                oldest_key = min(self.timestamps.items(), key=lambda x: x[1])[0]
-                del self.cache[oldest_key]
-                del self.timestamps[oldest_key]
-            
-            self.cache[key] = value
-            self.timestamps[key] = time.time()
+    def atualizar_cota(self, headers):
+        self.limitador.atualizar_cota(headers)
     
-    def clear(self):
-        """Limpa todo o cache"""
-        with self.lock:
-            self.cache.clear()
-            self.timestamps.clear()
+    def bloquear(self, segundos):
+        self.limitador.bloquear(segundos)
+
+class SmartCache(CacheDuasCamadas):
+    """Cache com TTL em memória e em disco (SQLite compartilhado entre sessões e reinícios)"""
+    def __init__(self, cache_type: str):
+        config = ConfigManager.CACHE_CONFIG.get(cache_type, {"ttl": 3600, "max_size": 100})
+        super().__init__(f"NBATD.{cache_type}", **config)
 
 class APIMonitor:
     """Monitora uso da API"""
@@ -320,158 +271,154 @@ class ImageCache:
 class DataStorage:
     """Gerencia armazenamento e recuperação de dados"""
     
+    # Alertas e resultados ficam no armazem_alertas (SQLite, uma linha por
+    # registro); os caminhos .json identificam as coleções e são importados na
+    # primeira leitura.
+    ARQUIVOS_ALERTAS = {
+        "over_under": ConfigManager.ALERTAS_PATH,
+        "favorito": ConfigManager.ALERTAS_FAVORITOS_PATH,
+        "gols_ht": ConfigManager.ALERTAS_GOLS_HT_PATH,
+        "ambas_marcam": ConfigManager.ALERTAS_AMBAS_MARCAM_PATH,
+    }
+    ARQUIVOS_RESULTADOS = {
+        "over_under": ConfigManager.RESULTADOS_PATH,
+        "favorito": ConfigManager.RESULTADOS_FAVORITOS_PATH,
+        "gols_ht": ConfigManager.RESULTADOS_GOLS_HT_PATH,
+        "ambas_marcam": ConfigManager.RESULTADOS_AMBAS_MARCAM_PATH,
+    }
+    
     @staticmethod
-    def _serialize_for_json(obj):
-        """Converte objetos datetime para strings ISO para serialização JSON"""
-        if isinstance(obj, datetime):
-            return obj.isoformat()
-        elif isinstance(obj, dict):
-            return {k: DataStorage._serialize_for_json(v) for k, v in obj.items()}
-        elif isinstance(obj, list):
-            return [DataStorage._serialize_for_json(item) for item in obj]
-        return obj
+    def carregar_colecao(caminho: str) -> dict:
+        """Coleção inteira {chave: registro}"""
+        return armazem_alertas.carregar(caminho)
     
     @staticmethod
-    def carregar_json(caminho: str) -> dict:
-        """Carrega JSON do arquivo"""
-        try:
-            if os.path.exists(caminho):
-                with open(caminho, "r", encoding='utf-8') as f:
-                    dados = json.load(f)
-                
-                if not dados:
-                    return {}
-                    
-                if caminho in [ConfigManager.CACHE_JOGOS, ConfigManager.CACHE_CLASSIFICACAO]:
-                    agora = datetime.now().timestamp()
-                    if isinstance(dados, dict) and '_timestamp' in dados:
-                        if agora - dados['_timestamp'] > ConfigManager.CACHE_TIMEOUT:
-                            return {}
-                    else:
-                        if agora - os.path.getmtime(caminho) > ConfigManager.CACHE_TIMEOUT:
-                            return {}
-                return dados
-        except (json.JSONDecodeError, IOError, Exception) as e:
-            logging.error(f"Erro ao carregar {caminho}: {e}")
-            st.error(f"Erro ao carregar {caminho}: {e}")
-        return {}
+    def salvar_colecao(caminho: str, dados: dict):
+        """Deixa a coleção igual a dados (só as linhas alteradas são gravadas)"""
+        armazem_alertas.salvar(caminho, dados)
     
     @staticmethod
-    def salvar_json(caminho: str, dados: dict):
-        """Salva dados no arquivo JSON"""
-        try:
-            # Serializar objetos datetime para strings ISO
-            dados_serializados = DataStorage._serialize_for_json(dados)
-            
-            if caminho in [ConfigManager.CACHE_JOGOS, ConfigManager.CACHE_CLASSIFICACAO]:
-                if isinstance(dados_serializados, dict):
-                    dados_serializados['_timestamp'] = datetime.now().timestamp()
-            
-            with open(caminho, "w", encoding='utf-8') as f:
-                json.dump(dados_serializados, f, ensure_ascii=False, indent=2)
-        except IOError as e:
-            logging.error(f"Erro ao salvar {caminho}: {e}")
-            st.error(f"Erro ao salvar {caminho}: {e}")
+    def registrar(caminho: str, chave: str, registro: dict):
+        """Grava um registro sem reler a coleção"""
+        armazem_alertas.registrar(caminho, chave, registro)
+    
+    @staticmethod
+    def alerta_registrado(tipo_alerta: str, fixture_id: str) -> bool:
+        """Indica se já existe alerta do tipo para o jogo"""
+        return armazem_alertas.contem(DataStorage.ARQUIVOS_ALERTAS[tipo_alerta], fixture_id)
+    
+    @staticmethod
+    def alertas_pendentes(tipo_alerta: str) -> dict:
+        """Alertas do tipo ainda não conferidos"""
+        return armazem_alertas.pendentes(DataStorage.ARQUIVOS_ALERTAS[tipo_alerta])
+    
+    @staticmethod
+    def registrar_conferencias(tipo_alerta: str, alertas: dict, resultados: dict):
+        """Alertas conferidos e os resultados deles, na mesma transação"""
+        armazem_alertas.registrar_em_lote({
+            DataStorage.ARQUIVOS_ALERTAS[tipo_alerta]: alertas,
+            DataStorage.ARQUIVOS_RESULTADOS[tipo_alerta]: resultados,
+        })
     
     @staticmethod
     def carregar_alertas() -> dict:
         """Carrega alertas do arquivo"""
-        return DataStorage.carregar_json(ConfigManager.ALERTAS_PATH)
+        return DataStorage.carregar_colecao(ConfigManager.ALERTAS_PATH)
     
     @staticmethod
     def salvar_alertas(alertas: dict):
         """Salva alertas no arquivo"""
-        DataStorage.salvar_json(ConfigManager.ALERTAS_PATH, alertas)
+        DataStorage.salvar_colecao(ConfigManager.ALERTAS_PATH, alertas)
     
     @staticmethod
     def carregar_alertas_favoritos() -> dict:
         """Carrega alertas de favoritos do arquivo"""
-        return DataStorage.carregar_json(ConfigManager.ALERTAS_FAVORITOS_PATH)
+        return DataStorage.carregar_colecao(ConfigManager.ALERTAS_FAVORITOS_PATH)
     
     @staticmethod
     def salvar_alertas_favoritos(alertas: dict):
         """Salva alertas de favoritos no arquivo"""
-        DataStorage.salvar_json(ConfigManager.ALERTAS_FAVORITOS_PATH, alertas)
+        DataStorage.salvar_colecao(ConfigManager.ALERTAS_FAVORITOS_PATH, alertas)
     
     @staticmethod
     def carregar_alertas_gols_ht() -> dict:
         """Carrega alertas de gols HT do arquivo"""
-        return DataStorage.carregar_json(ConfigManager.ALERTAS_GOLS_HT_PATH)
+        return DataStorage.carregar_colecao(ConfigManager.ALERTAS_GOLS_HT_PATH)
     
     @staticmethod
     def salvar_alertas_gols_ht(alertas: dict):
         """Salva alertas de gols HT no arquivo"""
-        DataStorage.salvar_json(ConfigManager.ALERTAS_GOLS_HT_PATH, alertas)
+        DataStorage.salvar_colecao(ConfigManager.ALERTAS_GOLS_HT_PATH, alertas)
     
     @staticmethod
     def carregar_alertas_ambas_marcam() -> dict:
         """Carrega alertas de ambas marcam do arquivo"""
-        return DataStorage.carregar_json(ConfigManager.ALERTAS_AMBAS_MARCAM_PATH)
+        return DataStorage.carregar_colecao(ConfigManager.ALERTAS_AMBAS_MARCAM_PATH)
     
     @staticmethod
     def salvar_alertas_ambas_marcam(alertas: dict):
         """Salva alertas de ambas marcam no arquivo"""
-        DataStorage.salvar_json(ConfigManager.ALERTAS_AMBAS_MARCAM_PATH, alertas)
+        DataStorage.salvar_colecao(ConfigManager.ALERTAS_AMBAS_MARCAM_PATH, alertas)
     
     @staticmethod
     def carregar_resultados() -> dict:
         """Carrega resultados do arquivo"""
-        return DataStorage.carregar_json(ConfigManager.RESULTADOS_PATH)
+        return DataStorage.carregar_colecao(ConfigManager.RESULTADOS_PATH)
     
     @staticmethod
     def salvar_resultados(resultados: dict):
         """Salva resultados no arquivo"""
-        DataStorage.salvar_json(ConfigManager.RESULTADOS_PATH, resultados)
+        DataStorage.salvar_colecao(ConfigManager.RESULTADOS_PATH, resultados)
     
     @staticmethod
     def carregar_resultados_favoritos() -> dict:
         """Carrega resultados de favoritos do arquivo"""
-        return DataStorage.carregar_json(ConfigManager.RESULTADOS_FAVORITOS_PATH)
+        return DataStorage.carregar_colecao(ConfigManager.RESULTADOS_FAVORITOS_PATH)
     
     @staticmethod
     def salvar_resultados_favoritos(resultados: dict):
         """Salva resultados de favoritos no arquivo"""
-        DataStorage.salvar_json(ConfigManager.RESULTADOS_FAVORITOS_PATH, resultados)
+        DataStorage.salvar_colecao(ConfigManager.RESULTADOS_FAVORITOS_PATH, resultados)
     
     @staticmethod
     def carregar_resultados_gols_ht() -> dict:
         """Carrega resultados de gols HT do arquivo"""
-        return DataStorage.carregar_json(ConfigManager.RESULTADOS_GOLS_HT_PATH)
+        return DataStorage.carregar_colecao(ConfigManager.RESULTADOS_GOLS_HT_PATH)
     
     @staticmethod
     def salvar_resultados_gols_ht(resultados: dict):
         """Salva resultados de gols HT no arquivo"""
-        DataStorage.salvar_json(ConfigManager.RESULTADOS_GOLS_HT_PATH, resultados)
+        DataStorage.salvar_colecao(ConfigManager.RESULTADOS_GOLS_HT_PATH, resultados)
     
     @staticmethod
     def carregar_resultados_ambas_marcam() -> dict:
         """Carrega resultados de ambas marcam do arquivo"""
-        return DataStorage.carregar_json(ConfigManager.RESULTADOS_AMBAS_MARCAM_PATH)
+        return DataStorage.carregar_colecao(ConfigManager.RESULTADOS_AMBAS_MARCAM_PATH)
     
     @staticmethod
     def salvar_resultados_ambas_marcam(resultados: dict):
         """Salva resultados de ambas marcam no arquivo"""
-        DataStorage.salvar_json(ConfigManager.RESULTADOS_AMBAS_MARCAM_PATH, resultados)
+        DataStorage.salvar_colecao(ConfigManager.RESULTADOS_AMBAS_MARCAM_PATH, resultados)
     
     @staticmethod
     def carregar_alertas_top() -> dict:
         """Carrega alertas TOP do arquivo"""
-        return DataStorage.carregar_json(ConfigManager.ALERTAS_TOP_PATH)
+        return DataStorage.carregar_colecao(ConfigManager.ALERTAS_TOP_PATH)
     
     @staticmethod
     def salvar_alertas_top(alertas_top: dict):
         """Salva alertas TOP no arquivo"""
-        DataStorage.salvar_json(ConfigManager.ALERTAS_TOP_PATH, alertas_top)
+        DataStorage.salvar_colecao(ConfigManager.ALERTAS_TOP_PATH, alertas_top)
     
     @staticmethod
     def carregar_resultados_top() -> dict:
         """Carrega resultados TOP do arquivo"""
-        return DataStorage.carregar_json(ConfigManager.RESULTADOS_TOP_PATH)
+        return DataStorage.carregar_colecao(ConfigManager.RESULTADOS_TOP_PATH)
     
     @staticmethod
     def salvar_resultados_top(resultados_top: dict):
         """Salva resultados TOP no arquivo"""
-        DataStorage.salvar_json(ConfigManager.RESULTADOS_TOP_PATH, resultados_top)
+        DataStorage.salvar_colecao(ConfigManager.RESULTADOS_TOP_PATH, resultados_top)
     
     @staticmethod
     def carregar_historico() -> list:
@@ -2175,27 +2122,25 @@ class GerenciadorAlertasCompletos:
         self.RESULTADOS_COMPLETOS_PATH = "resultados_completos.json"
     
     def salvar_alerta_completo(self, alerta: AlertaCompleto):
-        """Salva alerta completo no arquivo"""
-        alertas = self.carregar_alertas()
+        """Salva alerta completo (só a linha dele)"""
         chave = f"{alerta.jogo.id}_{alerta.data_busca}"
-        alertas[chave] = alerta.to_dict()
-        self._salvar_alertas(alertas)
+        DataStorage.registrar(self.ALERTAS_COMPLETOS_PATH, chave, alerta.to_dict())
     
     def carregar_alertas(self) -> dict:
         """Carrega alertas completos do arquivo"""
-        return DataStorage.carregar_json(self.ALERTAS_COMPLETOS_PATH)
+        return DataStorage.carregar_colecao(self.ALERTAS_COMPLETOS_PATH)
     
     def _salvar_alertas(self, alertas: dict):
         """Salva alertas completos no arquivo"""
-        DataStorage.salvar_json(self.ALERTAS_COMPLETOS_PATH, alertas)
+        DataStorage.salvar_colecao(self.ALERTAS_COMPLETOS_PATH, alertas)
     
     def carregar_resultados(self) -> dict:
         """Carrega resultados completos do arquivo"""
-        return DataStorage.carregar_json(self.RESULTADOS_COMPLETOS_PATH)
+        return DataStorage.carregar_colecao(self.RESULTADOS_COMPLETOS_PATH)
     
     def _salvar_resultados(self, resultados: dict):
         """Salva resultados completos no arquivo"""
-        DataStorage.salvar_json(self.RESULTADOS_COMPLETOS_PATH, resultados)
+        DataStorage.salvar_colecao(self.RESULTADOS_COMPLETOS_PATH, resultados)
     
     def filtrar_melhores_jogos(self, jogos_analisados: list, limiares: dict = None) -> list:
         """
@@ -2309,16 +2254,9 @@ class GerenciadorAlertasCompletos:
             x_away = x_home + TAMANHO_QUADRADO + ESPACO_ENTRE_ESCUDOS
             y_escudos = y0 + 180
 
-            # Baixar escudos
-            escudo_home_bytes = self.api_client.baixar_escudo_time(jogo['home'], jogo.get('escudo_home', ''))
-            escudo_away_bytes = self.api_client.baixar_escudo_time(jogo['away'], jogo.get('escudo_away', ''))
-            
-            escudo_home_img = Image.open(io.BytesIO(escudo_home_bytes)).convert("RGBA") if escudo_home_bytes else None
-            escudo_away_img = Image.open(io.BytesIO(escudo_away_bytes)).convert("RGBA") if escudo_away_bytes else None
-
-            # Desenhar escudos
-            self.poster_generator._desenhar_escudo_quadrado(draw, img, escudo_home_img, x_home, y_escudos, TAMANHO_QUADRADO, TAMANHO_ESCUDO, jogo['home'])
-            self.poster_generator._desenhar_escudo_quadrado(draw, img, escudo_away_img, x_away, y_escudos, TAMANHO_QUADRADO, TAMANHO_ESCUDO, jogo['away'])
+            # Escudos (prontos do LRU de recursos_poster)
+            self.poster_generator._desenhar_escudo_quadrado_time(draw, img, jogo['home'], jogo.get('escudo_home', ''), x_home, y_escudos, TAMANHO_QUADRADO, TAMANHO_ESCUDO)
+            self.poster_generator._desenhar_escudo_quadrado_time(draw, img, jogo['away'], jogo.get('escudo_away', ''), x_away, y_escudos, TAMANHO_QUADRADO, TAMANHO_ESCUDO)
 
             # Nomes dos times
             try:
@@ -2410,7 +2348,7 @@ class GerenciadorAlertasCompletos:
             draw.text((LARGURA//2 - 300, altura_total - 70), rodape_text, font=FONTE_DETALHES, fill=(100, 130, 160))
 
         buffer = io.BytesIO()
-        img.save(buffer, format="PNG", optimize=True, quality=95)
+        img.save(buffer, format="PNG", quality=95)
         buffer.seek(0)
         
         return buffer
@@ -2525,16 +2463,9 @@ class GerenciadorAlertasCompletos:
             x_away = x_home + TAMANHO_QUADRADO + ESPACO_ENTRE_ESCUDOS
             y_escudos = y0 + 130
 
-            # Baixar escudos
-            escudo_home_bytes = self.api_client.baixar_escudo_time(jogo['home'], jogo.get('escudo_home', ''))
-            escudo_away_bytes = self.api_client.baixar_escudo_time(jogo['away'], jogo.get('escudo_away', ''))
-            
-            escudo_home_img = Image.open(io.BytesIO(escudo_home_bytes)).convert("RGBA") if escudo_home_bytes else None
-            escudo_away_img = Image.open(io.BytesIO(escudo_away_bytes)).convert("RGBA") if escudo_away_bytes else None
-
-            # Desenhar escudos
-            self.poster_generator._desenhar_escudo_quadrado(draw, img, escudo_home_img, x_home, y_escudos, TAMANHO_QUADRADO, TAMANHO_ESCUDO, jogo['home'])
-            self.poster_generator._desenhar_escudo_quadrado(draw, img, escudo_away_img, x_away, y_escudos, TAMANHO_QUADRADO, TAMANHO_ESCUDO, jogo['away'])
+            # Escudos (prontos do LRU de recursos_poster)
+            self.poster_generator._desenhar_escudo_quadrado_time(draw, img, jogo['home'], jogo.get('escudo_home', ''), x_home, y_escudos, TAMANHO_QUADRADO, TAMANHO_ESCUDO)
+            self.poster_generator._desenhar_escudo_quadrado_time(draw, img, jogo['away'], jogo.get('escudo_away', ''), x_away, y_escudos, TAMANHO_QUADRADO, TAMANHO_ESCUDO)
 
             # Resultado do jogo
             resultado_text = f"{home_goals} - {away_goals}"
@@ -2609,7 +2540,7 @@ class GerenciadorAlertasCompletos:
             draw.text((LARGURA//2 - 300, altura_total - 70), rodape_text, font=FONTE_DETALHES, fill=(100, 130, 160))
 
         buffer = io.BytesIO()
-        img.save(buffer, format="PNG", optimize=True, quality=95)
+        img.save(buffer, format="PNG", quality=95)
         buffer.seek(0)
         
         return buffer
@@ -2965,17 +2896,18 @@ class APIClient:
         """Obtém dados da API com rate limiting e retry automático"""
         for attempt in range(max_retries):
             try:
-                self.rate_limiter.wait_if_needed()
+                self.rate_limiter.wait_if_needed(prioridade_da_url(url))
                 
                 logging.info(f"🔗 Request {attempt+1}/{max_retries}: {url}")
                 
                 response = requests.get(url, headers=self.config.HEADERS, timeout=timeout)
+                self.rate_limiter.atualizar_cota(response.headers)
                 
                 if response.status_code == 429:
                     self.api_monitor.log_request(False, True)
                     retry_after = int(response.headers.get('Retry-After', 60))
                     logging.warning(f"⏳ Rate limit da API. Esperando {retry_after} segundos...")
-                    time.sleep(retry_after)
+                    self.rate_limiter.bloquear(retry_after)
                     continue
                     
                 response.raise_for_status()
@@ -3014,16 +2946,14 @@ class APIClient:
         return self.obter_dados_api_com_retry(url, timeout, max_retries=3)
     
     def obter_classificacao(self, liga_id: str) -> dict:
-        """Obtém classificação com cache inteligente"""
-        cached = self.classificacao_cache.get(liga_id)
-        if cached:
-            logging.info(f"📊 Classificação da liga {liga_id} obtida do cache")
-            return cached
-        
+        """Obtém classificação com cache inteligente (uma busca só por liga, mesmo com sessões simultâneas)"""
+        return self.classificacao_cache.obter_ou_buscar(liga_id, lambda: self._buscar_classificacao(liga_id)) or {}
+    
+    def _buscar_classificacao(self, liga_id: str) -> dict | None:
         url = f"{self.config.BASE_URL_FD}/competitions/{liga_id}/standings"
         data = self.obter_dados_api(url)
         if not data:
-            return {}
+            return None
 
         standings = {}
         for s in data.get("standings", []):
@@ -3039,23 +2969,16 @@ class APIClient:
                     "draws": t.get("draw", 0),
                     "losses": t.get("lost", 0)
                 }
-        self.classificacao_cache.set(liga_id, standings)
         return standings
     
     def obter_jogos(self, liga_id: str, data: str) -> list:
         """Obtém jogos com cache inteligente"""
-        key = f"{liga_id}_{data}"
-        
-        cached = self.jogos_cache.get(key)
-        if cached:
-            logging.info(f"⚽ Jogos {key} obtidos do cache")
-            return cached
-        
+        return self.jogos_cache.obter_ou_buscar(f"{liga_id}_{data}", lambda: self._buscar_jogos(liga_id, data)) or []
+    
+    def _buscar_jogos(self, liga_id: str, data: str) -> list | None:
         url = f"{self.config.BASE_URL_FD}/competitions/{liga_id}/matches?dateFrom={data}&dateTo={data}"
         data_api = self.obter_dados_api(url)
-        jogos = data_api.get("matches", []) if data_api else []
-        self.jogos_cache.set(key, jogos)
-        return jogos
+        return data_api.get("matches", []) if data_api else None
     
     def obter_jogos_brasileirao(self, liga_id: str, data_hoje: str) -> list:
         """Busca jogos do Brasileirão considerando o fuso horário"""
@@ -3214,26 +3137,7 @@ class PosterGenerator:
     @staticmethod
     def criar_fonte(tamanho: int) -> ImageFont.ImageFont:
         """Cria fonte com fallback robusto"""
-        try:
-            font_paths = [
-                "arial.ttf", "Arial.ttf", "arialbd.ttf",
-                "/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf",
-                "/System/Library/Fonts/Arial.ttf",
-                "C:/Windows/Fonts/arial.ttf"
-            ]
-            
-            for font_path in font_paths:
-                try:
-                    if os.path.exists(font_path):
-                        return ImageFont.truetype(font_path, tamanho)
-                except Exception:
-                    continue
-            
-            return ImageFont.load_default()
-            
-        except Exception as e:
-            logging.error(f"Erro ao carregar fonte: {e}")
-            return ImageFont.load_default()
+        return recursos_poster.fonte(tamanho)
     
     def gerar_poster_westham_style(self, jogos: list, titulo: str = " ALERTA DE GOLS", tipo_alerta: str = "over_under") -> io.BytesIO:
         """Gera poster no estilo West Ham"""
@@ -3319,38 +3223,11 @@ class PosterGenerator:
             x_away = x_home + TAMANHO_QUADRADO + ESPACO_ENTRE_ESCUDOS
             y_escudos = y0 + 250
 
-            # Baixar escudos usando o APIClient
+            # Escudos (prontos do LRU de recursos_poster)
             home_crest_url = jogo.get('escudo_home', '')
             away_crest_url = jogo.get('escudo_away', '')
-            
-            escudo_home_bytes = None
-            escudo_away_bytes = None
-            
-            if home_crest_url:
-                escudo_home_bytes = self.api_client.baixar_escudo_time(jogo['home'], home_crest_url)
-            
-            if away_crest_url:
-                escudo_away_bytes = self.api_client.baixar_escudo_time(jogo['away'], away_crest_url)
-            
-            # Converter bytes para imagens PIL
-            escudo_home_img = None
-            escudo_away_img = None
-            
-            if escudo_home_bytes:
-                try:
-                    escudo_home_img = Image.open(io.BytesIO(escudo_home_bytes)).convert("RGBA")
-                except Exception as e:
-                    logging.error(f"Erro ao abrir escudo do {jogo['home']}: {e}")
-            
-            if escudo_away_bytes:
-                try:
-                    escudo_away_img = Image.open(io.BytesIO(escudo_away_bytes)).convert("RGBA")
-                except Exception as e:
-                    logging.error(f"Erro ao abrir escudo do {jogo['away']}: {e}")
-
-            # Desenhar escudos
-            self._desenhar_escudo_quadrado(draw, img, escudo_home_img, x_home, y_escudos, TAMANHO_QUADRADO, TAMANHO_ESCUDO, jogo['home'])
-            self._desenhar_escudo_quadrado(draw, img, escudo_away_img, x_away, y_escudos, TAMANHO_QUADRADO, TAMANHO_ESCUDO, jogo['away'])
+            self._desenhar_escudo_quadrado_time(draw, img, jogo['home'], home_crest_url, x_home, y_escudos, TAMANHO_QUADRADO, TAMANHO_ESCUDO)
+            self._desenhar_escudo_quadrado_time(draw, img, jogo['away'], away_crest_url, x_away, y_escudos, TAMANHO_QUADRADO, TAMANHO_ESCUDO)
 
             home_text = jogo['home']
             away_text = jogo['away']
@@ -3458,7 +3335,7 @@ class PosterGenerator:
             draw.text((LARGURA//2 - 250, altura_total - 70), rodape_text, font=FONTE_DETALHES, fill=(100, 130, 160))
 
         buffer = io.BytesIO()
-        img.save(buffer, format="PNG", optimize=True, quality=95)
+        img.save(buffer, format="PNG", quality=95)
         buffer.seek(0)
         
         st.success(f"✅ Poster estilo West Ham GERADO com {len(jogos)} jogos")
@@ -3620,38 +3497,11 @@ class PosterGenerator:
             x_away = x_home + TAMANHO_QUADRADO + ESPACO_ENTRE_ESCUDOS
             y_escudos = y0 + 150
 
-            # Baixar escudos usando o APIClient
+            # Escudos (prontos do LRU de recursos_poster)
             home_crest_url = jogo.get('escudo_home', '')
             away_crest_url = jogo.get('escudo_away', '')
-            
-            escudo_home_bytes = None
-            escudo_away_bytes = None
-            
-            if home_crest_url:
-                escudo_home_bytes = self.api_client.baixar_escudo_time(jogo['home'], home_crest_url)
-            
-            if away_crest_url:
-                escudo_away_bytes = self.api_client.baixar_escudo_time(jogo['away'], away_crest_url)
-            
-            # Converter bytes para imagens PIL
-            escudo_home_img = None
-            escudo_away_img = None
-            
-            if escudo_home_bytes:
-                try:
-                    escudo_home_img = Image.open(io.BytesIO(escudo_home_bytes)).convert("RGBA")
-                except Exception as e:
-                    logging.error(f"Erro ao abrir escudo do {jogo['home']}: {e}")
-            
-            if escudo_away_bytes:
-                try:
-                    escudo_away_img = Image.open(io.BytesIO(escudo_away_bytes)).convert("RGBA")
-                except Exception as e:
-                    logging.error(f"Erro ao abrir escudo do {jogo['away']}: {e}")
-
-            # Desenhar escudos
-            self._desenhar_escudo_quadrado(draw, img, escudo_home_img, x_home, y_escudos, TAMANHO_QUADRADO, TAMANHO_ESCUDO, jogo['home'])
-            self._desenhar_escudo_quadrado(draw, img, escudo_away_img, x_away, y_escudos, TAMANHO_QUADRADO, TAMANHO_ESCUDO, jogo['away'])
+            self._desenhar_escudo_quadrado_time(draw, img, jogo['home'], home_crest_url, x_home, y_escudos, TAMANHO_QUADRADO, TAMANHO_ESCUDO)
+            self._desenhar_escudo_quadrado_time(draw, img, jogo['away'], away_crest_url, x_away, y_escudos, TAMANHO_QUADRADO, TAMANHO_ESCUDO)
 
             # Nomes dos times
             home_text = jogo['home'][:12]
@@ -3777,7 +3627,7 @@ class PosterGenerator:
             draw.text((LARGURA//2 - 300, altura_total - 70), rodape_text, font=FONTE_DETALHES, fill=(100, 130, 160))
 
         buffer = io.BytesIO()
-        img.save(buffer, format="PNG", optimize=True, quality=95)
+        img.save(buffer, format="PNG", quality=95)
         buffer.seek(0)
         
         st.success(f"✅ Poster de resultados GERADO com {len(jogos_com_resultados)} jogos")
@@ -3814,39 +3664,7 @@ class PosterGenerator:
             return
 
         try:
-            logo_img = logo_img.convert("RGBA")
-            largura, altura = logo_img.size
-            
-            # Calcular para manter proporção
-            proporcao = largura / altura
-            
-            if proporcao > 1:
-                # Imagem mais larga que alta
-                nova_altura = tamanho_escudo
-                nova_largura = int(tamanho_escudo * proporcao)
-                if nova_largura > tamanho_escudo:
-                    # Redimensionar mantendo proporção
-                    nova_largura = tamanho_escudo
-                    nova_altura = int(tamanho_escudo / proporcao)
-            else:
-                # Imagem mais alta que larga
-                nova_largura = tamanho_escudo
-                nova_altura = int(tamanho_escudo / proporcao)
-                if nova_altura > tamanho_escudo:
-                    nova_altura = tamanho_escudo
-                    nova_largura = int(tamanho_escudo * proporcao)
-            
-            # Redimensionar a imagem
-            imagem_redimensionada = logo_img.resize((nova_largura, nova_altura), Image.Resampling.LANCZOS)
-            
-            # Calcular posição para centralizar
-            pos_x = x + (tamanho_quadrado - nova_largura) // 2
-            pos_y = y + (tamanho_quadrado - nova_altura) // 2
-
-            # Criar uma imagem branca de fundo
-            fundo = Image.new("RGBA", (tamanho_quadrado, tamanho_quadrado), (255, 255, 255, 255))
-            fundo.paste(imagem_redimensionada, (pos_x - x, pos_y - y), imagem_redimensionada)
-            
+            fundo = self._preparar_escudo_quadrado(logo_img, tamanho_quadrado, tamanho_escudo)
             # Colar a imagem composta
             img.paste(fundo, (x, y), fundo)
 
@@ -3871,6 +3689,56 @@ class PosterGenerator:
             except:
                 draw.text((x + 70, y + 90), iniciais, font=self.criar_fonte(50), fill=(255, 255, 255))
 
+    @staticmethod
+    def _preparar_escudo_quadrado(logo_img, tamanho_quadrado, tamanho_escudo):
+        """Fundo branco tamanho_quadrado com o escudo centralizado, pronto para colar"""
+        logo_img = logo_img.convert("RGBA")
+        largura, altura = logo_img.size
+        
+        # Calcular para manter proporção
+        proporcao = largura / altura
+        
+        if proporcao > 1:
+            # Imagem mais larga que alta
+            nova_altura = tamanho_escudo
+            nova_largura = int(tamanho_escudo * proporcao)
+            if nova_largura > tamanho_escudo:
+                # Redimensionar mantendo proporção
+                nova_largura = tamanho_escudo
+                nova_altura = int(tamanho_escudo / proporcao)
+        else:
+            # Imagem mais alta que larga
+            nova_largura = tamanho_escudo
+            nova_altura = int(tamanho_escudo / proporcao)
+            if nova_altura > tamanho_escudo:
+                nova_altura = tamanho_escudo
+                nova_largura = int(tamanho_escudo * proporcao)
+        
+        # Redimensionar a imagem
+        imagem_redimensionada = logo_img.resize((nova_largura, nova_altura), Image.Resampling.LANCZOS)
+        
+        # Centralizar numa imagem branca de fundo
+        fundo = Image.new("RGBA", (tamanho_quadrado, tamanho_quadrado), (255, 255, 255, 255))
+        fundo.paste(imagem_redimensionada, ((tamanho_quadrado - nova_largura) // 2, (tamanho_quadrado - nova_altura) // 2), imagem_redimensionada)
+        return fundo
+
+    def _desenhar_escudo_quadrado_time(self, draw, img, nome_time, crest_url, x, y, tamanho_quadrado, tamanho_escudo):
+        """_desenhar_escudo_quadrado com o escudo pronto do LRU de recursos_poster"""
+        def preparar():
+            dados = self.api_client.baixar_escudo_time(nome_time, crest_url) if crest_url else None
+            logo_img = recursos_poster.decodificar(dados) if dados else None
+            return self._preparar_escudo_quadrado(logo_img, tamanho_quadrado, tamanho_escudo) if logo_img else None
+        fundo = recursos_poster.escudos.obter_ou_criar((nome_time, crest_url, (tamanho_quadrado, tamanho_escudo), "quadrado"), preparar)
+        if fundo is None:
+            self._desenhar_escudo_quadrado(draw, img, None, x, y, tamanho_quadrado, tamanho_escudo, nome_time)
+            return
+        draw.rectangle(
+            [x, y, x + tamanho_quadrado, y + tamanho_quadrado],
+            fill=(255, 255, 255),
+            outline=(255, 255, 255)
+        )
+        img.paste(fundo, (x, y), fundo)
+
 # =============================
 # SISTEMA PRINCIPAL
 # =============================
@@ -4313,22 +4181,13 @@ class SistemaAlertasFutebol:
     
     def _conferir_resultados_tipo(self, tipo_alerta: str, data_busca: str) -> dict:
         """Conferir resultados para um tipo específico de alerta"""
-        # Carregar alertas do tipo específico
-        if tipo_alerta == "over_under":
-            alertas = DataStorage.carregar_alertas()
-            resultados = DataStorage.carregar_resultados()
-        elif tipo_alerta == "favorito":
-            alertas = DataStorage.carregar_alertas_favoritos()
-            resultados = DataStorage.carregar_resultados_favoritos()
-        elif tipo_alerta == "gols_ht":
-            alertas = DataStorage.carregar_alertas_gols_ht()
-            resultados = DataStorage.carregar_resultados_gols_ht()
-        elif tipo_alerta == "ambas_marcam":
-            alertas = DataStorage.carregar_alertas_ambas_marcam()
-            resultados = DataStorage.carregar_resultados_ambas_marcam()
-        else:
+        if tipo_alerta not in DataStorage.ARQUIVOS_ALERTAS:
             return {}
         
+        # Só os não conferidos saem do armazém; no fim gravam-se apenas os conferidos agora
+        alertas = DataStorage.alertas_pendentes(tipo_alerta)
+        resultados = {}
+        
         jogos_com_resultados = {}
         progress_bar = st.progress(0)
         total_alertas = len(alertas)
@@ -4340,9 +4199,6 @@ class SistemaAlertasFutebol:
         st.write(f"🔍 Conferindo {total_alertas} alertas do tipo {tipo_alerta}...")
         
         for idx, (fixture_id, alerta) in enumerate(alertas.items()):
-            if alerta.get("conferido", False):
-                continue
-            
             # Obter detalhes atualizados do jogo
             match_data = self.api_client.obter_detalhes_jogo(fixture_id)
             if not match_data:
@@ -4461,19 +4317,9 @@ class SistemaAlertasFutebol:
             
             progress_bar.progress((idx + 1) / total_alertas)
         
-        # Salvar alertas e resultados atualizados
-        if tipo_alerta == "over_under":
-            DataStorage.salvar_alertas(alertas)
-            DataStorage.salvar_resultados(resultados)
-        elif tipo_alerta == "favorito":
-            DataStorage.salvar_alertas_favoritos(alertas)
-            DataStorage.salvar_resultados_favoritos(resultados)
-        elif tipo_alerta == "gols_ht":
-            DataStorage.salvar_alertas_gols_ht(alertas)
-            DataStorage.salvar_resultados_gols_ht(resultados)
-        elif tipo_alerta == "ambas_marcam":
-            DataStorage.salvar_alertas_ambas_marcam(alertas)
-            DataStorage.salvar_resultados_ambas_marcam(resultados)
+        # Salvar os alertas conferidos e os resultados deles
+        DataStorage.registrar_conferencias(
+            tipo_alerta, {fixture_id: alertas[fixture_id] for fixture_id in resultados}, resultados)
         
         return jogos_com_resultados
     
@@ -4578,27 +4424,11 @@ class SistemaAlertasFutebol:
     
     def _verificar_enviar_alerta(self, jogo: Jogo, match_data: dict, analise: dict, alerta_individual: bool, min_conf: int, max_conf: int, tipo_alerta: str):
         """Verifica e envia alerta individual - CORRIGIDO"""
-        # Carregar alertas apropriados baseado no tipo
-        if tipo_alerta == "over_under":
-            alertas = DataStorage.carregar_alertas()
-            path = ConfigManager.ALERTAS_PATH
-        elif tipo_alerta == "favorito":
-            alertas = DataStorage.carregar_alertas_favoritos()
-            path = ConfigManager.ALERTAS_FAVORITOS_PATH
-        elif tipo_alerta == "gols_ht":
-            alertas = DataStorage.carregar_alertas_gols_ht()
-            path = ConfigManager.ALERTAS_GOLS_HT_PATH
-        elif tipo_alerta == "ambas_marcam":
-            alertas = DataStorage.carregar_alertas_ambas_marcam()
-            path = ConfigManager.ALERTAS_AMBAS_MARCAM_PATH
-        else:
-            alertas = {}
-            path = ""
-        
         fixture_id = str(jogo.id)
+        conhecido = tipo_alerta in DataStorage.ARQUIVOS_ALERTAS
         
         # Verificar se já existe alerta para este jogo
-        if fixture_id not in alertas:
+        if not (conhecido and DataStorage.alerta_registrado(tipo_alerta, fixture_id)):
             # CRIAR alerta_data COM TODOS OS DADOS NECESSÁRIOS
             alerta_data = {
                 "id": fixture_id,
@@ -4655,20 +4485,12 @@ class SistemaAlertasFutebol:
                         "detalhes": analise.get("detalhes", {})
                     })
             
-            alertas[fixture_id] = alerta_data
-            
             if alerta_individual:
                 self._enviar_alerta_individual(match_data, analise, tipo_alerta, min_conf, max_conf)
             
-            # Salvar no arquivo apropriado
-            if tipo_alerta == "over_under":
-                DataStorage.salvar_alertas(alertas)
-            elif tipo_alerta == "favorito":
-                DataStorage.salvar_alertas_favoritos(alertas)
-            elif tipo_alerta == "gols_ht":
-                DataStorage.salvar_alertas_gols_ht(alertas)
-            elif tipo_alerta == "ambas_marcam":
-                DataStorage.salvar_alertas_ambas_marcam(alertas)
+            # Gravar só o alerta novo
+            if conhecido:
+                DataStorage.registrar(DataStorage.ARQUIVOS_ALERTAS[tipo_alerta], fixture_id, alerta_data)
     
     def _enviar_alerta_individual(self, fixture: dict, analise: dict, tipo_alerta: str, min_conf: int, max_conf: int):
         """Envia alerta individual para o Telegram"""
@@ -1,5 +1,6 @@
 import streamlit as st
 import requests
+import cliente_http
 import os
 import joblib
 from collections import deque, Counter
@@ -147,7 +148,7 @@ contadores = carregar(CONTADORES_PATH, {"green": 0, "red": 0})
 
 # === CONSULTA API ===
 try:
-    response = requests.get(API_URL, timeout=3)
+    response = cliente_http.get(API_URL, timeout=3)
     response.raise_for_status()
     data = response.json()
     numero_atual = data["data"]["result"]["outcome"]["number"]
@@ -1,5 +1,6 @@
 import streamlit as st
 import requests
+import cliente_http
 from collections import Counter, deque
 from streamlit_autorefresh import st_autorefresh
 import os
@@ -44,7 +45,7 @@ def expandir_com_vizinhos(numeros):
 
 def obter_numero_e_timestamp():
     try:
-        response = requests.get(API_URL)
+        response = cliente_http.get(API_URL)
         data = response.json()
         numero = int(data["data"]["outcome"]["number"])
         timestamp = data["data"]["startedAt"]
@@ -1,5 +1,6 @@
 import streamlit as st
 import requests
+import cliente_http
 import json
 import os
 import joblib
@@ -77,7 +78,7 @@ def salvar_modelo(modelo):
 
 # === CAPTURA DO NÚMERO MAIS RECENTE ===
 try:
-    resposta = requests.get(API_URL, timeout=10)
+    resposta = cliente_http.get(API_URL, timeout=10)
     if resposta.status_code == 200:
         dados = resposta.json()
         try:
@@ -1,33 +1,52 @@
 import streamlit as st
 import json
 import os
+import time
 import requests
+import cliente_http
 import logging
 import numpy as np
-import pandas as pd
 from collections import Counter, deque
-from sklearn.model_selection import train_test_split
 from sklearn.preprocessing import StandardScaler
-from sklearn.metrics import accuracy_score
-from sklearn.utils import resample
 import joblib
 from streamlit_autorefresh import st_autorefresh
 import pickle
+from roleta_features import MotorFeaturesRoleta
+from ingestao_roletas import ORIGEM_MANUAL, daemon_ativo, mesa_da_url, obter_registro_mesa
+from roleta_treino import (
+    DIRETORIO_MODELOS, ServicoTreinoRoleta, carregar_modelo_publicado,
+    preparar_dados_treinamento, publicar_modelo, treinar_ensemble, versao_publicada
+)
 
 # =============================
 # CONFIGURAÇÕES DE PERSISTÊNCIA
 # =============================
 SESSION_DATA_PATH = "session_data.pkl"
-HISTORICO_PATH = "historico_coluna_duzia.json"
+HISTORICO_PATH = "historico_coluna_duzia.json"  # legado: importado uma vez para o log de giros
+SESSAO_INTERVALO_SEGUNDOS = 60
 ML_MODEL_PATH = "ml_roleta_model.pkl"
 SCALER_PATH = "ml_scaler.pkl"
 META_PATH = "ml_meta.pkl"
 
-def salvar_sessao():
-    """Salva todos os dados da sessão em arquivo"""
+@st.cache_resource
+def obter_servico_treino():
+    """Serviço de treino único por processo, compartilhado entre sessões e reruns"""
+    return ServicoTreinoRoleta(DIRETORIO_MODELOS)
+
+def obter_registro_giros():
+    """Log append-only de giros da mesa, o mesmo que o daemon de ingestão alimenta"""
+    return obter_registro_mesa(MESA_ORIGEM)
+
+def salvar_sessao(forcar=False):
+    """
+    Salva as estatísticas da sessão em arquivo (o histórico fica no log de giros).
+    Sem forcar, grava no máximo uma vez a cada SESSAO_INTERVALO_SEGUNDOS.
+    """
+    agora = time.time()
+    if not forcar and agora - st.session_state.get('ultimo_salvamento_sessao', 0) < SESSAO_INTERVALO_SEGUNDOS:
+        return True
     try:
         session_data = {
-            'historico': st.session_state.historico,
             'telegram_token': st.session_state.telegram_token,
             'telegram_chat_id': st.session_state.telegram_chat_id,
             'sistema_acertos': st.session_state.sistema.acertos,
@@ -58,8 +77,10 @@ def salvar_sessao():
             'sistema_combinacoes_frias': st.session_state.sistema.combinacoes_frias
         }
         
-        with open(SESSION_DATA_PATH, 'wb') as f:
+        with open(SESSION_DATA_PATH + '.tmp', 'wb') as f:
             pickle.dump(session_data, f)
+        os.replace(SESSION_DATA_PATH + '.tmp', SESSION_DATA_PATH)
+        st.session_state.ultimo_salvamento_sessao = agora
         
         logging.info("✅ Sessão salva com sucesso")
         return True
@@ -78,12 +99,11 @@ def carregar_sessao():
                 logging.error("❌ Dados de sessão corrompidos - não é um dicionário")
                 return False
                 
-            chaves_essenciais = ['historico', 'sistema_acertos', 'sistema_erros']
+            chaves_essenciais = ['sistema_acertos', 'sistema_erros']
             if not all(chave in session_data for chave in chaves_essenciais):
                 logging.error("❌ Dados de sessão incompletos")
                 return False
                 
-            st.session_state.historico = session_data.get('historico', [])
             st.session_state.telegram_token = session_data.get('telegram_token', '')
             st.session_state.telegram_chat_id = session_data.get('telegram_chat_id', '')
             
@@ -144,6 +164,25 @@ def carregar_sessao():
         logging.error(f"❌ Erro ao carregar sessão: {e}")
     return False
 
+def carregar_historico():
+    """Lê o histórico do log de giros; na primeira execução importa o JSON/sessão legados"""
+    registro = obter_registro_giros()
+    if registro.total() == 0:
+        legado = []
+        try:
+            if os.path.exists(HISTORICO_PATH):
+                with open(HISTORICO_PATH, "r") as f:
+                    legado = json.load(f)
+            elif os.path.exists(SESSION_DATA_PATH):
+                with open(SESSION_DATA_PATH, 'rb') as f:
+                    legado = pickle.load(f).get('historico', [])
+        except Exception as e:
+            logging.warning(f"Histórico legado ignorado: {e}")
+        if legado:
+            importados = registro.importar(legado, MESA_ORIGEM)
+            logging.info(f"📥 {importados} giros legados importados para o log")
+    st.session_state.historico, st.session_state.posicao_registro = registro.ler_desde(0)
+
 def limpar_sessao():
     """Limpa todos os dados da sessão"""
     try:
@@ -151,6 +190,7 @@ def limpar_sessao():
             os.remove(SESSION_DATA_PATH)
         if os.path.exists(HISTORICO_PATH):
             os.remove(HISTORICO_PATH)
+        obter_registro_giros().limpar()
         for key in list(st.session_state.keys()):
             del st.session_state[key]
         st.rerun()
@@ -399,6 +439,7 @@ def enviar_telegram(mensagem):
 # =============================
 API_URL = "https://api.casinoscores.com/svc-evolution-game-events/api/xxxtremelightningroulette/latest"
 HEADERS = {"User-Agent": "Mozilla/5.0"}
+MESA_ORIGEM = mesa_da_url(API_URL)
 
 # =============================
 # SISTEMA DE SELEÇÃO INTELIGENTE DE NÚMEROS
@@ -592,12 +633,15 @@ class MLRoletaOtimizada:
         self.is_trained = False
         self.contador_treinamento = 0
         self.meta = {}
+        self.versao_modelo = None
 
         self.window_for_features = [3, 8, 15, 30, 60, 120]
         self.k_vizinhos = 2
         self.numeros = list(range(37))
         self.ensemble_size = 3
 
+        self.motor_features = MotorFeaturesRoleta(self.roleta.race, janelas=self.window_for_features)
+
     def get_neighbors(self, numero, k=None):
         if k is None:
             k = self.k_vizinhos
@@ -700,204 +744,84 @@ class MLRoletaOtimizada:
             return None, None
 
     def preparar_dados_treinamento(self, historico_completo):
-        historico_completo = list(historico_completo)
-        if len(historico_completo) > self.max_history:
-            historico_completo = historico_completo[-self.max_history:]
+        X, y = preparar_dados_treinamento(historico_completo, self.motor_features, self.max_history)
+        self.feature_names = self.motor_features.feature_names
+        return X, y
 
-        X = []
-        y = []
-        
-        start_index = max(50, len(historico_completo) // 10)
-        
-        for i in range(start_index, len(historico_completo)):
-            janela = historico_completo[:i]
-            feats, _ = self.extrair_features(janela)
-            if feats is None:
-                continue
-            X.append(feats)
-            y.append(historico_completo[i])
-        
-        if len(X) == 0:
-            return np.array([]), np.array([])
-        
-        class_counts = Counter(y)
-        if len(class_counts) < 10:
-            logging.warning(f"Pouca variedade de classes: apenas {len(class_counts)} números únicos")
-            return np.array([]), np.array([])
-        
-        return np.array(X), np.array(y)
+    def _config_treino(self, balance=True):
+        return {
+            'seed': self.seed,
+            'max_history': self.max_history,
+            'janelas': self.window_for_features,
+            'balance': balance,
+        }
 
-    def _build_and_train_model(self, X_train, y_train, X_val=None, y_val=None, seed=0):
-        try:
-            try:
-                from catboost import CatBoostClassifier
-                model = CatBoostClassifier(
-                    iterations=1500,
-                    learning_rate=0.05,
-                    depth=10,
-                    l2_leaf_reg=5,
-                    bagging_temperature=0.8,
-                    random_strength=1.0,
-                    loss_function='MultiClass',
-                    eval_metric='MultiClass',
-                    random_seed=seed,
-                    use_best_model=True,
-                    early_stopping_rounds=100,
-                    verbose=False
-                )
-                if X_val is not None and y_val is not None:
-                    model.fit(X_train, y_train, eval_set=(X_val, y_val), verbose=False)
-                else:
-                    model.fit(X_train, y_train, verbose=False)
-                return model, "CatBoost"
-            except ImportError:
-                raise Exception("CatBoost não disponível")
-                
-        except Exception as e:
-            logging.warning(f"CatBoost não disponível ou falha ({e}). Usando RandomForest como fallback.")
-            from sklearn.ensemble import RandomForestClassifier
-            model = RandomForestClassifier(
-                n_estimators=400,
-                max_depth=20,
-                min_samples_split=3,
-                min_samples_leaf=2,
-                random_state=seed,
-                n_jobs=-1
-            )
-            model.fit(X_train, y_train)
-            return model, "RandomForest"
+    def _aplicar_pacote(self, versao, pacote, contar=True):
+        # Troca tudo de uma vez: a previsão nunca mistura modelos e scaler de versões diferentes
+        self.models = pacote.get('models', [])
+        self.scaler = pacote.get('scaler', self.scaler)
+        self.feature_names = pacote.get('feature_names', self.feature_names)
+        self.meta.update(pacote.get('meta', {}))
+        self.meta['versao_modelo'] = versao
+        self.versao_modelo = versao
+        self.is_trained = len(self.models) > 0
+        if contar:
+            self.contador_treinamento += 1
 
     def treinar_modelo(self, historico_completo, force_retrain: bool = False, balance: bool = True):
+        """Treino síncrono (bloqueia o rerun); o caminho normal é treinar_em_segundo_plano"""
         try:
             if len(historico_completo) < self.min_training_samples and not force_retrain:
                 return False, f"Necessário mínimo de {self.min_training_samples} amostras. Atual: {len(historico_completo)}"
 
-            X, y = self.preparar_dados_treinamento(historico_completo)
-            if X.size == 0 or len(X) < 50:
-                return False, f"Dados insuficientes para treino: {len(X)} amostras"
-
-            X_scaled = self.scaler.fit_transform(X)
-
-            try:
-                class_counts = Counter(y)
-                min_samples_per_class = min(class_counts.values())
-                
-                can_stratify = min_samples_per_class >= 2 and len(class_counts) > 1
-                
-                X_train, X_val, y_train, y_val = train_test_split(
-                    X_scaled, y, 
-                    test_size=0.2, 
-                    random_state=self.seed, 
-                    stratify=y if can_stratify else None
-                )
-                
-                logging.info(f"Split realizado: estratificação = {can_stratify}, classes = {len(class_counts)}, min_amostras = {min_samples_per_class}")
-                
-            except Exception as e:
-                logging.warning(f"Erro no split estratificado: {e}. Usando split sem estratificação.")
-                X_train, X_val, y_train, y_val = train_test_split(
-                    X_scaled, y, test_size=0.2, random_state=self.seed
-                )
-
-            if balance and len(X_train) > 0:
-                try:
-                    df_train = pd.DataFrame(X_train, columns=[f"f{i}" for i in range(X_train.shape[1])])
-                    df_train['y'] = y_train
-                    
-                    value_counts = df_train['y'].value_counts()
-                    if len(value_counts) == 0:
-                        raise ValueError("Nenhuma classe encontrada")
-                    
-                    max_count = value_counts.max()
-                    
-                    if len(value_counts) < 2:
-                        logging.warning("Apenas uma classe disponível, pulando balanceamento")
-                        balance = False
-                    else:
-                        frames = []
-                        for cls, grp in df_train.groupby('y'):
-                            if len(grp) < max_count:
-                                if len(grp) >= 1:
-                                    min_samples = max(5, max_count // 3)
-                                    n_samples = min(max_count, min_samples)
-                                    grp_up = resample(grp, replace=True, n_samples=n_samples, random_state=self.seed)
-                                    frames.append(grp_up)
-                                else:
-                                    frames.append(grp)
-                            else:
-                                frames.append(grp)
-                        
-                        if frames:
-                            df_bal = pd.concat(frames)
-                            y_train = df_bal['y'].values
-                            X_train = df_bal.drop(columns=['y']).values
-                        else:
-                            balance = False
-                            
-                except Exception as e:
-                    logging.warning(f"Erro no balanceamento: {e}. Continuando sem balanceamento.")
-                    balance = False
-
-            models = []
-            model_names = []
-            
-            for s in [self.seed, self.seed + 7, self.seed + 13]:
-                try:
-                    model, name = self._build_and_train_model(X_train, y_train, X_val, y_val, seed=s)
-                    models.append(model)
-                    model_names.append(name)
-                except Exception as e:
-                    logging.error(f"Erro ao treinar modelo {s}: {e}")
-
-            if not models:
-                return False, "Todos os modelos falharam no treinamento"
-
-            try:
-                probs = []
-                for m in models:
-                    if hasattr(m, 'predict_proba'):
-                        probs.append(m.predict_proba(X_val))
-                    else:
-                        preds = m.predict(X_val)
-                        prob = np.zeros((len(preds), len(self.numeros)))
-                        for i, p in enumerate(preds):
-                            prob[i, p] = 1.0
-                        probs.append(prob)
-                
-                if probs:
-                    avg_prob = np.mean(probs, axis=0)
-                    y_pred = np.argmax(avg_prob, axis=1)
-                    acc = accuracy_score(y_val, y_pred)
-                else:
-                    acc = 0.0
-                    
-            except Exception as e:
-                logging.warning(f"Erro na avaliação: {e}")
-                acc = 0.0
-
-            self.models = models
-            self.is_trained = True
-            self.contador_treinamento += 1
-            self.meta['last_accuracy'] = acc
-            self.meta['trained_on'] = len(historico_completo)
-            self.meta['last_training_size'] = len(X)
+            pacote, mensagem = treinar_ensemble(list(historico_completo), self.roleta.race, self._config_treino(balance))
+            if pacote is None:
+                return False, mensagem
 
             try:
-                joblib.dump({'models': self.models}, ML_MODEL_PATH)
-                joblib.dump(self.scaler, SCALER_PATH)
-                joblib.dump(self.meta, META_PATH)
-                logging.info(f"Modelos salvos em disco: {ML_MODEL_PATH}")
+                versao = publicar_modelo(pacote, DIRETORIO_MODELOS)
+                logging.info(f"Modelos publicados em disco: versão {versao}")
             except Exception as e:
+                versao = None
                 logging.warning(f"Falha ao salvar modelos: {e}")
 
-            return True, f"Ensemble treinado ({', '.join(model_names)}) com {len(X)} amostras. Acurácia validação: {acc:.2%}"
+            self._aplicar_pacote(versao, pacote)
+            return True, mensagem
 
         except Exception as e:
             logging.error(f"[treinar_modelo] Erro: {e}", exc_info=True)
             return False, f"Erro no treinamento: {str(e)}"
 
+    def treinar_em_segundo_plano(self, historico_completo, force_retrain: bool = False, balance: bool = True):
+        """Envia o treino para o ServicoTreinoRoleta; o modelo atual segue ativo até a nova versão ser publicada"""
+        try:
+            if len(historico_completo) < self.min_training_samples and not force_retrain:
+                return False, f"Necessário mínimo de {self.min_training_samples} amostras. Atual: {len(historico_completo)}"
+
+            job_id = obter_servico_treino().submeter(historico_completo, self.roleta.race, self._config_treino(balance))
+            return True, f"Treinamento #{job_id} enviado para segundo plano"
+        except Exception as e:
+            logging.error(f"[treinar_em_segundo_plano] Erro: {e}")
+            return False, f"Erro ao agendar treinamento: {str(e)}"
+
+    def atualizar_modelo_publicado(self):
+        """Carrega a versão publicada se for mais nova que a em uso (uma leitura do ponteiro por chamada)"""
+        versao = versao_publicada(DIRETORIO_MODELOS)
+        if versao is None or versao == self.versao_modelo:
+            return False
+        versao, pacote = carregar_modelo_publicado(DIRETORIO_MODELOS)
+        if pacote is None:
+            return False
+        self._aplicar_pacote(versao, pacote)
+        logging.info(f"Modelo ML atualizado para a versão {versao}")
+        return True
+
     def carregar_modelo(self):
         try:
+            versao, pacote = carregar_modelo_publicado(DIRETORIO_MODELOS)
+            if pacote is not None:
+                self._aplicar_pacote(versao, pacote, contar=False)
+                return True
             if os.path.exists(ML_MODEL_PATH) and os.path.exists(SCALER_PATH):
                 data = joblib.load(ML_MODEL_PATH)
                 self.models = data.get('models', [])
@@ -928,10 +852,12 @@ class MLRoletaOtimizada:
         return np.mean(probs, axis=0)
 
     def prever_proximo_numero(self, historico, top_k: int = 25):
+        self.atualizar_modelo_publicado()
         if not self.is_trained:
             return None, "Modelo não treinado"
 
-        feats, _ = self.extrair_features(historico)
+        self.motor_features.sincronizar(historico)
+        feats, _ = self.motor_features.features_atuais()
         if feats is None:
             return None, "Features insuficientes"
 
@@ -972,7 +898,7 @@ class MLRoletaOtimizada:
             hits = sum(1 for r in recent if r['hit'])
             if len(recent) >= 5 and hits / len(recent) < 0.25:
                 logging.info("[feedback] Baixa performance detectada — forçando retreinamento incremental")
-                self.treinar_modelo(historico, force_retrain=True, balance=True)
+                self.treinar_em_segundo_plano(historico, force_retrain=True, balance=True)
             return True
         except Exception as e:
             logging.error(f"[registrar_resultado] Erro: {e}")
@@ -983,7 +909,7 @@ class MLRoletaOtimizada:
             n = len(historico_completo)
             if n >= self.min_training_samples:
                 if n % self.retrain_every_n == 0:
-                    return self.treinar_modelo(historico_completo)
+                    return self.treinar_em_segundo_plano(historico_completo)
             return False, "Aguardando próximo ciclo de treinamento"
         except Exception as e:
             return False, f"Erro ao verificar retrain: {e}"
@@ -1847,6 +1773,7 @@ class EstrategiaML:
         if len(self.historico) < 10:
             return None
 
+        self.ml.atualizar_modelo_publicado()
         if not self.ml.is_trained:
             return None
 
@@ -1965,7 +1892,7 @@ class EstrategiaML:
         
         if len(historico_numeros) >= self.ml.min_training_samples:
             try:
-                success, message = self.ml.treinar_modelo(historico_numeros)
+                success, message = self.ml.treinar_em_segundo_plano(historico_numeros)
                 if success:
                     logging.info(f"✅ Treinamento automático ML: {message}")
                 else:
@@ -2014,7 +1941,7 @@ class EstrategiaML:
             historico_numeros = self.extrair_numeros_historico()
         
         if len(historico_numeros) >= self.ml.min_training_samples:
-            success, message = self.ml.treinar_modelo(historico_numeros)
+            success, message = self.ml.treinar_em_segundo_plano(historico_numeros)
             return success, message
         else:
             return False, f"Histórico insuficiente: {len(historico_numeros)}/{self.ml.min_training_samples} números"
@@ -2684,16 +2611,9 @@ class SistemaRoletaCompleto:
 def tocar_som_moeda():
     st.markdown("""<audio autoplay><source src="" type="audio/mp3"></audio>""", unsafe_allow_html=True)
 
-def salvar_resultado_em_arquivo(historico, caminho=HISTORICO_PATH):
-    try:
-        with open(caminho, "w") as f:
-            json.dump(historico, f, indent=2)
-    except Exception as e:
-        logging.error(f"Erro ao salvar histórico: {e}")
-
 def fetch_latest_result():
     try:
-        response = requests.get(API_URL, headers=HEADERS, timeout=5)
+        response = cliente_http.get(API_URL, headers=HEADERS, timeout=5)
         response.raise_for_status()
         data = response.json()
         game_data = data.get("data", {})
@@ -2740,18 +2660,13 @@ st.title("🎯 IA Roleta — Sistema Multi-Estratégias")
 if "sistema" not in st.session_state:
     st.session_state.sistema = SistemaRoletaCompleto()
 
-# Tentar carregar sessão salva
-sessao_carregada = carregar_sessao()
+# Tentar carregar sessão salva (uma vez por sessão; o estado vive em st.session_state)
+if "sessao_carregada" not in st.session_state:
+    st.session_state.sessao_carregada = carregar_sessao()
+sessao_carregada = st.session_state.sessao_carregada
 
 if "historico" not in st.session_state:
-    if not sessao_carregada and os.path.exists(HISTORICO_PATH):
-        try:
-            with open(HISTORICO_PATH, "r") as f:
-                st.session_state.historico = json.load(f)
-        except:
-            st.session_state.historico = []
-    elif not sessao_carregada:
-        st.session_state.historico = []
+    carregar_historico()
 
 if "telegram_token" not in st.session_state and not sessao_carregada:
     st.session_state.telegram_token = ""
@@ -2772,7 +2687,7 @@ with st.sidebar.expander("💾 Gerenciamento de Sessão", expanded=False):
     
     with col1:
         if st.button("💾 Salvar Sessão", use_container_width=True):
-            salvar_sessao()
+            salvar_sessao(forcar=True)
             st.success("✅ Sessão salva!")
             
     with col2:
@@ -2831,7 +2746,7 @@ with st.sidebar.expander("🔔 Configurações do Telegram", expanded=False):
     if st.button("Salvar Configurações Telegram"):
         st.session_state.telegram_token = telegram_token
         st.session_state.telegram_chat_id = telegram_chat_id
-        salvar_sessao()
+        salvar_sessao(forcar=True)
         st.success("✅ Configurações do Telegram salvas!")
         
     if st.button("Testar Conexão Telegram"):
@@ -2968,16 +2883,14 @@ with st.sidebar.expander("🧠 Treinamento ML", expanded=False):
         st.success("✨ **Pronto para treinar!**")
         
         if st.button("🚀 Treinar Modelo ML", type="primary", use_container_width=True):
-            with st.spinner("Treinando modelo ML com CatBoost... Isso pode levar alguns segundos"):
-                try:
-                    success, message = st.session_state.sistema.treinar_modelo_ml(numeros_lista)
-                    if success:
-                        st.success(f"✅ {message}")
-                        st.balloons()
-                    else:
-                        st.error(f"❌ {message}")
-                except Exception as e:
-                    st.error(f"💥 Erro no treinamento: {str(e)}")
+            try:
+                success, message = st.session_state.sistema.treinar_modelo_ml(numeros_lista)
+                if success:
+                    st.success(f"✅ {message}")
+                else:
+                    st.error(f"❌ {message}")
+            except Exception as e:
+                st.error(f"💥 Erro no treinamento: {str(e)}")
     
     else:
         st.warning(f"📥 Colete mais {200 - numeros_disponiveis} números para treinar o ML")
@@ -3000,6 +2913,16 @@ with st.sidebar.expander("🧠 Treinamento ML", expanded=False):
     else:
         st.info("🤖 ML aguardando treinamento")
 
+    jobs_treino = obter_servico_treino().status()
+    if jobs_treino:
+        st.write("**Treinamentos em segundo plano:**")
+        for job in jobs_treino[:5]:
+            duracao = f"{job['duracao']:.1f}s" if job['duracao'] is not None else "-"
+            versao = f" → v{job['versao']}" if job['versao'] else ""
+            st.write(f"#{job['id']} {job['estado']} ({job['amostras']} números, {duracao}){versao}")
+            if job['estado'] == 'erro':
+                st.caption(job['mensagem'])
+
 # Estatísticas de Padrões ML
 with st.sidebar.expander("🔍 Estatísticas de Padrões ML", expanded=False):
     if st.session_state.sistema.estrategia_selecionada == "ML":
@@ -3086,12 +3009,9 @@ entrada = st.text_input("Digite números (0-36) separados por espaço:")
 if st.button("Adicionar") and entrada:
     try:
         nums = [int(n) for n in entrada.split() if n.isdigit() and 0 <= int(n) <= 36]
+        registro = obter_registro_giros()
         for n in nums:
-            item = {"number": n, "timestamp": f"manual_{len(st.session_state.historico)}"}
-            st.session_state.historico.append(item)
-            st.session_state.sistema.processar_novo_numero(n)
-        salvar_resultado_em_arquivo(st.session_state.historico)
-        salvar_sessao()
+            registro.registrar(n, f"manual_{registro.total()}", ORIGEM_MANUAL)
         st.success(f"{len(nums)} números adicionados!")
         st.rerun()
     except Exception as e:
@@ -3100,20 +3020,21 @@ if st.button("Adicionar") and entrada:
 # Atualização automática
 st_autorefresh(interval=3000, key="refresh")
 
-# Buscar resultado da API
-resultado = fetch_latest_result()
-if st.session_state.historico:
-    ultimo_ts = st.session_state.historico[-1].get("timestamp") if st.session_state.historico else None
-else:
-    ultimo_ts = None
-
-if resultado and resultado.get("timestamp") and resultado["timestamp"] != ultimo_ts:
-    numero_atual = resultado.get("number")
-    if numero_atual is not None:
-        st.session_state.historico.append(resultado)
-        st.session_state.sistema.processar_novo_numero(resultado)
-        salvar_resultado_em_arquivo(st.session_state.historico)
-        salvar_sessao()
+# Buscar resultado da API só se o daemon de ingestão não estiver rodando
+# (o log descarta timestamps repetidos da mesa)
+registro = obter_registro_giros()
+if not daemon_ativo(MESA_ORIGEM):
+    resultado = fetch_latest_result()
+    if resultado and resultado.get("timestamp") and resultado.get("number") is not None:
+        registro.registrar(resultado["number"], resultado["timestamp"], MESA_ORIGEM)
+
+# Processar giros novos do log: API, entrada manual ou outras abas
+novos_giros, st.session_state.posicao_registro = registro.ler_desde(st.session_state.posicao_registro)
+for item in novos_giros:
+    st.session_state.historico.append(item)
+    st.session_state.sistema.processar_novo_numero(item)
+if novos_giros:
+    salvar_sessao()
 
 # Interface principal
 st.subheader("🔁 Últimos Números")
@@ -3297,9 +3218,8 @@ if sistema.historico_desempenho:
         st.write(f"{emoji}{rotacao_emoji} {resultado['estrategia']}{tipo_aposta_info}: Número {resultado['numero']}{zona_info}")
 
 # Download histórico
-if os.path.exists(HISTORICO_PATH):
-    with open(HISTORICO_PATH, "r") as f:
-        conteudo = f.read()
+if st.session_state.historico:
+    conteudo = json.dumps(st.session_state.historico, indent=2)
     st.download_button("📥 Baixar histórico", data=conteudo, file_name="historico_roleta.json")
 
 # ✅ CORREÇÃO FINAL: Salvar sessão
@@ -1,5 +1,6 @@
 import streamlit as st
 import requests
+import cliente_http
 import os
 import joblib
 from collections import Counter, deque
@@ -81,7 +82,7 @@ def salvar_modelo(modelo):
 
 # CAPTURA DO NÚMERO MAIS RECENTE
 try:
-    resposta = requests.get(API_URL, timeout=5)
+    resposta = cliente_http.get(API_URL, timeout=5)
     if resposta.status_code == 200:
         dados = resposta.json()
         try:
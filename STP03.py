@@ -1,5 +1,6 @@
 import streamlit as st
 import requests
+import cliente_http
 import json
 import os
 import joblib
@@ -38,7 +39,7 @@ if "entrada_atual" not in st.session_state:
 # === FUNÇÕES ===
 def capturar_numero_api():
     try:
-        response = requests.get(API_URL)
+        response = cliente_http.get(API_URL)
         response.raise_for_status()
         data = response.json()
 
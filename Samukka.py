@@ -1,5 +1,6 @@
 import streamlit as st
 import requests
+import cliente_http
 import json
 from collections import deque
 from streamlit_autorefresh import st_autorefresh
@@ -64,7 +65,7 @@ st.markdown(f"""
 
 # === CAPTURA DA API ===
 try:
-    response = requests.get(URL_API)
+    response = cliente_http.get(URL_API)
     data = response.json()
 
     resultado = data.get("data", {}).get("result", {}).get("outcome")
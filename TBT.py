@@ -1,5 +1,6 @@
 import streamlit as st
 import requests
+import cliente_http
 import pandas as pd
 from collections import Counter, deque
 from datetime import datetime, timedelta
@@ -67,7 +68,7 @@ def salvar_historico(numero, terminal):
 
 def get_numeros():
     try:
-        r = requests.get(API_URL, headers={"User-Agent": "Mozilla/5.0"}, timeout=5)
+        r = cliente_http.get(API_URL, headers={"User-Agent": "Mozilla/5.0"}, timeout=5)
         data = r.json()
         numero = data.get("data", {}).get("result", {}).get("outcome", {}).get("number")
         if numero is not None and 0 <= int(numero) <= 36:
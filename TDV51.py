@@ -1,5 +1,6 @@
 import streamlit as st
 import requests
+import cliente_http
 import joblib
 from collections import Counter, deque
 import pandas as pd
@@ -199,7 +200,7 @@ def estrategia_7_rodadas(historico):
 # === CAPTURA DA API ===
 # ==========================
 try:
-    r = requests.get(API_URL, timeout=5)
+    r = cliente_http.get(API_URL, timeout=5)
     if r.status_code == 200:
         d = r.json()
         numero = int(d["data"]["result"]["outcome"]["number"])
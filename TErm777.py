@@ -1,5 +1,6 @@
 import streamlit as st
 import requests
+import cliente_http
 from collections import Counter, deque
 from streamlit_autorefresh import st_autorefresh
 import os
@@ -28,7 +29,7 @@ def enviar_telegram(msg):
 
 def get_numero_api():
     try:
-        r = requests.get(API_URL, headers={"User-Agent": "Mozilla/5.0"}, timeout=2)
+        r = cliente_http.get(API_URL, headers={"User-Agent": "Mozilla/5.0"}, timeout=2)
         data = r.json()
         numero = data.get("data", {}).get("result", {}).get("outcome", {}).get("number")
         timestamp = data.get("data", {}).get("settledAt")  # Corrigido aqui!
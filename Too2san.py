@@ -1,5 +1,6 @@
 import streamlit as st
 import requests
+import cliente_http
 import joblib
 import numpy as np
 from collections import deque, Counter
@@ -237,7 +238,7 @@ def extrair_features(janela_numeros):
 
 def capturar_numero_api():
     try:
-        r = requests.get(API_URL, timeout=4)
+        r = cliente_http.get(API_URL, timeout=4)
         r.raise_for_status()
         data = r.json()
         candidates = []
@@ -0,0 +1,212 @@
+# agregados_performance.py
+"""
+Agregados de desempenho dos alertas (acertos por liga, faixa de confiança e
+tipo de aposta) com gravação em lote.
+
+O AnalisadorPerformance regravava o modelo_performance.json inteiro a cada
+alerta conferido. Aqui registrar() só acumula o delta na memória — e já
+atualiza os contadores lidos pelo app — e descarregar() grava tudo de uma vez,
+ao fim de cada rodada de conferência: relê o arquivo, aplica os deltas
+pendentes por cima e grava, então outro processo que gravou nesse meio-tempo
+não perde contagem.
+
+Além das chaves mensais de antes ("over_under_202610"), cada resultado entra
+num balde diário (guardados por JANELA_MAXIMA dias). As janelas móveis
+JANELAS (7/30/90 dias) são mantidas somadas: registrar() incrementa todas, e
+elas só são refeitas a partir dos baldes quando o dia vira. Assim
+acuracia() e limiar() leem valores prontos.
+
+Instâncias criadas com compartilhado() dividem o mesmo estado no processo,
+então cada AnalisadorTendencia novo não relê o arquivo.
+"""
+import threading
+from datetime import date, datetime, timedelta
+
+JANELAS = (7, 30, 90)
+JANELA_MAXIMA = max(JANELAS)
+MAX_ERROS = 100
+CHAVE_DIARIO = "diario"
+DIMENSOES = ("por_liga", "por_faixa_confianca", "por_tipo")
+
+_compartilhados = {}
+_compartilhados_lock = threading.Lock()
+
+
+def faixa_confianca(confianca) -> str:
+    """70.5 -> "70-79" """
+    base = int((confianca or 0) // 10 * 10)
+    return f"{base}-{base + 9}"
+
+
+def _novo_contador():
+    return {"total": 0, "greens": 0, **{dimensao: {} for dimensao in DIMENSOES}}
+
+
+def _somar(contador, green, chaves, sinal=1):
+    """Soma (ou subtrai) um resultado no contador; chaves = valor de cada dimensão"""
+    contador["total"] += sinal
+    contador["greens"] += sinal * green
+    for dimensao, chave in zip(DIMENSOES, chaves):
+        item = contador[dimensao].setdefault(chave, {"total": 0, "greens": 0})
+        item["total"] += sinal
+        item["greens"] += sinal * green
+
+
+def _somar_contador(destino, origem):
+    destino["total"] += origem.get("total", 0)
+    destino["greens"] += origem.get("greens", 0)
+    for dimensao in DIMENSOES:
+        for chave, item in origem.get(dimensao, {}).items():
+            alvo = destino[dimensao].setdefault(chave, {"total": 0, "greens": 0})
+            alvo["total"] += item.get("total", 0)
+            alvo["greens"] += item.get("greens", 0)
+
+
+def _aplicar(estado, delta):
+    """Aplica um resultado registrado ao estado persistido (chave mensal + balde diário)"""
+    tipo_alerta, dia, mes, green, chaves, erro = delta
+    if mes not in estado:
+        estado[mes] = {"total": 0, "greens": 0, "reds": 0, **{dimensao: {} for dimensao in DIMENSOES}, "erros": []}
+    hist = estado[mes]
+    _somar(hist, green, chaves)
+    if not green:
+        hist["reds"] += 1
+        if erro is not None and len(hist["erros"]) < MAX_ERROS:
+            hist["erros"].append(erro)
+
+    baldes = estado.setdefault(CHAVE_DIARIO, {}).setdefault(tipo_alerta, {})
+    _somar(baldes.setdefault(dia, _novo_contador()), green, chaves)
+
+
+def _podar(estado, hoje):
+    """Descarta baldes diários mais velhos que a maior janela"""
+    limite = (hoje - timedelta(days=JANELA_MAXIMA - 1)).isoformat()
+    for baldes in estado.get(CHAVE_DIARIO, {}).values():
+        for dia in [d for d in baldes if d < limite]:
+            del baldes[dia]
+
+
+class AgregadosPerformance:
+    def __init__(self, carregar, salvar):
+        """carregar() -> dict e salvar(dict) fazem a persistência (DataStorage no app)"""
+        self._carregar = carregar
+        self._salvar = salvar
+        self.lock = threading.RLock()
+        self.estado = carregar() or {}
+        self._deltas = []
+        self._janelas = {}          # tipo_alerta -> {dias: contador}
+        self._janelas_dia = None
+
+    # ---------- janelas móveis ----------
+    def _refazer_janelas(self, hoje):
+        self._janelas = {}
+        for tipo_alerta, baldes in self.estado.get(CHAVE_DIARIO, {}).items():
+            janelas = self._janelas[tipo_alerta] = {dias: _novo_contador() for dias in JANELAS}
+            for dia, contador in baldes.items():
+                try:
+                    idade = (hoje - date.fromisoformat(dia)).days
+                except ValueError:
+                    continue
+                for dias in JANELAS:
+                    if 0 <= idade < dias:
+                        _somar_contador(janelas[dias], contador)
+        self._janelas_dia = hoje
+
+    def _janela(self, tipo_alerta, dias):
+        hoje = date.today()
+        if self._janelas_dia != hoje:
+            self._refazer_janelas(hoje)
+        janelas = self._janelas.get(tipo_alerta)
+        return janelas.get(dias) if janelas else None
+
+    # ---------- escrita ----------
+    def registrar(self, tipo_alerta: str, resultado: str, alerta: dict, metadata: dict):
+        """Conta um alerta conferido; fica na memória até descarregar()"""
+        agora = datetime.now()
+        green = int(resultado == "GREEN")
+        chaves = (alerta.get("liga", "Desconhecida"),
+                  faixa_confianca(alerta.get("confianca", 0)),
+                  alerta.get("tipo_aposta", "unknown"))
+        erro = None if green else {
+            "alerta": alerta,
+            "metadata": metadata,
+            "resultado_esperado": alerta.get("tendencia", ""),
+            "resultado_real": f"{metadata.get('home_goals', '?')}-{metadata.get('away_goals', '?')}"
+        }
+        delta = (tipo_alerta, agora.date().isoformat(), f"{tipo_alerta}_{agora.strftime('%Y%m')}", green, chaves, erro)
+        with self.lock:
+            self._janela(tipo_alerta, JANELAS[0])
+            _aplicar(self.estado, delta)
+            self._deltas.append(delta)
+            janelas = self._janelas.setdefault(tipo_alerta, {dias: _novo_contador() for dias in JANELAS})
+            for contador in janelas.values():
+                _somar(contador, green, chaves)
+
+    def descarregar(self) -> int:
+        """Grava os deltas pendentes de uma vez; devolve quantos foram gravados"""
+        with self.lock:
+            if not self._deltas:
+                return 0
+            estado = self._carregar() or {}
+            for delta in self._deltas:
+                _aplicar(estado, delta)
+            _podar(estado, date.today())
+            self._salvar(estado)
+            gravados = len(self._deltas)
+            self._deltas = []
+            self.estado = estado
+            self._refazer_janelas(date.today())
+            return gravados
+
+    def recarregar(self):
+        """Descarta os deltas pendentes e relê o arquivo (ex.: depois de um reset)"""
+        with self.lock:
+            self._deltas = []
+            self.estado = self._carregar() or {}
+            self._janelas_dia = None
+
+    # ---------- leitura ----------
+    def mensal(self, tipo_alerta: str, mes: str = None) -> dict:
+        """Contador do mês ("YYYYMM", padrão o atual) no formato antigo, ou {}"""
+        with self.lock:
+            return self.estado.get(f"{tipo_alerta}_{mes or datetime.now().strftime('%Y%m')}", {})
+
+    def contador(self, tipo_alerta: str, dias: int = 30) -> dict:
+        """Soma dos últimos `dias` (um de JANELAS) ou None sem dados"""
+        with self.lock:
+            return self._janela(tipo_alerta, dias)
+
+    def acuracia(self, tipo_alerta: str, dimensao: str, chave: str, dias: int = 30, padrao: float = 0.5) -> float:
+        with self.lock:
+            contador = self._janela(tipo_alerta, dias)
+            item = contador[dimensao].get(chave) if contador else None
+            if not item or item["total"] <= 0:
+                return padrao
+            return item["greens"] / item["total"]
+
+    def limiar(self, tipo_alerta: str, dias: int = 30, minimo_amostras: int = 5, padrao: float = 70.0) -> float:
+        """Início da faixa de confiança com melhor acurácia × √amostras na janela"""
+        with self.lock:
+            contador = self._janela(tipo_alerta, dias)
+            if not contador:
+                return padrao
+            melhor_faixa, melhor_score = padrao, 0.0
+            for faixa, item in contador["por_faixa_confianca"].items():
+                if item["total"] < minimo_amostras:
+                    continue
+                score = item["greens"] / item["total"] * (item["total"] ** 0.5)
+                if score > melhor_score:
+                    melhor_score = score
+                    try:
+                        melhor_faixa = float(faixa.split('-')[0])
+                    except ValueError:
+                        melhor_faixa = padrao
+            return melhor_faixa
+
+
+def compartilhado(nome: str, carregar, salvar) -> AgregadosPerformance:
+    """Uma instância por nome no processo (o arquivo é lido uma vez só)"""
+    with _compartilhados_lock:
+        if nome not in _compartilhados:
+            _compartilhados[nome] = AgregadosPerformance(carregar, salvar)
+        return _compartilhados[nome]
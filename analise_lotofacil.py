@@ -0,0 +1,154 @@
+# analise_lotofacil.py
+"""
+Estatísticas de histórico da Lotofácil sobre uma matriz concursos × 25 (uint8).
+
+A linha i da matriz é concursos[i], na ordem em que a lista chegou (alguns apps
+guardam o mais recente no índice 0, outros no fim); cada app escolhe as fatias.
+- frequência de qualquer janela: diferença de duas linhas da soma acumulada
+- co-ocorrência: um único produto X.T @ X (diagonal zerada)
+- atraso: primeira linha em que a dezena aparece
+- ciclo: OR acumulado das máscaras até cobrir as 25 dezenas
+As tabelas ficam em cache por lista de concursos: enquanto não sai concurso
+novo, todas as classes de estratégia leem as mesmas tabelas já calculadas.
+"""
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+import lotofacil_bits as lb
+
+MAX_TABELAS = 8
+_POSICOES = np.arange(lb.DEZENAS, dtype=np.uint32)
+
+
+def matriz_binaria(mascaras):
+    """Máscaras -> matriz len × 25 com 1 onde a dezena saiu (coluna n-1 = dezena n)"""
+    return ((np.asarray(mascaras, dtype=np.uint32)[:, None] >> _POSICOES) & 1).astype(np.uint8)
+
+
+class TabelasConcursos:
+    """Tabelas das máscaras dos concursos; as fatias seguem a semântica de lista do Python"""
+
+    def __init__(self, mascaras):
+        self.mascaras = np.array(mascaras, dtype=np.uint32)
+        self.total = len(self.mascaras)
+        self.matriz = matriz_binaria(self.mascaras)
+        self.acumulada = np.zeros((self.total + 1, lb.DEZENAS), dtype=np.int64)
+        np.cumsum(self.matriz, axis=0, out=self.acumulada[1:])
+        for tabela in (self.mascaras, self.matriz, self.acumulada):
+            tabela.flags.writeable = False
+        self._cache = {}
+        self._lock = threading.Lock()
+
+    def _intervalo(self, inicio, fim):
+        a, b, _ = slice(inicio, fim).indices(self.total)
+        return a, max(a, b)
+
+    def _guardado(self, chave, calcular):
+        with self._lock:
+            if chave not in self._cache:
+                valor = calcular()
+                valor.flags.writeable = False
+                self._cache[chave] = valor
+            return self._cache[chave]
+
+    def frequencia(self, inicio=None, fim=None):
+        """Quantas vezes cada dezena saiu em concursos[inicio:fim]"""
+        a, b = self._intervalo(inicio, fim)
+        return self.acumulada[b] - self.acumulada[a]
+
+    def coocorrencia(self, inicio=None, fim=None):
+        """25 × 25: M[i, j] = concursos de concursos[inicio:fim] com as dezenas i+1 e j+1 juntas"""
+        a, b = self._intervalo(inicio, fim)
+
+        def calcular():
+            x = self.matriz[a:b].astype(np.int64)
+            m = x.T @ x
+            np.fill_diagonal(m, 0)
+            return m
+
+        return self._guardado(("coocorrencia", a, b), calcular)
+
+    def primeira_ocorrencia(self):
+        """Índice da primeira linha com cada dezena (total se ela nunca saiu)"""
+
+        def calcular():
+            # uma linha "todas presentes" no fim faz o argmax cair em total quando a dezena nunca saiu
+            presente = np.vstack([self.matriz, np.ones((1, lb.DEZENAS), dtype=np.uint8)])
+            return presente.argmax(axis=0)
+
+        return self._guardado(("primeira_ocorrencia",), calcular)
+
+    def distancia_media_ausencias(self, inicio, fim, referencia):
+        """Média de (referencia - i) sobre as linhas i de [inicio:fim] em que cada dezena não saiu (0 se sempre saiu)"""
+        a, b = self._intervalo(inicio, fim)
+
+        def calcular():
+            ausente = 1 - self.matriz[a:b].astype(np.int64)
+            distancias = referencia - np.arange(a, b, dtype=np.int64)
+            quantidade = ausente.sum(axis=0)
+            soma = distancias @ ausente
+            return np.divide(soma, quantidade, out=np.zeros(lb.DEZENAS), where=quantidade > 0)
+
+        return self._guardado(("ausencias", a, b, referencia), calcular)
+
+    def ciclo(self, limite=None):
+        """
+        A partir da linha 0, quantas linhas até todas as 25 dezenas aparecerem
+        (ou até `limite`) e a máscara das dezenas vistas nesse trecho
+        """
+        _, fim = self._intervalo(0, limite)
+        if fim == 0:
+            return 0, 0
+        vistas = np.bitwise_or.accumulate(self.mascaras[:fim])
+        fechou = np.flatnonzero(vistas == lb.TODAS)
+        if len(fechou):
+            fim = int(fechou[0]) + 1
+        return fim, int(vistas[fim - 1])
+
+
+_tabelas = OrderedDict()
+_por_lista = OrderedDict()      # id(lista) -> (lista, assinatura, tabelas)
+_tabelas_lock = threading.Lock()
+
+
+def _assinatura(concursos):
+    """Tamanho e máscaras das pontas: O(1), muda quando entra concurso (no começo ou no fim)"""
+    if not len(concursos):
+        return (0,)
+    return len(concursos), lb.mascara(concursos[0]), lb.mascara(concursos[-1])
+
+
+def obter_tabelas(concursos):
+    """
+    Tabelas da lista de concursos, reaproveitadas entre as classes e os reruns
+    do app; a chave são as máscaras, então um concurso novo gera tabelas novas.
+    A mesma lista (mesmo objeto, mesma assinatura) nem recalcula as máscaras:
+    cada método das estratégias chama isto, e o hit tem de custar O(1).
+    """
+    assinatura = _assinatura(concursos)
+    with _tabelas_lock:
+        item = _por_lista.get(id(concursos))
+        if item is not None and item[0] is concursos and item[1] == assinatura:
+            _por_lista.move_to_end(id(concursos))
+            return item[2]
+
+    mascaras = np.fromiter((lb.mascara(c) for c in concursos), dtype=np.uint32, count=len(concursos))
+    chave = mascaras.tobytes()
+    with _tabelas_lock:
+        tabelas = _tabelas.get(chave)
+        if tabelas is not None:
+            _tabelas.move_to_end(chave)
+    if tabelas is None:
+        tabelas = TabelasConcursos(mascaras)
+    with _tabelas_lock:
+        _tabelas[chave] = tabelas
+        while len(_tabelas) > MAX_TABELAS:
+            _tabelas.popitem(last=False)
+        # guarda a própria lista junto: o id não é reaproveitado enquanto ela estiver aqui
+        _por_lista[id(concursos)] = (concursos, assinatura, tabelas)
+        _por_lista.move_to_end(id(concursos))
+        while len(_por_lista) > MAX_TABELAS:
+            _por_lista.popitem(last=False)
+    return tabelas
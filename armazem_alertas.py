@@ -0,0 +1,286 @@
+# armazem_alertas.py
+"""
+Alertas, resultados e múltiplas dos apps de futebol em SQLite.
+
+Antes cada registro carregava um JSON inteiro (alertas.json,
+resultados_favoritos.json, multiplas_pro.json...), mudava uma chave e
+regravava o arquivo com indent=2, então o custo crescia com o histórico.
+Aqui cada arquivo antigo vira uma coleção (o nome do arquivo sem .json) dentro
+de uma de três tabelas — alertas, resultados e multiplas — com uma linha por
+chave e colunas indexadas para fixture_id, data, tipo, liga e conferido:
+- registrar()/registrar_varios() gravam só as linhas do registro (upsert);
+  registrar_em_lote() grava várias coleções na mesma transação
+- pendentes() lê os não conferidos de uma data, ou até uma data, pelo índice
+- carregar()/salvar() mantêm a interface de dict inteiro dos apps; salvar()
+  só regrava as linhas que mudaram e apaga as chaves que saíram
+O JSON legado de cada coleção é importado uma única vez, na primeira vez que a
+coleção é usada; o arquivo antigo fica no disco, intocado.
+"""
+import os
+import json
+import sqlite3
+import logging
+import threading
+from datetime import date, datetime
+
+CAMINHO_PADRAO = "alertas_futebol.sqlite3"
+TABELAS = ("alertas", "resultados", "multiplas")
+
+_conexoes = threading.local()
+_importadas = set()
+_importacao_lock = threading.Lock()
+
+
+# =========================
+# CONEXÃO E ESQUEMA
+# =========================
+def _conexao(caminho):
+    """Uma conexão por thread e arquivo; o esquema é criado na primeira"""
+    abertas = getattr(_conexoes, "abertas", None)
+    if abertas is None:
+        abertas = _conexoes.abertas = {}
+    if caminho not in abertas:
+        conexao = sqlite3.connect(caminho, timeout=30)
+        conexao.execute("PRAGMA journal_mode=WAL")
+        conexao.execute("PRAGMA synchronous=NORMAL")
+        with conexao:
+            for tabela in TABELAS:
+                conexao.execute(f"""
+                    CREATE TABLE IF NOT EXISTS {tabela} (
+                        colecao TEXT NOT NULL,
+                        chave TEXT NOT NULL,
+                        fixture_id TEXT,
+                        data TEXT,
+                        tipo TEXT,
+                        liga TEXT,
+                        conferido INTEGER NOT NULL DEFAULT 0,
+                        dados TEXT NOT NULL,
+                        PRIMARY KEY (colecao, chave)
+                    )
+                """)
+                conexao.execute(f"CREATE INDEX IF NOT EXISTS {tabela}_pendentes ON {tabela} (colecao, conferido, data)")
+                conexao.execute(f"CREATE INDEX IF NOT EXISTS {tabela}_fixture ON {tabela} (fixture_id)")
+                conexao.execute(f"CREATE INDEX IF NOT EXISTS {tabela}_tipo ON {tabela} (colecao, tipo, data)")
+                conexao.execute(f"CREATE INDEX IF NOT EXISTS {tabela}_liga ON {tabela} (colecao, liga, data)")
+            conexao.execute("""
+                CREATE TABLE IF NOT EXISTS importacoes (
+                    colecao TEXT PRIMARY KEY,
+                    arquivo TEXT,
+                    registros INTEGER,
+                    importado_em TEXT
+                )
+            """)
+        abertas[caminho] = conexao
+    return abertas[caminho]
+
+
+def colecao_do_arquivo(arquivo):
+    """"multiplas_pro.json" -> "multiplas_pro" """
+    return os.path.splitext(os.path.basename(arquivo))[0]
+
+
+def tabela_da_colecao(colecao):
+    if colecao.startswith("resultados"):
+        return "resultados"
+    if "multiplas" in colecao:
+        return "multiplas"
+    return "alertas"
+
+
+# =========================
+# LINHAS
+# =========================
+def _padrao_json(valor):
+    if isinstance(valor, (datetime, date)):
+        return valor.isoformat()
+    return str(valor)
+
+
+def _linha(colecao, chave, registro):
+    """(colecao, chave, fixture_id, data, tipo, liga, conferido, dados) de um registro"""
+    jogo = registro.get("jogo") if isinstance(registro.get("jogo"), dict) else {}
+    fixture_id = registro.get("id", jogo.get("id"))
+    data = (registro.get("data_busca") or registro.get("data_criacao") or registro.get("data_conferencia")
+            or registro.get("hora") or "")
+    # "conferida" nas múltiplas Pro/individuais, "enviada" nas múltiplas do sistema autônomo
+    conferido = registro.get("conferido", registro.get("conferida", registro.get("enviada", False)))
+    return (
+        colecao,
+        str(chave),
+        None if fixture_id is None else str(fixture_id),
+        _padrao_json(data)[:10] or None,
+        registro.get("tipo_alerta") or registro.get("tipo"),
+        registro.get("liga") or jogo.get("liga"),
+        int(bool(conferido)),
+        json.dumps(registro, ensure_ascii=False, default=_padrao_json),
+    )
+
+
+def _upsert(tabela):
+    return (f"INSERT INTO {tabela} (colecao, chave, fixture_id, data, tipo, liga, conferido, dados) "
+            f"VALUES (?, ?, ?, ?, ?, ?, ?, ?) "
+            f"ON CONFLICT (colecao, chave) DO UPDATE SET fixture_id = excluded.fixture_id, data = excluded.data, "
+            f"tipo = excluded.tipo, liga = excluded.liga, conferido = excluded.conferido, dados = excluded.dados")
+
+
+# =========================
+# ARMAZÉM
+# =========================
+class ArmazemAlertas:
+    """Coleções identificadas pelo caminho do JSON legado (ConfigManager.ALERTAS_PATH etc.)"""
+
+    def __init__(self, caminho=CAMINHO_PADRAO):
+        self.caminho = caminho
+
+    def _preparar(self, arquivo):
+        """Conexão, coleção e tabela; importa o JSON legado na primeira vez"""
+        conexao = _conexao(self.caminho)
+        colecao = colecao_do_arquivo(arquivo)
+        tabela = tabela_da_colecao(colecao)
+        if (self.caminho, colecao) not in _importadas:
+            with _importacao_lock:
+                if (self.caminho, colecao) not in _importadas:
+                    self._importar_legado(conexao, arquivo, colecao, tabela)
+                    _importadas.add((self.caminho, colecao))
+        return conexao, colecao, tabela
+
+    def _importar_legado(self, conexao, arquivo, colecao, tabela):
+        if conexao.execute("SELECT 1 FROM importacoes WHERE colecao = ?", (colecao,)).fetchone():
+            return
+        dados = {}
+        if os.path.exists(arquivo):
+            try:
+                with open(arquivo, "r", encoding="utf-8") as f:
+                    dados = json.load(f)
+            except (OSError, ValueError) as e:
+                logging.error(f"❌ JSON legado {arquivo} ilegível, importação ignorada: {e}")
+                dados = {}
+        linhas = [_linha(colecao, chave, registro) for chave, registro in (dados.items() if isinstance(dados, dict) else [])
+                  if isinstance(registro, dict)]
+        with conexao:
+            conexao.executemany(f"INSERT OR IGNORE INTO {tabela} (colecao, chave, fixture_id, data, tipo, liga, "
+                                f"conferido, dados) VALUES (?, ?, ?, ?, ?, ?, ?, ?)", linhas)
+            conexao.execute("INSERT OR REPLACE INTO importacoes VALUES (?, ?, ?, ?)",
+                            (colecao, arquivo, len(linhas), datetime.now().isoformat()))
+        if linhas:
+            logging.info(f"📥 {len(linhas)} registros de {arquivo} importados para {self.caminho}")
+
+    # ---------- leitura ----------
+    def carregar(self, arquivo) -> dict:
+        """A coleção inteira como dict {chave: registro}, na ordem de inserção"""
+        conexao, colecao, tabela = self._preparar(arquivo)
+        linhas = conexao.execute(f"SELECT chave, dados FROM {tabela} WHERE colecao = ? ORDER BY rowid", (colecao,))
+        return {chave: json.loads(dados) for chave, dados in linhas}
+
+    def obter(self, arquivo, chave):
+        conexao, colecao, tabela = self._preparar(arquivo)
+        linha = conexao.execute(f"SELECT dados FROM {tabela} WHERE colecao = ? AND chave = ?",
+                                (colecao, str(chave))).fetchone()
+        return json.loads(linha[0]) if linha else None
+
+    def contem(self, arquivo, chave) -> bool:
+        conexao, colecao, tabela = self._preparar(arquivo)
+        return conexao.execute(f"SELECT 1 FROM {tabela} WHERE colecao = ? AND chave = ?",
+                               (colecao, str(chave))).fetchone() is not None
+
+    def pendentes(self, arquivo, data: str = None, ate: str = None) -> dict:
+        """Registros não conferidos; data="YYYY-MM-DD" filtra o dia, ate= os dias até ele (inclusive)"""
+        conexao, colecao, tabela = self._preparar(arquivo)
+        sql = f"SELECT chave, dados FROM {tabela} WHERE colecao = ? AND conferido = 0"
+        parametros = [colecao]
+        if data is not None:
+            sql += " AND data = ?"
+            parametros.append(data)
+        if ate is not None:
+            sql += " AND data <= ?"
+            parametros.append(ate)
+        return {chave: json.loads(dados) for chave, dados in conexao.execute(sql + " ORDER BY rowid", parametros)}
+
+    # ---------- escrita ----------
+    def registrar(self, arquivo, chave, registro: dict):
+        self.registrar_varios(arquivo, {chave: registro})
+
+    def registrar_varios(self, arquivo, registros: dict):
+        """Upsert das linhas informadas; o resto da coleção não é tocado"""
+        self.registrar_em_lote({arquivo: registros})
+
+    def registrar_em_lote(self, por_arquivo: dict):
+        """{arquivo: {chave: registro}} de várias coleções numa transação só (ex.: alerta conferido + resultado)"""
+        preparados = [(self._preparar(arquivo), registros) for arquivo, registros in por_arquivo.items() if registros]
+        if not preparados:
+            return
+        conexao = preparados[0][0][0]
+        with conexao:
+            for (_, colecao, tabela), registros in preparados:
+                conexao.executemany(_upsert(tabela), [_linha(colecao, c, r) for c, r in registros.items()])
+
+    def salvar(self, arquivo, dados: dict):
+        """
+        Deixa a coleção igual a `dados` (interface antiga de salvar o arquivo
+        inteiro): só as linhas com conteúdo diferente são regravadas.
+        """
+        conexao, colecao, tabela = self._preparar(arquivo)
+        atuais = dict(conexao.execute(f"SELECT chave, dados FROM {tabela} WHERE colecao = ?", (colecao,)))
+        linhas = [_linha(colecao, c, r) for c, r in (dados or {}).items()]
+        mudadas = [linha for linha in linhas if atuais.get(linha[1]) != linha[-1]]
+        removidas = atuais.keys() - {linha[1] for linha in linhas}
+        with conexao:
+            conexao.executemany(_upsert(tabela), mudadas)
+            conexao.executemany(f"DELETE FROM {tabela} WHERE colecao = ? AND chave = ?",
+                                [(colecao, chave) for chave in removidas])
+
+    def remover(self, arquivo, chaves):
+        conexao, colecao, tabela = self._preparar(arquivo)
+        with conexao:
+            conexao.executemany(f"DELETE FROM {tabela} WHERE colecao = ? AND chave = ?",
+                                [(colecao, str(chave)) for chave in chaves])
+
+    def limpar(self):
+        """Apaga todas as coleções (os JSON legados não voltam a ser importados)"""
+        conexao = _conexao(self.caminho)
+        with conexao:
+            for tabela in TABELAS:
+                conexao.execute(f"DELETE FROM {tabela}")
+
+
+_padrao = ArmazemAlertas()
+
+
+def carregar(arquivo) -> dict:
+    return _padrao.carregar(arquivo)
+
+
+def obter(arquivo, chave):
+    return _padrao.obter(arquivo, chave)
+
+
+def contem(arquivo, chave) -> bool:
+    return _padrao.contem(arquivo, chave)
+
+
+def pendentes(arquivo, data: str = None, ate: str = None) -> dict:
+    return _padrao.pendentes(arquivo, data, ate)
+
+
+def registrar(arquivo, chave, registro: dict):
+    _padrao.registrar(arquivo, chave, registro)
+
+
+def registrar_varios(arquivo, registros: dict):
+    _padrao.registrar_varios(arquivo, registros)
+
+
+def registrar_em_lote(por_arquivo: dict):
+    _padrao.registrar_em_lote(por_arquivo)
+
+
+def salvar(arquivo, dados: dict):
+    _padrao.salvar(arquivo, dados)
+
+
+def remover(arquivo, chaves):
+    _padrao.remover(arquivo, chaves)
+
+
+def limpar():
+    _padrao.limpar()
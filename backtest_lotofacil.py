@@ -0,0 +1,268 @@
+# backtest_lotofacil.py
+"""
+Backtest walk-forward das estratégias do Sistema Autônomo (Lotofoda.py).
+
+Os concursos são percorridos em ordem cronológica. Para prever o concurso i,
+cada estratégia só enxerga o estado montado com os concursos anteriores a ele;
+frequência e atraso são atualizados um concurso por vez, sem recontar o histórico.
+Os jogos de cada teste saem de todas as combinações válidas da base (816 para
+uma base de 18), filtradas uma vez por base e guardadas em cache, e não de
+sorteio com rejeição. Cada estratégia roda num processo do pool com uma semente
+própria, derivada de uma SeedSequence: a mesma semente sempre gera a mesma
+tabela de resultados.
+
+O módulo não importa Streamlit para poder rodar nos processos filhos.
+"""
+import os
+from functools import lru_cache
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from concurrent.futures.process import BrokenProcessPool
+
+import numpy as np
+import pandas as pd
+
+import lotofacil_bits as lb
+
+AQUECIMENTO = 50
+JOGOS_POR_TESTE = 10
+TAMANHO_BASE = 18
+SEMENTE_PADRAO = 0
+FAIXAS_PREMIO = (11, 12, 13, 14, 15)
+_POSICOES = np.arange(lb.DEZENAS, dtype=np.uint32)
+
+
+# =========================
+# ESTADO INCREMENTAL
+# =========================
+class EstadoHistorico:
+    """Frequência e atraso de cada dezena, avançando um concurso por vez"""
+
+    def __init__(self):
+        self.total = 0
+        self.frequencia = np.zeros(lb.DEZENAS, dtype=np.int64)
+
+    @classmethod
+    def de_concursos(cls, concursos_cronologicos):
+        estado = cls()
+        for concurso in concursos_cronologicos:
+            estado.avancar(lb.mascara(concurso))
+        return estado
+
+    def avancar(self, mascara):
+        self.frequencia += (np.uint32(mascara) >> _POSICOES) & 1
+        self.total += 1
+
+    @property
+    def atraso(self):
+        """Concursos em que a dezena não saiu (a conta de estrategia_atraso)"""
+        return self.total - self.frequencia
+
+
+def _ranking(valores):
+    """Dezenas (1-25) do maior para o menor valor; empate fica com a dezena menor"""
+    return [int(i) + 1 for i in np.argsort(-np.asarray(valores), kind="stable")]
+
+
+# =========================
+# ESTRATÉGIAS DE BASE
+# =========================
+def base_frequencia(estado, rng, qtd=TAMANHO_BASE):
+    return sorted(_ranking(estado.frequencia)[:qtd])
+
+
+def base_atraso(estado, rng, qtd=TAMANHO_BASE):
+    return sorted(_ranking(estado.atraso)[:qtd])
+
+
+def base_hibrida(estado, rng, qtd=TAMANHO_BASE):
+    """70% frequência + 30% atraso, cada um normalizado pelo máximo"""
+    freq = estado.frequencia / max(estado.frequencia.max(), 1)
+    atraso = estado.atraso / max(estado.atraso.max(), 1)
+    return sorted(_ranking(freq * 0.7 + atraso * 0.3)[:qtd])
+
+
+def base_aleatoria(estado, rng, qtd=TAMANHO_BASE):
+    return sorted(int(n) for n in rng.choice(np.arange(1, lb.DEZENAS + 1), qtd, replace=False))
+
+
+def componentes_hard(estado):
+    """Top 10 mais frequentes, 8 menos frequentes (atrasados) e o resto (rotativos)"""
+    ranking = _ranking(estado.frequencia)
+    top_10 = ranking[:10]
+    atrasados = ranking[::-1][:8]
+    rotativos = sorted(set(range(1, lb.DEZENAS + 1)) - set(top_10) - set(atrasados))
+    return top_10, atrasados, rotativos
+
+
+BASES = {
+    "frequencia": base_frequencia,
+    "atraso": base_atraso,
+    "hibrida": base_hibrida,
+    "aleatoria": base_aleatoria,
+}
+ESTRATEGIAS = tuple(BASES) + ("hard",)
+
+
+# =========================
+# FILTROS E GERAÇÃO
+# =========================
+def filtro_basico_lote(mascaras):
+    """Pares 6-9, 2-4 dezenas por linha e 2-5 pares consecutivos"""
+    pares = lb.contar_lote(mascaras, lb.PARES)
+    linhas = lb.linhas_lote(mascaras)
+    seq = lb.consecutivos_lote(mascaras)
+    return (
+        (pares >= 6) & (pares <= 9) &
+        (linhas >= 2).all(axis=1) & (linhas <= 4).all(axis=1) &
+        (seq >= 2) & (seq <= 5)
+    )
+
+
+def filtro_hard_lote(mascaras, mascara_atrasados):
+    """Pares 6-9, linhas 2-4/2-4/2-4/1-3/3-5 e pelo menos 2 atrasados"""
+    pares = lb.contar_lote(mascaras, lb.PARES)
+    linhas = lb.linhas_lote(mascaras)
+    minimos = np.array([2, 2, 2, 1, 3])
+    maximos = np.array([4, 4, 4, 3, 5])
+    return (
+        (pares >= 6) & (pares <= 9) &
+        (linhas >= minimos).all(axis=1) & (linhas <= maximos).all(axis=1) &
+        (lb.contar_lote(mascaras, mascara_atrasados) >= 2)
+    )
+
+
+@lru_cache(maxsize=256)
+def _validos_base(base):
+    """Todas as combinações de 15 dezenas da base que passam no filtro básico"""
+    mascaras = lb.combinacoes_lote(base, lb.TAMANHO_JOGO)
+    return mascaras[filtro_basico_lote(mascaras)]
+
+
+@lru_cache(maxsize=256)
+def _validos_hard(base, complemento, atrasados):
+    """Base fixa + todas as escolhas de 5 dezenas do complemento que passam no filtro HARD"""
+    mascaras = lb.combinacoes_lote(complemento, 5) | np.uint32(lb.mascara(base))
+    return mascaras[filtro_hard_lote(mascaras, lb.mascara(atrasados))]
+
+
+def _sortear_validos(validos, qtd, rng, excluir=()):
+    if len(excluir):
+        validos = validos[~np.isin(validos, np.asarray(list(excluir), dtype=np.uint32))]
+    escolhidos = rng.choice(validos, size=min(qtd, len(validos)), replace=False) if len(validos) else validos
+    return [int(m) for m in escolhidos]
+
+
+def jogos_base(base, qtd, rng):
+    """
+    Até qtd jogos distintos de 15 dezenas da base que passam no filtro básico.
+    Uma base de 18 dezenas tem só C(18, 15) = 816 jogos: em vez de sortear e
+    rejeitar, todos são filtrados (uma vez por base) e o sorteio é entre os válidos.
+    """
+    if len(base) < lb.TAMANHO_JOGO:
+        return []
+    return _sortear_validos(_validos_base(tuple(sorted(base))), qtd, rng)
+
+
+def jogos_hard(base, rotativos, atrasados, qtd, rng):
+    """
+    Base fixa + 5 rotativos (ou 5 de fora da base, se faltarem rotativos), com
+    pelo menos 2 atrasados; se não bastar, base + 5 quaisquer de fora dela
+    """
+    base, atrasados = tuple(sorted(base)), tuple(sorted(atrasados))
+    fora_da_base = tuple(n for n in range(1, lb.DEZENAS + 1) if n not in base)
+    complemento = tuple(sorted(rotativos)) if len(rotativos) >= 5 else fora_da_base
+    mascaras = _sortear_validos(_validos_hard(base, complemento, atrasados), qtd, rng)
+    if len(mascaras) < qtd and complemento != fora_da_base:
+        mascaras += _sortear_validos(_validos_hard(base, fora_da_base, atrasados), qtd - len(mascaras), rng,
+                                     excluir=mascaras)
+    return mascaras
+
+
+def jogos_da_estrategia(nome, estado, qtd, rng):
+    if nome == "hard":
+        top_10, atrasados, rotativos = componentes_hard(estado)
+        return jogos_hard(top_10, rotativos, atrasados, qtd, rng)
+    return jogos_base(BASES[nome](estado, rng), qtd, rng)
+
+
+# =========================
+# WALK-FORWARD
+# =========================
+def _walk_forward(nome, mascaras_concursos, inicio, jogos_por_teste, semente):
+    """Linhas da tabela de resultados de uma estratégia (roda dentro do processo filho)"""
+    rng = np.random.default_rng(semente)
+    estado = EstadoHistorico()
+    for m in mascaras_concursos[:inicio]:
+        estado.avancar(m)
+
+    linhas = []
+    for posicao in range(inicio, len(mascaras_concursos)):
+        alvo = mascaras_concursos[posicao]
+        jogos = lb.para_array(jogos_da_estrategia(nome, estado, jogos_por_teste, rng))
+        acertos = lb.contar_lote(jogos, alvo) if len(jogos) else np.zeros(0, dtype=np.uint8)
+        histograma = np.bincount(acertos, minlength=lb.TAMANHO_JOGO + 1)
+        linha = {
+            "estrategia": nome,
+            "posicao": posicao,
+            "jogos": len(jogos),
+            "melhor": int(acertos.max()) if len(acertos) else 0,
+            "media": float(acertos.mean()) if len(acertos) else 0.0,
+        }
+        linha.update({f"acertos_{k}": int(histograma[k]) for k in FAIXAS_PREMIO})
+        linhas.append(linha)
+        estado.avancar(alvo)
+    return linhas
+
+
+def executar_backtest(concursos_cronologicos, estrategias=ESTRATEGIAS, num_testes=None,
+                      jogos_por_teste=JOGOS_POR_TESTE, semente=SEMENTE_PADRAO, processos=None,
+                      ao_progredir=None):
+    """
+    Testa as estratégias nos últimos `num_testes` concursos (todos depois do
+    aquecimento, se None) e devolve um DataFrame com uma linha por estratégia
+    e concurso: melhor acerto, média e quantos jogos fizeram 11..15.
+
+    processos=1 roda tudo no processo atual; se o pool não puder ser criado
+    (ambiente sem fork, limites do servidor) também cai para o modo serial.
+    ao_progredir(concluidas, total, nome) é chamado a cada estratégia concluída.
+    """
+    mascaras = [lb.mascara(c) for c in concursos_cronologicos]
+    inicio = AQUECIMENTO if num_testes is None else max(AQUECIMENTO, len(mascaras) - num_testes)
+    if len(mascaras) <= inicio:
+        return pd.DataFrame()
+
+    sementes = np.random.SeedSequence(semente).spawn(len(estrategias))
+    tarefas = {nome: (nome, mascaras, inicio, jogos_por_teste, s) for nome, s in zip(estrategias, sementes)}
+    processos = min(len(tarefas), processos or os.cpu_count() or 1)
+    resultados = {}
+
+    if processos > 1:
+        try:
+            with ProcessPoolExecutor(max_workers=processos) as pool:
+                futuros = {pool.submit(_walk_forward, *args): nome for nome, args in tarefas.items()}
+                for futuro in as_completed(futuros):
+                    resultados[futuros[futuro]] = futuro.result()
+                    if ao_progredir:
+                        ao_progredir(len(resultados), len(tarefas), futuros[futuro])
+        except (OSError, BrokenProcessPool):
+            resultados = {}
+
+    for nome, args in tarefas.items():
+        if nome not in resultados:
+            resultados[nome] = _walk_forward(*args)
+            if ao_progredir:
+                ao_progredir(len(resultados), len(tarefas), nome)
+
+    return pd.DataFrame([linha for nome in estrategias for linha in resultados[nome]])
+
+
+def resumo_backtest(tabela):
+    """Por estratégia: média do melhor acerto e em quantos % dos concursos o melhor jogo fez 11..15"""
+    if tabela.empty:
+        return pd.DataFrame()
+    resumo = tabela.groupby("estrategia", sort=False).agg(
+        testes=("melhor", "size"), melhor_medio=("melhor", "mean"), media_jogos=("media", "mean")
+    )
+    for k in FAIXAS_PREMIO:
+        resumo[f"melhor_{k}"] = tabela.assign(_ok=tabela["melhor"] == k).groupby("estrategia", sort=False)["_ok"].mean()
+    return resumo.reset_index()
@@ -0,0 +1,82 @@
+# benchmark_cliente_http.py
+"""
+Compara requests.get "cru" com cliente_http.get contra um servidor local.
+
+O servidor fala HTTP/1.1 com keep-alive, simula alguns ms de processamento
+por requisição e responde 304 quando recebe If-None-Match com o ETag atual.
+
+Uso: python benchmark_cliente_http.py [chamadas]
+"""
+import sys
+import json
+import time
+import socket
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import requests
+
+import cliente_http
+
+CORPO = json.dumps({"data": {"startedAt": "2026-01-01T00:00:00Z",
+                             "result": {"outcome": {"number": 17}},
+                             "eventos": list(range(2000))}}).encode()
+ETAG = '"v1"'
+PROCESSAMENTO_S = 0.002
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def setup(self):
+        super().setup()
+        # Como servidores reais: sem Nagle, senão o keep-alive esbarra no ACK atrasado
+        self.request.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+
+    def do_GET(self):
+        time.sleep(PROCESSAMENTO_S)
+        if self.headers.get("If-None-Match") == ETAG:
+            self.send_response(304)
+            self.send_header("ETag", ETAG)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("ETag", ETAG)
+        self.send_header("Content-Length", str(len(CORPO)))
+        self.end_headers()
+        self.wfile.write(CORPO)
+
+    def log_message(self, *args):
+        pass
+
+
+def medir(funcao, url, chamadas):
+    latencias = []
+    for _ in range(chamadas):
+        inicio = time.perf_counter()
+        funcao(url).json()
+        latencias.append((time.perf_counter() - inicio) * 1000)
+    latencias.sort()
+    return latencias[len(latencias) // 2], latencias[int(0.99 * (len(latencias) - 1))]
+
+
+def main(chamadas):
+    servidor = ThreadingHTTPServer(("127.0.0.1", 0), StubHandler)
+    threading.Thread(target=servidor.serve_forever, daemon=True).start()
+    url = f"http://127.0.0.1:{servidor.server_port}/api/mesa/latest"
+
+    cru = medir(lambda u: requests.get(u, timeout=5), url, chamadas)
+    pool = medir(lambda u: cliente_http.get(u, timeout=5, condicional=False), url, chamadas)
+    condicional = medir(lambda u: cliente_http.get(u, timeout=5), url, chamadas)
+
+    print(f"{'caminho':<28} | {'p50 (ms)':>8} | {'p99 (ms)':>8}")
+    print(f"{'requests.get':<28} | {cru[0]:>8.2f} | {cru[1]:>8.2f}")
+    print(f"{'cliente_http (keep-alive)':<28} | {pool[0]:>8.2f} | {pool[1]:>8.2f}")
+    print(f"{'cliente_http (+ ETag/304)':<28} | {condicional[0]:>8.2f} | {condicional[1]:>8.2f}")
+    servidor.shutdown()
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 500)
@@ -0,0 +1,98 @@
+# benchmark_poster.py
+"""
+Mede a geração dos pôsteres do Furões com e sem o LRU de escudos de recursos_poster.
+
+  - escudos frios: recursos_poster.limpar() antes de cada pôster, como se cada
+    pôster decodificasse e redimensionasse os escudos de novo
+  - escudos no LRU: só o cache de pôsteres prontos é limpo entre as chamadas
+
+Os escudos são PNGs gerados em memória e servidos por um APIClient local, então
+o tempo medido é só decodificação, redimensionamento e desenho.
+
+Uso: python benchmark_poster.py [jogos] [repeticoes]
+"""
+import io
+import sys
+import time
+import importlib
+from datetime import datetime
+
+from PIL import Image, ImageDraw
+
+import recursos_poster
+
+PosterGenerator = importlib.import_module("Furões").PosterGenerator
+
+LADO_ESCUDO = 512
+
+
+def escudo_png(i):
+    img = Image.new("RGBA", (LADO_ESCUDO, LADO_ESCUDO), (0, 0, 0, 0))
+    ImageDraw.Draw(img).ellipse([20, 20, LADO_ESCUDO - 20, LADO_ESCUDO - 20], fill=(i * 20 % 255, 80, 200 - i * 10 % 200, 255))
+    buffer = io.BytesIO()
+    img.save(buffer, format="PNG")
+    return buffer.getvalue()
+
+
+class APIClientLocal:
+    """Só o que o PosterGenerator usa do APIClient: bytes do escudo por time"""
+
+    def __init__(self, times):
+        self.escudos = {nome: escudo_png(i) for i, nome in enumerate(times)}
+
+    def baixar_escudo_time(self, team_name, crest_url):
+        return self.escudos.get(team_name)
+
+
+def gerar_jogos(quantidade):
+    jogos = []
+    for i in range(quantidade):
+        jogos.append({
+            "home": f"Time {2 * i}", "away": f"Time {2 * i + 1}",
+            "escudo_home": f"http://escudos.local/{2 * i}.png", "escudo_away": f"http://escudos.local/{2 * i + 1}.png",
+            "liga": "Premier League", "hora": datetime(2026, 10, 17, 16, 0), "tendencia": "Mais 2.5",
+            "estimativa": 2.8, "probabilidade": 60, "confianca": 70 + i, "tipo_aposta": "over" if i % 2 else "under",
+            "home_goals": 2, "away_goals": 1, "ht_home_goals": 1, "ht_away_goals": 0,
+            "resultado": "GREEN" if i % 3 else "RED",
+        })
+    return jogos
+
+
+def medir(gerar, limpar, repeticoes):
+    tempos = []
+    for _ in range(repeticoes):
+        limpar()
+        inicio = time.perf_counter()
+        gerar()
+        tempos.append(time.perf_counter() - inicio)
+    tempos.sort()
+    return tempos[len(tempos) // 2]
+
+
+def main(quantidade, repeticoes):
+    jogos = gerar_jogos(quantidade)
+    gerador = PosterGenerator(APIClientLocal([j[lado] for j in jogos for lado in ("home", "away")]))
+    escudos = [(j[lado], j[f"escudo_{lado}"]) for j in jogos for lado in ("home", "away")]
+
+    def preparar_escudos():
+        # só o preparo dos escudos de um pôster: baixar, decodificar, redimensionar e recortar
+        return [gerador._escudo_squircle(nome, url, gerador.WESTHAM_TAMANHO_ESCUDO) for nome, url in escudos]
+
+    etapas = [
+        (f"{len(escudos)} escudos", preparar_escudos),
+        ("westham_style", lambda: gerador.gerar_poster_westham_style([dict(j) for j in jogos], "⚽ ALERTA DE GOLS", "over_under")),
+        ("resultados", lambda: gerador.gerar_poster_resultados([dict(j) for j in jogos], "over_under")),
+    ]
+
+    print(f"{'etapa':<16} | {'escudos frios (s)':>17} | {'escudos no LRU (s)':>18} | {'ganho':>7}")
+    for nome, gerar in etapas:
+        frio = medir(gerar, recursos_poster.limpar, repeticoes)
+        gerar()
+        quente = medir(gerar, recursos_poster.posters.clear, repeticoes)
+        print(f"{nome:<16} | {frio:>17.3f} | {quente:>18.4f} | {frio / quente:>6.1f}x")
+
+
+if __name__ == "__main__":
+    quantidade = int(sys.argv[1]) if len(sys.argv) > 1 else 10
+    repeticoes = int(sys.argv[2]) if len(sys.argv) > 2 else 5
+    main(quantidade, repeticoes)
@@ -0,0 +1,49 @@
+# benchmark_roleta_features.py
+"""
+Compara a extração de features da roleta:
+  - caminho atual: MotorFeaturesRoleta (uma passada, features_atuais por giro)
+  - lote: extrair_features_lote (NumPy, matriz N x F de uma vez)
+
+Uso: python benchmark_roleta_features.py [tamanhos...]
+"""
+import sys
+import time
+
+import numpy as np
+
+from roleta_features import MotorFeaturesRoleta, extrair_features_lote
+
+RACE = [0, 32, 15, 19, 4, 21, 2, 25, 17, 34, 6, 27, 13, 36, 11, 30, 8, 23, 10, 5, 24, 16, 33, 1, 20, 14, 31, 9, 22, 18, 29, 7, 28, 12, 35, 3, 26]
+
+
+def caminho_atual(historico):
+    motor = MotorFeaturesRoleta(RACE)
+    linhas = []
+    for x in historico:
+        motor.adicionar_numero(x)
+        feats, _ = motor.features_atuais()
+        linhas.append(feats if feats is not None else [np.nan] * len(motor.feature_names))
+    return np.array(linhas, dtype=float)
+
+
+def medir(funcao, *args):
+    inicio = time.perf_counter()
+    resultado = funcao(*args)
+    return resultado, time.perf_counter() - inicio
+
+
+def main(tamanhos):
+    rng = np.random.default_rng(42)
+    print(f"{'giros':>8} | {'atual (s)':>10} | {'lote (s)':>10} | {'ganho':>7} | {'dif. máx':>9}")
+    for n in tamanhos:
+        historico = rng.integers(0, 37, size=n).astype(np.int8)
+        atual, t_atual = medir(caminho_atual, historico.tolist())
+        lote, t_lote = medir(extrair_features_lote, historico, RACE)
+        validas = ~np.isnan(atual[:, 0])
+        dif = float(np.max(np.abs(atual[validas] - lote[validas]))) if validas.any() else 0.0
+        print(f"{n:>8} | {t_atual:>10.4f} | {t_lote:>10.4f} | {t_atual / t_lote:>6.1f}x | {dif:>9.2e}")
+
+
+if __name__ == "__main__":
+    tamanhos = [int(a) for a in sys.argv[1:]] or [1_000, 10_000, 100_000]
+    main(tamanhos)
@@ -0,0 +1,285 @@
+# cache_persistente.py
+"""
+Cache em duas camadas para as respostas da API do football-data.
+
+- memória: LRU (OrderedDict) por processo, com limite de itens e, opcional, de bytes
+- disco: SQLite em WAL, compartilhado pelas sessões Streamlit e pelos reinícios
+  do app; cada chave guarda o próprio vencimento (ttl por chave)
+Uma chave vencida ainda é servida por `stale` segundos enquanto uma thread busca
+o valor novo (stale-while-revalidate). Buscas simultâneas da mesma chave no
+processo viram uma requisição só (single-flight): quem chega depois espera a
+primeira e recebe o mesmo valor.
+
+Instâncias com o mesmo namespace e arquivo dividem a mesma camada de memória,
+então cada sessão que cria o seu APIClient enxerga o que as outras já buscaram.
+Os valores são gravados em JSON (respostas da API e dicts derivados delas) e as
+duas camadas guardam o texto: cada leitura devolve uma cópia nova (json.loads),
+então alterar o valor recebido não vaza para as outras sessões, e um hit da
+memória devolve o mesmo que um hit do disco.
+"""
+import json
+import time
+import sqlite3
+import logging
+import threading
+from collections import OrderedDict
+
+CAMINHO_PADRAO = "cache_api.sqlite3"
+LIMPEZA_A_CADA = 200           # gravações entre duas limpezas dos vencidos no disco
+
+_conexoes = threading.local()
+_estados = {}
+_estados_lock = threading.Lock()
+
+
+# =========================
+# DISCO (SQLITE)
+# =========================
+def _conexao(caminho):
+    """Uma conexão por thread e arquivo"""
+    abertas = getattr(_conexoes, "abertas", None)
+    if abertas is None:
+        abertas = _conexoes.abertas = {}
+    if caminho not in abertas:
+        conexao = sqlite3.connect(caminho, timeout=10)
+        conexao.execute("PRAGMA journal_mode=WAL")
+        conexao.execute("PRAGMA synchronous=NORMAL")
+        conexao.execute("""
+            CREATE TABLE IF NOT EXISTS cache (
+                namespace TEXT NOT NULL,
+                chave TEXT NOT NULL,
+                valor TEXT NOT NULL,
+                expira_em REAL NOT NULL,
+                PRIMARY KEY (namespace, chave)
+            ) WITHOUT ROWID
+        """)
+        conexao.commit()
+        abertas[caminho] = conexao
+    return abertas[caminho]
+
+
+class _Estado:
+    """Camada de memória, voos em andamento e contadores de um namespace"""
+
+    def __init__(self):
+        self.itens = OrderedDict()   # chave -> (texto JSON, expira_em, bytes)
+        self.bytes = 0
+        self.lock = threading.Lock()
+        self.voos = {}               # chave -> [Event, texto JSON]
+        self.gravacoes = 0
+        self.hits = 0
+        self.hits_disco = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.vencidos_servidos = 0
+
+
+def _estado(caminho, namespace):
+    with _estados_lock:
+        return _estados.setdefault((caminho, namespace), _Estado())
+
+
+# =========================
+# CACHE EM DUAS CAMADAS
+# =========================
+class CacheDuasCamadas:
+    def __init__(self, namespace: str, ttl: int = 3600, max_size: int = 100,
+                 max_bytes: int = None, stale: int = 0, caminho: str = CAMINHO_PADRAO):
+        self.namespace = namespace
+        self.caminho = caminho
+        self.config = {"ttl": ttl, "max_size": max_size, "max_bytes": max_bytes, "stale": stale}
+        self._estado = _estado(caminho, namespace)
+        self.cache = self._estado.itens
+        self.lock = self._estado.lock
+
+    # ---------- memória ----------
+    def _remover(self, chave):
+        _, _, tamanho = self.cache.pop(chave)
+        self._estado.bytes -= tamanho
+
+    def _guardar_memoria(self, chave, texto, expira_em, tamanho):
+        if chave in self.cache:
+            self._remover(chave)
+        self.cache[chave] = (texto, expira_em, tamanho)
+        self._estado.bytes += tamanho
+        max_bytes = self.config["max_bytes"]
+        while len(self.cache) > self.config["max_size"] or (
+                max_bytes and self._estado.bytes > max_bytes and len(self.cache) > 1):
+            self._remover(next(iter(self.cache)))
+            self._estado.evictions += 1
+
+    # ---------- disco ----------
+    def _ler_disco(self, chave):
+        try:
+            linha = _conexao(self.caminho).execute(
+                "SELECT valor, expira_em FROM cache WHERE namespace = ? AND chave = ?",
+                (self.namespace, chave)).fetchone()
+        except sqlite3.Error as e:
+            logging.warning(f"⚠️ Cache em disco indisponível ({self.namespace}): {e}")
+            return None
+        if linha is None:
+            return None
+        return linha[0], linha[1], len(linha[0])
+
+    def _gravar_disco(self, chave, texto, expira_em):
+        try:
+            conexao = _conexao(self.caminho)
+            with conexao:
+                conexao.execute(
+                    "INSERT OR REPLACE INTO cache (namespace, chave, valor, expira_em) VALUES (?, ?, ?, ?)",
+                    (self.namespace, chave, texto, expira_em))
+                self._estado.gravacoes += 1
+                if self._estado.gravacoes % LIMPEZA_A_CADA == 0:
+                    conexao.execute("DELETE FROM cache WHERE namespace = ? AND expira_em < ?",
+                                    (self.namespace, time.time() - self.config["stale"]))
+        except sqlite3.Error as e:
+            logging.warning(f"⚠️ Falha ao gravar cache em disco ({self.namespace}): {e}")
+
+    # ---------- leitura ----------
+    def _ler(self, chave):
+        """(valor, expira_em, veio_do_disco) enquanto ainda servir como vencido; senão None"""
+        chave = str(chave)
+        limite = time.time() - self.config["stale"]
+        with self.lock:
+            item = self.cache.get(chave)
+            if item is not None:
+                if item[1] >= limite:
+                    self.cache.move_to_end(chave)
+                    texto, expira_em = item[0], item[1]
+                    return json.loads(texto), expira_em, False
+                self._remover(chave)
+        item = self._ler_disco(chave)
+        if item is None or item[1] < limite:
+            return None
+        texto, expira_em, tamanho = item
+        with self.lock:
+            self._guardar_memoria(chave, texto, expira_em, tamanho if self.config["max_bytes"] else 0)
+        return json.loads(texto), expira_em, True
+
+    def get(self, key: str):
+        """Valor dentro do prazo (memória, depois disco) ou None"""
+        item = self._ler(key)
+        with self.lock:
+            if item is None or item[1] < time.time():
+                self._estado.misses += 1
+                if item is not None:
+                    self._estado.expirations += 1
+                return None
+            if item[2]:
+                self._estado.hits_disco += 1
+            self._estado.hits += 1
+            return item[0]
+
+    def set(self, key: str, value, ttl: int = None):
+        """Grava nas duas camadas; ttl sobrescreve o do namespace só para esta chave"""
+        self._gravar(str(key), json.dumps(value, ensure_ascii=False, default=str), ttl)
+
+    def _gravar(self, chave, texto, ttl):
+        expira_em = time.time() + (self.config["ttl"] if ttl is None else ttl)
+        with self.lock:
+            self._guardar_memoria(chave, texto, expira_em, len(texto) if self.config["max_bytes"] else 0)
+        self._gravar_disco(chave, texto, expira_em)
+
+    # ---------- busca com single-flight ----------
+    def _buscar_unico(self, chave, buscar, ttl):
+        with self.lock:
+            voo = self._estado.voos.get(chave)
+            dono = voo is None
+            if dono:
+                voo = self._estado.voos[chave] = [threading.Event(), None]
+        if not dono:
+            voo[0].wait()
+            return None if voo[1] is None else json.loads(voo[1])
+        try:
+            valor = buscar()
+            if valor is None:
+                return None
+            # quem buscou também recebe a versão JSON, igual à que as leituras seguintes vão ver
+            voo[1] = json.dumps(valor, ensure_ascii=False, default=str)
+            self._gravar(chave, voo[1], ttl)
+            return json.loads(voo[1])
+        finally:
+            with self.lock:
+                self._estado.voos.pop(chave, None)
+            voo[0].set()
+
+    def _revalidar(self, chave, buscar, ttl):
+        with self.lock:
+            if chave in self._estado.voos:
+                return
+        threading.Thread(target=self._revalidar_em_segundo_plano, args=(chave, buscar, ttl), daemon=True).start()
+
+    def _revalidar_em_segundo_plano(self, chave, buscar, ttl):
+        try:
+            self._buscar_unico(chave, buscar, ttl)
+        except Exception as e:
+            logging.warning(f"⚠️ Revalidação de {self.namespace}/{chave} falhou: {e}")
+
+    def obter_ou_buscar(self, key: str, buscar, ttl: int = None):
+        """
+        Valor da chave; no miss chama buscar() uma vez só, mesmo com várias
+        threads pedindo a mesma chave. Um valor vencido há menos de `stale`
+        segundos é devolvido na hora e buscado de novo em segundo plano.
+        buscar() devolvendo None (falha) não é guardado.
+        """
+        chave = str(key)
+        item = self._ler(chave)
+        agora = time.time()
+        if item is not None and item[1] >= agora:
+            with self.lock:
+                self._estado.hits += 1
+                self._estado.hits_disco += item[2]
+            return item[0]
+        if item is not None:
+            with self.lock:
+                self._estado.vencidos_servidos += 1
+            self._revalidar(chave, buscar, ttl)
+            return item[0]
+        with self.lock:
+            self._estado.misses += 1
+        return self._buscar_unico(chave, buscar, ttl)
+
+    def chaves(self) -> list:
+        """Chaves ainda utilizáveis (memória e disco)"""
+        limite = time.time() - self.config["stale"]
+        try:
+            linhas = _conexao(self.caminho).execute(
+                "SELECT chave FROM cache WHERE namespace = ? AND expira_em >= ?", (self.namespace, limite)).fetchall()
+        except sqlite3.Error:
+            linhas = []
+        with self.lock:
+            memoria = [c for c, item in self.cache.items() if item[1] >= limite]
+        return sorted(set(memoria) | {c for (c,) in linhas})
+
+    def clear(self):
+        with self.lock:
+            self.cache.clear()
+            self._estado.bytes = 0
+        try:
+            conexao = _conexao(self.caminho)
+            with conexao:
+                conexao.execute("DELETE FROM cache WHERE namespace = ?", (self.namespace,))
+        except sqlite3.Error as e:
+            logging.warning(f"⚠️ Falha ao limpar cache em disco ({self.namespace}): {e}")
+
+    def get_stats(self):
+        estado = self._estado
+        with self.lock:
+            consultas = estado.hits + estado.misses
+            return {
+                "cache": self.namespace,
+                "itens": len(self.cache),
+                "max_itens": self.config["max_size"],
+                "ttl_s": self.config["ttl"],
+                "stale_s": self.config["stale"],
+                "kb": round(estado.bytes / 1024, 1) if self.config["max_bytes"] else None,
+                "max_kb": round(self.config["max_bytes"] / 1024, 1) if self.config["max_bytes"] else None,
+                "hits": estado.hits,
+                "hits_disco": estado.hits_disco,
+                "misses": estado.misses,
+                "hit_rate": f"{(estado.hits / consultas * 100) if consultas else 0:.1f}%",
+                "vencidos_servidos": estado.vencidos_servidos,
+                "despejos": estado.evictions,
+                "expirados": estado.expirations,
+            }
@@ -0,0 +1,196 @@
+# candidatos_lotofacil.py
+"""
+Geração paralela de candidatos do Motor PRO (Lotofoda.py).
+
+Cada processo do pool recebe o plano do motor (quentes, mornos, frios,
+atrasados e máscaras dos filtros) e uma semente própria derivada de uma
+SeedSequence. Os jogos base saem em lotes; os filtros das camadas 4 e 5 e o
+score geométrico são calculados sobre as máscaras do lote inteiro. Repetidos
+são descartados por um set de máscaras (O(1) por jogo) e só os `quantidade`
+melhores ficam num heap de tamanho fixo, então a memória e o custo de ordenar
+não crescem com o número de candidatos. No fim os heaps dos processos são
+unidos, sem repetidos, e os melhores são devolvidos em ordem de score.
+
+O módulo não importa Streamlit para poder rodar nos processos filhos.
+"""
+import os
+import heapq
+import random
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from concurrent.futures.process import BrokenProcessPool
+
+import numpy as np
+
+import lotofacil_bits as lb
+
+LOTE = 1024
+FATOR_CANDIDATOS = 5          # candidatos aprovados por jogo pedido (como o laço antigo)
+MINIMO_PARALELO = 2000        # abaixo disso abrir processos custa mais do que gerar
+
+DIAGONAL_PRINCIPAL = lb.mascara([1, 7, 13, 19, 25])
+DIAGONAL_SECUNDARIA = lb.mascara([5, 9, 13, 17, 21])
+CRUZ = lb.mascara([3, 11, 13, 15, 23])
+# Linhas/colunas 0-2 contra 3-4 do volante, como em _calcular_score_geometrico
+QUADRANTES = tuple(
+    lb.mascara(n for n in range(1, 26) if ((n - 1) // 5 < 3) == lin and ((n - 1) % 5 < 3) == col)
+    for lin, col in ((True, True), (True, False), (False, True), (False, False))
+)
+
+
+# =========================
+# JOGO BASE, FILTROS E SCORE
+# =========================
+def jogo_base(aleatorio, quentes, mornos, frios, atrasados):
+    """
+    6 quentes / 5 mornos / 4 frios, completando com atrasados (camadas 1 e 2).
+    `aleatorio` é o módulo random ou um random.Random com semente.
+    """
+    jogo = set()
+
+    quentes_disp = quentes if len(quentes) >= 6 else quentes + mornos[:6 - len(quentes)]
+    mornos_disp = mornos if len(mornos) >= 5 else mornos + frios[:5 - len(mornos)]
+    frios_disp = frios if len(frios) >= 4 else frios + list(range(1, 26))[:4 - len(frios)]
+
+    jogo.update(aleatorio.sample(quentes_disp, min(6, len(quentes_disp))))
+
+    mornos_restantes = [n for n in mornos_disp if n not in jogo]
+    if mornos_restantes:
+        jogo.update(aleatorio.sample(mornos_restantes, min(5, len(mornos_restantes))))
+
+    frios_restantes = [n for n in frios_disp if n not in jogo]
+    if frios_restantes:
+        jogo.update(aleatorio.sample(frios_restantes, min(4, len(frios_restantes))))
+
+    while len(jogo) < 15:
+        atrasados_disp = [n for n in atrasados if n not in jogo]
+        if atrasados_disp:
+            jogo.add(aleatorio.choice(atrasados_disp))
+        else:
+            jogo.add(aleatorio.choice([n for n in range(1, 26) if n not in jogo]))
+
+    return sorted(jogo)
+
+
+def filtro_pro_lote(mascaras, mascara_baixos, mascara_ultimo=0):
+    """Camadas 4 e 5 do Motor PRO; mascara_ultimo=0 desliga o filtro de repetidas"""
+    pares = lb.contar_lote(mascaras, lb.PARES)
+    baixos = lb.contar_lote(mascaras, mascara_baixos)
+    soma = lb.soma_lote(mascaras)
+    linhas = lb.linhas_lote(mascaras)
+    aprovado = (
+        ((pares == 7) | (pares == 8)) &
+        ((baixos == 7) | (baixos == 8)) &
+        (soma >= 170) & (soma <= 210) &
+        (lb.maior_sequencia_lote(mascaras) <= 3) &
+        (linhas >= 2).all(axis=1) & (linhas <= 4).all(axis=1)
+    )
+    if mascara_ultimo:
+        rep = lb.contar_lote(mascaras, mascara_ultimo)
+        aprovado &= (rep >= 7) & (rep <= 11)
+    return aprovado
+
+
+def score_geometrico_lote(mascaras):
+    """Diagonais (0.5), cruz (0.3) e +1 por quadrante com 3 a 5 dezenas"""
+    score = (lb.contar_lote(mascaras, DIAGONAL_PRINCIPAL) * 0.5 +
+             lb.contar_lote(mascaras, DIAGONAL_SECUNDARIA) * 0.5 +
+             lb.contar_lote(mascaras, CRUZ) * 0.3)
+    for quadrante in QUADRANTES:
+        qtd = lb.contar_lote(mascaras, quadrante)
+        score += (qtd >= 3) & (qtd <= 5)
+    return np.round(score, 1)
+
+
+def score_total_lote(mascaras, aprovado):
+    """Score do gerar_multiplos_jogos: geometria + 10 (pares 7-8) + 10 (soma 170-210) + 5 (filtros)"""
+    pares = lb.contar_lote(mascaras, lb.PARES)
+    soma = lb.soma_lote(mascaras)
+    return (score_geometrico_lote(mascaras) +
+            np.where((pares == 7) | (pares == 8), 10, 0) +
+            np.where((soma >= 170) & (soma <= 210), 10, 0) +
+            np.where(aprovado, 5, 0))
+
+
+# =========================
+# PRODUÇÃO (PROCESSO FILHO)
+# =========================
+def _produzir(plano, semente, quantidade, meta, max_jogos_base, lote):
+    """
+    Gera lotes até `meta` aprovados distintos ou `max_jogos_base` jogos base.
+    Retorna (heap com os `quantidade` melhores, aprovados distintos, jogos base gerados);
+    cada item do heap é (score, desempate, máscara).
+    """
+    aleatorio = random.Random(int(np.random.default_rng(semente).integers(1 << 62)))
+    vistos = set()
+    heap = []
+    gerados = 0
+    while len(vistos) < meta and gerados < max_jogos_base:
+        n = min(lote, max_jogos_base - gerados)
+        jogos = [jogo_base(aleatorio, plano["quentes"], plano["mornos"], plano["frios"], plano["atrasados"])
+                 for _ in range(n)]
+        gerados += n
+        mascaras = lb.de_matriz(jogos)
+        aprovado = filtro_pro_lote(mascaras, plano["mascara_baixos"], plano["mascara_ultimo"])
+        mascaras = np.unique(mascaras[aprovado])
+        if len(mascaras) == 0:
+            continue
+        novos = mascaras[[int(m) not in vistos for m in mascaras]]
+        if len(novos) == 0:
+            continue
+        vistos.update(int(m) for m in novos)
+        for score, m in zip(score_total_lote(novos, np.ones(len(novos), dtype=bool)).tolist(), novos.tolist()):
+            item = (score, aleatorio.random(), m)
+            if len(heap) < quantidade:
+                heapq.heappush(heap, item)
+            elif item > heap[0]:
+                heapq.heapreplace(heap, item)
+    return heap, len(vistos), gerados
+
+
+def gerar_candidatos(plano, quantidade, max_jogos_base, semente=None, processos=None, lote=LOTE, ao_progredir=None):
+    """
+    Os `quantidade` melhores jogos distintos (máscaras, do maior score para o
+    menor), buscando FATOR_CANDIDATOS × quantidade aprovados distintos em até
+    `max_jogos_base` jogos base divididos entre os processos.
+
+    Devolve (lista de (máscara, score), aprovados distintos, jogos base gerados).
+    processos=1 roda no processo atual; se o pool falhar também cai para o modo
+    serial. ao_progredir(concluidos, total) é chamado a cada processo concluído.
+    """
+    meta = quantidade * FATOR_CANDIDATOS
+    processos = processos or os.cpu_count() or 1
+    if meta < MINIMO_PARALELO:
+        processos = 1
+    sementes = np.random.SeedSequence(semente).spawn(processos)
+    tarefas = [
+        (plano, s, quantidade, -(-meta // processos), -(-max_jogos_base // processos), lote)
+        for s in sementes
+    ]
+    resultados = {}
+
+    if processos > 1:
+        try:
+            with ProcessPoolExecutor(max_workers=processos) as pool:
+                futuros = {pool.submit(_produzir, *args): i for i, args in enumerate(tarefas)}
+                for futuro in as_completed(futuros):
+                    resultados[futuros[futuro]] = futuro.result()
+                    if ao_progredir:
+                        ao_progredir(len(resultados), len(tarefas))
+        except (OSError, BrokenProcessPool):
+            resultados = {}
+
+    for i, args in enumerate(tarefas):
+        if i not in resultados:
+            resultados[i] = _produzir(*args)
+            if ao_progredir:
+                ao_progredir(len(resultados), len(tarefas))
+
+    melhores = {}
+    for i in range(len(tarefas)):
+        for score, desempate, m in resultados[i][0]:
+            if m not in melhores or (score, desempate) > melhores[m]:
+                melhores[m] = (score, desempate)
+    topo = heapq.nlargest(quantidade, melhores.items(), key=lambda item: item[1])
+    aprovados = sum(r[1] for r in resultados.values())
+    gerados = sum(r[2] for r in resultados.values())
+    return [(m, score) for m, (score, _) in topo], aprovados, gerados
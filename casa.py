@@ -1,7 +1,7 @@
 import streamlit as st
 import json
 import os
-import requests
+import cliente_http
 import logging
 import numpy as np
 from collections import Counter
@@ -44,7 +44,7 @@ def tocar_som_moeda():
 # Utilitários
 def fetch_latest_result():
     try:
-        response = requests.get(API_URL, headers=HEADERS, timeout=10)
+        response = cliente_http.get(API_URL, headers=HEADERS, timeout=10)
         response.raise_for_status()
         data = response.json()
         game_data = data.get("data", {})
@@ -0,0 +1,188 @@
+# cliente_http.py
+"""
+Camada HTTP compartilhada pelos apps.
+
+- uma requests.Session por host, com pool de conexões e keep-alive HTTP/1.1
+  (sem novo handshake TCP+TLS a cada chamada)
+- requisições condicionais: se a API devolve ETag/Last-Modified, a próxima
+  chamada manda If-None-Match/If-Modified-Since e um 304 reaproveita o corpo
+- limite de requisições simultâneas por host
+- histograma de latência por host (p50/p99 em estatisticas())
+
+Uso: substitui requests.get/requests.post mantendo a mesma assinatura e as
+mesmas exceções (requests.RequestException, Timeout...).
+"""
+import copy
+import time
+import threading
+from collections import OrderedDict, deque
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+
+# =========================
+# CONFIGURAÇÕES
+# =========================
+MAX_CONEXOES_POR_HOST = 10
+MAX_CONCORRENCIA_POR_HOST = 4
+MAX_RESPOSTAS_CONDICIONAIS = 256
+AMOSTRAS_LATENCIA = 1000
+LIMITES_HISTOGRAMA_MS = [5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000]
+# Cabeçalhos que descrevem o corpo; os do 304 (sem corpo) não podem substituir os guardados
+CABECALHOS_DO_CORPO = {"content-length", "content-encoding", "content-type", "transfer-encoding"}
+
+
+class _Host:
+    """Sessão, semáforo, respostas condicionais e latências de um host"""
+
+    def __init__(self, concorrencia):
+        self.sessao = requests.Session()
+        adaptador = HTTPAdapter(pool_connections=1, pool_maxsize=MAX_CONEXOES_POR_HOST)
+        self.sessao.mount("http://", adaptador)
+        self.sessao.mount("https://", adaptador)
+        self.semaforo = threading.BoundedSemaphore(concorrencia)
+        self.lock = threading.Lock()
+        self.respostas = OrderedDict()
+        self.latencias = deque(maxlen=AMOSTRAS_LATENCIA)
+        self.histograma = [0] * (len(LIMITES_HISTOGRAMA_MS) + 1)
+        self.requisicoes = 0
+        self.respostas_304 = 0
+        self.erros = 0
+
+    def registrar_latencia(self, ms):
+        with self.lock:
+            self.requisicoes += 1
+            self.latencias.append(ms)
+            for i, limite in enumerate(LIMITES_HISTOGRAMA_MS):
+                if ms <= limite:
+                    self.histograma[i] += 1
+                    break
+            else:
+                self.histograma[-1] += 1
+
+    def validadores(self, chave):
+        with self.lock:
+            resposta = self.respostas.get(chave)
+            if resposta is None:
+                return None, {}
+            self.respostas.move_to_end(chave)
+        cabecalhos = {}
+        if resposta.headers.get("ETag"):
+            cabecalhos["If-None-Match"] = resposta.headers["ETag"]
+        if resposta.headers.get("Last-Modified"):
+            cabecalhos["If-Modified-Since"] = resposta.headers["Last-Modified"]
+        return resposta, cabecalhos
+
+    def guardar(self, chave, resposta):
+        with self.lock:
+            self.respostas[chave] = resposta
+            self.respostas.move_to_end(chave)
+            while len(self.respostas) > MAX_RESPOSTAS_CONDICIONAIS:
+                self.respostas.popitem(last=False)
+
+
+def _revalidada(anterior, resposta_304):
+    """
+    Cópia da resposta guardada com os cabeçalhos novos do 304 por cima
+    (X-Requests-Remaining, reset, ETag, Date...): o corpo é o de antes, a cota não.
+    """
+    revalidada = copy.copy(anterior)
+    revalidada.headers = requests.structures.CaseInsensitiveDict(anterior.headers)
+    for nome, valor in resposta_304.headers.items():
+        if nome.lower() not in CABECALHOS_DO_CORPO:
+            revalidada.headers[nome] = valor
+    revalidada.elapsed = resposta_304.elapsed
+    return revalidada
+
+
+_hosts = {}
+_hosts_lock = threading.Lock()
+_concorrencia_por_host = {}
+
+
+def configurar_host(host, concorrencia):
+    """Define o limite de requisições simultâneas de um host (antes do primeiro uso)"""
+    _concorrencia_por_host[host] = concorrencia
+
+
+def _obter_host(url):
+    host = urlsplit(url).netloc
+    with _hosts_lock:
+        if host not in _hosts:
+            _hosts[host] = _Host(_concorrencia_por_host.get(host, MAX_CONCORRENCIA_POR_HOST))
+        return _hosts[host]
+
+
+def _executar(metodo, url, **kwargs):
+    host = _obter_host(url)
+    with host.semaforo:
+        inicio = time.perf_counter()
+        try:
+            return host, host.sessao.request(metodo, url, **kwargs)
+        except requests.RequestException:
+            with host.lock:
+                host.erros += 1
+            raise
+        finally:
+            host.registrar_latencia((time.perf_counter() - inicio) * 1000)
+
+
+def get(url, params=None, headers=None, timeout=10, condicional=True, **kwargs):
+    """requests.get com pool por host e revalidação por ETag/Last-Modified"""
+    cabecalhos = dict(headers or {})
+    chave = requests.Request("GET", url, params=params).prepare().url
+    anterior = None
+    if condicional:
+        anterior, extras = _obter_host(url).validadores(chave)
+        cabecalhos.update(extras)
+
+    host, resposta = _executar("GET", url, params=params, headers=cabecalhos, timeout=timeout, **kwargs)
+
+    if resposta.status_code == 304 and anterior is not None:
+        with host.lock:
+            host.respostas_304 += 1
+        revalidada = _revalidada(anterior, resposta)
+        host.guardar(chave, revalidada)
+        return revalidada
+    if condicional and resposta.status_code == 200 and (
+            resposta.headers.get("ETag") or resposta.headers.get("Last-Modified")):
+        host.guardar(chave, resposta)
+    return resposta
+
+
+def post(url, **kwargs):
+    """requests.post pela sessão do host (keep-alive, sem revalidação)"""
+    kwargs.setdefault("timeout", 10)
+    _, resposta = _executar("POST", url, **kwargs)
+    return resposta
+
+
+def _percentil(valores, p):
+    if not valores:
+        return 0.0
+    ordenados = sorted(valores)
+    return ordenados[min(len(ordenados) - 1, int(round(p / 100 * (len(ordenados) - 1))))]
+
+
+def estatisticas():
+    """Requisições, 304s, erros, p50/p99 (ms) e histograma por host"""
+    resultado = {}
+    with _hosts_lock:
+        hosts = dict(_hosts)
+    for nome, host in hosts.items():
+        with host.lock:
+            latencias = list(host.latencias)
+            histograma = list(host.histograma)
+            resultado[nome] = {
+                "requisicoes": host.requisicoes,
+                "respostas_304": host.respostas_304,
+                "erros": host.erros,
+            }
+        rotulos = [f"<={l}ms" for l in LIMITES_HISTOGRAMA_MS] + [f">{LIMITES_HISTOGRAMA_MS[-1]}ms"]
+        resultado[nome].update({
+            "p50_ms": _percentil(latencias, 50),
+            "p99_ms": _percentil(latencias, 99),
+            "histograma": dict(zip(rotulos, histograma)),
+        })
+    return resultado
@@ -0,0 +1,142 @@
+# conciliacao_resultados.py
+"""
+Conferência de resultados em lote na API do football-data.
+
+Antes cada alerta pendente custava um /matches/{id}; com o limitador em 10
+req/min, 60 alertas levavam seis minutos. Aqui os jogos pendentes de todos os
+tipos (over/under, favorito, gols HT, ambas marcam, múltiplas) são juntados:
+- jogos com competição conhecida são agrupados por competição e dia (UTC) e
+  cada competição é consultada uma vez por janela de dias seguidos
+  (/competitions/{código}/matches?dateFrom&dateTo)
+- o que não tem competição conhecida, ou não veio na janela, vai junto em
+  /matches?ids=...
+- só o que ainda faltar cai na consulta individual de antes
+O resultado é um mapa {id do jogo (str): partida}, no mesmo formato de
+/matches/{id}, que as rotinas de conferência leem no lugar da chamada por jogo.
+
+O módulo não importa Streamlit; o APIClient passa as funções de consulta.
+"""
+import re
+import logging
+from collections import defaultdict
+from datetime import datetime, date, timedelta, timezone
+
+JANELA_MAXIMA_DIAS = 10        # intervalo máximo de dateFrom/dateTo aceito pela API
+IDS_POR_CONSULTA = 50
+FUSO_BRASILIA = timezone(timedelta(hours=-3))
+
+
+# =========================
+# AGRUPAMENTO DOS PENDENTES
+# =========================
+def codigo_da_liga(nome, ligas):
+    """
+    Código da competição a partir do nome gravado no alerta. O nome vem da API
+    ("Premier League") e o LIGA_DICT usa o país entre parênteses
+    ("Premier League (Inglaterra)"), então os dois formatos são aceitos.
+    """
+    if not nome:
+        return None
+    if nome in ligas:
+        return ligas[nome]
+    for chave, codigo in ligas.items():
+        if re.sub(r"\s*\(.*\)$", "", chave) == nome:
+            return codigo
+    return None
+
+
+def data_utc(jogo):
+    """Dia (UTC) do jogo pela "hora" gravada (horário de Brasília) ou, sem ela, pelo data_busca"""
+    hora = jogo.get("hora")
+    if isinstance(hora, str) and hora:
+        try:
+            hora = datetime.fromisoformat(hora.replace("Z", "+00:00"))
+        except ValueError:
+            hora = None
+    if isinstance(hora, datetime):
+        if hora.tzinfo is None:
+            hora = hora.replace(tzinfo=FUSO_BRASILIA)
+        return hora.astimezone(timezone.utc).date()
+    try:
+        return date.fromisoformat(str(jogo.get("data_busca", ""))[:10])
+    except ValueError:
+        return None
+
+
+def _janelas(dias):
+    """Dias ordenados -> intervalos (início, fim) de dias seguidos, com até JANELA_MAXIMA_DIAS cada"""
+    janelas = []
+    for dia in sorted(dias):
+        if janelas and (dia - janelas[-1][1]).days <= 1 and (dia - janelas[-1][0]).days < JANELA_MAXIMA_DIAS:
+            janelas[-1][1] = dia
+        else:
+            janelas.append([dia, dia])
+    return [tuple(j) for j in janelas]
+
+
+def planejar_consultas(pendentes, ligas):
+    """
+    Jogos pendentes ({"id", "liga", "hora", "data_busca"}) -> (consultas por
+    competição [(código, início, fim, ids)], ids sem competição ou sem data).
+    Ids que não são da API (ex.: "jogo_3_...") ficam de fora.
+    """
+    dias_por_liga = defaultdict(lambda: defaultdict(set))
+    avulsos = set()
+    for jogo in pendentes:
+        fixture_id = str(jogo.get("id") or "")
+        if not fixture_id.isdigit():
+            continue
+        codigo = codigo_da_liga(jogo.get("liga"), ligas)
+        dia = data_utc(jogo)
+        if codigo and dia:
+            dias_por_liga[codigo][dia].add(fixture_id)
+        else:
+            avulsos.add(fixture_id)
+
+    consultas = []
+    for codigo, dias in dias_por_liga.items():
+        for inicio, fim in _janelas(dias):
+            ids = set().union(*(ids for dia, ids in dias.items() if inicio <= dia <= fim))
+            consultas.append((codigo, inicio, fim, ids))
+    return consultas, avulsos
+
+
+# =========================
+# MAPA DE RESULTADOS
+# =========================
+def mapa_resultados(pendentes, ligas, buscar_competicao, buscar_ids, buscar_partida=None):
+    """
+    {id do jogo (str): partida} para os pendentes.
+
+    buscar_competicao(código, "YYYY-MM-DD", "YYYY-MM-DD") e buscar_ids([ids])
+    devolvem listas de partidas (vazia se a consulta falhar); buscar_partida(id)
+    é a consulta individual, usada só para o que as consultas em lote não trouxeram.
+    """
+    consultas, avulsos = planejar_consultas(pendentes, ligas)
+    mapa = {}
+
+    for codigo, inicio, fim, ids in consultas:
+        for partida in buscar_competicao(codigo, inicio.isoformat(), fim.isoformat()):
+            if str(partida.get("id")) in ids:
+                mapa[str(partida["id"])] = partida
+        avulsos.update(ids - mapa.keys())
+
+    faltando = sorted(avulsos - mapa.keys())
+    for i in range(0, len(faltando), IDS_POR_CONSULTA):
+        lote = set(faltando[i:i + IDS_POR_CONSULTA])
+        for partida in buscar_ids(sorted(lote)):
+            if str(partida.get("id")) in lote:
+                mapa[str(partida["id"])] = partida
+
+    if buscar_partida:
+        # mesmo filtro de planejar_consultas: id que não é da API não gasta cota
+        restantes = {str(jogo.get("id") or "") for jogo in pendentes} - mapa.keys()
+        restantes = {fixture_id for fixture_id in restantes if fixture_id.isdigit()}
+        for fixture_id in sorted(restantes):
+            partida = buscar_partida(fixture_id)
+            if partida:
+                mapa[fixture_id] = partida
+
+    logging.info(f"📦 Conferência em lote: {len(mapa)} jogos, {len(consultas)} consultas por competição, "
+                 f"{-(-len(faltando) // IDS_POR_CONSULTA)} por ids")
+    return mapa
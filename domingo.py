@@ -1,7 +1,7 @@
 import streamlit as st
 import json
 import os
-import requests
+import cliente_http
 import numpy as np
 import logging
 from collections import Counter
@@ -132,7 +132,7 @@ def estrategia_maior_alternancia(historico):
 
 def buscar_numero_api():
     try:
-        response = requests.get(API_URL, headers=HEADERS, timeout=10)
+        response = cliente_http.get(API_URL, headers=HEADERS, timeout=10)
         if response.status_code == 200:
             data = response.json()
             numero = data.get("data", {}).get("result", {}).get("outcome", {}).get("number", -1)
@@ -0,0 +1,206 @@
+# fechamento_lotofacil.py
+"""
+Fechamentos: N jogos de 15 dezenas dentro de uma base de 18-20 dezenas,
+escolhidos em conjunto para maximizar a chance de algum jogo fazer k pontos.
+
+Para jogos contidos na base, o acerto só depende de S = sorteio ∩ base. Numa
+base de v dezenas, S tem m dezenas (v-10 <= m <= 15) e cada S de tamanho m
+aparece em C(25-v, 15-m) dos C(25, 15) sorteios. P(melhor jogo >= k) vira uma
+soma ponderada sobre os subconjuntos da base (199 mil numa base de 18, 630 mil
+numa de 20), feita com popcount de máscaras, e não sobre os 3,2 milhões de
+sorteios. A garantia "se m dezenas da base saírem, algum jogo faz k pontos" é
+o pior caso sobre os S de tamanho m.
+
+A otimização é gulosa (cada jogo novo cobre o maior peso ainda descoberto)
+seguida de busca local: cada posição é trocada pelo melhor candidato enquanto
+houver ganho. Bases grandes têm candidatos demais para a matriz de cobertura;
+aí cada passada usa uma amostra nova de candidatos.
+"""
+from functools import lru_cache
+from math import comb
+
+import numpy as np
+
+import lotofacil_bits as lb
+import probabilidades_lotofacil as prob
+
+FAIXAS_PREMIO = (11, 12, 13, 14, 15)
+TAMANHO_BASE_MINIMO = 16
+TAMANHO_BASE_MAXIMO = 20
+LIMITE_CELULAS = 30_000_000      # candidatos × alvos na matriz de cobertura (bool)
+PASSADAS_BUSCA_LOCAL = 3
+_BLOCO_CELULAS = 1 << 22
+
+
+# =========================
+# ALVOS (S = SORTEIO ∩ BASE)
+# =========================
+@lru_cache(maxsize=16)
+def alvos_da_base(base):
+    """
+    Todos os S possíveis de uma base (tupla ordenada): máscaras, tamanho m de
+    cada S e quantos sorteios dão aquele S
+    """
+    fora = lb.DEZENAS - len(base)
+    mascaras, tamanhos, pesos = [], [], []
+    for m in range(max(0, lb.TAMANHO_JOGO - fora), min(lb.TAMANHO_JOGO, len(base)) + 1):
+        alvos = lb.combinacoes_lote(base, m) if m else np.zeros(1, dtype=np.uint32)
+        mascaras.append(alvos)
+        tamanhos.append(np.full(len(alvos), m, dtype=np.uint8))
+        pesos.append(np.full(len(alvos), comb(fora, lb.TAMANHO_JOGO - m), dtype=np.int64))
+    resultado = tuple(np.concatenate(a) for a in (mascaras, tamanhos, pesos))
+    for a in resultado:
+        a.flags.writeable = False
+    return resultado
+
+
+def _melhores_acertos(mascaras_jogos, alvos):
+    melhor = np.zeros(len(alvos), dtype=np.uint8)
+    for m in mascaras_jogos:
+        np.maximum(melhor, lb.contar_lote(alvos, m), out=melhor)
+    return melhor
+
+
+def avaliar_jogos(jogos, base=None):
+    """
+    P(melhor jogo >= k), k = 11..15, de qualquer conjunto de jogos.
+
+    Exato pelos subconjuntos da base quando a base (informada + dezenas dos
+    jogos) tem até TAMANHO_BASE_MAXIMO dezenas; senão usa probabilidades_lotofacil
+    (exato até 24 jogos, simulação acima). Com todos os jogos dentro da base
+    informada, "garantias" traz, para cada m, o mínimo de pontos do melhor jogo
+    quando m dezenas da base são sorteadas.
+    """
+    mascaras = sorted({lb.mascara(j) for j in jogos})
+    dezenas_jogos = set(lb.dezenas(np.bitwise_or.reduce(mascaras))) if mascaras else set()
+    uniao = tuple(sorted(dezenas_jogos | set(base or ())))
+    resultado = {"jogos": len(mascaras), "exato": True}
+
+    if len(uniao) <= TAMANHO_BASE_MAXIMO:
+        alvos, tamanhos, pesos = alvos_da_base(uniao)
+        melhor = _melhores_acertos(mascaras, alvos)
+        total = pesos.sum()
+        for k in FAIXAS_PREMIO:
+            resultado[f"P>={k}"] = float(pesos[melhor >= k].sum() / total)
+        if base is not None and len(uniao) == len(set(base)):
+            resultado["garantias"] = {
+                int(m): int(melhor[tamanhos == m].min()) for m in np.unique(tamanhos) if m >= min(FAIXAS_PREMIO)
+            }
+    else:
+        dist, exato = prob.distribuicao_melhor_acerto([lb.dezenas(m) for m in mascaras])
+        resultado.update({f"P>={k}": float(dist[k:].sum()) for k in FAIXAS_PREMIO})
+        resultado["exato"] = exato
+    return resultado
+
+
+# =========================
+# OTIMIZAÇÃO
+# =========================
+def _alvos_relevantes(base, acertos, sorteadas):
+    """
+    Alvos que algum jogo pode cobrir ou deixar de cobrir, com o peso de cada um.
+    S com m < acertos nunca é coberto; S com m - (v - 15) >= acertos sempre é.
+    """
+    alvos, tamanhos, pesos = alvos_da_base(base)
+    folga = len(base) - lb.TAMANHO_JOGO
+    if sorteadas is None:
+        selecao = (tamanhos >= acertos) & (tamanhos < acertos + folga)
+        return alvos[selecao], pesos[selecao].astype(np.float64)
+    selecao = tamanhos == sorteadas
+    return alvos[selecao], np.ones(int(selecao.sum()))
+
+
+def _cobertura(candidatos, alvos, acertos):
+    """Matriz candidatos × alvos: True se o jogo faz pelo menos `acertos` pontos com aquele S"""
+    cobertura = np.empty((len(candidatos), len(alvos)), dtype=bool)
+    passo = max(1, _BLOCO_CELULAS // max(len(alvos), 1))
+    for inicio in range(0, len(candidatos), passo):
+        bloco = candidatos[inicio:inicio + passo]
+        cobertura[inicio:inicio + passo] = lb.popcount_lote(bloco[:, None] & alvos[None, :]) >= acertos
+    return cobertura
+
+
+def _ganhos(cobertura, pesos_livres):
+    """Peso descoberto que cada candidato cobriria (em blocos, sem converter a matriz inteira)"""
+    ganhos = np.empty(len(cobertura))
+    pesos = pesos_livres.astype(np.float32)
+    passo = max(1, _BLOCO_CELULAS // max(cobertura.shape[1], 1))
+    for inicio in range(0, len(cobertura), passo):
+        ganhos[inicio:inicio + passo] = cobertura[inicio:inicio + passo].astype(np.float32) @ pesos
+    return ganhos
+
+
+def _amostra_candidatos(todos, tamanho, fixos, rng):
+    if len(todos) <= tamanho:
+        return todos
+    livres = np.setdiff1d(todos, fixos, assume_unique=True)
+    amostra = rng.choice(livres, size=max(0, tamanho - len(fixos)), replace=False)
+    return np.concatenate([np.asarray(fixos, dtype=np.uint32), amostra])
+
+
+def otimizar_fechamento(base, qtd_jogos, acertos=13, sorteadas=None, passadas=PASSADAS_BUSCA_LOCAL, rng=None):
+    """
+    Escolhe `qtd_jogos` jogos de 15 dentro da base.
+
+    sorteadas=None maximiza P(algum jogo fazer >= acertos) sobre todos os
+    sorteios; sorteadas=m maximiza a fração dos casos "m dezenas da base
+    sorteadas" em que algum jogo faz `acertos` (100% = garantia).
+    Devolve (jogos, avaliar_jogos(jogos, base)).
+    """
+    base = tuple(sorted({int(n) for n in base}))
+    if not TAMANHO_BASE_MINIMO <= len(base) <= TAMANHO_BASE_MAXIMO:
+        raise ValueError(f"A base precisa ter de {TAMANHO_BASE_MINIMO} a {TAMANHO_BASE_MAXIMO} dezenas")
+    rng = rng if rng is not None else np.random.default_rng()
+
+    todos = lb.combinacoes_lote(base, lb.TAMANHO_JOGO)
+    qtd_jogos = min(qtd_jogos, len(todos))
+    alvos, pesos = _alvos_relevantes(base, acertos, sorteadas)
+    tamanho_amostra = max(qtd_jogos * 10, LIMITE_CELULAS // max(len(alvos), 1))
+
+    candidatos = _amostra_candidatos(todos, tamanho_amostra, [], rng)
+    cobertura = _cobertura(candidatos, alvos, acertos)
+
+    # Guloso: cada jogo novo cobre o maior peso ainda descoberto
+    vezes = np.zeros(len(alvos), dtype=np.int32)
+    escolhidos = []
+    for _ in range(qtd_jogos):
+        ganhos = _ganhos(cobertura, pesos * (vezes == 0))
+        ganhos[escolhidos] = -1
+        i = int(np.argmax(ganhos))
+        escolhidos.append(i)
+        vezes += cobertura[i]
+    selecao = candidatos[escolhidos]
+
+    # Busca local: troca cada jogo pelo melhor candidato enquanto houver ganho
+    for _ in range(passadas):
+        if len(todos) > len(candidatos):
+            candidatos = _amostra_candidatos(todos, tamanho_amostra, selecao, rng)
+            cobertura = _cobertura(candidatos, alvos, acertos)
+        posicao = {int(m): i for i, m in enumerate(candidatos)}
+        escolhidos = [posicao[int(m)] for m in selecao]
+        vezes = cobertura[escolhidos].sum(axis=0, dtype=np.int32)
+        melhorou = False
+        for j in range(len(escolhidos)):
+            vezes -= cobertura[escolhidos[j]]
+            ganhos = _ganhos(cobertura, pesos * (vezes == 0))
+            atual = ganhos[escolhidos[j]]
+            ganhos[escolhidos] = -1
+            i = int(np.argmax(ganhos))
+            if ganhos[i] > atual * (1 + 1e-9):
+                escolhidos[j] = i
+                melhorou = True
+            vezes += cobertura[escolhidos[j]]
+        selecao = candidatos[escolhidos]
+        if not melhorou and len(todos) <= len(candidatos):
+            break
+
+    jogos = sorted(lb.dezenas(m) for m in selecao)
+    return jogos, avaliar_jogos(jogos, base)
+
+
+def jogos_aleatorios_da_base(base, qtd_jogos, rng=None):
+    """Referência para comparação: jogos distintos sorteados dentro da base"""
+    rng = rng if rng is not None else np.random.default_rng()
+    todos = lb.combinacoes_lote(sorted(base), lb.TAMANHO_JOGO)
+    escolhidos = rng.choice(todos, size=min(qtd_jogos, len(todos)), replace=False)
+    return sorted(lb.dezenas(m) for m in escolhidos)
@@ -0,0 +1,202 @@
+# indice_lotofacil.py
+"""
+Índice completo das C(25,15) = 3.268.760 combinações da Lotofácil.
+
+Montado uma única vez e gravado em indice_lotofacil/ como arrays .npy abertos
+com mmap: a coluna "mascaras" (uint32, ordem crescente) e uma coluna por
+característica (soma, pares, primos, maior sequência, linhas, colunas, quadrantes...).
+Em vez de sortear e rejeitar, o gerador pergunta "quais jogos passam nos filtros"
+com comparações sobre as colunas e sorteia entre os sobreviventes: não há laço
+de tentativas e, havendo sobrevivente, a geração sempre termina.
+"""
+import os
+import json
+import shutil
+import threading
+
+import numpy as np
+
+import lotofacil_bits as lb
+
+try:
+    import fcntl
+except ImportError:  # Windows: sem trava entre processos (a pasta temporária já é por pid)
+    fcntl = None
+
+DIRETORIO_INDICE = "indice_lotofacil"
+VERSAO_INDICE = 1
+TOTAL_COMBINACOES = 3268760
+
+# Regiões do volante usadas como colunas do índice (nome -> máscara)
+REGIOES = {
+    "pares": lb.PARES,
+    "primos": lb.PRIMOS,
+    "baixos_12": lb.mascara(range(1, 13)),
+    "faixa_baixa": lb.mascara(range(1, 9)),
+    "faixa_media": lb.mascara(range(9, 17)),
+    "faixa_alta": lb.mascara(range(17, 26)),
+    "moldura": lb.mascara([1, 2, 3, 4, 5, 6, 10, 11, 15, 16, 20, 21, 22, 23, 24, 25]),
+    "quadrante_1": lb.mascara([1, 2, 6, 7]),
+    "quadrante_2": lb.mascara([4, 5, 9, 10]),
+    "quadrante_3": lb.mascara([16, 17, 21, 22]),
+    "quadrante_4": lb.mascara([19, 20, 24, 25]),
+    "cruz_central": lb.mascara([3, 8, 11, 12, 13, 14, 15, 18, 23]),
+}
+REGIOES.update({f"linha_{i + 1}": m for i, m in enumerate(lb.LINHAS)})
+REGIOES.update({f"coluna_{i + 1}": m for i, m in enumerate(lb.COLUNAS)})
+
+_indices = {}
+_indices_lock = threading.Lock()
+
+
+def _todas_as_mascaras(bloco=1 << 20):
+    """Todas as máscaras de 25 bits com 15 bits ligados, em ordem crescente"""
+    partes = []
+    for inicio in range(0, 1 << lb.DEZENAS, bloco):
+        candidatas = np.arange(inicio, inicio + bloco, dtype=np.uint32)
+        partes.append(candidatas[lb.popcount_lote(candidatas) == lb.TAMANHO_JOGO])
+    return np.concatenate(partes)
+
+
+def construir_indice(diretorio=DIRETORIO_INDICE):
+    """
+    Monta o índice numa pasta temporária do processo e publica com rename.
+
+    Construtores concorrentes se enfileiram num flock em <diretorio>.lock e quem
+    chega depois reaproveita o índice já publicado. A pasta antiga (se houver) é
+    só renomeada para o lado antes da troca: quem já abriu os .npy com mmap
+    continua lendo, e quem abre no meio da troca cai em construir_indice, espera
+    a trava e encontra o índice novo.
+    """
+    pasta = os.path.dirname(os.path.abspath(diretorio))
+    os.makedirs(pasta, exist_ok=True)
+    with open(diretorio + ".lock", "a") as trava:
+        if fcntl is not None:
+            fcntl.flock(trava.fileno(), fcntl.LOCK_EX)
+        if _indice_valido(diretorio):
+            return
+        temporario = f"{diretorio}.tmp{os.getpid()}"
+        shutil.rmtree(temporario, ignore_errors=True)
+        os.makedirs(temporario)
+        try:
+            _gravar_colunas(temporario)
+            _publicar(temporario, diretorio)
+        finally:
+            shutil.rmtree(temporario, ignore_errors=True)
+
+
+def _publicar(temporario, diretorio):
+    antigo = None
+    if os.path.exists(diretorio):
+        antigo = f"{diretorio}.old{os.getpid()}"
+        os.replace(diretorio, antigo)
+    try:
+        os.replace(temporario, diretorio)
+    except OSError:
+        # Sem flock (Windows) outro construtor pode ter publicado primeiro
+        if not _indice_valido(diretorio):
+            raise
+    if antigo is not None:
+        shutil.rmtree(antigo, ignore_errors=True)
+
+
+def _gravar_colunas(temporario):
+    """Máscaras, colunas e meta.json do índice inteiro na pasta informada"""
+    mascaras = _todas_as_mascaras()
+    colunas = {
+        "soma": lb.soma_lote(mascaras),
+        "consecutivos": lb.consecutivos_lote(mascaras),
+        "maior_sequencia": lb.maior_sequencia_lote(mascaras),
+        "blocos": lb.blocos_lote(mascaras),
+    }
+    for nome, regiao in REGIOES.items():
+        colunas[nome] = lb.contar_lote(mascaras, regiao)
+
+    np.save(os.path.join(temporario, "mascaras.npy"), mascaras)
+    for nome, valores in colunas.items():
+        np.save(os.path.join(temporario, f"{nome}.npy"), valores)
+    with open(os.path.join(temporario, "meta.json"), "w") as f:
+        json.dump({"versao": VERSAO_INDICE, "total": int(len(mascaras)), "colunas": sorted(colunas)}, f)
+
+
+def _indice_valido(diretorio):
+    try:
+        with open(os.path.join(diretorio, "meta.json")) as f:
+            meta = json.load(f)
+    except (OSError, ValueError):
+        return False
+    return meta.get("versao") == VERSAO_INDICE and meta.get("total") == TOTAL_COMBINACOES
+
+
+class IndiceLotofacil:
+    """
+    Consulta das combinações por característica.
+
+    Filtros devolvem arrays booleanos do tamanho do índice e podem ser
+    combinados com & e |; sortear() escolhe entre os sobreviventes.
+    """
+
+    def __init__(self, diretorio=DIRETORIO_INDICE):
+        if not _indice_valido(diretorio):
+            construir_indice(diretorio)
+        with open(os.path.join(diretorio, "meta.json")) as f:
+            self.meta = json.load(f)
+        self.diretorio = diretorio
+        self.mascaras = np.load(os.path.join(diretorio, "mascaras.npy"), mmap_mode="r")
+        self._colunas = {
+            nome: np.load(os.path.join(diretorio, f"{nome}.npy"), mmap_mode="r")
+            for nome in self.meta["colunas"]
+        }
+
+    def __len__(self):
+        return len(self.mascaras)
+
+    def coluna(self, nome):
+        return self._colunas[nome]
+
+    def entre(self, nome, minimo, maximo):
+        """minimo <= coluna <= maximo"""
+        valores = self._colunas[nome]
+        return (valores >= minimo) & (valores <= maximo)
+
+    def em(self, nome, permitidos):
+        """coluna com um dos valores permitidos"""
+        return np.isin(self._colunas[nome], list(permitidos))
+
+    def contar(self, regiao):
+        """Dezenas de cada combinação dentro de uma região qualquer (ex.: o último concurso)"""
+        return lb.contar_lote(self.mascaras, regiao)
+
+    def sortear(self, selecao, quantidade, rng, pesos=None, excluir=()):
+        """
+        Sorteia até `quantidade` máscaras distintas entre as selecionadas (array booleano ou de posições).
+        Sem pesos o sorteio é uniforme; com pesos por dezena (25 valores) cada jogo pesa o produto
+        dos pesos das suas dezenas.
+        """
+        posicoes = np.flatnonzero(selecao) if np.asarray(selecao).dtype == bool else np.asarray(selecao)
+        if len(excluir):
+            posicoes = posicoes[~np.isin(self.mascaras[posicoes], np.asarray(list(excluir), dtype=np.uint32))]
+        quantidade = min(quantidade, len(posicoes))
+        if quantidade == 0:
+            return []
+        if pesos is None:
+            escolhidas = rng.choice(posicoes, size=quantidade, replace=False)
+        else:
+            log_pesos = np.log(np.asarray(pesos, dtype=float))
+            mascaras = self.mascaras[posicoes]
+            # uma dezena por vez: nada de matriz sobreviventes×25 (centenas de MB com o índice inteiro)
+            log_jogo = np.zeros(len(mascaras))
+            for k in range(lb.DEZENAS):
+                log_jogo += log_pesos[k] * ((mascaras >> np.uint32(k)) & 1)
+            probabilidades = np.exp(log_jogo - log_jogo.max())
+            escolhidas = rng.choice(posicoes, size=quantidade, replace=False,
+                                    p=probabilidades / probabilidades.sum())
+        return [int(m) for m in self.mascaras[escolhidas]]
+
+
+def obter_indice(diretorio=DIRETORIO_INDICE):
+    """Um índice por processo (o primeiro uso monta os arquivos se ainda não existirem)"""
+    with _indices_lock:
+        if diretorio not in _indices:
+            _indices[diretorio] = IndiceLotofacil(diretorio)
+        return _indices[diretorio]
@@ -0,0 +1,200 @@
+# ingestao_roletas.py
+"""
+Daemon de ingestão das mesas de roleta.
+
+Um único poller por mesa consulta a API, descarta startedAt repetidos e grava os
+giros no log compartilhado (dados_roletas/<mesa>.bin). Os apps Streamlit leem
+esse log em vez de chamar a API a cada rerun de cada aba, então o volume de
+requisições não cresce com o número de apps ou de pessoas olhando.
+
+Uso:
+    python ingestao_roletas.py
+    python ingestao_roletas.py --intervalo 2 outra_mesa=https://.../latest
+"""
+import os
+import time
+import logging
+import argparse
+import threading
+from collections import deque
+
+import cliente_http
+from registro_giros import RegistroGiros
+
+# =========================
+# CONFIGURAÇÕES
+# =========================
+DIRETORIO_ROLETAS = "dados_roletas"
+INTERVALO_PADRAO = 3.0
+VIDA_MAXIMA_BATIMENTO = 15.0
+HEADERS = {"User-Agent": "Mozilla/5.0"}
+# Origem gravada no campo mesa dos giros digitados à mão (Roletawxx); não são giros ao vivo
+ORIGEM_MANUAL = "manual"
+MESAS = {
+    "xxxtremelightningroulette": "https://api.casinoscores.com/svc-evolution-game-events/api/xxxtremelightningroulette/latest",
+}
+
+_registros = {}
+_registros_lock = threading.Lock()
+
+
+def mesa_da_url(url):
+    """Nome da mesa a partir da URL .../api/<mesa>/latest"""
+    return url.rstrip("/").split("/")[-2]
+
+
+def caminho_mesa(mesa, diretorio=DIRETORIO_ROLETAS):
+    return os.path.join(diretorio, f"{mesa}.bin")
+
+
+def caminho_batimento(mesa, diretorio=DIRETORIO_ROLETAS):
+    return os.path.join(diretorio, f"{mesa}.vivo")
+
+
+def extrair_resultado(data):
+    """Mesmo formato de fetch_latest_result: {"number", "timestamp"}"""
+    game_data = data.get("data", {})
+    outcome = game_data.get("result", {}).get("outcome", {})
+    return {"number": outcome.get("number"), "timestamp": game_data.get("startedAt")}
+
+
+# =========================
+# LADO DOS APPS
+# =========================
+def daemon_ativo(mesa, diretorio=DIRETORIO_ROLETAS):
+    """True se o poller da mesa bateu o ponto nos últimos VIDA_MAXIMA_BATIMENTO segundos"""
+    try:
+        return time.time() - os.path.getmtime(caminho_batimento(mesa, diretorio)) < VIDA_MAXIMA_BATIMENTO
+    except OSError:
+        return False
+
+
+def obter_registro_mesa(mesa, diretorio=DIRETORIO_ROLETAS):
+    """Um RegistroGiros por mesa e por processo"""
+    chave = (diretorio, mesa)
+    with _registros_lock:
+        if chave not in _registros:
+            _registros[chave] = RegistroGiros(caminho_mesa(mesa, diretorio))
+        return _registros[chave]
+
+
+def ultimo_resultado_compartilhado(mesa, diretorio=DIRETORIO_ROLETAS):
+    """
+    Último giro gravado pelo daemon, no formato de fetch_latest_result.
+    Retorna None se o daemon não está rodando (o app deve consultar a API direto).
+    Só conta giros com origem = mesa; entradas manuais de outros apps ficam de fora.
+    """
+    if not daemon_ativo(mesa, diretorio):
+        return None
+    try:
+        return obter_registro_mesa(mesa, diretorio).ultimo(mesa)
+    except Exception as e:
+        logging.error(f"[ingestao] Erro ao ler log da mesa {mesa}: {e}")
+        return None
+
+
+# =========================
+# DAEMON
+# =========================
+class PollerMesa(threading.Thread):
+    """Consulta uma mesa em intervalo fixo e grava giros novos no log"""
+
+    def __init__(self, mesa, url, diretorio, intervalo, parar):
+        super().__init__(name=f"poller-{mesa}", daemon=True)
+        self.mesa = mesa
+        self.url = url
+        self.diretorio = diretorio
+        self.intervalo = intervalo
+        self.parar = parar
+        self.registro = RegistroGiros(caminho_mesa(mesa, diretorio))
+        self.recentes = deque(maxlen=50)
+        self.erros_seguidos = 0
+
+    def _bater_ponto(self):
+        with open(caminho_batimento(self.mesa, self.diretorio), "w") as f:
+            f.write(str(time.time()))
+
+    def consultar(self):
+        response = cliente_http.get(self.url, headers=HEADERS, timeout=5)
+        response.raise_for_status()
+        resultado = extrair_resultado(response.json())
+        numero, timestamp = resultado["number"], resultado["timestamp"]
+        if numero is None or not timestamp or timestamp in self.recentes:
+            return False
+        self.recentes.append(timestamp)
+        if self.registro.registrar(numero, timestamp, self.mesa):
+            logging.info(f"[{self.mesa}] {numero} ({timestamp})")
+            return True
+        return False
+
+    def run(self):
+        while not self.parar.is_set():
+            inicio = time.time()
+            try:
+                self.consultar()
+                self.erros_seguidos = 0
+            except Exception as e:
+                self.erros_seguidos += 1
+                logging.error(f"[{self.mesa}] Erro ao buscar resultado: {e}")
+            else:
+                # Só bate o ponto com a API respondendo: com ela fora, o batimento
+                # envelhece e os apps voltam a consultar direto
+                try:
+                    self._bater_ponto()
+                except OSError as e:
+                    logging.error(f"[{self.mesa}] Erro ao gravar batimento: {e}")
+            espera = self.intervalo * (2 ** min(self.erros_seguidos, 4)) if self.erros_seguidos else self.intervalo
+            self.parar.wait(max(0.0, espera - (time.time() - inicio)))
+        self.registro.sincronizar()
+
+
+def _travar_instancia(diretorio):
+    """Garante um único daemon por diretório (no Windows a trava é ignorada)"""
+    try:
+        import fcntl
+    except ImportError:
+        return None
+    trava = open(os.path.join(diretorio, ".ingestao.lock"), "w")
+    try:
+        fcntl.lockf(trava, fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except OSError:
+        raise SystemExit(f"Já existe um daemon de ingestão rodando em {diretorio}")
+    return trava
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Daemon de ingestão das mesas de roleta")
+    parser.add_argument("mesas", nargs="*", help="mesa=url adicionais")
+    parser.add_argument("--intervalo", type=float, default=INTERVALO_PADRAO)
+    parser.add_argument("--diretorio", default=DIRETORIO_ROLETAS)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
+    os.makedirs(args.diretorio, exist_ok=True)
+    trava = _travar_instancia(args.diretorio)
+
+    mesas = dict(MESAS)
+    for item in args.mesas:
+        mesa, _, url = item.partition("=")
+        mesas[mesa] = url
+
+    parar = threading.Event()
+    pollers = [PollerMesa(mesa, url, args.diretorio, args.intervalo, parar) for mesa, url in mesas.items()]
+    for poller in pollers:
+        poller.start()
+    logging.info(f"Ingestão iniciada: {', '.join(mesas)}")
+
+    try:
+        while True:
+            time.sleep(1)
+    except KeyboardInterrupt:
+        parar.set()
+        for poller in pollers:
+            poller.join(timeout=10)
+    finally:
+        if trava is not None:
+            trava.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,224 @@
+# limitador_api.py
+"""
+Limitador de requisições da API do football-data.
+
+Balde de tokens do tamanho da cota (10 req/min no plano gratuito):
+- rajadas passam enquanto houver saldo, sem intervalo fixo entre requisições
+- o saldo é corrigido pelos cabeçalhos X-Requests-Remaining / X-RequestCounter-Reset
+  de cada resposta; um 429 com Retry-After segura todo mundo até a liberação
+- quem espera dorme fora do lock (Condition.wait)
+- duas filas: conferência de resultados passa na frente das varreduras de ligas
+
+CotaCompartilhada guarda uma janela de cota num arquivo mapeado em memória,
+para vários processos (sessões Streamlit, workers) dividirem o mesmo limite.
+"""
+import os
+import time
+import mmap
+import struct
+import threading
+from collections import deque
+
+PRIORIDADE_RESULTADO = 0
+PRIORIDADE_VARREDURA = 1
+CAPACIDADE_PADRAO = 10
+JANELA_PADRAO = 60.0
+# Requisição admitida sem resposta informada depois disso conta como encerrada (timeout/erro)
+VIDA_EM_VOO = 30.0
+
+
+def prioridade_da_url(url):
+    """Consulta de uma partida (/matches/<id>) é conferência de resultado; o resto é varredura"""
+    return PRIORIDADE_RESULTADO if "/matches/" in url else PRIORIDADE_VARREDURA
+
+
+class LimitadorCota:
+    """
+    Balde de tokens com fila de prioridade.
+
+    Sem cabeçalhos da API o saldo volta aos poucos (capacidade por janela).
+    Depois da primeira resposta com X-RequestCounter-Reset o saldo segue o
+    servidor: fica no que ele informou, menos as requisições já admitidas que
+    ainda não responderam, e só enche de novo na virada da janela.
+    """
+
+    def __init__(self, capacidade=CAPACIDADE_PADRAO, janela=JANELA_PADRAO):
+        self.capacidade = capacidade
+        self.janela = janela
+        self.tokens = float(capacidade)
+        self.abastecido_em = time.monotonic()
+        self.reset_em = None
+        self.bloqueado_ate = 0.0
+        self.filas = {PRIORIDADE_RESULTADO: deque(), PRIORIDADE_VARREDURA: deque()}
+        self.em_voo = deque()       # instantes de admissão ainda sem resposta
+        self.condicao = threading.Condition()
+
+    # -------------------------
+    # Saldo
+    # -------------------------
+    def _abastecer(self, agora):
+        if self.reset_em is not None:
+            if agora >= self.reset_em:
+                self.tokens = float(self.capacidade)
+                self.reset_em = None
+        else:
+            taxa = self.capacidade / self.janela
+            self.tokens = min(float(self.capacidade), self.tokens + (agora - self.abastecido_em) * taxa)
+        self.abastecido_em = agora
+
+    def _espera_por_token(self, agora):
+        if self.tokens >= 1:
+            return 0.0
+        if self.reset_em is not None:
+            return self.reset_em - agora
+        return (1 - self.tokens) * self.janela / self.capacidade
+
+    def _primeiro_da_fila(self):
+        for prioridade in sorted(self.filas):
+            if self.filas[prioridade]:
+                return self.filas[prioridade][0]
+        return None
+
+    # -------------------------
+    # API
+    # -------------------------
+    def adquirir(self, prioridade=PRIORIDADE_VARREDURA):
+        """Espera a vez e um token; retorna quantos segundos esperou"""
+        vez = object()
+        inicio = time.monotonic()
+        with self.condicao:
+            fila = self.filas.get(prioridade, self.filas[PRIORIDADE_VARREDURA])
+            fila.append(vez)
+            try:
+                while True:
+                    agora = time.monotonic()
+                    self._abastecer(agora)
+                    if self._primeiro_da_fila() is not vez:
+                        # Só o primeiro da fila acompanha o relógio; os demais acordam quando ela anda
+                        self.condicao.wait()
+                        continue
+                    espera = max(self.bloqueado_ate - agora, self._espera_por_token(agora))
+                    if espera <= 0:
+                        self.tokens -= 1
+                        self.em_voo.append(agora)
+                        return agora - inicio
+                    self.condicao.wait(espera)
+            finally:
+                fila.remove(vez)
+                self.condicao.notify_all()
+
+    def atualizar_cota(self, headers):
+        """Sincroniza o saldo com X-Requests-Remaining / X-RequestCounter-Reset de uma resposta"""
+        try:
+            restantes = int(headers.get("X-Requests-Remaining"))
+        except (TypeError, ValueError):
+            return
+        try:
+            reset = float(headers.get("X-RequestCounter-Reset"))
+        except (TypeError, ValueError):
+            reset = None
+        with self.condicao:
+            agora = time.monotonic()
+            self._abastecer(agora)
+            while self.em_voo and agora - self.em_voo[0] > VIDA_EM_VOO:
+                self.em_voo.popleft()
+            if self.em_voo:
+                # esta resposta é de uma das admitidas
+                self.em_voo.popleft()
+            if restantes > self.capacidade:
+                # Plano com cota maior que a padrão
+                self.capacidade = restantes
+            # O servidor ainda não contou as que estão em voo: esses tokens já foram gastos
+            self.tokens = float(max(0, restantes - len(self.em_voo)))
+            if reset is not None:
+                self.reset_em = agora + reset
+            self.condicao.notify_all()
+
+    def bloquear(self, segundos):
+        """429 da API: ninguém sai antes de Retry-After"""
+        with self.condicao:
+            agora = time.monotonic()
+            self.bloqueado_ate = max(self.bloqueado_ate, agora + segundos)
+            self.tokens = 0.0
+            self.condicao.notify_all()
+
+    def saldo(self):
+        with self.condicao:
+            self._abastecer(time.monotonic())
+            return self.tokens
+
+
+# =========================
+# COTA ENTRE PROCESSOS
+# =========================
+# inicio da janela, chamadas na janela, pausa forçada até, última chamada
+FORMATO_COTA = struct.Struct("<dqdd")
+
+
+class CotaCompartilhada:
+    """
+    Janela fixa de N chamadas por minuto num arquivo de 32 bytes mapeado em memória.
+
+    reservar() faz a conta sob uma trava de arquivo (fcntl.flock; no Windows só
+    a trava de thread) e devolve quanto falta para o horário reservado: a espera
+    acontece fora da trava e o custo por chamada é um flock e um struct.
+    """
+
+    def __init__(self, caminho, chamadas_por_janela, janela=60.0):
+        self.caminho = caminho
+        self.chamadas_por_janela = chamadas_por_janela
+        self.janela = janela
+        self._lock = threading.Lock()
+        pasta = os.path.dirname(caminho)
+        if pasta:
+            os.makedirs(pasta, exist_ok=True)
+        self._fd = os.open(caminho, os.O_RDWR | os.O_CREAT, 0o644)
+        if os.fstat(self._fd).st_size < FORMATO_COTA.size:
+            os.ftruncate(self._fd, FORMATO_COTA.size)
+        self._mapa = mmap.mmap(self._fd, FORMATO_COTA.size)
+        try:
+            import fcntl
+            self._fcntl = fcntl
+        except ImportError:
+            self._fcntl = None
+
+    def _travar(self):
+        self._lock.acquire()
+        if self._fcntl is not None:
+            self._fcntl.flock(self._fd, self._fcntl.LOCK_EX)
+
+    def _destravar(self):
+        if self._fcntl is not None:
+            self._fcntl.flock(self._fd, self._fcntl.LOCK_UN)
+        self._lock.release()
+
+    def reservar(self):
+        """Reserva a próxima chamada; retorna os segundos a esperar antes de fazê-la"""
+        self._travar()
+        try:
+            inicio, chamadas, pausa_ate, _ = FORMATO_COTA.unpack_from(self._mapa)
+            agora = time.time()
+            horario = max(agora, pausa_ate, inicio)
+            if horario - inicio >= self.janela:
+                inicio, chamadas = horario, 0
+            if chamadas >= self.chamadas_por_janela:
+                inicio, chamadas = inicio + self.janela, 0
+                horario = max(horario, inicio)
+            FORMATO_COTA.pack_into(self._mapa, 0, inicio, chamadas + 1, pausa_ate, horario)
+        finally:
+            self._destravar()
+        return horario - agora
+
+    def pausar(self, segundos):
+        """Ninguém (em nenhum processo) chama a API nos próximos segundos"""
+        self._travar()
+        try:
+            inicio, chamadas, pausa_ate, ultima = FORMATO_COTA.unpack_from(self._mapa)
+            pausa_ate = max(pausa_ate, time.time() + segundos)
+            FORMATO_COTA.pack_into(self._mapa, 0, inicio, chamadas, pausa_ate, ultima)
+        finally:
+            self._destravar()
+
+    def estado(self):
+        inicio, chamadas, pausa_ate, ultima = FORMATO_COTA.unpack_from(self._mapa)
+        return {"inicio_janela": inicio, "chamadas": chamadas, "pausa_ate": pausa_ate, "ultima_chamada": ultima}
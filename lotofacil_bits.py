@@ -0,0 +1,210 @@
+# lotofacil_bits.py
+"""
+Jogos da Lotofácil como máscaras de 25 bits (bit n-1 = dezena n).
+
+Um jogo cabe num uint32: contagem por faixa é popcount(mascara & faixa), a soma
+sai de duas tabelas (dezenas 1-13 e 14-25) e os consecutivos de mascara & (mascara >> 1).
+As funções *_lote recebem arrays de máscaras e fazem tudo em NumPy, sem laço por jogo;
+as versões escalares trabalham com int do Python para validar um jogo só.
+"""
+from itertools import combinations
+
+import numpy as np
+
+DEZENAS = 25
+TAMANHO_JOGO = 15
+TODAS = (1 << DEZENAS) - 1
+
+
+def mascara(numeros):
+    """Dezenas (1-25) -> int com um bit por dezena"""
+    m = 0
+    for n in numeros:
+        m |= 1 << (int(n) - 1)
+    return m
+
+
+def dezenas(m):
+    """int -> lista ordenada de dezenas"""
+    m = int(m)
+    return [i + 1 for i in range(DEZENAS) if m >> i & 1]
+
+
+# =========================
+# FAIXAS DO VOLANTE
+# =========================
+PARES = mascara(range(2, 26, 2))
+PRIMOS = mascara([2, 3, 5, 7, 11, 13, 17, 19, 23])
+LINHAS = tuple(mascara(range(5 * i + 1, 5 * i + 6)) for i in range(5))
+COLUNAS = tuple(mascara(range(c, 26, 5)) for c in range(1, 6))
+
+# =========================
+# TABELAS
+# =========================
+_indices16 = np.arange(1 << 16, dtype=np.uint32)
+_POPCOUNT_16 = np.zeros(1 << 16, dtype=np.uint8)
+for _b in range(16):
+    _POPCOUNT_16 += ((_indices16 >> _b) & 1).astype(np.uint8)
+
+_BITS_BAIXOS = 13  # dezenas 1-13
+_SOMA_BAIXA = np.zeros(1 << _BITS_BAIXOS, dtype=np.uint16)
+_SOMA_ALTA = np.zeros(1 << (DEZENAS - _BITS_BAIXOS), dtype=np.uint16)
+for _b in range(_BITS_BAIXOS):
+    _SOMA_BAIXA += (((np.arange(1 << _BITS_BAIXOS) >> _b) & 1) * (_b + 1)).astype(np.uint16)
+for _b in range(DEZENAS - _BITS_BAIXOS):
+    _SOMA_ALTA += (((np.arange(1 << (DEZENAS - _BITS_BAIXOS)) >> _b) & 1) * (_b + 1 + _BITS_BAIXOS)).astype(np.uint16)
+del _indices16, _b
+
+
+# =========================
+# ESCALARES (um jogo)
+# =========================
+def popcount(m):
+    return int(m).bit_count()
+
+
+def soma(m):
+    m = int(m)
+    return int(_SOMA_BAIXA[m & ((1 << _BITS_BAIXOS) - 1)]) + int(_SOMA_ALTA[m >> _BITS_BAIXOS])
+
+
+def consecutivos(m):
+    """Pares de dezenas vizinhas (n, n+1) presentes no jogo"""
+    m = int(m)
+    return (m & (m >> 1)).bit_count()
+
+
+def maior_sequencia(m):
+    """Tamanho do maior bloco de dezenas consecutivas"""
+    m = int(m)
+    tamanho = 0
+    while m:
+        m &= m >> 1
+        tamanho += 1
+    return tamanho
+
+
+def blocos(m):
+    """Quantidade de blocos com 2 ou mais dezenas consecutivas"""
+    m = int(m)
+    vizinhos = m & (m >> 1)
+    return (vizinhos & ~(vizinhos << 1)).bit_count()
+
+
+def linhas(m):
+    return [popcount(m & linha) for linha in LINHAS]
+
+
+# =========================
+# LOTES (arrays de máscaras)
+# =========================
+def para_array(mascaras):
+    return np.asarray(mascaras, dtype=np.uint32)
+
+
+def de_matriz(jogos):
+    """Matriz N x 15 de dezenas -> array de máscaras uint32"""
+    jogos = np.asarray(jogos, dtype=np.int64)
+    if jogos.size == 0:
+        return np.zeros(0, dtype=np.uint32)
+    return np.bitwise_or.reduce(np.left_shift(np.uint32(1), (jogos - 1).astype(np.uint32)), axis=1)
+
+
+def para_matriz(mascaras, tamanho=TAMANHO_JOGO):
+    """Array de máscaras com `tamanho` bits cada -> matriz N x tamanho de dezenas ordenadas"""
+    mascaras = para_array(mascaras)
+    bits = ((mascaras[:, None] >> np.arange(DEZENAS, dtype=np.uint32)) & 1).astype(bool)
+    return (np.nonzero(bits)[1].reshape(len(mascaras), tamanho) + 1).astype(np.int8)
+
+
+def popcount_lote(mascaras):
+    mascaras = para_array(mascaras)
+    return _POPCOUNT_16[mascaras & 0xFFFF] + _POPCOUNT_16[mascaras >> 16]
+
+
+def contar_lote(mascaras, faixa):
+    """Quantas dezenas de cada jogo caem na faixa (máscara)"""
+    return popcount_lote(para_array(mascaras) & np.uint32(faixa))
+
+
+def soma_lote(mascaras):
+    mascaras = para_array(mascaras)
+    return _SOMA_BAIXA[mascaras & ((1 << _BITS_BAIXOS) - 1)] + _SOMA_ALTA[mascaras >> _BITS_BAIXOS]
+
+
+def consecutivos_lote(mascaras):
+    mascaras = para_array(mascaras)
+    return popcount_lote(mascaras & (mascaras >> 1))
+
+
+def maior_sequencia_lote(mascaras):
+    x = para_array(mascaras).copy()
+    tamanho = np.zeros(len(x), dtype=np.uint8)
+    while True:
+        vivos = x != 0
+        if not vivos.any():
+            return tamanho
+        tamanho += vivos
+        x &= x >> 1
+
+
+def blocos_lote(mascaras):
+    mascaras = para_array(mascaras)
+    vizinhos = mascaras & (mascaras >> 1)
+    return popcount_lote(vizinhos & ~(vizinhos << 1) & np.uint32(TODAS))
+
+
+def linhas_lote(mascaras):
+    """Matriz N x 5 com as dezenas por linha do volante"""
+    mascaras = para_array(mascaras)
+    return np.stack([contar_lote(mascaras, linha) for linha in LINHAS], axis=1)
+
+
+def combinacoes_lote(numeros, k):
+    """Todas as combinações de k dezenas dentre `numeros`, como array de máscaras"""
+    pesos = np.left_shift(np.uint32(1), np.asarray(sorted(numeros), dtype=np.uint32) - 1)
+    if not 0 < k <= len(pesos):
+        return np.zeros(0, dtype=np.uint32)
+    indices = np.fromiter(
+        (i for c in combinations(range(len(pesos)), k) for i in c), dtype=np.intp
+    ).reshape(-1, k)
+    return np.bitwise_or.reduce(pesos[indices], axis=1)
+
+
+def sortear_lote(quantidade, rng, k=TAMANHO_JOGO, numeros=None, pesos=None):
+    """
+    Sorteia `quantidade` conjuntos de k dezenas sem reposição, direto como máscaras.
+    Com pesos usa Gumbel top-k (mesma distribuição de np.random.choice(replace=False, p=...)).
+    """
+    numeros = np.arange(1, DEZENAS + 1) if numeros is None else np.asarray(numeros)
+    chaves = rng.random((quantidade, len(numeros)))
+    if pesos is not None:
+        pesos = np.asarray(pesos, dtype=float)
+        chaves = np.log(pesos / pesos.sum()) - np.log(-np.log(chaves))
+    escolhidos = np.argpartition(-chaves, k - 1, axis=1)[:, :k]
+    return de_matriz(numeros[escolhidos])
+
+
+def coletar_validos(sortear, filtrar, quantidade, max_candidatos, lote=50_000, excluir=(), ao_progredir=None):
+    """
+    Sorteia lotes com sortear(n), aprova com filtrar(mascaras) e junta até `quantidade`
+    máscaras distintas (fora de `excluir`), na ordem em que foram sorteadas.
+    Retorna (mascaras, candidatos_examinados).
+    """
+    escolhidas = []
+    vistas = set(int(m) for m in excluir)
+    candidatos = 0
+    while len(escolhidas) < quantidade and candidatos < max_candidatos:
+        n = min(lote, max_candidatos - candidatos)
+        mascaras = sortear(n)
+        candidatos += n
+        aprovadas = mascaras[filtrar(mascaras)]
+        for m in aprovadas.tolist():
+            if m not in vistas:
+                vistas.add(m)
+                escolhidas.append(m)
+                if len(escolhidas) >= quantidade:
+                    break
+        if ao_progredir is not None:
+            ao_progredir(len(escolhidas), candidatos)
+    return escolhidas, candidatos
@@ -0,0 +1,193 @@
+# modelos_lotofacil.py
+"""
+Cache dos modelos por dezena do LotoFacilIA (um CatBoostClassifier por dezena).
+
+A chave é (dados de treino, hiperparâmetros): o hash de X e Y identifica o
+histórico usado, então um rerun do Streamlit ou outro clique com os mesmos
+concursos lê os modelos da memória ou do disco em vez de treinar de novo.
+Quando chega concurso novo, o modelo mais recente com os mesmos hiperparâmetros
+serve de init_model e o CatBoost só acrescenta ITERACOES_INCREMENTO árvores;
+passado o teto de árvores, o treino volta a ser do zero.
+
+Os apps treinam numa janela fixa (mais recente primeiro), então concurso novo
+não muda o número de linhas: cada versão guarda a assinatura das suas primeiras
+LINHAS_ASSINATURA linhas de Y, e a versão serve de ponto de partida quando essa
+assinatura aparece k <= MAX_CONCURSOS_NOVOS linhas abaixo do topo da janela nova.
+
+O catboost só é importado ao carregar ou treinar, para os apps abrirem sem ele.
+"""
+import os
+import json
+import shutil
+import hashlib
+import logging
+import threading
+
+import numpy as np
+
+DIRETORIO_MODELOS = "modelos_lotofacil"
+ITERACOES_INCREMENTO = 100
+FATOR_MAXIMO_ARVORES = 3       # árvores acumuladas × iterations antes de retreinar do zero
+MAX_CONCURSOS_NOVOS = 10       # acima disso o modelo anterior não vale como ponto de partida
+LINHAS_ASSINATURA = 5          # concursos do topo que identificam a janela de uma versão
+VERSOES_GUARDADAS = 3
+MODELOS_EM_MEMORIA = 4
+
+_modelos = {}
+_lock = threading.Lock()
+
+
+def _hash(*partes):
+    h = hashlib.sha1()
+    for parte in partes:
+        h.update(parte if isinstance(parte, bytes) else json.dumps(parte, sort_keys=True).encode())
+    return h.hexdigest()[:16]
+
+
+def _ler_json(caminho):
+    try:
+        with open(caminho, encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def _gravar_json(caminho, dados):
+    temporario = caminho + ".tmp"
+    with open(temporario, "w", encoding="utf-8") as f:
+        json.dump(dados, f)
+    os.replace(temporario, caminho)
+
+
+def _assinatura(Y, inicio=0):
+    """Hash das LINHAS_ASSINATURA linhas de Y a partir de inicio (None se não couberem)"""
+    if len(Y) < inicio + LINHAS_ASSINATURA:
+        return None
+    return _hash(np.ascontiguousarray(Y[inicio:inicio + LINHAS_ASSINATURA], dtype=np.int8).tobytes())
+
+
+def _versao_anterior(versoes, X, Y):
+    """
+    Versão mais recente cuja janela é a atual com até MAX_CONCURSOS_NOVOS concursos
+    a menos no topo, independente do tamanho da janela; None se nenhuma servir.
+    """
+    deslocamentos = {}
+    for k in range(MAX_CONCURSOS_NOVOS + 1):
+        deslocamentos.setdefault(_assinatura(Y, k), k)
+    for v in reversed(versoes):
+        if v.get("colunas") != X.shape[1] or v.get("assinatura") is None:
+            continue
+        k = deslocamentos.get(v["assinatura"])
+        if k is not None and (k > 0 or len(X) > v["linhas"]):
+            return v
+    return None
+
+
+def _carregar(pasta, numeros):
+    from catboost import CatBoostClassifier
+    modelos = {}
+    for n in numeros:
+        caminho = os.path.join(pasta, f"{n:02d}.cbm")
+        if os.path.exists(caminho):
+            modelos[n] = CatBoostClassifier().load_model(caminho)
+    return modelos
+
+
+def _treinar_um(X, y, parametros, inicial):
+    """Continua o modelo inicial quando possível; senão treina do zero"""
+    from catboost import CatBoostClassifier
+    if inicial is not None and inicial.tree_count_ + ITERACOES_INCREMENTO <= parametros.get("iterations", 1000) * FATOR_MAXIMO_ARVORES:
+        try:
+            modelo = CatBoostClassifier(**{**parametros, "iterations": ITERACOES_INCREMENTO})
+            modelo.fit(X, y, init_model=inicial)
+            return modelo
+        except Exception as e:
+            logging.warning(f"[lotofacil] warm start falhou, treinando do zero: {e}")
+    modelo = CatBoostClassifier(**parametros)
+    modelo.fit(X, y)
+    return modelo
+
+
+def treinar_ou_carregar(X, Y, numeros, parametros, diretorio=DIRETORIO_MODELOS, ao_falhar=None):
+    """
+    Modelos {dezena: CatBoostClassifier} para prever a coluna i de Y a partir de X.
+
+    ao_falhar(dezena, erro) permite seguir sem a dezena que não treinou (ex.:
+    alvo constante); sem ele a exceção sobe como no treino antigo.
+    """
+    X = np.ascontiguousarray(X, dtype=np.float64)
+    Y = np.ascontiguousarray(Y)
+    chave_hiper = _hash(parametros)
+    chave_dados = _hash(X.tobytes(), Y.tobytes(), list(X.shape), list(Y.shape))
+
+    with _lock:
+        if (chave_hiper, chave_dados) in _modelos:
+            return dict(_modelos[(chave_hiper, chave_dados)])
+
+        pasta_hiper = os.path.join(diretorio, chave_hiper)
+        pasta = os.path.join(pasta_hiper, chave_dados)
+        caminho_meta = os.path.join(pasta_hiper, "versoes.json")
+        versoes = _ler_json(caminho_meta) or []
+
+        modelos = _carregar(pasta, numeros) if any(v["dados"] == chave_dados for v in versoes) else {}
+        if len(modelos) < len(numeros):
+            anterior = _versao_anterior(versoes, X, Y)
+            iniciais = _carregar(os.path.join(pasta_hiper, anterior["dados"]), numeros) if anterior else {}
+
+            os.makedirs(pasta, exist_ok=True)
+            for i, n in enumerate(numeros):
+                if n in modelos:
+                    continue
+                try:
+                    modelos[n] = _treinar_um(X, Y[:, i], parametros, iniciais.get(n))
+                except Exception as e:
+                    if ao_falhar is None:
+                        raise
+                    ao_falhar(n, e)
+                    continue
+                modelos[n].save_model(os.path.join(pasta, f"{n:02d}.cbm"))
+
+            versoes = [v for v in versoes if v["dados"] != chave_dados]
+            versoes.append({"dados": chave_dados, "linhas": len(X), "colunas": X.shape[1],
+                            "assinatura": _assinatura(Y)})
+            for antiga in versoes[:-VERSOES_GUARDADAS]:
+                shutil.rmtree(os.path.join(pasta_hiper, antiga["dados"]), ignore_errors=True)
+            _gravar_json(caminho_meta, versoes[-VERSOES_GUARDADAS:])
+
+        _modelos[(chave_hiper, chave_dados)] = modelos
+        while len(_modelos) > MODELOS_EM_MEMORIA:
+            _modelos.pop(next(iter(_modelos)))
+        return dict(modelos)
+
+
+if __name__ == "__main__":
+    # verificação: janela de tamanho fixo + 1 concurso novo continua o modelo anterior
+    import tempfile
+
+    rng = np.random.default_rng(42)
+    sorteios = np.zeros((262, 25), dtype=np.int8)
+    for linha in sorteios:
+        linha[rng.choice(25, 15, replace=False)] = 1
+
+    def janela(inicio, tamanho=250):
+        presenca = sorteios[inicio:inicio + tamanho]        # mais recente primeiro
+        return presenca[:-1].astype(np.float64), presenca[1:]
+
+    X1, Y1 = janela(1)
+    X2, Y2 = janela(0)
+    versoes = [{"dados": "v1", "linhas": len(X1), "colunas": X1.shape[1], "assinatura": _assinatura(Y1)}]
+    assert len(X2) == len(X1) and _versao_anterior(versoes, X2, Y2) is versoes[0]
+    assert _versao_anterior(versoes, *janela(12)) is None
+    print("janela fixa + 1 concurso: usa a versão anterior como init_model")
+
+    import importlib.util
+
+    if importlib.util.find_spec("catboost") is None:
+        print("catboost não instalado; treino real não verificado")
+    else:
+        parametros = {"iterations": 50, "verbose": 0, "random_state": 42}
+        with tempfile.TemporaryDirectory() as diretorio:
+            frio = treinar_ou_carregar(X1, Y1, [1], parametros, diretorio)
+            morno = treinar_ou_carregar(X2, Y2, [1], parametros, diretorio)
+        assert morno[1].tree_count_ == frio[1].tree_count_ + ITERACOES_INCREMENTO
+        print(f"treino real: {frio[1].tree_count_} -> {morno[1].tree_count_} árvores (init_model)")
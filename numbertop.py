@@ -1,5 +1,5 @@
 import streamlit as st
-import requests
+import cliente_http
 import json
 import os
 import numpy as np
@@ -170,7 +170,7 @@ if "acertos_top4" not in st.session_state:
 # 🔁 Captura automática via API
 def buscar_novo_numero():
     try:
-        r = requests.get(API_URL, headers=HEADERS, timeout=10)
+        r = cliente_http.get(API_URL, headers=HEADERS, timeout=10)
         if r.status_code == 200:
             data = r.json()
             numero = data.get("data", {}).get("result", {}).get("outcome", {}).get("number")
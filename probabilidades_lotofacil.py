@@ -0,0 +1,120 @@
+# probabilidades_lotofacil.py
+"""
+Probabilidades exatas de acerto na Lotofácil.
+
+Um jogo de t dezenas contra um sorteio de 15 em 25 segue a hipergeométrica:
+P(k acertos) = C(t, k) * C(25 - t, 15 - k) / C(25, 15). Para um conjunto de jogos
+("pelo menos um jogo com k ou mais"), os jogos se sobrepõem e a conta fechada
+deixa de existir; aí percorremos os 3.268.760 sorteios possíveis do índice
+(indice_lotofacil) e contamos o melhor acerto de cada um. Acima de
+LIMITE_JOGOS_EXATO jogos a varredura fica lenta e o resultado passa a ser uma
+simulação vetorizada em NumPy.
+"""
+from math import comb
+
+import numpy as np
+
+import lotofacil_bits as lb
+from indice_lotofacil import obter_indice
+
+TOTAL_SORTEIOS = comb(lb.DEZENAS, lb.TAMANHO_JOGO)
+FAIXAS_PREMIO = (11, 12, 13, 14, 15)
+LIMITE_JOGOS_EXATO = 24
+SIMULACOES_PADRAO = 200_000
+_BLOCO_SORTEIOS = 1 << 19
+
+
+def distribuicao_acertos(tamanho_jogo=lb.TAMANHO_JOGO):
+    """Array com P(k acertos), k = 0..15, para um jogo de `tamanho_jogo` dezenas"""
+    return np.array([
+        comb(tamanho_jogo, k) * comb(lb.DEZENAS - tamanho_jogo, lb.TAMANHO_JOGO - k) / TOTAL_SORTEIOS
+        for k in range(lb.TAMANHO_JOGO + 1)
+    ])
+
+
+def _resumo(dist):
+    """Mesmas chaves do monte_carlo_jogo antigo, a partir de uma distribuição de acertos"""
+    k = np.arange(len(dist))
+    media = float((k * dist).sum())
+    return {
+        "P>=11": float(dist[11:].sum()),
+        "P>=12": float(dist[12:].sum()),
+        "P>=13": float(dist[13:].sum()),
+        "P>=14": float(dist[14:].sum()),
+        "P=15": float(dist[15]),
+        "media": media,
+        "std": float(np.sqrt(((k - media) ** 2 * dist).sum())),
+    }
+
+
+def resumo_jogo(jogo):
+    """P(≥11..15), média e desvio de acertos de um jogo (só depende de quantas dezenas ele tem)"""
+    return _resumo(distribuicao_acertos(len(set(jogo))))
+
+
+def baseline():
+    """Interseção de dois conjuntos de 15 em 25, no formato do baseline_aleatorio antigo"""
+    dist = distribuicao_acertos()
+    resumo = _resumo(dist)
+    return {
+        "media": resumo["media"],
+        "std": resumo["std"],
+        "dist": dist,
+        "descricao": "Interseção 15×15 em universo 25 (hipergeométrica exata)",
+    }
+
+
+# =========================
+# CONJUNTOS DE JOGOS
+# =========================
+def _melhores_acertos(mascaras_jogos, sorteios):
+    melhor = np.zeros(len(sorteios), dtype=np.uint8)
+    for m in mascaras_jogos:
+        np.maximum(melhor, lb.contar_lote(sorteios, m), out=melhor)
+    return melhor
+
+
+def distribuicao_melhor_acerto(jogos, simulacoes=SIMULACOES_PADRAO, rng=None):
+    """
+    P(o melhor jogo do conjunto fazer k pontos), k = 0..15, e se a conta foi exata.
+
+    Até LIMITE_JOGOS_EXATO jogos percorre todos os sorteios possíveis; acima disso
+    estima com `simulacoes` sorteios aleatórios.
+    """
+    mascaras_jogos = sorted({lb.mascara(j) for j in jogos})
+    contagem = np.zeros(lb.TAMANHO_JOGO + 1, dtype=np.int64)
+    if not mascaras_jogos:
+        contagem[0] = 1
+        return contagem / 1.0, True
+
+    exato = len(mascaras_jogos) <= LIMITE_JOGOS_EXATO
+    if exato:
+        sorteios = obter_indice().mascaras
+        for inicio in range(0, len(sorteios), _BLOCO_SORTEIOS):
+            bloco = np.asarray(sorteios[inicio:inicio + _BLOCO_SORTEIOS])
+            contagem += np.bincount(_melhores_acertos(mascaras_jogos, bloco), minlength=len(contagem))
+    else:
+        rng = rng if rng is not None else np.random.default_rng()
+        for inicio in range(0, simulacoes, _BLOCO_SORTEIOS):
+            bloco = lb.sortear_lote(min(_BLOCO_SORTEIOS, simulacoes - inicio), rng)
+            contagem += np.bincount(_melhores_acertos(mascaras_jogos, bloco), minlength=len(contagem))
+    return contagem / contagem.sum(), exato
+
+
+def resumo_conjunto(jogos, simulacoes=SIMULACOES_PADRAO, rng=None):
+    """
+    Probabilidades do bilhete inteiro:
+    - "P>=k": pelo menos um jogo com k ou mais pontos (considera a sobreposição dos jogos)
+    - "premios_esperados_k": número esperado de jogos com exatamente k pontos (linearidade, exato)
+    - "exato": False quando "P>=k" veio da simulação
+    """
+    dist_melhor, exato = distribuicao_melhor_acerto(jogos, simulacoes, rng)
+    resumo = {f"P>={k}": float(dist_melhor[k:].sum()) for k in FAIXAS_PREMIO}
+    for jogo in jogos:
+        dist = distribuicao_acertos(len(set(jogo)))
+        for k in FAIXAS_PREMIO:
+            chave = f"premios_esperados_{k}"
+            resumo[chave] = resumo.get(chave, 0.0) + float(dist[k])
+    resumo["exato"] = exato
+    resumo["jogos"] = len(jogos)
+    return resumo
@@ -0,0 +1,157 @@
+# recursos_poster.py
+"""
+Recursos reaproveitados entre pôsteres (PIL).
+
+- fontes: o caminho da fonte é procurado uma vez por processo e cada tamanho
+  vira um ImageFont só (antes cada criar_fonte() testava até seis caminhos e
+  abria o .ttf de novo)
+- escudos: LRU das imagens de escudo já decodificadas, redimensionadas e
+  recortadas, por (time, url, tamanho, forma)
+- modelos: LRU de pedaços fixos do pôster (cabeçalho, cartão do jogo com
+  molduras e "VS") desenhados uma vez e colados
+- posters: LRU dos bytes PNG finais por hash do conteúdo; a mesma lista de
+  jogos (ex.: rerun do Streamlit) não é desenhada de novo
+Tudo é compartilhado no processo e protegido por lock.
+"""
+import io
+import os
+import json
+import hashlib
+import logging
+import threading
+from collections import OrderedDict
+
+from PIL import Image, ImageFont
+
+CAMINHOS_FONTE = [
+    "arial.ttf", "Arial.ttf", "arialbd.ttf",
+    "/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf",
+    "/System/Library/Fonts/Arial.ttf",
+    "C:/Windows/Fonts/arial.ttf"
+]
+
+_fontes = {}
+_caminho_fonte = []          # [caminho ou None] depois da primeira procura
+_fontes_lock = threading.Lock()
+
+
+# =========================
+# FONTES
+# =========================
+def _procurar_fonte():
+    for caminho in CAMINHOS_FONTE:
+        try:
+            if os.path.exists(caminho):
+                ImageFont.truetype(caminho, 10)
+                return caminho
+        except Exception:
+            continue
+    return None
+
+
+def fonte(tamanho: int) -> ImageFont.ImageFont:
+    """ImageFont do tamanho pedido, criado uma vez por processo"""
+    with _fontes_lock:
+        if tamanho in _fontes:
+            return _fontes[tamanho]
+        if not _caminho_fonte:
+            _caminho_fonte.append(_procurar_fonte())
+        try:
+            criada = ImageFont.truetype(_caminho_fonte[0], tamanho) if _caminho_fonte[0] else ImageFont.load_default()
+        except Exception as e:
+            logging.error(f"Erro ao carregar fonte: {e}")
+            criada = ImageFont.load_default()
+        _fontes[tamanho] = criada
+        return criada
+
+
+# =========================
+# LRU
+# =========================
+class LRU:
+    """OrderedDict com limite de itens e, opcional, de bytes (tamanho(valor) -> int)"""
+
+    def __init__(self, max_itens: int, max_bytes: int = None, tamanho=None):
+        self.itens = OrderedDict()
+        self.max_itens = max_itens
+        self.max_bytes = max_bytes
+        self.tamanho = tamanho or (lambda valor: 0)
+        self.bytes = 0
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, chave):
+        with self.lock:
+            if chave in self.itens:
+                self.itens.move_to_end(chave)
+                self.hits += 1
+                return self.itens[chave]
+            self.misses += 1
+            return None
+
+    def set(self, chave, valor):
+        with self.lock:
+            if chave in self.itens:
+                self.bytes -= self.tamanho(self.itens.pop(chave))
+            self.itens[chave] = valor
+            self.bytes += self.tamanho(valor)
+            while len(self.itens) > self.max_itens or (
+                    self.max_bytes and self.bytes > self.max_bytes and len(self.itens) > 1):
+                _, antigo = self.itens.popitem(last=False)
+                self.bytes -= self.tamanho(antigo)
+
+    def obter_ou_criar(self, chave, criar):
+        """Valor da chave; no miss chama criar() e guarda o resultado se não for None"""
+        valor = self.get(chave)
+        if valor is None:
+            valor = criar()
+            if valor is not None:
+                self.set(chave, valor)
+        return valor
+
+    def clear(self):
+        with self.lock:
+            self.itens.clear()
+            self.bytes = 0
+
+    def get_stats(self):
+        with self.lock:
+            consultas = self.hits + self.misses
+            return {
+                "itens": len(self.itens),
+                "max_itens": self.max_itens,
+                "mb": round(self.bytes / (1024 * 1024), 1),
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": f"{(self.hits / consultas * 100) if consultas else 0:.1f}%",
+            }
+
+
+escudos = LRU(256)
+modelos = LRU(32)
+posters = LRU(24, max_bytes=48 * 1024 * 1024, tamanho=len)
+
+
+# =========================
+# AUXILIARES
+# =========================
+def hash_conteudo(*partes) -> str:
+    """Hash estável das entradas de um pôster (datetime e afins viram str)"""
+    texto = json.dumps(partes, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha1(texto.encode("utf-8")).hexdigest()
+
+
+def decodificar(dados: bytes):
+    """bytes do escudo -> Image RGBA, ou None se não for imagem válida"""
+    try:
+        return Image.open(io.BytesIO(dados)).convert("RGBA")
+    except Exception as e:
+        logging.warning(f"Escudo inválido: {e}")
+        return None
+
+
+def limpar():
+    escudos.clear()
+    modelos.clear()
+    posters.clear()
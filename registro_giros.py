@@ -0,0 +1,291 @@
+# registro_giros.py
+import os
+import time
+import mmap
+import struct
+import logging
+import threading
+from contextlib import contextmanager
+
+import numpy as np
+
+try:
+    import fcntl
+except ImportError:  # Windows: só a trava de thread
+    fcntl = None
+
+# =========================
+# FORMATO DO REGISTRO
+# =========================
+# Registro fixo de 64 bytes: marca, número, mesa de origem e timestamp original da API.
+# Um giro = um append; nada é reescrito, então o custo por giro não depende do histórico.
+MARCA = 0xA5
+FORMATO = struct.Struct("<BbH28s32s")
+TAMANHO_REGISTRO = FORMATO.size
+DTYPE_REGISTRO = np.dtype([
+    ("marca", "u1"),
+    ("numero", "i1"),
+    ("reservado", "<u2"),
+    ("mesa", "S28"),
+    ("timestamp", "S32"),
+])
+
+# Cabeçalho (mesmo tamanho de um registro) com a posição absoluta do primeiro giro.
+# Arquivos sem cabeçalho continuam válidos (base 0).
+MARCA_CABECALHO = 0x5A
+FORMATO_CABECALHO = struct.Struct("<B7xQ48x")
+
+# Quantos registros do fim ultimo(mesa) examina procurando o último giro daquela origem
+JANELA_ULTIMO = 256
+
+
+class RegistroGiros:
+    """
+    Log binário append-only dos giros da roleta.
+
+    - registrar(): um write por giro, fsync em lote (a cada N giros ou T segundos)
+    - ler_desde(): leitura via mmap a partir de uma posição absoluta
+    - ultimo(): só o último giro, lendo 64 bytes
+    - compactar(): reescreve só a cauda, de forma atômica, quando o log passa do limite
+
+    As posições são absolutas: depois de uma compactação, quem guardou uma
+    posição continua lendo do ponto certo. Vários processos podem abrir o mesmo
+    arquivo; cada operação confere tamanho/inode com um stat e recarrega o que mudou.
+    Toda operação roda sob flock em <caminho>.lock (um arquivo à parte, que a
+    compactação não troca), então conferir duplicata + append e compactar são
+    atômicos entre processos.
+    """
+
+    def __init__(self, caminho="historico_giros.bin", fsync_a_cada=20, fsync_intervalo=5.0,
+                 manter_registros=50000):
+        self.caminho = caminho
+        self.fsync_a_cada = fsync_a_cada
+        self.fsync_intervalo = fsync_intervalo
+        self.manter_registros = manter_registros
+        self._lock = threading.Lock()
+        self._pendentes = 0
+        self._ultimo_fsync = time.time()
+        self._arquivo = None
+        self._inode = None
+        self._tamanho = -1
+        self.base = 0
+        self._cabecalho = 0
+        self._quantidade = 0
+        self.ultimo_por_mesa = {}
+        pasta = os.path.dirname(caminho)
+        if pasta:
+            os.makedirs(pasta, exist_ok=True)
+        self._fd_trava = os.open(caminho + ".lock", os.O_RDWR | os.O_CREAT, 0o644)
+        with self._exclusivo():
+            self._atualizar()
+
+    @contextmanager
+    def _exclusivo(self):
+        """Trava de thread + flock exclusivo no .lock (entre processos)"""
+        with self._lock:
+            if fcntl is not None:
+                fcntl.flock(self._fd_trava, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                if fcntl is not None:
+                    fcntl.flock(self._fd_trava, fcntl.LOCK_UN)
+
+    # -------------------------
+    # Estado do arquivo
+    # -------------------------
+    def _reabrir(self):
+        if self._arquivo is not None:
+            self._arquivo.close()
+        self._arquivo = open(self.caminho, "ab")
+        if self._arquivo.tell() == 0:
+            self._arquivo.write(FORMATO_CABECALHO.pack(MARCA_CABECALHO, 0))
+            self._arquivo.flush()
+        self._inode = os.fstat(self._arquivo.fileno()).st_ino
+        with open(self.caminho, "rb") as f:
+            primeiro = f.read(TAMANHO_REGISTRO)
+        if len(primeiro) == TAMANHO_REGISTRO and primeiro[0] == MARCA_CABECALHO:
+            self.base = FORMATO_CABECALHO.unpack(primeiro)[1]
+            self._cabecalho = TAMANHO_REGISTRO
+        else:
+            self.base = 0
+            self._cabecalho = 0
+        self._quantidade = 0
+        self._tamanho = -1
+
+    def _atualizar(self):
+        """Um stat por chamada: reabre se o arquivo foi trocado e relê a cauda se cresceu"""
+        try:
+            info = os.stat(self.caminho)
+        except FileNotFoundError:
+            info = None
+        if self._arquivo is None or info is None or info.st_ino != self._inode:
+            self._reabrir()
+            info = os.stat(self.caminho)
+        if info.st_size == self._tamanho:
+            return
+        dados = info.st_size - self._cabecalho
+        sobra = dados % TAMANHO_REGISTRO
+        if sobra:
+            # Registro incompleto (queda no meio do write); fica de fora até ser completado
+            logging.warning(f"[RegistroGiros] Ignorando {sobra} bytes de registro incompleto")
+        anterior = self._quantidade
+        self._quantidade = dados // TAMANHO_REGISTRO
+        self._tamanho = info.st_size
+        for item in self._ler_arquivo(max(anterior, self._quantidade - 200)):
+            self.ultimo_por_mesa[item["mesa"]] = item["timestamp"]
+
+    def total(self):
+        """Posição absoluta logo após o último giro registrado"""
+        with self._exclusivo():
+            self._atualizar()
+            return self.base + self._quantidade
+
+    # -------------------------
+    # Escrita
+    # -------------------------
+    def registrar(self, numero, timestamp, mesa=""):
+        """Acrescenta um giro; retorna False se o timestamp já é o último da mesa"""
+        timestamp = str(timestamp)
+        with self._exclusivo():
+            self._atualizar()
+            if self.ultimo_por_mesa.get(mesa) == timestamp:
+                return False
+            sobra = (self._tamanho - self._cabecalho) % TAMANHO_REGISTRO
+            if sobra:
+                # Registro incompleto de uma queda no meio do write: com a trava ninguém
+                # está escrevendo, então é lixo. Corta até o último registro inteiro
+                # (completar com zeros deixaria a marca e o número já gravados valendo).
+                logging.warning(f"[RegistroGiros] Descartando {sobra} bytes de registro incompleto")
+                self._arquivo.flush()
+                self._arquivo.truncate(self._tamanho - sobra)
+                self._tamanho -= sobra
+            self._arquivo.write(FORMATO.pack(
+                MARCA, int(numero), 0,
+                mesa.encode("utf-8")[:28], timestamp.encode("utf-8")[:32]
+            ))
+            self._arquivo.flush()
+            self._quantidade += 1
+            self._tamanho += TAMANHO_REGISTRO
+            self._pendentes += 1
+            self.ultimo_por_mesa[mesa] = timestamp
+            agora = time.time()
+            if self._pendentes >= self.fsync_a_cada or agora - self._ultimo_fsync >= self.fsync_intervalo:
+                self._sincronizar(agora)
+            if self._quantidade > 2 * self.manter_registros:
+                self._compactar(self.manter_registros)
+        return True
+
+    def _sincronizar(self, agora=None):
+        os.fsync(self._arquivo.fileno())
+        self._pendentes = 0
+        self._ultimo_fsync = agora or time.time()
+
+    def sincronizar(self):
+        with self._exclusivo():
+            self._arquivo.flush()
+            self._sincronizar()
+
+    # -------------------------
+    # Leitura
+    # -------------------------
+    def _ler_arquivo(self, inicio_relativo):
+        if self._quantidade <= inicio_relativo:
+            return []
+        with open(self.caminho, "rb") as f:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                registros = np.frombuffer(
+                    mm, dtype=DTYPE_REGISTRO,
+                    count=self._quantidade - inicio_relativo,
+                    offset=self._cabecalho + inicio_relativo * TAMANHO_REGISTRO
+                ).copy()
+        registros = registros[registros["marca"] == MARCA]
+        numeros = registros["numero"].tolist()
+        mesas = np.char.decode(registros["mesa"], "utf-8").tolist()
+        timestamps = np.char.decode(registros["timestamp"], "utf-8").tolist()
+        return [
+            {"number": n, "timestamp": ts, "mesa": m}
+            for n, ts, m in zip(numeros, timestamps, mesas)
+        ]
+
+    def ler_desde(self, posicao=0):
+        """
+        Giros a partir da posição absoluta informada, no formato do histórico.
+        Retorna (itens, proxima_posicao) lidos sob o mesmo lock.
+        """
+        with self._exclusivo():
+            self._atualizar()
+            inicio = max(posicao - self.base, 0)
+            itens = self._ler_arquivo(inicio)
+            proxima = self.base + self._quantidade
+        return [{"number": i["number"], "timestamp": i["timestamp"]} for i in itens], proxima
+
+    def ultimo(self, mesa=None):
+        """
+        Último giro registrado ({"number", "timestamp"}) ou None; lê um único registro.
+        Com mesa, o último gravado por essa origem (entre os JANELA_ULTIMO finais).
+        """
+        with self._exclusivo():
+            self._atualizar()
+            if mesa is None:
+                itens = self._ler_arquivo(self._quantidade - 1) if self._quantidade else []
+            else:
+                itens = [i for i in self._ler_arquivo(max(self._quantidade - JANELA_ULTIMO, 0)) if i["mesa"] == mesa]
+        if not itens:
+            return None
+        return {"number": itens[-1]["number"], "timestamp": itens[-1]["timestamp"]}
+
+    # -------------------------
+    # Manutenção
+    # -------------------------
+    def _compactar(self, manter):
+        remover = self._quantidade - manter
+        if remover <= 0:
+            return
+        self._arquivo.flush()
+        with open(self.caminho, "rb") as f:
+            f.seek(self._cabecalho + remover * TAMANHO_REGISTRO)
+            cauda = f.read(manter * TAMANHO_REGISTRO)
+        temporario = self.caminho + ".tmp"
+        with open(temporario, "wb") as f:
+            f.write(FORMATO_CABECALHO.pack(MARCA_CABECALHO, self.base + remover))
+            f.write(cauda)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temporario, self.caminho)
+        self._reabrir()
+        self._quantidade = manter
+        self._tamanho = self._cabecalho + manter * TAMANHO_REGISTRO
+        self._pendentes = 0
+        logging.info(f"[RegistroGiros] Compactado: {remover} giros antigos removidos")
+
+    def compactar(self, manter=None):
+        with self._exclusivo():
+            self._atualizar()
+            self._compactar(self.manter_registros if manter is None else manter)
+
+    def importar(self, historico, mesa=""):
+        """Importa uma lista legada [{"number", "timestamp"}, ...] (uma única vez, com o log vazio)"""
+        with self._exclusivo():
+            self._atualizar()
+            if self._quantidade > 0:
+                return 0
+        importados = 0
+        for item in historico:
+            if isinstance(item, dict) and item.get("number") is not None:
+                numero, timestamp = item["number"], item.get("timestamp") or f"importado_{importados}"
+            elif isinstance(item, (int, float)):
+                numero, timestamp = item, f"importado_{importados}"
+            else:
+                continue
+            if self.registrar(numero, timestamp, mesa):
+                importados += 1
+        self.sincronizar()
+        return importados
+
+    def limpar(self):
+        """Apaga todos os giros (a numeração absoluta continua de onde parou)"""
+        with self._exclusivo():
+            self._atualizar()
+            self._compactar(0)
+            self.ultimo_por_mesa = {}
@@ -0,0 +1,265 @@
+# resultados_lotofacil.py
+"""
+Base local de resultados da Lotofácil (SQLite, chave = número do concurso).
+
+Os apps leem os concursos daqui; sincronizar() só busca na API o que falta:
+- uma chamada a /latest descobre o último concurso
+- poucos concursos faltando: busca cada um em paralelo, com novas tentativas
+- muitos faltando (primeira carga): uma única chamada à lista completa
+Com a base em dia, abrir o app é uma consulta local e no máximo uma requisição.
+"""
+import os
+import json
+import time
+import sqlite3
+import logging
+import threading
+from contextlib import contextmanager
+from concurrent.futures import ThreadPoolExecutor
+
+import cliente_http
+
+# =========================
+# CONFIGURAÇÕES
+# =========================
+URL_API = "https://loteriascaixa-api.herokuapp.com/api/lotofacil/"
+CAMINHO_BASE = os.path.join("dados_lotofacil", "resultados.db")
+TIMEOUT = 20
+TENTATIVAS = 3
+MAX_WORKERS = 8
+LIMITE_BUSCA_INDIVIDUAL = 40   # acima disso vale mais baixar a lista completa
+INTERVALO_MINIMO_SYNC = 60     # segundos entre consultas à API
+
+_sync_lock = threading.Lock()
+
+
+def extrair_dezenas(dados):
+    """Dezenas ordenadas de um concurso da API ("dezenas" ou "resultado", lista ou texto)"""
+    if "dezenas" in dados:
+        valores = dados.get("dezenas") or []
+    else:
+        valores = dados.get("resultado") or []
+    if isinstance(valores, str):
+        valores = valores.split()
+    return sorted(int(d) for d in valores)
+
+
+def _criar_tabelas(caminho):
+    pasta = os.path.dirname(caminho)
+    if pasta:
+        os.makedirs(pasta, exist_ok=True)
+    with _conexao(caminho) as con:
+        con.execute("PRAGMA journal_mode=WAL")
+        con.execute(
+            "CREATE TABLE IF NOT EXISTS concursos ("
+            "concurso INTEGER PRIMARY KEY, data TEXT, dezenas TEXT NOT NULL, bruto TEXT NOT NULL)"
+        )
+        con.execute("CREATE TABLE IF NOT EXISTS meta (chave TEXT PRIMARY KEY, valor TEXT)")
+
+
+@contextmanager
+def _conexao(caminho):
+    """Uma conexão por operação (os apps chamam de threads diferentes); commit ao sair"""
+    con = sqlite3.connect(caminho, timeout=30)
+    try:
+        with con:
+            yield con
+    finally:
+        con.close()
+
+
+def _obter_json(url):
+    """GET com novas tentativas (espera 1s, 2s...); retorna None se o concurso não existe"""
+    for tentativa in range(TENTATIVAS):
+        try:
+            resposta = cliente_http.get(url, timeout=TIMEOUT)
+            if resposta.status_code == 404:
+                return None
+            resposta.raise_for_status()
+            return resposta.json()
+        except Exception as e:
+            if tentativa == TENTATIVAS - 1:
+                raise
+            logging.warning(f"[lotofacil] {url}: {e}; nova tentativa")
+            time.sleep(2 ** tentativa)
+
+
+def _um_concurso(dados):
+    return dados[0] if isinstance(dados, list) else dados
+
+
+class BaseResultados:
+    """Leitura e sincronização da base local"""
+
+    def __init__(self, caminho=CAMINHO_BASE, url_api=URL_API):
+        self.caminho = caminho
+        self.url_api = url_api
+        _criar_tabelas(caminho)
+
+    # -------------------------
+    # Escrita
+    # -------------------------
+    def gravar(self, lista_dados):
+        """Insere/atualiza concursos no formato da API; retorna quantos eram novos"""
+        linhas = []
+        for dados in lista_dados:
+            try:
+                numero = int(dados["concurso"])
+                dezenas = extrair_dezenas(dados)
+            except (KeyError, TypeError, ValueError):
+                continue
+            if len(dezenas) != 15:
+                continue
+            linhas.append((numero, dados.get("data"), " ".join(f"{d:02d}" for d in dezenas),
+                           json.dumps(dados, ensure_ascii=False)))
+        if not linhas:
+            return 0
+        with _conexao(self.caminho) as con:
+            antes = con.execute("SELECT COUNT(*) FROM concursos").fetchone()[0]
+            con.executemany("INSERT OR REPLACE INTO concursos VALUES (?, ?, ?, ?)", linhas)
+            depois = con.execute("SELECT COUNT(*) FROM concursos").fetchone()[0]
+        return depois - antes
+
+    def _meta(self, chave, valor=None):
+        with _conexao(self.caminho) as con:
+            if valor is None:
+                linha = con.execute("SELECT valor FROM meta WHERE chave = ?", (chave,)).fetchone()
+                return linha[0] if linha else None
+            con.execute("INSERT OR REPLACE INTO meta VALUES (?, ?)", (chave, str(valor)))
+
+    # -------------------------
+    # Sincronização
+    # -------------------------
+    def sincronizar(self, qtd=250, forcar=False, historico_completo=False):
+        """
+        Garante os últimos `qtd` concursos na base. Retorna quantos concursos novos
+        foram gravados; exceções da API sobem para o app decidir o que mostrar.
+
+        historico_completo=True também busca (pela lista completa) os concursos
+        anteriores aos últimos `qtd`, para os apps que usam o histórico inteiro.
+        """
+        with _sync_lock:
+            ultima_sync = float(self._meta("ultima_sync") or 0)
+            if (not forcar and time.time() - ultima_sync < INTERVALO_MINIMO_SYNC and self.quantidade() >= qtd
+                    and (not historico_completo or self._meta("lista_completa"))):
+                return 0
+
+            try:
+                ultimo = _um_concurso(_obter_json(f"{self.url_api}latest"))
+            except Exception:
+                ultimo = None
+            if not ultimo:
+                dados = _obter_json(self.url_api)
+                novos = self.gravar(dados if isinstance(dados, list) else [dados])
+                if isinstance(dados, list):
+                    self._meta("lista_completa", time.time())
+                ultimo = _um_concurso(dados)
+            else:
+                novos = self.gravar([ultimo])
+
+            numero_atual = int(ultimo["concurso"])
+            completo = historico_completo and not self._meta("lista_completa")
+            primeiro = 1 if completo else max(1, numero_atual - qtd + 1)
+            desejados = set(range(primeiro, numero_atual + 1))
+            faltando = sorted(desejados - self.numeros_gravados(primeiro), reverse=True)
+
+            if len(faltando) > LIMITE_BUSCA_INDIVIDUAL:
+                dados = _obter_json(self.url_api)
+                if isinstance(dados, list):
+                    novos += self.gravar(dados)
+                    self._meta("lista_completa", time.time())
+                    faltando = sorted(desejados - self.numeros_gravados(primeiro), reverse=True)
+
+            # concurso a concurso só os últimos `qtd`; o resto vem apenas pela lista completa
+            faltando = [n for n in faltando if n > numero_atual - qtd]
+            if faltando:
+                with ThreadPoolExecutor(max_workers=MAX_WORKERS) as pool:
+                    resultados = list(pool.map(self._buscar_concurso, faltando))
+                novos += self.gravar([r for r in resultados if r])
+
+            self._meta("ultima_sync", time.time())
+            return novos
+
+    def _buscar_concurso(self, numero):
+        try:
+            dados = _obter_json(f"{self.url_api}{numero}")
+            return _um_concurso(dados) if dados else None
+        except Exception as e:
+            logging.error(f"[lotofacil] Concurso {numero} não sincronizado: {e}")
+            return None
+
+    # -------------------------
+    # Leitura
+    # -------------------------
+    def quantidade(self):
+        with _conexao(self.caminho) as con:
+            return con.execute("SELECT COUNT(*) FROM concursos").fetchone()[0]
+
+    def numeros_gravados(self, a_partir_de=0):
+        with _conexao(self.caminho) as con:
+            return {n for (n,) in con.execute("SELECT concurso FROM concursos WHERE concurso >= ?", (a_partir_de,))}
+
+    def ultimos(self, qtd=None):
+        """Concursos do mais recente para o mais antigo: dicts com numero, data e dezenas"""
+        with _conexao(self.caminho) as con:
+            linhas = con.execute(
+                "SELECT concurso, data, dezenas FROM concursos ORDER BY concurso DESC LIMIT ?",
+                (-1 if qtd is None else qtd,)
+            ).fetchall()
+        return [{"numero": n, "data": data, "dezenas": [int(d) for d in dezenas.split()]} for n, data, dezenas in linhas]
+
+    def dados_api(self, qtd=None):
+        """Concursos no formato bruto da API (lista do mais recente para o mais antigo)"""
+        with _conexao(self.caminho) as con:
+            linhas = con.execute(
+                "SELECT bruto FROM concursos ORDER BY concurso DESC LIMIT ?",
+                (-1 if qtd is None else qtd,)
+            ).fetchall()
+        return [json.loads(bruto) for (bruto,) in linhas]
+
+
+_bases = {}
+_bases_lock = threading.Lock()
+
+
+def obter_base(caminho=CAMINHO_BASE):
+    with _bases_lock:
+        if caminho not in _bases:
+            _bases[caminho] = BaseResultados(caminho)
+        return _bases[caminho]
+
+
+def carregar_concursos(qtd=250, caminho=CAMINHO_BASE):
+    """
+    Sincroniza e devolve (concursos, info_ultimo) como o antigo capturar_ultimos_resultados:
+    listas de dezenas do mais recente para o mais antigo. Se a API falhar, usa o que
+    já está na base e devolve o erro como terceiro item (None quando deu tudo certo).
+    """
+    base = obter_base(caminho)
+    erro = None
+    try:
+        base.sincronizar(qtd)
+    except Exception as e:
+        erro = e
+        logging.error(f"[lotofacil] Sincronização falhou: {type(e).__name__}: {e}")
+    ultimos = base.ultimos(qtd)
+    if not ultimos:
+        return [], None, erro
+    return [c["dezenas"] for c in ultimos], ultimos[0], erro
+
+
+def carregar_dados_api(qtd=250, caminho=CAMINHO_BASE):
+    """
+    Histórico inteiro no formato bruto da API (mais recente primeiro) e o erro da
+    sincronização (None se deu tudo certo), para os apps que usavam a lista completa.
+    Na primeira carga baixa a lista toda, não só os últimos `qtd`; se a API falhar,
+    devolve o que já está na base.
+    """
+    base = obter_base(caminho)
+    erro = None
+    try:
+        base.sincronizar(qtd, historico_completo=True)
+    except Exception as e:
+        erro = e
+        logging.error(f"[lotofacil] Sincronização falhou: {type(e).__name__}: {e}")
+    return base.dados_api(), erro
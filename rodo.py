@@ -1,7 +1,7 @@
 import streamlit as st
 import json
 import os
-import requests
+import cliente_http
 import logging
 import numpy as np
 from collections import Counter
@@ -307,7 +307,7 @@ st.session_state.duzia_prevista = mais_votado
 # Captura do último número da API
 resultado = None
 try:
-    response = requests.get(API_URL, headers=HEADERS, timeout=10)
+    response = cliente_http.get(API_URL, headers=HEADERS, timeout=10)
     response.raise_for_status()
     data = response.json()
     game_data = data.get("data", {})
@@ -1,7 +1,7 @@
 import streamlit as st
 import json
 import os
-import requests
+import cliente_http
 import logging
 import numpy as np
 from collections import Counter
@@ -452,7 +452,7 @@ def adicionar_resultado_se_novo(novo_resultado):
 # --- Captura da API ---
 resultado_api = None
 try:
-    response = requests.get(API_URL, headers=HEADERS, timeout=10)
+    response = cliente_http.get(API_URL, headers=HEADERS, timeout=10)
     response.raise_for_status()
     data = response.json()
     game_data = data.get("data", {})
@@ -1,7 +1,7 @@
 import streamlit as st
 import json
 import os
-import requests
+import cliente_http
 import logging
 import numpy as np
 from collections import Counter
@@ -475,7 +475,7 @@ st.session_state.duzia_prevista = mais_votado
 
 # 🛰️ Buscar novo número da API
 try:
-    response = requests.get(API_URL, headers=HEADERS, timeout=10)
+    response = cliente_http.get(API_URL, headers=HEADERS, timeout=10)
     data = response.json()
     resultado_api = {
         "number": data.get("data", {}).get("result", {}).get("outcome", {}).get("number"),
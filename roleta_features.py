@@ -0,0 +1,399 @@
+# roleta_features.py
+import math
+from collections import deque
+
+import numpy as np
+
+
+# =========================
+# CONSTANTES DA ROLETA
+# =========================
+VERMELHOS = {1, 3, 5, 7, 9, 12, 14, 16, 18, 19, 21, 23, 25, 27, 30, 32, 34, 36}
+NUMEROS = list(range(37))
+
+
+def duzia_of(x):
+    """Dúzia do número (0 = zero, 1 = 1-12, 2 = 13-24, 3 = 25-36)"""
+    if x == 0:
+        return 0
+    if 1 <= x <= 12:
+        return 1
+    if 13 <= x <= 24:
+        return 2
+    return 3
+
+
+class _JanelaRolante:
+    """Estatísticas de uma janela deslizante mantidas em O(1) por giro"""
+
+    def __init__(self, tamanho):
+        self.tamanho = tamanho
+        self.contagem = [0] * 37
+        self.tamanho_atual = 0
+        self.distintos = 0
+        self.soma = 0
+        self.soma_quadrados = 0
+
+    def entrar(self, x):
+        if self.contagem[x] == 0:
+            self.distintos += 1
+        self.contagem[x] += 1
+        self.tamanho_atual += 1
+        self.soma += x
+        self.soma_quadrados += x * x
+
+    def sair(self, x):
+        self.contagem[x] -= 1
+        if self.contagem[x] == 0:
+            self.distintos -= 1
+        self.tamanho_atual -= 1
+        self.soma -= x
+        self.soma_quadrados -= x * x
+
+    def media(self):
+        return self.soma / self.tamanho_atual if self.tamanho_atual > 0 else 0.0
+
+    def desvio(self):
+        m = self.tamanho_atual
+        if m <= 1:
+            return 0.0
+        # Somas inteiras: variância exata até a raiz
+        return math.sqrt(max(m * self.soma_quadrados - self.soma * self.soma, 0)) / m
+
+    def mediana(self):
+        m = self.tamanho_atual
+        if m == 0:
+            return 0.0
+        alvo_baixo = (m - 1) // 2
+        alvo_alto = m // 2
+        baixo = alto = None
+        acumulado = 0
+        for valor, c in enumerate(self.contagem):
+            if c == 0:
+                continue
+            acumulado += c
+            if baixo is None and acumulado > alvo_baixo:
+                baixo = valor
+            if acumulado > alvo_alto:
+                alto = valor
+                break
+        return (baixo + alto) / 2.0
+
+    def top1(self):
+        return max(self.contagem)
+
+
+class MotorFeaturesRoleta:
+    """
+    Motor incremental de features para o MLRoletaOtimizada.
+
+    Mantém janelas rolantes, o "tempo desde a última saída" de cada número e as
+    somas das transições em buffers de tamanho fixo, atualizados em O(1) por giro.
+    As colunas geradas são idênticas (nome e ordem) às de extrair_features.
+    """
+
+    def __init__(self, race, janelas=(3, 8, 15, 30, 60, 120), k_seq=10,
+                 janela_cores=50, raio_vizinhos=6, minimo_historico=10):
+        self.race = list(race)
+        self.janelas = list(janelas)
+        self.k_seq = k_seq
+        self.janela_cores = janela_cores
+        self.raio_vizinhos = raio_vizinhos
+        self.minimo_historico = minimo_historico
+
+        self.vizinhos = {}
+        n = len(self.race)
+        for num in NUMEROS:
+            if num in self.race:
+                idx = self.race.index(num)
+                self.vizinhos[num] = {self.race[(idx + o) % n] for o in range(-raio_vizinhos, raio_vizinhos + 1)}
+            else:
+                self.vizinhos[num] = {num}
+
+        self.feature_names = self._montar_nomes()
+        self.reset()
+
+    def _montar_nomes(self):
+        names = [f"ultimo_{i+1}" for i in range(self.k_seq)]
+        for w in self.janelas:
+            names.extend([f"media_{w}", f"std_{w}", f"mediana_{w}"])
+        for w in self.janelas:
+            names.extend([f"diversidade_{w}", f"top1_prop_{w}"])
+        names.extend(f"tempo_desde_{num}" for num in NUMEROS)
+        names.extend(["prop_vermelhos_50", "prop_pretos_50", "prop_zero_50"])
+        names.extend(f"prop_duzia_{d}_50" for d in [1, 2, 3])
+        names.append("prop_ultimos_em_vizinhos_6")
+        names.extend(["repetiu_ultimo", "repetiu_paridade", "repetiu_duzia"])
+        names.append("delta_media_small_large")
+        names.extend(["media_transicoes", "std_transicoes"])
+        return names
+
+    def reset(self):
+        """Zera o estado do motor"""
+        tamanhos = sorted(set(self.janelas) | {self.janela_cores})
+        self.stats = {w: _JanelaRolante(w) for w in tamanhos}
+        self.buffer = deque(maxlen=max(tamanhos))
+        self.ultima_posicao = [-1] * 37
+        self.n = 0
+        self.soma_transicoes = 0
+        self.soma_quadrados_transicoes = 0
+        self.historico = []
+
+    def adicionar_numero(self, numero):
+        """Atualiza o estado com um novo giro em O(1)"""
+        x = int(numero)
+        for w, janela in self.stats.items():
+            if self.n >= w:
+                janela.sair(self.buffer[-w])
+            janela.entrar(x)
+
+        if self.n > 0:
+            d = abs(x - self.buffer[-1])
+            self.soma_transicoes += d
+            self.soma_quadrados_transicoes += d * d
+
+        self.buffer.append(x)
+        self.ultima_posicao[x] = self.n
+        self.n += 1
+        self.historico.append(x)
+
+    def sincronizar(self, historico):
+        """
+        Alinha o estado ao histórico informado.
+        Se o histórico apenas estende o já processado, aplica só os giros novos;
+        caso contrário (ex.: deque com maxlen deslizando) reconstrói do zero.
+        """
+        historico = list(historico)
+        if len(historico) < self.n or historico[:self.n] != self.historico:
+            self.reset()
+        for x in historico[self.n:]:
+            self.adicionar_numero(x)
+
+    def features_atuais(self):
+        """Vetor de features do estado atual (equivalente a extrair_features)"""
+        N = self.n
+        if N < self.minimo_historico:
+            return None, None
+
+        ultimos = list(self.buffer)[-self.k_seq:]
+        features = [ultimos[i] if i < len(ultimos) else -1 for i in range(self.k_seq)]
+
+        for w in self.janelas:
+            janela = self.stats[w]
+            features.extend([janela.media(), janela.desvio(), janela.mediana()])
+
+        for w in self.janelas:
+            janela = self.stats[w]
+            features.append(janela.distintos / (w if w > 0 else 1))
+            features.append(janela.top1() / (w if w > 0 else 1))
+
+        for num in NUMEROS:
+            pos = self.ultima_posicao[num]
+            features.append(N - 1 - pos if pos >= 0 else N + 1)
+
+        cores = self.stats[self.janela_cores]
+        total = cores.tamanho_atual
+        contagem = cores.contagem
+        count_zero = contagem[0]
+        count_verm = sum(contagem[v] for v in VERMELHOS)
+        count_pret = total - count_verm - count_zero
+        features.extend([count_verm / total, count_pret / total, count_zero / total])
+        features.append(sum(contagem[1:13]) / total)
+        features.append(sum(contagem[13:25]) / total)
+        features.append(sum(contagem[25:37]) / total)
+
+        vizinhos_k = self.vizinhos.get(ultimos[-1], {ultimos[-1]})
+        features.append(sum(1 for x in ultimos if x in vizinhos_k) / len(ultimos))
+
+        a, b = self.buffer[-1], self.buffer[-2]
+        features.append(1 if a == b else 0)
+        features.append(1 if (a % 2) == (b % 2) else 0)
+        features.append(1 if duzia_of(a) == duzia_of(b) else 0)
+
+        if N >= max(self.janelas):
+            small = self.stats[self.janelas[0]].media()
+            large = self.stats[self.janelas[-1]].media()
+            features.append(small - large)
+        else:
+            features.append(0.0)
+
+        m = N - 1
+        features.append(self.soma_transicoes / m if m > 0 else 0.0)
+        if m > 1:
+            var = max(m * self.soma_quadrados_transicoes - self.soma_transicoes ** 2, 0)
+            features.append(math.sqrt(var) / m)
+        else:
+            features.append(0.0)
+
+        return features, self.feature_names
+
+    def gerar_matriz(self, historico, start_index):
+        """
+        Monta X/y de treino de uma vez: a linha i usa historico[:i] como
+        contexto e historico[i] como alvo. A matriz vem de extrair_features_lote
+        e o estado incremental é alinhado ao histórico completo, pronto para a
+        previsão ao vivo.
+        """
+        historico = list(historico)
+        inicio = max(start_index, self.minimo_historico)
+        matriz = extrair_features_lote(
+            historico, self.race, janelas=self.janelas, k_seq=self.k_seq,
+            janela_cores=self.janela_cores, raio_vizinhos=self.raio_vizinhos
+        )
+        self.reset()
+        for x in historico:
+            self.adicionar_numero(x)
+        if len(historico) <= inicio:
+            return np.empty((0, len(self.feature_names))), np.array([], dtype=int)
+        # Linha j da matriz = contexto historico[:j+1]
+        X = matriz[inicio - 1:len(historico) - 1]
+        y = np.asarray(historico[inicio:], dtype=int)
+        return X, y
+
+
+# =========================
+# EXTRAÇÃO EM LOTE (NUMPY)
+# =========================
+def _contagens_janela(acumulado, w):
+    """Contagens por número da janela historico[max(0, L-w):L] para cada L = 1..N"""
+    N = acumulado.shape[0] - 1
+    fim = np.arange(1, N + 1)
+    inicio = np.maximum(fim - w, 0)
+    return acumulado[fim] - acumulado[inicio], fim - inicio
+
+
+def extrair_features_lote(historico, race, janelas=(3, 8, 15, 30, 60, 120), k_seq=10,
+                          janela_cores=50, raio_vizinhos=6, minimo_historico=10):
+    """
+    Versão vetorizada de extrair_features para o histórico inteiro.
+
+    Recebe o histórico como array int8 (ou lista) e devolve a matriz (N x F),
+    em que a linha i corresponde ao contexto historico[:i+1]. Linhas com menos
+    de `minimo_historico` giros ficam com NaN. A ordem das colunas é a mesma de
+    MotorFeaturesRoleta.feature_names.
+    """
+    h8 = np.asarray(historico, dtype=np.int8)
+    h = h8.astype(np.int64)
+    N = len(h)
+    janelas = list(janelas)
+    F = k_seq + 5 * len(janelas) + 37 + 6 + 1 + 3 + 1 + 2
+    X = np.full((N, F), np.nan)
+    if N < minimo_historico or N == 0:
+        return X
+
+    comprimento = np.arange(1, N + 1)
+    validas = comprimento >= minimo_historico
+    col = 0
+
+    # 1) Últimos K (preenche com -1 quando o contexto é menor que K)
+    preenchido = np.concatenate([np.full(k_seq, -1, dtype=np.int64), h])
+    ultimos = np.lib.stride_tricks.sliding_window_view(preenchido, k_seq)[1:]
+    tamanho_ultimos = np.minimum(comprimento, k_seq)
+    # extrair_features usa historico[-K:] alinhado à esquerda
+    deslocamento = k_seq - tamanho_ultimos
+    idx = (np.arange(k_seq)[None, :] + deslocamento[:, None]) % k_seq
+    ultimos_alinhados = np.take_along_axis(ultimos, idx, axis=1)
+    ultimos_alinhados[np.arange(k_seq)[None, :] >= tamanho_ultimos[:, None]] = -1
+    X[:, col:col + k_seq] = ultimos_alinhados
+    col += k_seq
+
+    # Contagens one-hot acumuladas: acumulado[L] = contagem de cada número em historico[:L]
+    one_hot = np.zeros((N, 37), dtype=np.int32)
+    one_hot[np.arange(N), h] = 1
+    acumulado = np.zeros((N + 1, 37), dtype=np.int32)
+    np.cumsum(one_hot, axis=0, out=acumulado[1:])
+
+    soma = np.concatenate([[0], np.cumsum(h)])
+    soma_q = np.concatenate([[0], np.cumsum(h * h)])
+    valores = np.arange(37)
+
+    contagens_por_janela = {}
+    for w in sorted(set(janelas) | {janela_cores}):
+        contagens_por_janela[w] = _contagens_janela(acumulado, w)
+
+    # 2) Média, desvio e mediana por janela
+    medias = {}
+    for w in janelas:
+        contagens, m = contagens_por_janela[w]
+        inicio = comprimento - m
+        s = soma[comprimento] - soma[inicio]
+        sq = soma_q[comprimento] - soma_q[inicio]
+        media = s / m
+        desvio = np.where(m > 1, np.sqrt(np.maximum(m * sq - s * s, 0)) / m, 0.0)
+        acum = np.cumsum(contagens, axis=1)
+        baixo = np.argmax(acum > ((m - 1) // 2)[:, None], axis=1)
+        alto = np.argmax(acum > (m // 2)[:, None], axis=1)
+        medias[w] = media
+        X[:, col] = media
+        X[:, col + 1] = desvio
+        X[:, col + 2] = (valores[baixo] + valores[alto]) / 2.0
+        col += 3
+
+    # 3) Diversidade e proporção do mais frequente
+    for w in janelas:
+        contagens, _ = contagens_por_janela[w]
+        divisor = w if w > 0 else 1
+        X[:, col] = (contagens > 0).sum(axis=1) / divisor
+        X[:, col + 1] = contagens.max(axis=1) / divisor
+        col += 2
+
+    # 4) Tempo desde a última saída de cada número
+    posicoes = np.where(one_hot.astype(bool), np.arange(N)[:, None], -1)
+    ultima = np.maximum.accumulate(posicoes, axis=0)
+    i = np.arange(N)[:, None]
+    X[:, col:col + 37] = np.where(ultima >= 0, i - ultima, i + 2)
+    col += 37
+
+    # 5) Cores e dúzias na janela de 50
+    contagens, m = contagens_por_janela[janela_cores]
+    mascara_verm = np.zeros(37, dtype=bool)
+    mascara_verm[list(VERMELHOS)] = True
+    verm = contagens[:, mascara_verm].sum(axis=1)
+    zero = contagens[:, 0]
+    X[:, col] = verm / m
+    X[:, col + 1] = (m - verm - zero) / m
+    X[:, col + 2] = zero / m
+    X[:, col + 3] = contagens[:, 1:13].sum(axis=1) / m
+    X[:, col + 4] = contagens[:, 13:25].sum(axis=1) / m
+    X[:, col + 5] = contagens[:, 25:37].sum(axis=1) / m
+    col += 6
+
+    # 6) Últimos K dentro dos vizinhos físicos do último número
+    tabela_vizinhos = np.eye(37, dtype=bool)
+    n_race = len(race)
+    for pos, num in enumerate(race):
+        tabela_vizinhos[num, :] = False
+        for o in range(-raio_vizinhos, raio_vizinhos + 1):
+            tabela_vizinhos[num, race[(pos + o) % n_race]] = True
+    dentro = tabela_vizinhos[h[:, None], np.maximum(ultimos_alinhados, 0)]
+    dentro &= np.arange(k_seq)[None, :] < tamanho_ultimos[:, None]
+    X[:, col] = dentro.sum(axis=1) / tamanho_ultimos
+    col += 1
+
+    # 7) Repetições
+    anterior = np.concatenate([[-1], h[:-1]])
+    tem_anterior = comprimento >= 2
+    tabela_duzia = np.array([duzia_of(n) for n in range(37)])
+    X[:, col] = tem_anterior & (h == anterior)
+    X[:, col + 1] = tem_anterior & ((h % 2) == (anterior % 2))
+    X[:, col + 2] = tem_anterior & (tabela_duzia[h] == tabela_duzia[np.maximum(anterior, 0)])
+    col += 3
+
+    # 8) Diferença entre a menor e a maior janela
+    X[:, col] = np.where(comprimento >= max(janelas), medias[janelas[0]] - medias[janelas[-1]], 0.0)
+    col += 1
+
+    # 9) Transições |h[t] - h[t-1]| acumuladas
+    d = np.abs(np.diff(h))
+    soma_d = np.concatenate([[0, 0], np.cumsum(d)])
+    soma_dq = np.concatenate([[0, 0], np.cumsum(d * d)])
+    m = comprimento - 1
+    s = soma_d[comprimento]
+    sq = soma_dq[comprimento]
+    with np.errstate(invalid='ignore', divide='ignore'):
+        X[:, col] = np.where(m > 0, s / np.maximum(m, 1), 0.0)
+        X[:, col + 1] = np.where(m > 1, np.sqrt(np.maximum(m * sq - s * s, 0)) / np.maximum(m, 1), 0.0)
+    col += 2
+
+    X[~validas] = np.nan
+    return X
@@ -0,0 +1,400 @@
+# roleta_treino.py
+import os
+import time
+import logging
+import threading
+import multiprocessing
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+import numpy as np
+import pandas as pd
+import joblib
+from sklearn.model_selection import train_test_split
+from sklearn.preprocessing import StandardScaler
+from sklearn.metrics import accuracy_score
+from sklearn.utils import resample
+
+from roleta_features import MotorFeaturesRoleta
+
+# =========================
+# PUBLICAÇÃO DOS MODELOS
+# =========================
+DIRETORIO_MODELOS = "modelos_roleta"
+ARQUIVO_PONTEIRO = "ATUAL"
+VERSOES_MANTIDAS = 3
+
+
+def _caminho_versao(diretorio, versao):
+    return os.path.join(diretorio, f"modelo_v{versao:05d}.joblib")
+
+
+def _listar_versoes(diretorio):
+    versoes = []
+    if os.path.isdir(diretorio):
+        for nome in os.listdir(diretorio):
+            if nome.startswith("modelo_v") and nome.endswith(".joblib"):
+                try:
+                    versoes.append(int(nome[len("modelo_v"):-len(".joblib")]))
+                except ValueError:
+                    continue
+    return sorted(versoes)
+
+
+def versao_publicada(diretorio=DIRETORIO_MODELOS):
+    """Versão apontada pelo ponteiro ATUAL (None se ainda não há modelo)"""
+    try:
+        with open(os.path.join(diretorio, ARQUIVO_PONTEIRO), "r") as f:
+            return int(f.read().strip())
+    except (OSError, ValueError):
+        return None
+
+
+def publicar_modelo(pacote, diretorio=DIRETORIO_MODELOS):
+    """
+    Grava o pacote como um novo arquivo versionado e só então troca o ponteiro.
+    Os dois passos usam os.replace, então leitores nunca veem arquivo pela metade.
+    """
+    os.makedirs(diretorio, exist_ok=True)
+    versoes = _listar_versoes(diretorio)
+    versao = (versoes[-1] if versoes else 0) + 1
+
+    destino = _caminho_versao(diretorio, versao)
+    joblib.dump(pacote, destino + ".tmp")
+    os.replace(destino + ".tmp", destino)
+
+    ponteiro = os.path.join(diretorio, ARQUIVO_PONTEIRO)
+    with open(ponteiro + ".tmp", "w") as f:
+        f.write(str(versao))
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(ponteiro + ".tmp", ponteiro)
+
+    for antiga in versoes[:-(VERSOES_MANTIDAS - 1) or None]:
+        try:
+            os.remove(_caminho_versao(diretorio, antiga))
+        except OSError:
+            pass
+    return versao
+
+
+def carregar_modelo_publicado(diretorio=DIRETORIO_MODELOS):
+    """Retorna (versao, pacote) do modelo atual ou (None, None)"""
+    versao = versao_publicada(diretorio)
+    if versao is None:
+        return None, None
+    try:
+        return versao, joblib.load(_caminho_versao(diretorio, versao))
+    except Exception as e:
+        logging.error(f"[carregar_modelo_publicado] Erro: {e}")
+        return None, None
+
+
+# =========================
+# TREINAMENTO DO ENSEMBLE
+# =========================
+def preparar_dados_treinamento(historico_completo, motor, max_history=1000):
+    historico_completo = list(historico_completo)
+    if len(historico_completo) > max_history:
+        historico_completo = historico_completo[-max_history:]
+
+    start_index = max(50, len(historico_completo) // 10)
+
+    X, y = motor.gerar_matriz(historico_completo, start_index)
+
+    if len(X) == 0:
+        return np.array([]), np.array([])
+
+    class_counts = Counter(y)
+    if len(class_counts) < 10:
+        logging.warning(f"Pouca variedade de classes: apenas {len(class_counts)} números únicos")
+        return np.array([]), np.array([])
+
+    return np.array(X), np.array(y)
+
+
+def construir_modelo(X_train, y_train, X_val=None, y_val=None, seed=0):
+    try:
+        try:
+            from catboost import CatBoostClassifier
+            model = CatBoostClassifier(
+                iterations=1500,
+                learning_rate=0.05,
+                depth=10,
+                l2_leaf_reg=5,
+                bagging_temperature=0.8,
+                random_strength=1.0,
+                loss_function='MultiClass',
+                eval_metric='MultiClass',
+                random_seed=seed,
+                use_best_model=True,
+                early_stopping_rounds=100,
+                verbose=False
+            )
+            if X_val is not None and y_val is not None:
+                model.fit(X_train, y_train, eval_set=(X_val, y_val), verbose=False)
+            else:
+                model.fit(X_train, y_train, verbose=False)
+            return model, "CatBoost"
+        except ImportError:
+            raise Exception("CatBoost não disponível")
+
+    except Exception as e:
+        logging.warning(f"CatBoost não disponível ou falha ({e}). Usando RandomForest como fallback.")
+        from sklearn.ensemble import RandomForestClassifier
+        model = RandomForestClassifier(
+            n_estimators=400,
+            max_depth=20,
+            min_samples_split=3,
+            min_samples_leaf=2,
+            random_state=seed,
+            n_jobs=-1
+        )
+        model.fit(X_train, y_train)
+        return model, "RandomForest"
+
+
+def _balancear(X_train, y_train, seed):
+    df_train = pd.DataFrame(X_train, columns=[f"f{i}" for i in range(X_train.shape[1])])
+    df_train['y'] = y_train
+
+    value_counts = df_train['y'].value_counts()
+    if len(value_counts) == 0:
+        raise ValueError("Nenhuma classe encontrada")
+
+    max_count = value_counts.max()
+
+    if len(value_counts) < 2:
+        logging.warning("Apenas uma classe disponível, pulando balanceamento")
+        return X_train, y_train
+
+    frames = []
+    for cls, grp in df_train.groupby('y'):
+        if 1 <= len(grp) < max_count:
+            min_samples = max(5, max_count // 3)
+            n_samples = min(max_count, min_samples)
+            frames.append(resample(grp, replace=True, n_samples=n_samples, random_state=seed))
+        else:
+            frames.append(grp)
+
+    if not frames:
+        return X_train, y_train
+    df_bal = pd.concat(frames)
+    return df_bal.drop(columns=['y']).values, df_bal['y'].values
+
+
+def treinar_ensemble(historico_completo, race, config):
+    """
+    Treina o ensemble a partir de um snapshot do histórico.
+    Retorna (pacote, mensagem); pacote é None quando não há dados suficientes.
+    """
+    seed = config.get('seed', 42)
+    numeros = list(range(37))
+    motor = MotorFeaturesRoleta(race, janelas=config.get('janelas', (3, 8, 15, 30, 60, 120)))
+
+    X, y = preparar_dados_treinamento(historico_completo, motor, config.get('max_history', 1000))
+    if X.size == 0 or len(X) < 50:
+        return None, f"Dados insuficientes para treino: {len(X)} amostras"
+
+    scaler = StandardScaler()
+    X_scaled = scaler.fit_transform(X)
+
+    try:
+        class_counts = Counter(y)
+        min_samples_per_class = min(class_counts.values())
+        can_stratify = min_samples_per_class >= 2 and len(class_counts) > 1
+
+        X_train, X_val, y_train, y_val = train_test_split(
+            X_scaled, y,
+            test_size=0.2,
+            random_state=seed,
+            stratify=y if can_stratify else None
+        )
+        logging.info(f"Split realizado: estratificação = {can_stratify}, classes = {len(class_counts)}, min_amostras = {min_samples_per_class}")
+
+    except Exception as e:
+        logging.warning(f"Erro no split estratificado: {e}. Usando split sem estratificação.")
+        X_train, X_val, y_train, y_val = train_test_split(
+            X_scaled, y, test_size=0.2, random_state=seed
+        )
+
+    if config.get('balance', True) and len(X_train) > 0:
+        try:
+            X_train, y_train = _balancear(X_train, y_train, seed)
+        except Exception as e:
+            logging.warning(f"Erro no balanceamento: {e}. Continuando sem balanceamento.")
+
+    models = []
+    model_names = []
+    for s in [seed, seed + 7, seed + 13]:
+        try:
+            model, name = construir_modelo(X_train, y_train, X_val, y_val, seed=s)
+            models.append(model)
+            model_names.append(name)
+        except Exception as e:
+            logging.error(f"Erro ao treinar modelo {s}: {e}")
+
+    if not models:
+        return None, "Todos os modelos falharam no treinamento"
+
+    try:
+        probs = []
+        for m in models:
+            if hasattr(m, 'predict_proba'):
+                probs.append(m.predict_proba(X_val))
+            else:
+                preds = m.predict(X_val)
+                prob = np.zeros((len(preds), len(numeros)))
+                for i, p in enumerate(preds):
+                    prob[i, p] = 1.0
+                probs.append(prob)
+        acc = accuracy_score(y_val, np.argmax(np.mean(probs, axis=0), axis=1)) if probs else 0.0
+    except Exception as e:
+        logging.warning(f"Erro na avaliação: {e}")
+        acc = 0.0
+
+    pacote = {
+        'models': models,
+        'scaler': scaler,
+        'feature_names': motor.feature_names,
+        'meta': {
+            'last_accuracy': acc,
+            'trained_on': len(historico_completo),
+            'last_training_size': len(X),
+        },
+    }
+    mensagem = f"Ensemble treinado ({', '.join(model_names)}) com {len(X)} amostras. Acurácia validação: {acc:.2%}"
+    return pacote, mensagem
+
+
+def _executar_job(historico, race, config, diretorio):
+    """Ponto de entrada do processo filho: treina e publica"""
+    inicio = time.time()
+    pacote, mensagem = treinar_ensemble(historico, race, config)
+    versao = publicar_modelo(pacote, diretorio) if pacote is not None else None
+    return {
+        'sucesso': pacote is not None,
+        'mensagem': mensagem,
+        'versao': versao,
+        'inicio': inicio,
+        'fim': time.time(),
+    }
+
+
+# =========================
+# SERVIÇO EM SEGUNDO PLANO
+# =========================
+class ServicoTreinoRoleta:
+    """
+    Fila de treinamento fora da thread de rerun do Streamlit.
+
+    Um processo filho treina sobre um snapshot do histórico e publica o
+    modelo versionado; quem prevê continua com o modelo anterior até o ponteiro
+    mudar. Enquanto um job roda, só o pedido mais recente fica aguardando
+    (pedidos intermediários são marcados como substituídos).
+    """
+
+    def __init__(self, diretorio=DIRETORIO_MODELOS, max_workers=1, max_jobs_registrados=20):
+        self.diretorio = diretorio
+        self.max_workers = max_workers
+        self.max_jobs_registrados = max_jobs_registrados
+        self.executor = self._novo_executor()
+        self.jobs = []
+        # RLock: add_done_callback pode rodar na hora, ainda dentro do lock
+        self._lock = threading.RLock()
+        self._proximo_id = 1
+        self._em_execucao = None
+        self._pendente = None
+
+    def _novo_executor(self):
+        # spawn: o processo do Streamlit tem várias threads, fork não é seguro
+        return ProcessPoolExecutor(
+            max_workers=self.max_workers,
+            mp_context=multiprocessing.get_context("spawn")
+        )
+
+    def _recriar_executor(self):
+        """Pool quebrado (filho morto por OOM/sinal) não aceita mais jobs: troca por um novo"""
+        logging.warning("[ServicoTreinoRoleta] Pool de processos quebrado; recriando")
+        antigo, self.executor = self.executor, self._novo_executor()
+        antigo.shutdown(wait=False, cancel_futures=True)
+
+    def submeter(self, historico, race, config):
+        """Enfileira um treino sobre uma cópia do histórico; retorna o id do job"""
+        job = {
+            'id': None,
+            'estado': 'na fila',
+            'criado_em': time.time(),
+            'inicio': None,
+            'duracao': None,
+            'amostras': len(historico),
+            'mensagem': '',
+            'versao': None,
+            '_args': ([int(x) for x in historico], list(race), dict(config), self.diretorio),
+        }
+        with self._lock:
+            job['id'] = self._proximo_id
+            self._proximo_id += 1
+            self.jobs.append(job)
+            del self.jobs[:-self.max_jobs_registrados]
+            if self._em_execucao is None:
+                self._iniciar(job)
+            else:
+                if self._pendente is not None:
+                    self._pendente['estado'] = 'substituído'
+                    self._pendente.pop('_args', None)
+                self._pendente = job
+        return job['id']
+
+    def _iniciar(self, job):
+        args = job.pop('_args')
+        job['estado'] = 'treinando'
+        job['inicio'] = time.time()
+        self._em_execucao = job
+        try:
+            try:
+                futuro = self.executor.submit(_executar_job, *args)
+            except BrokenProcessPool:
+                self._recriar_executor()
+                futuro = self.executor.submit(_executar_job, *args)
+        except Exception as e:
+            job['estado'] = 'erro'
+            job['mensagem'] = str(e)
+            self._em_execucao = None
+            return
+        futuro.add_done_callback(lambda f, job=job: self._concluir(job, f))
+
+    def _concluir(self, job, futuro):
+        with self._lock:
+            try:
+                resultado = futuro.result()
+                job['estado'] = 'publicado' if resultado['sucesso'] else 'sem dados'
+                job['mensagem'] = resultado['mensagem']
+                job['versao'] = resultado['versao']
+                job['duracao'] = resultado['fim'] - resultado['inicio']
+            except Exception as e:
+                logging.error(f"[ServicoTreinoRoleta] Job {job['id']} falhou: {e}")
+                job['estado'] = 'erro'
+                job['mensagem'] = str(e)
+                job['duracao'] = time.time() - job['inicio']
+                if isinstance(e, BrokenProcessPool):
+                    self._recriar_executor()
+            self._em_execucao = None
+            if self._pendente is not None:
+                proximo, self._pendente = self._pendente, None
+                self._iniciar(proximo)
+
+    def ocupado(self):
+        with self._lock:
+            return self._em_execucao is not None
+
+    def status(self):
+        """Cópia dos jobs (mais recente primeiro) para exibição na interface"""
+        with self._lock:
+            jobs = [{k: v for k, v in job.items() if not k.startswith('_')} for job in reversed(self.jobs)]
+        agora = time.time()
+        for job in jobs:
+            if job['estado'] == 'treinando':
+                job['duracao'] = agora - job['inicio']
+        return jobs
@@ -1,7 +1,7 @@
 # [Parte 1] - Imports e Configs iniciais
 
 import streamlit as st
-import requests
+import cliente_http
 import json
 import os
 import numpy as np
@@ -163,7 +163,7 @@ if "modelo_top4" not in st.session_state:
 # Captura de número via API
 def buscar_novo_numero():
     try:
-        r = requests.get(API_URL, headers=HEADERS, timeout=10)
+        r = cliente_http.get(API_URL, headers=HEADERS, timeout=10)
         if r.status_code == 200:
             data = r.json()
             numero = int(data["data"]["result"]["outcome"]["number"])